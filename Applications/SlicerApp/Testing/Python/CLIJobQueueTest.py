@@ -0,0 +1,151 @@
+import concurrent.futures
+
+import qt
+
+import slicer
+from slicer.ScriptedLoadableModule import *
+
+
+#
+# CLIJobQueueTest
+#
+
+
+class CLIJobQueueTest(ScriptedLoadableModule):
+    def __init__(self, parent):
+        parent.title = "CLIJobQueueTest"  # TODO make this more human readable by adding spaces
+        parent.categories = ["Testing.TestCases"]
+        parent.dependencies = ["CLI4Test"]
+        parent.contributors = ["Slicer Community"]
+        parent.helpText = """
+    This is a self test that tests running CLIs through slicer.cli.CLIJobQueue
+    """
+        parent.acknowledgementText = """"""  # replace with organization, grant and thanks.
+        self.parent = parent
+
+        # Add this test to the SelfTest module's list for discovery when the module
+        # is created.  Since this module may be discovered before SelfTests itself,
+        # create the list if it doesn't already exist.
+        try:
+            slicer.selfTests
+        except AttributeError:
+            slicer.selfTests = {}
+        slicer.selfTests["CLIJobQueueTest"] = self.runTest
+
+    def runTest(self):
+        tester = CLIJobQueueTestTest()
+        tester.runTest()
+
+
+#
+# CLIJobQueueTestWidget
+#
+
+
+class CLIJobQueueTestWidget(ScriptedLoadableModuleWidget):
+    def setup(self):
+        ScriptedLoadableModuleWidget.setup(self)
+
+
+#
+# CLIJobQueueTestTest
+#
+
+
+class CLIJobQueueTestTest(ScriptedLoadableModuleTest):
+    def setUp(self):
+        """Reset the state for testing."""
+        slicer.mrmlScene.Clear(0)
+        self.tempFiles = []
+
+    def runTest(self):
+        """Run as few or as many tests as needed here."""
+        self.setUp()
+        self.test_CLIJobQueueConcurrency()
+        self.setUp()
+        self.test_CLIJobQueueErrors()
+        self.setUp()
+        self.test_CLIJobQueueCancel()
+
+    def parameters(self, operationType="Addition"):
+        tempFile = qt.QTemporaryFile("CLIJobQueueTest-outputFile-XXXXXX")
+        self.assertTrue(tempFile.open())
+        # Keep a reference to the file, it is deleted when the object is destroyed
+        self.tempFiles.append(tempFile)
+        return {
+            "InputValue1": 1,
+            "InputValue2": 2,
+            "OperationType": operationType,
+            "OutputFile": tempFile.fileName(),
+        }
+
+    def test_CLIJobQueueConcurrency(self):
+        self.delayDisplay("Testing CLI job queue concurrency limit")
+
+        queue = slicer.cli.CLIJobQueue(max_concurrent_jobs=2)
+        numberOfCLINodesBefore = slicer.mrmlScene.GetNumberOfNodesByClass("vtkMRMLCommandLineModuleNode")
+
+        maximumNumberOfRunningJobs = 0
+
+        def onJobDone(future):
+            nonlocal maximumNumberOfRunningJobs
+            maximumNumberOfRunningJobs = max(maximumNumberOfRunningJobs, queue.numberOfRunningJobs + 1)
+
+        futures = [queue.submit(slicer.modules.cli4test, self.parameters()) for _ in range(5)]
+        self.assertEqual(queue.numberOfRunningJobs, 2)
+        self.assertEqual(queue.numberOfPendingJobs, 3)
+        for future in futures:
+            future.add_done_callback(onJobDone)
+
+        self.assertTrue(queue.wait(timeout=60))
+        self.assertLessEqual(maximumNumberOfRunningJobs, 2)
+
+        for future in futures:
+            job = future.result()
+            self.assertEqual(job.status, "Completed")
+            self.assertGreaterEqual(job.waitingTime, 0.0)
+            self.assertGreaterEqual(job.executionTime, 0.0)
+
+        # Temporary parameter nodes are removed
+        self.assertEqual(slicer.mrmlScene.GetNumberOfNodesByClass("vtkMRMLCommandLineModuleNode"), numberOfCLINodesBefore)
+
+        self.delayDisplay("Testing CLI job queue concurrency limit passed")
+
+    def test_CLIJobQueueErrors(self):
+        self.delayDisplay("Testing CLI job queue errors")
+
+        queue = slicer.cli.CLIJobQueue()
+        failingFuture = queue.submit(slicer.modules.cli4test, self.parameters("Fail"))
+        succeedingFuture = queue.submit(slicer.modules.cli4test, self.parameters())
+        self.assertTrue(queue.wait(timeout=60))
+
+        with self.assertRaises(slicer.cli.CLIJobError) as context:
+            failingFuture.result()
+        self.assertEqual(context.exception.job.status, "CompletedWithErrors")
+        self.assertEqual(succeedingFuture.result().status, "Completed")
+
+        self.delayDisplay("Testing CLI job queue errors passed")
+
+    def test_CLIJobQueueCancel(self):
+        self.delayDisplay("Testing CLI job queue cancellation")
+
+        queue = slicer.cli.CLIJobQueue(max_concurrent_jobs=1)
+        runningFuture = queue.submit(slicer.modules.cli4test, self.parameters())
+        pendingFuture = queue.submit(slicer.modules.cli4test, self.parameters())
+        lastFuture = queue.submit(slicer.modules.cli4test, self.parameters())
+
+        # Pending job is removed from the queue
+        queue.cancel(pendingFuture)
+        self.assertTrue(pendingFuture.cancelled())
+        self.assertEqual(queue.numberOfPendingJobs, 1)
+
+        # Running job is cancelled
+        queue.cancel(runningFuture)
+        self.assertTrue(queue.wait(timeout=60))
+        with self.assertRaises(concurrent.futures.CancelledError):
+            runningFuture.result()
+
+        # Next job is started after cancellation
+        self.assertEqual(lastFuture.result().status, "Completed")
+
+        self.delayDisplay("Testing CLI job queue cancellation passed")
@@ -0,0 +1,110 @@
+import logging
+import tempfile
+import time
+
+import slicer
+from slicer.ScriptedLoadableModule import *
+from DICOMLib import DICOMUtils
+
+
+#
+# DICOMExaminePerformance
+#
+
+
+class DICOMExaminePerformance(ScriptedLoadableModule):
+    def __init__(self, parent):
+        ScriptedLoadableModule.__init__(self, parent)
+        parent.title = "DICOM Examine Performance"
+        parent.categories = ["Testing.TestCases"]
+        parent.dependencies = ["DICOM"]
+        parent.contributors = ["Slicer Community"]
+        parent.helpText = """
+    Benchmark of examining a synthetic multi-series DICOM database with DICOM plugins,
+    examining each file separately, using bulk tag queries, and using a pool of worker threads.
+    """
+        parent.acknowledgementText = """"""  # replace with organization, grant and thanks.
+
+
+#
+# DICOMExaminePerformanceWidget
+#
+
+
+class DICOMExaminePerformanceWidget(ScriptedLoadableModuleWidget):
+    def setup(self):
+        ScriptedLoadableModuleWidget.setup(self)
+
+
+#
+# DICOMExaminePerformanceTest
+#
+
+
+class DICOMExaminePerformanceTest(ScriptedLoadableModuleTest):
+    def setUp(self):
+        """Reset the state for testing."""
+        slicer.mrmlScene.Clear(0)
+
+    def runTest(self):
+        """Run as few or as many tests as needed here."""
+        self.setUp()
+        self.test_ExamineMultiSeriesDatabase()
+
+    def examine(self, fileLists, numberOfWorkers):
+        # Use new plugin instances so that results cached by a previous run are not reused
+        pluginInstances = {}
+        startTime = time.perf_counter()
+        loadablesByPlugin, loadEnabled = DICOMUtils.getLoadablesFromFileLists(
+            fileLists, ["DICOMScalarVolumePlugin"], pluginInstances=pluginInstances, numberOfWorkers=numberOfWorkers)
+        elapsedTime = time.perf_counter() - startTime
+        self.assertTrue(loadEnabled)
+        loadableNames = [[loadable.name for loadable in loadables] for loadables in loadablesByPlugin.values()]
+        return loadableNames, elapsedTime
+
+    def examineWithoutPrefetching(self, fileLists):
+        # Reference: query tag values of each file from the DICOM database one by one
+        plugin = slicer.modules.dicomPlugins["DICOMScalarVolumePlugin"]()
+        startTime = time.perf_counter()
+        loadables = plugin.examineForImport(fileLists)
+        elapsedTime = time.perf_counter() - startTime
+        return [[loadable.name for loadable in loadables]], elapsedTime
+
+    def test_ExamineMultiSeriesDatabase(self):
+        self.delayDisplay("Creating synthetic DICOM database")
+        numberOfSeries = 100
+        numberOfSlices = 5
+        with tempfile.TemporaryDirectory(dir=slicer.app.temporaryPath) as dicomDataDir, DICOMUtils.TemporaryDICOMDatabase() as db:
+            DICOMUtils.createSyntheticCTStudy(dicomDataDir, numberOfSeries, numberOfSlices)
+            DICOMUtils.importDicom(dicomDataDir, db)
+            fileLists = [db.filesForSeries(seriesUID) for seriesUID in DICOMUtils.allSeriesUIDsInDatabase(db)]
+            self.assertEqual(len(fileLists), numberOfSeries)
+
+            self.delayDisplay("Query tag values in bulk")
+            plugin = slicer.modules.dicomPlugins["DICOMScalarVolumePlugin"]()
+            self.assertTrue(plugin.examineThreadSafe)
+            tags = sorted({tag.upper() for tag in plugin.tags.values()})
+            tagValues = DICOMUtils.getFileTagValuesFromDatabase(fileLists[0], tags, db)
+            seriesUIDTag = plugin.tags["seriesUID"].upper()
+            for file in fileLists[0]:
+                # Tags that are not in the tag cache are read from the files when pre-fetching
+                self.assertIn((file, seriesUIDTag), tagValues)
+                for tag in tags:
+                    if (file, tag) in tagValues:
+                        self.assertEqual(tagValues[(file, tag)] or "", db.fileValue(file, tag))
+                        self.assertEqual(tagValues[(file, tag)] is not None, db.fileValueExists(file, tag))
+
+            self.delayDisplay("Examining series")
+            referenceLoadableNames, referenceTime = self.examineWithoutPrefetching(fileLists)
+            sequentialLoadableNames, sequentialTime = self.examine(fileLists, numberOfWorkers=1)
+            parallelLoadableNames, parallelTime = self.examine(fileLists, numberOfWorkers=4)
+
+            # Results must not depend on prefetching and the number of workers
+            self.assertEqual(len(referenceLoadableNames[0]), numberOfSeries)
+            self.assertEqual(referenceLoadableNames, sequentialLoadableNames)
+            self.assertEqual(referenceLoadableNames, parallelLoadableNames)
+
+            logging.info(f"Examined {numberOfSeries} series of {numberOfSlices} slices: "
+                         f"file by file {referenceTime:.3f}s, bulk query {sequentialTime:.3f}s, worker pool {parallelTime:.3f}s")
+
+        self.delayDisplay("Test passed")
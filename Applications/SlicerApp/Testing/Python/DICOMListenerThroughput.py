@@ -0,0 +1,143 @@
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+import qt
+
+import slicer
+from slicer.ScriptedLoadableModule import *
+from DICOMLib import DICOMUtils, DICOMListener, DICOMProcess
+
+
+#
+# DICOMListenerThroughput
+#
+
+
+class DICOMListenerThroughput(ScriptedLoadableModule):
+    def __init__(self, parent):
+        ScriptedLoadableModule.__init__(self, parent)
+        parent.title = "DICOM Listener Throughput"
+        parent.categories = ["Testing.TestCases"]
+        parent.dependencies = ["DICOM"]
+        parent.contributors = ["Slicer Community"]
+        parent.helpText = """
+    Measures how fast the DICOM listener receives and indexes files sent by storescu
+    through a local network connection.
+    """
+        parent.acknowledgementText = """"""  # replace with organization, grant and thanks.
+
+
+#
+# DICOMListenerThroughputWidget
+#
+
+
+class DICOMListenerThroughputWidget(ScriptedLoadableModuleWidget):
+    def setup(self):
+        ScriptedLoadableModuleWidget.setup(self)
+
+
+#
+# DICOMListenerThroughputTest
+#
+
+
+class DICOMListenerThroughputTest(ScriptedLoadableModuleTest):
+    port = 11199
+
+    def setUp(self):
+        """Reset the state for testing."""
+        slicer.mrmlScene.Clear(0)
+
+    def runTest(self):
+        """Run as few or as many tests as needed here."""
+        self.setUp()
+        self.test_ListenerThroughput()
+        self.setUp()
+        self.test_ListenerResumesPendingFiles()
+
+    def numberOfInstancesInDatabase(self, db):
+        return sum(len(db.filesForSeries(seriesUID)) for seriesUID in DICOMUtils.allSeriesUIDsInDatabase(db))
+
+    def waitForInstances(self, db, expectedNumberOfInstances, timeoutSec=120):
+        # Received files are indexed by the timers of the listener
+        startTime = time.time()
+        while time.time() - startTime < timeoutSec:
+            slicer.app.processEvents()
+            if self.numberOfInstancesInDatabase(db) >= expectedNumberOfInstances:
+                return True
+            time.sleep(0.05)
+        return False
+
+    def test_ListenerThroughput(self):
+        self.delayDisplay("Creating synthetic DICOM files")
+        numberOfSeries = 10
+        numberOfSlices = 30
+        with tempfile.TemporaryDirectory(dir=slicer.app.temporaryPath) as dicomDataDir, DICOMUtils.TemporaryDICOMDatabase() as db:
+            filePaths = DICOMUtils.createSyntheticCTStudy(dicomDataDir, numberOfSeries, numberOfSlices)
+
+            listener = DICOMListener(db, incomingPort=self.port)
+            numberOfBatches = 0
+
+            def onFileAdded():
+                nonlocal numberOfBatches
+                numberOfBatches += 1
+
+            listener.fileAddedCallback = onFileAdded
+            listener.start()
+            try:
+                self.delayDisplay("Sending files using storescu")
+                storescuExecutable = os.path.join(DICOMProcess.getDCMTKToolsPath(), "storescu" + listener.exeExtension)
+                storescu = qt.QProcess()
+                startTime = time.time()
+                storescu.start(storescuExecutable, ["--scan-directories", "localhost", str(self.port), dicomDataDir])
+                self.assertTrue(self.waitForInstances(db, len(filePaths)))
+                elapsedTime = time.time() - startTime
+                storescu.waitForFinished()
+                self.assertEqual(storescu.exitCode(), 0)
+            finally:
+                listener.stop()
+
+            self.assertEqual(self.numberOfInstancesInDatabase(db), len(filePaths))
+            # A batch is indexed when it reaches the maximum batch size or when the ingest window that
+            # started at its first file has elapsed. Ingest windows do not overlap, so the number of
+            # batches closed by the timer is at most one more than the number of windows in the elapsed time.
+            maximumNumberOfBatches = len(filePaths) // listener.maximumBatchSize + int(elapsedTime / listener.ingestWindowSec) + 1
+            self.assertGreaterEqual(numberOfBatches, -(-len(filePaths) // listener.maximumBatchSize))
+            self.assertLessEqual(numberOfBatches, maximumNumberOfBatches)
+            # Indexed files and the pending list are removed from the incoming folder
+            self.assertEqual(os.listdir(listener.incomingDataDir), [])
+
+            logging.info(f"DICOM listener received and indexed {len(filePaths)} files in {elapsedTime:.2f}s "
+                         f"({len(filePaths) / elapsedTime:.1f} files/s, {numberOfBatches} batches)")
+
+        self.delayDisplay("Test passed")
+
+    def test_ListenerResumesPendingFiles(self):
+        self.delayDisplay("Testing indexing of files received before restart")
+        with tempfile.TemporaryDirectory(dir=slicer.app.temporaryPath) as dicomDataDir, DICOMUtils.TemporaryDICOMDatabase() as db:
+            filePaths = DICOMUtils.createSyntheticCTStudy(dicomDataDir, 1, 3)
+
+            listener = DICOMListener(db, incomingPort=self.port)
+            # Simulate files that were received by a previous listener but not indexed
+            incomingFilePaths = []
+            for filePath in filePaths:
+                incomingFilePath = os.path.join(listener.incomingDataDir, os.path.basename(filePath))
+                shutil.copy(filePath, incomingFilePath)
+                incomingFilePaths.append(incomingFilePath)
+            listener.writePendingFilesList(incomingFilePaths)
+
+            listener.start()
+            try:
+                self.assertTrue(self.waitForInstances(db, len(filePaths), timeoutSec=30))
+            finally:
+                listener.stop()
+
+            self.assertFalse(os.path.exists(listener.pendingFilesListPath))
+            for incomingFilePath in incomingFilePaths:
+                self.assertFalse(os.path.exists(incomingFilePath))
+
+        self.delayDisplay("Test passed")
@@ -0,0 +1,164 @@
+import io
+import os
+import struct
+import tempfile
+import zipfile
+
+import numpy as np
+import vtk
+
+import slicer
+from slicer.ScriptedLoadableModule import *
+from DICOMLib import DICOMExportScene, DICOMUtils
+
+
+#
+# DICOMSlicerDataBundleExportTest
+#
+
+
+class DICOMSlicerDataBundleExportTest(ScriptedLoadableModule):
+    def __init__(self, parent):
+        ScriptedLoadableModule.__init__(self, parent)
+        parent.title = "DICOM Slicer Data Bundle Export Test"
+        parent.categories = ["Testing.TestCases"]
+        parent.dependencies = ["DICOM"]
+        parent.contributors = ["Slicer Community"]
+        parent.helpText = """
+    Export the scene as a Slicer Data Bundle DICOM file and load it back with the DICOM plugin.
+    """
+        parent.acknowledgementText = """"""  # replace with organization, grant and thanks.
+
+
+#
+# DICOMSlicerDataBundleExportTestWidget
+#
+
+
+class DICOMSlicerDataBundleExportTestWidget(ScriptedLoadableModuleWidget):
+    def setup(self):
+        ScriptedLoadableModuleWidget.setup(self)
+
+
+#
+# DICOMSlicerDataBundleExportTestTest
+#
+
+
+class DICOMSlicerDataBundleExportTestTest(ScriptedLoadableModuleTest):
+    def setUp(self):
+        """Reset the state for testing."""
+        slicer.mrmlScene.Clear(0)
+
+    def runTest(self):
+        """Run as few or as many tests as needed here."""
+        self.setUp()
+        self.test_ExportAndLoadScene()
+        self.setUp()
+        self.test_CancelExport()
+
+    def createScene(self):
+        volumeArray = np.arange(8 * 16 * 32, dtype=np.int16).reshape(8, 16, 32)
+        volumeNode = slicer.util.addVolumeFromArray(volumeArray, name="BundleVolume")
+        sphere = vtk.vtkSphereSource()
+        sphere.SetRadius(5.0)
+        sphere.Update()
+        modelNode = slicer.modules.models.logic().AddModel(sphere.GetOutput())
+        modelNode.SetName("BundleModel")
+        return volumeNode, modelNode
+
+    def createImageFile(self, directory):
+        """Write a small screenshot, so that the test does not depend on the main window content."""
+        image = vtk.vtkImageData()
+        image.SetDimensions(32, 24, 1)
+        image.AllocateScalars(vtk.VTK_UNSIGNED_CHAR, 3)
+        image.GetPointData().GetScalars().Fill(128)
+        imageFile = os.path.join(directory, "screenshot.jpg")
+        writer = vtk.vtkJPEGWriter()
+        writer.SetFileName(imageFile)
+        writer.SetInputData(image)
+        writer.Write()
+        return imageFile
+
+    def test_ExportAndLoadScene(self):
+        self.delayDisplay("Exporting scene")
+        volumeNode, modelNode = self.createScene()
+        volumeArray = slicer.util.arrayFromVolume(volumeNode).copy()
+        numberOfModelPoints = modelNode.GetPolyData().GetNumberOfPoints()
+
+        with tempfile.TemporaryDirectory(dir=slicer.app.temporaryPath) as tempDir:
+            exportDir = os.path.join(tempDir, "export")
+            os.mkdir(exportDir)
+            progressMessages = []
+
+            def progressCallback(message):
+                progressMessages.append(message)
+                return True
+
+            exporter = DICOMExportScene(None, exportDir, progressCallback)
+            exporter.imageFile = self.createImageFile(tempDir)
+            exporter.optionalTags = {"PatientName": "Bundle^Test", "PatientID": "BundleTest"}
+            self.assertTrue(exporter.export())
+            self.assertEqual(progressMessages[-1], "Done")
+            self.assertEqual(exporter.sdbFile, os.path.join(exportDir, "SlicerDataBundle.dcm").replace("\\", "/"))
+            # Intermediate files are removed
+            self.assertEqual(os.listdir(exportDir), ["SlicerDataBundle.dcm"])
+
+            self.delayDisplay("Checking file layout")
+            with open(exporter.sdbFile, "rb") as fp:
+                content = fp.read()
+            # Zip size is filled in both in the private creator and in the zip size element
+            creatorPrefix = b"3D Slicer "
+            creatorOffset = content.rfind(creatorPrefix) + len(creatorPrefix)
+            zipSize = int(content[creatorOffset:creatorOffset + DICOMExportScene.zipSizeDigits])
+            zipSizeOffset = content.rfind(b"\xdb\xca\x08\x10LO") + 8
+            self.assertEqual(int(content[zipSizeOffset:zipSizeOffset + DICOMExportScene.zipSizeDigits]), zipSize)
+            # Zip data element is the last element of the file
+            paddedZipSize = zipSize + zipSize % 2
+            elementOffset = len(content) - paddedZipSize - 12
+            group, element, vr, _, length = struct.unpack_from("<HH2sHI", content, elementOffset)
+            self.assertEqual((group, element, vr, length), (0xcadb, 0x1010, b"OB", paddedZipSize))
+            zipData = content[elementOffset + 12:elementOffset + 12 + zipSize]
+            with zipfile.ZipFile(io.BytesIO(zipData)) as zipFile:
+                self.assertIsNone(zipFile.testzip())
+                self.assertTrue(any(name.endswith(".mrml") for name in zipFile.namelist()))
+
+            self.delayDisplay("Loading scene from DICOM")
+            with DICOMUtils.TemporaryDICOMDatabase() as db:
+                DICOMUtils.importDicom(exportDir, db)
+                seriesUIDs = DICOMUtils.allSeriesUIDsInDatabase(db)
+                self.assertEqual(len(seriesUIDs), 1)
+                files = db.filesForSeries(seriesUIDs[0])
+                self.assertEqual(db.fileValue(files[0], "0010,0020"), "BundleTest")
+
+                plugin = slicer.modules.dicomPlugins["DICOMSlicerDataBundlePlugin"]()
+                loadables = plugin.examineForImport([files])
+                self.assertEqual(len(loadables), 1)
+                slicer.mrmlScene.Clear(0)
+                self.assertTrue(plugin.load(loadables[0]))
+
+            loadedVolumeNode = slicer.util.getFirstNodeByClassByName("vtkMRMLScalarVolumeNode", "BundleVolume")
+            loadedModelNode = slicer.util.getFirstNodeByClassByName("vtkMRMLModelNode", "BundleModel")
+            self.assertIsNotNone(loadedVolumeNode)
+            self.assertIsNotNone(loadedModelNode)
+            np.testing.assert_array_equal(slicer.util.arrayFromVolume(loadedVolumeNode), volumeArray)
+            self.assertEqual(loadedModelNode.GetPolyData().GetNumberOfPoints(), numberOfModelPoints)
+
+        self.delayDisplay("Test passed")
+
+    def test_CancelExport(self):
+        self.delayDisplay("Cancelling scene export")
+        self.createScene()
+
+        with tempfile.TemporaryDirectory(dir=slicer.app.temporaryPath) as tempDir:
+            exportDir = os.path.join(tempDir, "export")
+            os.mkdir(exportDir)
+            exporter = DICOMExportScene(None, exportDir, lambda message: not message.startswith("Creating DICOM header"))
+            exporter.imageFile = self.createImageFile(tempDir)
+            with self.assertRaises(UserWarning):
+                exporter.export()
+            # Partial output and intermediate files are removed
+            self.assertIsNone(exporter.sdbFile)
+            self.assertEqual(os.listdir(exportDir), [])
+
+        self.delayDisplay("Test passed")
@@ -21,15 +21,65 @@
 import argparse
 import json
 import os
+import sys
 import tempfile
 
 from SlicerAppTesting import *
+from slicer import benchmark
 
 """
 Usage:
-    MeasureStartupTimes.py /path/to/Slicer
+    PythonSlicer MeasureStartupTimes.py /path/to/Slicer
+
+The script must be run using the PythonSlicer executable (or any Python environment
+where the slicer package can be imported), as measurements are recorded using slicer.benchmark.
+
+The --import-times experiment runs "PythonSlicer -X importtime" importing slicer
+and accessing one MRML class, with and without SLICER_LAZY_IMPORT set, and reports
+the cumulative import time of each top-level package.
+
+Each measurement is also recorded as a benchmark result. Use --json-output to save all
+of them in a single file, and --baseline to compare them to a file saved previously:
+
+    PythonSlicer MeasureStartupTimes.py --overall -n 5 --json-output current.json --baseline previous.json /path/to/Slicer
 """
 
+benchmark_results = []
+
+
+def benchmarkcall(method, repeat=1, warmup=0):
+    """Wrap ``method`` and return its median execution time.
+
+    The benchmark result of each call is appended to ``benchmark_results``.
+    """
+
+    def wrapper(executable, arguments=[], **kwargs):
+        name = " ".join([os.path.basename(executable)] + list(arguments))
+        if "SLICER_LAZY_IMPORT" in os.environ:
+            name = "SLICER_LAZY_IMPORT={} {}".format(os.environ["SLICER_LAZY_IMPORT"], name)
+        # Make the name unique, as the same command may be measured in multiple experiments
+        previous_names = [result.name for result in benchmark_results]
+        unique_name = name
+        index = 1
+        while unique_name in previous_names:
+            index += 1
+            unique_name = f"{name} ({index})"
+
+        call_results = []
+
+        def call():
+            # Copy arguments since run() inserts the executable in the list
+            call_results.append(method(executable, list(arguments), **kwargs))
+
+        result = benchmark.Benchmark(unique_name, call, warmup=warmup, repeat=repeat, measureMemory=False).run()
+        for iteration, duration in enumerate(result.durations, start=1):
+            print(f"{iteration:d}/{repeat:d}: {duration:.2f}s")
+        print(f"Median: {result.median:.2f}s, mean: {result.mean:.2f}s, p90: {result.percentile(90):.2f}s\n")
+        benchmark_results.append(result)
+        return (result.median, call_results[-1])
+
+    return wrapper
+
 
 def TemporaryPythonScript(code, *args, **kwargs):
     if "suffix" not in kwargs:
@@ -222,6 +272,61 @@ def collect_startup_times_modules_to_load(output_file, modules_to_load, module_l
         file.write(json.dumps(results, indent=4))
 
 
+def runPythonSlicer(python_slicer_executable, arguments=[], **kwargs):
+    # Copy arguments since run() inserts the executable in the list
+    return run(python_slicer_executable, list(arguments), **kwargs)
+
+
+def parse_import_times(stderr):
+    """Parse the output of ``python -X importtime`` and return the cumulative
+    import time in seconds of each top-level imported package.
+    """
+    import_times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            # Skip header
+            continue
+        package = fields[2].rstrip()
+        # Nested imports are indented, only keep the top-level ones
+        if package.startswith("  "):
+            continue
+        package = package.strip().split(".")[0]
+        import_times[package] = import_times.get(package, 0.0) + int(fields[1]) * 1e-6
+    return import_times
+
+
+def collect_import_times(output_file, python_slicer_executable, drop_cache=False, display_output=False):
+    # Collect time spent importing the slicer package and each of its top-level
+    # dependencies, with and without lazy import of the kits.
+    results = {}
+    for mode, lazy_import in [("eager", "0"), ("lazy", "1")]:
+        os.environ["SLICER_LAZY_IMPORT"] = lazy_import
+        try:
+            test = ["-X", "importtime", "-c", "import slicer; slicer.vtkMRMLScene"]
+            (duration, result) = runPythonSlicerWithTime(python_slicer_executable, test, drop_cache=drop_cache)
+        finally:
+            del os.environ["SLICER_LAZY_IMPORT"]
+        (returnCode, stdout, stderr) = result
+        if display_output and stdout:
+            print("STDOUT [%s]\n" % stdout)
+        if returnCode != EXIT_SUCCESS:
+            print("=> failed\n")
+            continue
+        import_times = parse_import_times(stderr)
+        for package, import_time in sorted(import_times.items(), key=lambda item: item[1], reverse=True):
+            print(f"  {package}: {import_time:.3f}s")
+        results[mode] = {
+            "duration": duration,
+            "import_times": import_times,
+        }
+
+    with open(output_file, "w") as file:
+        file.write(json.dumps(results, indent=4))
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Measure startup times.")
     # Experiments
@@ -230,11 +335,17 @@ if __name__ == "__main__":
     parser.add_argument("--overall", action="store_true")
     parser.add_argument("--excluding-one-module", action="store_true")
     parser.add_argument("--including-one-module", action="store_true")
+    parser.add_argument("--import-times", action="store_true")
     # Common options
     parser.add_argument("-n", "--repeat", default=1, type=int)
+    parser.add_argument("--warmup", default=0, type=int, help="number of runs before the measurement (default: 0)")
     parser.add_argument("--drop-cache", action="store_true")
     parser.add_argument("--reuse-module-list", action="store_true")
     parser.add_argument("--display-slicer-output", action="store_true")
+    parser.add_argument("--python-slicer", help="path to PythonSlicer executable (default: bin/PythonSlicer next to Slicer)")
+    parser.add_argument("--json-output", help="save all measurements as benchmark results to this file")
+    parser.add_argument("--baseline", help="compare measurements to benchmark results saved in this file")
+    parser.add_argument("--threshold", default=0.1, type=float, help="relative slowdown that is reported as regression (default: 0.1)")
     parser.add_argument("/path/to/Slicer")
     args = parser.parse_args()
 
@@ -243,9 +354,11 @@ if __name__ == "__main__":
            and not args.modules_to_load
            and not args.overall
            and not args.excluding_one_module
-           and not args.including_one_module)
+           and not args.including_one_module
+           and not args.import_times)
 
-    runSlicerAndExitWithTime = timecall(runSlicerAndExit, repeat=args.repeat)
+    runSlicerAndExitWithTime = benchmarkcall(runSlicerAndExit, repeat=args.repeat, warmup=args.warmup)
+    runPythonSlicerWithTime = benchmarkcall(runPythonSlicer, repeat=args.repeat, warmup=args.warmup)
 
     sliver_revision = slicerRevision()
     module_list = "Modules-r%s.json" % sliver_revision
@@ -280,3 +393,21 @@ if __name__ == "__main__":
     if all or args.including_one_module:
         collect_startup_times_including_one_module(
             "StartupTimesIncludingOneModule-r%s.json" % sliver_revision, module_list, **common_kwargs)
+
+    if all or args.import_times:
+        python_slicer_executable = args.python_slicer
+        if python_slicer_executable is None:
+            python_slicer_executable = os.path.join(
+                os.path.dirname(slicer_executable), "bin", "PythonSlicer" + (".exe" if sys.platform == "win32" else ""))
+        collect_import_times(
+            "ImportTimes-r%s.json" % sliver_revision, os.path.expanduser(python_slicer_executable), **common_kwargs)
+
+    if args.json_output:
+        benchmark.saveResults(benchmark_results, args.json_output, metadata={"revision": sliver_revision})
+        print("Saved benchmark results to %s" % args.json_output)
+
+    if args.baseline:
+        comparisons = benchmark.compareResults(benchmark_results, benchmark.loadResults(args.baseline), args.threshold)
+        print(benchmark.formatComparisons(comparisons))
+        if any(comparison.regression for comparison in comparisons):
+            sys.exit(1)
@@ -1,8 +1,10 @@
 import os
+import time
 
 import qt
 
 import slicer
+import slicer.benchmark
 from slicer.ScriptedLoadableModule import *
 from slicer.util import TESTING_DATA_URL
 
@@ -135,6 +137,7 @@ class ScenePerformanceLogic(ScriptedLoadableModuleLogic):
 class ScenePerformanceTest(ScriptedLoadableModuleTest):
     def setUp(self):
         self.Repeat = 1
+        self.results = []
         self.delayDisplay("Setup")
         # layoutManager = slicer.app.layoutManager()
         # layoutManager.setLayout(slicer.vtkMRMLLayoutNode.SlicerLayoutConventionalView)
@@ -172,6 +175,10 @@ class ScenePerformanceTest(ScriptedLoadableModuleTest):
         self.restoreSceneView(0)
         self.closeScene()
 
+        # Save results and compare to baseline, if enabled by environment variables
+        comparisons = slicer.benchmark.reportResults(self.results, "ScenePerformance")
+        self.assertEqual([comparison.name for comparison in comparisons if comparison.regression], [])
+
     def reportPerformance(self, action, property, time):
         message = self.displayPerformance(action, property, time)
         print(f'<DartMeasurement name="{action}-{property}" type="numeric/integer">{time}</DartMeasurement>')
@@ -187,59 +194,52 @@ class ScenePerformanceTest(ScriptedLoadableModuleTest):
         file = logic.downloadFile(url, file, checksum)
         self.addData(file)
 
+    def measure(self, action, property, function, setup=None, measuresOwnDuration=False):
+        """Measure execution time of a function `Repeat` times and report the mean time.
+
+        If `measuresOwnDuration` is enabled then the function must return the measured duration (in seconds).
+        """
+        # Make the name unique, as the same action may be measured multiple times
+        previousNames = [result.name for result in self.results]
+        name = f"{action}-{property}"
+        index = 1
+        while name in previousNames:
+            index += 1
+            name = f"{action}-{property} ({index})"
+        benchmark = slicer.benchmark.Benchmark(name, function, setup=setup, warmup=0, repeat=self.Repeat, tags=["scene"],
+                                                measuresOwnDuration=measuresOwnDuration)
+        result = benchmark.run()
+        for duration in result.durations:
+            self.displayPerformance(action, property, round(1000.0 * duration))
+        self.results.append(result)
+        return self.reportPerformance(action, property, round(1000.0 * result.mean))
+
     def addData(self, file):
         self.delayDisplay("Starting the AddData test")
-        logic = ScenePerformanceLogic()
-        averageTime = 0
-        for x in range(self.Repeat):
-            logic.startTiming()
-            ioManager = slicer.app.ioManager()
+        ioManager = slicer.app.ioManager()
+
+        def loadFile():
             ioManager.loadFile(file)
-            time = logic.stopTiming()
-            self.displayPerformance("AddData", file, time)
-            averageTime = averageTime + time
-        averageTime = averageTime / self.Repeat
-        return self.reportPerformance("AddData", os.path.basename(file), averageTime)
+
+        return self.measure("AddData", os.path.basename(file), loadFile)
 
     def closeScene(self):
         self.delayDisplay("Starting the Close Scene test")
-        logic = ScenePerformanceLogic()
-        averageTime = 0
-        for x in range(self.Repeat):
-            logic.startTiming()
-            slicer.mrmlScene.Clear(0)
-            time = logic.stopTiming()
-            self.displayPerformance("CloseScene", "", time)
-            averageTime = averageTime + time
-        averageTime = averageTime / self.Repeat
-        return self.reportPerformance("CloseScene", "", averageTime)
+        return self.measure("CloseScene", "", lambda: slicer.mrmlScene.Clear(0))
 
     def restoreSceneView(self, sceneViewIndex):
         self.delayDisplay("Starting the Restore Scene test")
-        logic = ScenePerformanceLogic()
-        averageTime = 0
-        for x in range(self.Repeat):
-            logic.startTiming()
-            slicer.modules.sceneviews.logic().RestoreSceneView(sceneViewIndex)
-            time = logic.stopTiming()
-            self.displayPerformance("RestoreSceneView", x, time)
-            averageTime = averageTime + time
-        averageTime = averageTime / self.Repeat
-        return self.reportPerformance("RestoreSceneView", x, averageTime)
+        sceneViewsLogic = slicer.modules.sceneviews.logic()
+
+        def restoreSceneView():
+            sceneViewsLogic.RestoreSceneView(sceneViewIndex)
+
+        return self.measure("RestoreSceneView", sceneViewIndex, restoreSceneView)
 
     def setLayout(self, layoutIndex):
         self.delayDisplay("Starting the layout test")
-        logic = ScenePerformanceLogic()
-        averageTime = 0
-        for x in range(self.Repeat):
-            logic.startTiming()
-            layoutManager = slicer.app.layoutManager()
-            layoutManager.setLayout(layoutIndex)
-            time = logic.stopTiming()
-            self.displayPerformance("Layout", layoutIndex, time)
-            averageTime = averageTime + time
-        averageTime = averageTime / self.Repeat
-        return self.reportPerformance("Layout", layoutIndex, averageTime)
+        layoutManager = slicer.app.layoutManager()
+        return self.measure("Layout", layoutIndex, lambda: layoutManager.setLayout(layoutIndex))
 
     def addNodeByID(self, nodeID):
         node = slicer.mrmlScene.GetNodeByID(nodeID)
@@ -247,19 +247,17 @@ class ScenePerformanceTest(ScriptedLoadableModuleTest):
 
     def addNode(self, node):
         self.delayDisplay("Starting the add node test")
-        logic = ScenePerformanceLogic()
-        averageTime = 0
-        for x in range(self.Repeat):
+
+        def addNodeCopy():
             newNode = node.CreateNodeInstance()
             newNode.UnRegister(node)
             newNode.Copy(node)
-            logic.startTiming()
+            # Only adding the node to the scene is measured
+            startTime = time.perf_counter()
             slicer.mrmlScene.AddNode(newNode)
-            time = logic.stopTiming()
-            self.displayPerformance("AddNode", node.GetID(), time)
-            averageTime = averageTime + time
-        averageTime = averageTime / self.Repeat
-        return self.reportPerformance("AddNode", node.GetID(), averageTime)
+            return time.perf_counter() - startTime
+
+        return self.measure("AddNode", node.GetID(), addNodeCopy, measuresOwnDuration=True)
 
     def modifyNodeByID(self, nodeID):
         node = slicer.mrmlScene.GetNodeByID(nodeID)
@@ -267,13 +265,4 @@ class ScenePerformanceTest(ScriptedLoadableModuleTest):
 
     def modifyNode(self, node):
         self.delayDisplay("Starting the modify node test")
-        logic = ScenePerformanceLogic()
-        averageTime = 0
-        for x in range(self.Repeat):
-            logic.startTiming()
-            node.Modified()
-            time = logic.stopTiming()
-            self.displayPerformance("ModifyNode", node.GetID(), time)
-            averageTime = averageTime + time
-        averageTime = averageTime / self.Repeat
-        return self.reportPerformance("ModifyNode", node.GetID(), averageTime)
+        return self.measure("ModifyNode", node.GetID(), node.Modified)
@@ -79,6 +79,9 @@ class UtilTestTest(ScriptedLoadableModuleTest):
         self.test_arrayFromVTKMatrix()
         self.test_arrayFromTransformMatrix()
         self.test_arrayFromMarkupsControlPoints()
+        self.test_arraysFromMarkupsControlPoints()
+        self.test_segmentBinaryLabelmapArray()
+        self.test_segmentationArray()
         self.test_array()
 
     def test_setSliceViewerLayers(self):
@@ -482,6 +485,169 @@ class UtilTestTest(ScriptedLoadableModuleTest):
         markupsNode.GetNthControlPointPositionWorld(1, position)
         np.testing.assert_array_equal(position, narray[1, :])
 
+    def test_arraysFromMarkupsControlPoints(self):
+        # Test if retrieving and setting all markups control point properties as numpy arrays works
+        import numpy as np
+
+        self.delayDisplay("Test updateMarkupsControlPointsFromArrays")
+
+        markupsNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLMarkupsFiducialNode")
+        modifiedEvents = []
+        markupsNode.AddObserver(vtk.vtkCommand.ModifiedEvent, lambda caller, event: modifiedEvents.append(event))
+
+        numberOfControlPoints = 1000
+        positions = np.random.default_rng(0).uniform(-50, 50, size=[numberOfControlPoints, 3])
+        orientations = np.tile(np.array([[0.0, 1.0, 0.0], [-1.0, 0.0, 0.0], [0.0, 0.0, 1.0]]), (numberOfControlPoints, 1, 1))
+        labels = [f"P{index}" for index in range(numberOfControlPoints)]
+        selected = np.arange(numberOfControlPoints) % 2 == 0
+        locked = np.arange(numberOfControlPoints) % 3 == 0
+        visibility = np.arange(numberOfControlPoints) % 5 != 0
+        slicer.util.updateMarkupsControlPointsFromArrays(markupsNode, positions=positions, orientations=orientations,
+                                                         labels=labels, selected=selected, locked=locked, visibility=visibility)
+
+        # All changes are made in a single batched modification
+        self.assertEqual(len(modifiedEvents), 1)
+        self.assertEqual(markupsNode.GetNumberOfControlPoints(), numberOfControlPoints)
+        position = [0] * 3
+        markupsNode.GetNthControlPointPosition(10, position)
+        np.testing.assert_array_almost_equal(position, positions[10])
+        self.assertEqual(markupsNode.GetNthControlPointLabel(10), "P10")
+        self.assertTrue(markupsNode.GetNthControlPointSelected(10))
+        self.assertFalse(markupsNode.GetNthControlPointLocked(10))
+        self.assertFalse(markupsNode.GetNthControlPointVisibility(10))
+        orientationMatrix = vtk.vtkMatrix3x3()
+        markupsNode.GetNthControlPointOrientationMatrix(10, orientationMatrix)
+        self.assertEqual(orientationMatrix.GetElement(1, 0), -1.0)
+
+        self.delayDisplay("Test arraysFromMarkupsControlPoints")
+
+        arrays = slicer.util.arraysFromMarkupsControlPoints(markupsNode)
+        np.testing.assert_array_almost_equal(arrays["positions"], positions)
+        np.testing.assert_array_equal(arrays["orientations"], orientations)
+        self.assertEqual(list(arrays["labels"]), labels)
+        np.testing.assert_array_equal(arrays["selected"], selected)
+        np.testing.assert_array_equal(arrays["locked"], locked)
+        np.testing.assert_array_equal(arrays["visibility"], visibility)
+
+        self.delayDisplay("Test updateMarkupsControlPointsFromArrays round trip")
+
+        arrays["selected"] = np.logical_not(arrays["selected"])
+        arrays["positions"] = arrays["positions"][:500]
+        modifiedEvents.clear()
+        with self.assertRaises(RuntimeError):
+            # all other arrays must match the number of control points after positions are updated
+            slicer.util.updateMarkupsControlPointsFromArrays(markupsNode, **arrays)
+        # the node is not modified if any of the arrays is invalid
+        self.assertEqual(len(modifiedEvents), 0)
+        self.assertEqual(markupsNode.GetNumberOfControlPoints(), numberOfControlPoints)
+        np.testing.assert_array_almost_equal(slicer.util.arrayFromMarkupsControlPoints(markupsNode), positions)
+        self.assertTrue(markupsNode.GetNthControlPointSelected(10))
+        arrays = {name: array[:500] for name, array in arrays.items()}
+        slicer.util.updateMarkupsControlPointsFromArrays(markupsNode, **arrays)
+        self.assertEqual(markupsNode.GetNumberOfControlPoints(), 500)
+        self.assertFalse(markupsNode.GetNthControlPointSelected(10))
+        self.assertEqual(markupsNode.GetNthControlPointLabel(499), "P499")
+
+    def test_segmentBinaryLabelmapArray(self):
+        # Test arrayFromSegmentBinaryLabelmap and updateSegmentBinaryLabelmapFromArray
+        import numpy as np
+
+        self.delayDisplay("Test updateSegmentBinaryLabelmapFromArray")
+
+        volumeNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLScalarVolumeNode")
+        volumeNode.SetSpacing(1.5, 2.0, 2.5)
+        slicer.util.updateVolumeFromArray(volumeNode, np.zeros((20, 30, 40), np.int16))
+        segmentationNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLSegmentationNode")
+        segmentationNode.CreateDefaultDisplayNodes()
+        segmentationNode.SetReferenceImageGeometryParameterFromVolumeNode(volumeNode)
+        segmentId = segmentationNode.GetSegmentation().AddEmptySegment("first")
+
+        narray = np.zeros((20, 30, 40), np.float32)
+        narray[5:10, 10:20, 15:30] = 25.0
+        numberOfNodesBefore = slicer.mrmlScene.GetNumberOfNodes()
+        slicer.util.updateSegmentBinaryLabelmapFromArray(narray, segmentationNode, segmentId)
+        # Temporary nodes are not needed
+        self.assertEqual(slicer.mrmlScene.GetNumberOfNodes(), numberOfNodesBefore)
+
+        self.delayDisplay("Test arrayFromSegmentBinaryLabelmap")
+
+        segmentArray = slicer.util.arrayFromSegmentBinaryLabelmap(segmentationNode, segmentId)
+        self.assertEqual(slicer.mrmlScene.GetNumberOfNodes(), numberOfNodesBefore)
+        self.assertEqual(segmentArray.shape, narray.shape)
+        np.testing.assert_array_equal(segmentArray, (narray > 0).astype(segmentArray.dtype))
+
+        self.delayDisplay("Test segment array update and retrieval with multiple segments")
+
+        secondSegmentId = segmentationNode.GetSegmentation().AddEmptySegment("second")
+        segmentIds = [segmentId, secondSegmentId]
+        narray = np.zeros((20, 30, 40), np.int16)
+        narray[2:6, 3:9, 4:12] = 1
+        narray[12:18, 3:9, 4:12] = 2
+        narray[0, 0, 0] = 7  # does not correspond to any segment
+        slicer.util.updateSegmentBinaryLabelmapFromArray(narray, segmentationNode, segmentIds)
+        self.assertEqual(slicer.mrmlScene.GetNumberOfNodes(), numberOfNodesBefore)
+        segmentsArray = slicer.util.arrayFromSegmentBinaryLabelmap(segmentationNode, segmentIds)
+        narray[0, 0, 0] = 0
+        np.testing.assert_array_equal(segmentsArray, narray)
+        np.testing.assert_array_equal(slicer.util.arrayFromSegmentBinaryLabelmap(segmentationNode, secondSegmentId), narray == 2)
+
+    def test_segmentationArray(self):
+        # Test arrayFromSegmentation and updateSegmentationFromArray
+        import numpy as np
+
+        self.delayDisplay("Test updateSegmentationFromArray")
+
+        volumeNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLScalarVolumeNode")
+        slicer.util.updateVolumeFromArray(volumeNode, np.zeros((20, 30, 40), np.int16))
+        segmentationNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLSegmentationNode")
+        segmentationNode.CreateDefaultDisplayNodes()
+        segmentationNode.SetReferenceImageGeometryParameterFromVolumeNode(volumeNode)
+        segmentationNode.GetSegmentation().AddEmptySegment("existing")
+
+        narray = np.zeros((20, 30, 40), np.int16)
+        narray[2:6, 3:9, 4:12] = 1
+        narray[8:12, 3:9, 4:12] = 2
+        narray[14:18, 3:9, 4:12] = 3
+
+        modifiedEvents = []
+        observerTag = segmentationNode.AddObserver(vtk.vtkCommand.ModifiedEvent, lambda caller, event: modifiedEvents.append(event))
+        try:
+            segmentIds = slicer.util.updateSegmentationFromArray(narray, segmentationNode)
+        finally:
+            segmentationNode.RemoveObserver(observerTag)
+        self.assertEqual(len(modifiedEvents), 1)
+
+        # First label updates the existing segment, new segments are created for the others
+        segmentation = segmentationNode.GetSegmentation()
+        self.assertEqual(segmentation.GetNumberOfSegments(), 3)
+        self.assertEqual(segmentIds[1], "existing")
+        self.assertEqual(segmentation.GetSegment(segmentIds[3]).GetName(), "Label_3")
+        # All segments are stored in a single layer
+        self.assertEqual(segmentation.GetNumberOfLayers(), 1)
+
+        self.delayDisplay("Test arrayFromSegmentation")
+
+        labelmapArray = slicer.util.arrayFromSegmentation(segmentationNode)
+        np.testing.assert_array_equal(labelmapArray, narray)
+
+        selectedLabelmapArray = slicer.util.arrayFromSegmentation(segmentationNode, {5: segmentIds[3], 7: segmentIds[1]})
+        np.testing.assert_array_equal(selectedLabelmapArray[narray == 3], 5)
+        np.testing.assert_array_equal(selectedLabelmapArray[narray == 1], 7)
+        np.testing.assert_array_equal(selectedLabelmapArray[narray == 2], 0)
+
+        self.delayDisplay("Test updateSegmentationFromArray with label value mapping")
+
+        slicer.util.updateSegmentationFromArray(selectedLabelmapArray, segmentationNode, {5: "new", 7: segmentIds[1]})
+        self.assertEqual(segmentation.GetNumberOfSegments(), 4)
+        np.testing.assert_array_equal(slicer.util.arrayFromSegmentBinaryLabelmap(segmentationNode, "new"), narray == 3)
+
+        # Label values must fit in the merged labelmap
+        with self.assertRaises(ValueError):
+            slicer.util.arrayFromSegmentation(segmentationNode, {40000: segmentIds[1]})
+        with self.assertRaises(ValueError):
+            slicer.util.updateSegmentationFromArray(narray.astype(np.int32) * 20000, segmentationNode)
+        self.assertEqual(segmentation.GetNumberOfSegments(), 4)
+
     def test_array(self):
         # Test if convenience function of getting numpy array from various nodes works
 
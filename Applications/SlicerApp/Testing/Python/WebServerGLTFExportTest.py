@@ -0,0 +1,240 @@
+import base64
+import json
+import struct
+
+import numpy as np
+import vtk
+
+import slicer
+from slicer.ScriptedLoadableModule import *
+
+
+#
+# WebServerGLTFExportTest
+#
+
+
+class WebServerGLTFExportTest(ScriptedLoadableModule):
+    def __init__(self, parent):
+        ScriptedLoadableModule.__init__(self, parent)
+        parent.title = "WebServer glTF Export Test"
+        parent.categories = ["Testing.TestCases"]
+        parent.dependencies = ["WebServer", "Segmentations"]
+        parent.contributors = ["Slicer Community"]
+        parent.helpText = """
+    Check the glTF documents that the web server generates from models and segmentations.
+    """
+        parent.acknowledgementText = """"""  # replace with organization, grant and thanks.
+
+
+#
+# WebServerGLTFExportTestWidget
+#
+
+
+class WebServerGLTFExportTestWidget(ScriptedLoadableModuleWidget):
+    def setup(self):
+        ScriptedLoadableModuleWidget.setup(self)
+
+
+#
+# WebServerGLTFExportTestTest
+#
+
+
+class WebServerGLTFExportTestTest(ScriptedLoadableModuleTest):
+    def setUp(self):
+        """Reset the state for testing."""
+        slicer.mrmlScene.Clear(0)
+
+    def runTest(self):
+        """Run as few or as many tests as needed here."""
+        self.setUp()
+        self.test_ExportModel()
+        self.setUp()
+        self.test_ExportSegmentation()
+
+    def parseGLB(self, content):
+        """Check the chunk layout of a binary glTF document and return the JSON document and the binary buffer."""
+        magic, version, totalLength = struct.unpack_from("<4sII", content, 0)
+        self.assertEqual(magic, b"glTF")
+        self.assertEqual(version, 2)
+        self.assertEqual(totalLength, len(content))
+        jsonLength, jsonType = struct.unpack_from("<I4s", content, 12)
+        self.assertEqual(jsonType, b"JSON")
+        self.assertEqual(jsonLength % 4, 0)
+        gltf = json.loads(content[20:20 + jsonLength])
+        binaryOffset = 20 + jsonLength
+        if binaryOffset == len(content):
+            return gltf, b""
+        binaryLength, binaryType = struct.unpack_from("<I4s", content, binaryOffset)
+        self.assertEqual(binaryType, b"BIN\x00")
+        self.assertEqual(binaryLength % 4, 0)
+        self.assertEqual(binaryOffset + 8 + binaryLength, len(content))
+        return gltf, content[binaryOffset + 8:]
+
+    def checkAccessors(self, gltf, buffer):
+        """Check that the accessors of each mesh refer to non-overlapping aligned views of the buffer
+        and return the arrays of each mesh as (positions, normals, indices).
+        """
+        self.assertEqual(len(gltf["buffers"]), 1)
+        self.assertLessEqual(gltf["buffers"][0]["byteLength"], len(buffer))
+        dtypes = {5126: np.float32, 5125: np.uint32}
+        numberOfComponents = {"VEC3": 3, "SCALAR": 1}
+
+        def accessorArray(accessorIndex, expectedType, expectedTarget):
+            accessor = gltf["accessors"][accessorIndex]
+            self.assertEqual(accessor["type"], expectedType)
+            bufferView = gltf["bufferViews"][accessor["bufferView"]]
+            self.assertEqual(bufferView["buffer"], 0)
+            self.assertEqual(bufferView["target"], expectedTarget)
+            self.assertEqual(bufferView["byteOffset"] % 4, 0)
+            dtype = dtypes[accessor["componentType"]]
+            self.assertEqual(bufferView["byteLength"], accessor["count"] * numberOfComponents[expectedType] * np.dtype(dtype).itemsize)
+            self.assertLessEqual(bufferView["byteOffset"] + bufferView["byteLength"], gltf["buffers"][0]["byteLength"])
+            array = np.frombuffer(buffer, dtype=dtype, count=accessor["count"] * numberOfComponents[expectedType], offset=bufferView["byteOffset"])
+            return array.reshape(-1, 3) if expectedType == "VEC3" else array
+
+        viewRanges = sorted((view["byteOffset"], view["byteOffset"] + view["byteLength"]) for view in gltf["bufferViews"])
+        for viewIndex in range(1, len(viewRanges)):
+            self.assertLessEqual(viewRanges[viewIndex - 1][1], viewRanges[viewIndex][0])
+
+        meshArrays = []
+        for mesh in gltf["meshes"]:
+            self.assertEqual(len(mesh["primitives"]), 1)
+            primitive = mesh["primitives"][0]
+            self.assertEqual(primitive["mode"], 4)
+            positionAccessor = gltf["accessors"][primitive["attributes"]["POSITION"]]
+            positions = accessorArray(primitive["attributes"]["POSITION"], "VEC3", 34962)
+            normals = accessorArray(primitive["attributes"]["NORMAL"], "VEC3", 34962)
+            indices = accessorArray(primitive["indices"], "SCALAR", 34963)
+            self.assertEqual(len(positions), len(normals))
+            self.assertEqual(len(indices) % 3, 0)
+            self.assertLess(indices.max(), len(positions))
+            np.testing.assert_allclose(positionAccessor["min"], positions.min(axis=0))
+            np.testing.assert_allclose(positionAccessor["max"], positions.max(axis=0))
+            meshArrays.append((positions, normals, indices))
+        return meshArrays
+
+    def test_ExportModel(self):
+        from WebServerLib.GLTFExport import GLTFMesh, GLTFMeshGeometry, writeGLTF
+        from WebServerLib.SlicerRequestHandler import SlicerRequestHandler
+
+        self.delayDisplay("Exporting a cube model")
+        cube = vtk.vtkCubeSource()
+        cube.SetBounds(-10.0, 10.0, -20.0, 20.0, -30.0, 30.0)
+        cube.Update()
+
+        # Geometry of the cube: 6 quads are split into 12 triangles
+        geometry = GLTFMeshGeometry.fromPolyData(cube.GetOutput())
+        self.assertEqual(len(geometry.indices), 12 * 3)
+        self.assertEqual(geometry.positions.dtype, np.float32)
+        self.assertEqual(geometry.indices.dtype, np.uint32)
+
+        meshes = [GLTFMesh("Cube", geometry, [1.0, 0.0, 0.0], 0.5)]
+        for binary in [False, True]:
+            content = writeGLTF(meshes, binary, "TestScene")
+            if binary:
+                gltf, buffer = self.parseGLB(content)
+            else:
+                gltf = json.loads(content)
+                uri = gltf["buffers"][0]["uri"]
+                prefix = "data:application/octet-stream;base64,"
+                self.assertTrue(uri.startswith(prefix))
+                buffer = base64.b64decode(uri[len(prefix):])
+                self.assertEqual(gltf["buffers"][0]["byteLength"], len(buffer))
+            self.assertEqual(gltf["nodes"][0], {"name": "TestScene", "children": [1]})
+            self.assertEqual(gltf["nodes"][1], {"name": "Cube", "mesh": 0})
+            self.assertEqual(len(gltf["accessors"]), 3)
+            self.assertEqual(len(gltf["bufferViews"]), 3)
+            self.assertEqual(gltf["materials"][0]["pbrMetallicRoughness"]["baseColorFactor"], [1.0, 0.0, 0.0, 0.5])
+            self.assertEqual(gltf["materials"][0]["alphaMode"], "BLEND")
+            [(positions, normals, indices)] = self.checkAccessors(gltf, buffer)
+            np.testing.assert_array_equal(positions, geometry.positions)
+            np.testing.assert_array_equal(normals, geometry.normals)
+            np.testing.assert_array_equal(indices, geometry.indices)
+            np.testing.assert_allclose(positions.min(axis=0), [-10.0, -20.0, -30.0])
+            np.testing.assert_allclose(positions.max(axis=0), [10.0, 20.0, 30.0])
+
+        # An empty scene is still a valid document
+        gltf, buffer = self.parseGLB(writeGLTF([], True))
+        self.assertNotIn("accessors", gltf)
+        self.assertEqual(buffer, b"")
+
+        self.delayDisplay("Exporting a transformed model node")
+        modelNode = slicer.modules.models.logic().AddModel(cube.GetOutput())
+        transformNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLTransformNode")
+        transformMatrix = vtk.vtkMatrix4x4()
+        transformMatrix.SetElement(0, 3, 100.0)
+        transformNode.SetMatrixTransformToParent(transformMatrix)
+        modelNode.SetAndObserveTransformNodeID(transformNode.GetID())
+
+        handler = SlicerRequestHandler()
+        meshSources = [(modelNode, None, "Cube", [0.0, 1.0, 0.0], 1.0)]
+        content, contentType = handler.exportGraphics(("test",), meshSources, "glb", 0.0, "TestScene")
+        self.assertEqual(contentType, b"model/gltf-binary")
+        gltf, buffer = self.parseGLB(content)
+        self.assertNotIn("alphaMode", gltf["materials"][0])
+        [(positions, _, _)] = self.checkAccessors(gltf, buffer)
+        np.testing.assert_allclose(positions.min(axis=0), [90.0, -20.0, -30.0])
+        np.testing.assert_allclose(positions.max(axis=0), [110.0, 20.0, 30.0])
+
+        # Unchanged content is returned from the cache, transform change updates it
+        cachedContent, _ = handler.exportGraphics(("test",), meshSources, "glb", 0.0, "TestScene")
+        self.assertIs(cachedContent, content)
+        transformMatrix.SetElement(0, 3, 0.0)
+        transformNode.SetMatrixTransformToParent(transformMatrix)
+        content, _ = handler.exportGraphics(("test",), meshSources, "glb", 0.0, "TestScene")
+        self.assertNotEqual(content.etag, cachedContent.etag)
+        [(positions, _, _)] = self.checkAccessors(*self.parseGLB(content))
+        np.testing.assert_allclose(positions.min(axis=0), [-10.0, -20.0, -30.0])
+
+        self.delayDisplay("Test passed")
+
+    def test_ExportSegmentation(self):
+        from WebServerLib.SlicerRequestHandler import SlicerRequestHandler
+
+        self.delayDisplay("Exporting a segmentation")
+        labelmapArray = np.zeros((20, 30, 40), dtype=np.uint8)
+        labelmapArray[5:15, 5:15, 5:15] = 1
+        labelmapArray[5:15, 15:25, 25:35] = 2
+        labelmapNode = slicer.util.addVolumeFromArray(labelmapArray, nodeClassName="vtkMRMLLabelMapVolumeNode")
+        segmentationNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLSegmentationNode")
+        slicer.modules.segmentations.logic().ImportLabelmapToSegmentationNode(labelmapNode, segmentationNode)
+        segmentation = segmentationNode.GetSegmentation()
+        segmentIDs = list(segmentation.GetSegmentIDs())
+        self.assertEqual(len(segmentIDs), 2)
+        closedSurfaceName = slicer.vtkSegmentationConverter.GetSegmentationClosedSurfaceRepresentationName()
+        self.assertFalse(segmentation.ContainsRepresentation(closedSurfaceName))
+        segmentationMTime = segmentation.GetMTime()
+
+        handler = SlicerRequestHandler()
+        request = f"/slicer/segmentation?segmentationID={segmentationNode.GetID()}&format=glb".encode()
+        content, contentType = handler.segmentation(request, b"")
+        self.assertEqual(contentType, b"model/gltf-binary")
+
+        # Surfaces are computed without adding the closed surface representation to the segmentation
+        self.assertFalse(segmentation.ContainsRepresentation(closedSurfaceName))
+        self.assertEqual(segmentation.GetMTime(), segmentationMTime)
+
+        gltf, buffer = self.parseGLB(content)
+        self.assertEqual(gltf["nodes"][0]["name"], segmentationNode.GetName())
+        self.assertEqual(gltf["nodes"][0]["children"], [1, 2])
+        self.assertEqual([mesh["name"] for mesh in gltf["meshes"]],
+                         [segmentation.GetSegment(segmentID).GetName() for segmentID in segmentIDs])
+        self.assertEqual(len(gltf["accessors"]), 2 * 3)
+        meshArrays = self.checkAccessors(gltf, buffer)
+
+        # Each surface is within the bounding box of its labels (voxel corners in RAS)
+        volumeBounds = [0.0] * 6
+        labelmapNode.GetRASBounds(volumeBounds)
+        for positions, _, indices in meshArrays:
+            self.assertGreater(len(indices), 0)
+            self.assertTrue(np.all(positions.min(axis=0) >= np.array(volumeBounds[0::2]) - 1e-3))
+            self.assertTrue(np.all(positions.max(axis=0) <= np.array(volumeBounds[1::2]) + 1e-3))
+
+        # Repeated request is served from the cache
+        cachedContent, _ = handler.segmentation(request, b"")
+        self.assertIs(cachedContent, content)
+
+        self.delayDisplay("Test passed")
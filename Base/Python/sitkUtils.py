@@ -24,14 +24,12 @@ def PushVolumeToSlicer(sitkimage, targetNode=None, name=None, className="vtkMRML
         # Use direct memory transfer
         myNodeFullITKAddress = GetSlicerITKReadWriteAddress(targetNode)
         sitk.WriteImage(sitkimage, myNodeFullITKAddress)
+    elif _canTransferUsingArray(targetNode, sitkimage):
+        # Copy the voxels from the SimpleITK image buffer to the VTK image buffer
+        _pushVolumeToSlicerUsingArray(sitkimage, targetNode)
     else:
         # Use file transfer (less efficient, but works in all cases).
-        # Simple VTK/SimpleITK image conversion would not work, as coordinate system needs to be converted between LPS and RAS.
-        storageNode, tempFileName = _addDefaultStorageNode(targetNode)
-        sitk.WriteImage(sitkimage, tempFileName)
-        storageNode.ReadData(targetNode, True)
-        slicer.mrmlScene.RemoveNode(storageNode)
-        os.remove(tempFileName)
+        _pushVolumeToSlicerUsingFile(sitkimage, targetNode)
 
     return targetNode
 
@@ -46,14 +44,13 @@ def PullVolumeFromSlicer(nodeObjectOrName):
         myNodeFullITKAddress = GetSlicerITKReadWriteAddress(nodeObjectOrName)
         sitkimage = sitk.ReadImage(myNodeFullITKAddress)
     else:
-        # Use file transfer (less efficient, but works in all cases).
-        # Simple VTK/SimpleITK image conversion would not work, as coordinate system needs to be converted between LPS and RAS.
         targetNode = nodeObjectOrName if isinstance(nodeObjectOrName, slicer.vtkMRMLNode) else slicer.util.getNode(nodeObjectOrName)
-        storageNode, tempFileName = _addDefaultStorageNode(targetNode)
-        storageNode.WriteData(targetNode)
-        sitkimage = sitk.ReadImage(tempFileName)
-        slicer.mrmlScene.RemoveNode(storageNode)
-        os.remove(tempFileName)
+        if _canTransferUsingArray(targetNode):
+            # Copy the voxels from the VTK image buffer to the SimpleITK image buffer
+            sitkimage = _pullVolumeFromSlicerUsingArray(targetNode)
+        else:
+            # Use file transfer (less efficient, but works in all cases).
+            sitkimage = _pullVolumeFromSlicerUsingFile(targetNode)
 
     return sitkimage
 
@@ -89,6 +86,110 @@ def IsMRMLIDImageIOAvailable():
     return False
 
 
+# Only volumes with one voxel array of these types can be transferred using arrays. Other volumes
+# (for example tensor volumes, or voxel types that are not supported by SimpleITK) use file transfer.
+_arrayTransferNodeClassNames = ["vtkMRMLScalarVolumeNode", "vtkMRMLLabelMapVolumeNode", "vtkMRMLVectorVolumeNode"]
+_arrayTransferScalarTypes = ["int8", "uint8", "int16", "uint16", "int32", "uint32", "float32", "float64"]
+_arrayTransferPixelIDs = [
+    sitk.sitkInt8, sitk.sitkUInt8, sitk.sitkInt16, sitk.sitkUInt16,
+    sitk.sitkInt32, sitk.sitkUInt32, sitk.sitkFloat32, sitk.sitkFloat64,
+    sitk.sitkVectorInt8, sitk.sitkVectorUInt8, sitk.sitkVectorInt16, sitk.sitkVectorUInt16,
+    sitk.sitkVectorInt32, sitk.sitkVectorUInt32, sitk.sitkVectorFloat32, sitk.sitkVectorFloat64,
+]
+
+
+def _canTransferUsingArray(volumeNode, sitkimage=None):
+    """Determine if voxels can be transferred between the volume node and a SimpleITK image using
+    numpy arrays, without writing a temporary file.
+
+    :param sitkimage: image pushed to the volume node. If None then the volume node image is pulled.
+    """
+    if volumeNode.GetClassName() not in _arrayTransferNodeClassNames:
+        return False
+    if sitkimage is None:
+        imageData = volumeNode.GetImageData()
+        if imageData is None or imageData.GetPointData().GetScalars() is None:
+            return False
+        numberOfComponents = imageData.GetNumberOfScalarComponents()
+        supportedType = _numpyScalarTypeName(imageData.GetPointData().GetScalars()) in _arrayTransferScalarTypes
+    else:
+        if sitkimage.GetDimension() != 3:
+            return False
+        numberOfComponents = sitkimage.GetNumberOfComponentsPerPixel()
+        supportedType = sitkimage.GetPixelID() in _arrayTransferPixelIDs
+    # Scalar volumes can only store a single component
+    if numberOfComponents > 1 and volumeNode.GetClassName() != "vtkMRMLVectorVolumeNode":
+        return False
+    return supportedType
+
+
+def _numpyScalarTypeName(vtkArray):
+    import numpy as np
+    import vtk.util.numpy_support
+
+    try:
+        return np.dtype(vtk.util.numpy_support.get_numpy_array_type(vtkArray.GetDataType())).name
+    except KeyError:
+        return None
+
+
+# Matrix converting between LPS (used by ITK) and RAS (used by Slicer) coordinate systems
+_lpsToRas = ((-1.0, 0.0, 0.0), (0.0, -1.0, 0.0), (0.0, 0.0, 1.0))
+
+
+def _pushVolumeToSlicerUsingArray(sitkimage, targetNode):
+    import numpy as np
+
+    lpsToRas = np.array(_lpsToRas)
+    origin = lpsToRas @ np.array(sitkimage.GetOrigin())
+    directions = lpsToRas @ np.array(sitkimage.GetDirection()).reshape(3, 3)
+
+    with slicer.util.NodeModify(targetNode):
+        # The view shares the SimpleITK image buffer, voxels are only copied once into the VTK image buffer.
+        slicer.util.updateVolumeFromArray(targetNode, sitk.GetArrayViewFromImage(sitkimage))
+        targetNode.SetSpacing(sitkimage.GetSpacing())
+        targetNode.SetOrigin(*origin)
+        targetNode.SetIJKToRASDirections(*directions.flatten())
+
+
+def _pullVolumeFromSlicerUsingArray(volumeNode):
+    import numpy as np
+    import vtk
+
+    lpsToRas = np.array(_lpsToRas)
+    ijkToRASDirectionMatrix = vtk.vtkMatrix4x4()
+    volumeNode.GetIJKToRASDirectionMatrix(ijkToRASDirectionMatrix)
+    directions = lpsToRas @ slicer.util.arrayFromVTKMatrix(ijkToRASDirectionMatrix)[:3, :3]
+    origin = lpsToRas @ np.array(volumeNode.GetOrigin())
+
+    # The array is a view of the VTK image buffer, voxels are only copied once into the SimpleITK image buffer.
+    narray = slicer.util.arrayFromVolume(volumeNode)
+    isVector = volumeNode.GetImageData().GetNumberOfScalarComponents() > 1
+    sitkimage = sitk.GetImageFromArray(narray, isVector=isVector)
+    sitkimage.SetSpacing(volumeNode.GetSpacing())
+    sitkimage.SetOrigin(origin.tolist())
+    sitkimage.SetDirection(directions.flatten().tolist())
+    return sitkimage
+
+
+def _pushVolumeToSlicerUsingFile(sitkimage, targetNode):
+    # Simple VTK/SimpleITK image conversion would not work, as coordinate system needs to be converted between LPS and RAS.
+    storageNode, tempFileName = _addDefaultStorageNode(targetNode)
+    sitk.WriteImage(sitkimage, tempFileName)
+    storageNode.ReadData(targetNode, True)
+    slicer.mrmlScene.RemoveNode(storageNode)
+    os.remove(tempFileName)
+
+
+def _pullVolumeFromSlicerUsingFile(volumeNode):
+    storageNode, tempFileName = _addDefaultStorageNode(volumeNode)
+    storageNode.WriteData(volumeNode)
+    sitkimage = sitk.ReadImage(tempFileName)
+    slicer.mrmlScene.RemoveNode(storageNode)
+    os.remove(tempFileName)
+    return sitkimage
+
+
 def _addDefaultStorageNode(targetNode):
     originalStorageNode = targetNode.GetStorageNode()
     if originalStorageNode:
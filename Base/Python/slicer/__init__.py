@@ -186,19 +186,80 @@ import sys
 
 standalone_python = "python" in str.lower(os.path.split(sys.executable)[-1])
 
-for kit in available_kits:
-    # skip PythonQt kits if we are running in a regular python interpreter
-    if standalone_python and "PythonQt" in kit:
-        continue
+# Setting the SLICER_LAZY_IMPORT environment variable to "1" defers the import of
+# the kits (and of the classes registered using "slicer.util.importClassesFromDirectory()")
+# until one of their attributes is first accessed. This reduces the startup time
+# of short-lived "PythonSlicer" processes only using a small part of the API.
+#
+# Since attributes are resolved by the module level "__getattr__()", accessing
+# an attribute that does not exist triggers the import of all pending kits, and
+# "from slicer import *" only exports the attributes resolved so far.
+
+_lazyImportEnabled = os.environ.get("SLICER_LAZY_IMPORT", "0").lower() in ["1", "on", "true", "yes"]
+
+_lazyImports = []
+"""List of callables importing objects into the slicer namespace, each one is
+called at most once on-demand when an attribute cannot be found.
+"""
+
+
+def _importKit(kit):
+    import importlib
 
     try:
-        exec("from %s import *" % (kit))
+        module = importlib.import_module(kit)
     except ImportError as detail:
         # Try kit relative import if installed in as a traditional package
         try:
-            exec("from .%s import *" % (kit))
+            module = importlib.import_module("." + kit, __name__)
         except ImportError:
             print(detail)
+            return
+
+    # Same names as the ones imported using "from <kit> import *"
+    names = getattr(module, "__all__", None)
+    if names is None:
+        names = [name for name in vars(module) if not name.startswith("_")]
+    globals().update({name: getattr(module, name) for name in names})
+
+
+def _registerLazyImport(importFunction):
+    """Register ``importFunction`` to be called when an attribute is first looked up
+    and not found in the slicer namespace.
+
+    Returns ``False`` if lazy import is disabled, the caller is then expected to
+    perform the import immediately.
+    """
+    if not _lazyImportEnabled:
+        return False
+    _lazyImports.append(importFunction)
+    return True
+
+
+def __getattr__(name):
+    # Private and special attributes (e.g "__path__", "__wrapped__") are looked up by
+    # the import machinery and various tools, they are never provided by the kits.
+    if not name.startswith("_"):
+        while _lazyImports:
+            _lazyImports.pop(0)()
+            if name in globals():
+                return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    while _lazyImports:
+        _lazyImports.pop(0)()
+    return sorted(globals())
+
+
+for kit in available_kits:
+    # skip PythonQt kits if we are running in a regular python interpreter
+    if standalone_python and "PythonQt" in kit:
+        continue
+
+    if not _registerLazyImport(lambda kit=kit: _importKit(kit)):
+        _importKit(kit)
 
     del kit
 
@@ -209,9 +270,9 @@ for kit in available_kits:
 # See details in https://github.com/Slicer/Slicer/issues/5945
 # While the workaround is only needed for Windows 11, it is performed on
 # all operating systems to minimize differences of the startup process
-# between different platforms.
+# between different platforms, unless lazy import is enabled.
 
-if not standalone_python:
+if not standalone_python and (sys.platform == "win32" or not _lazyImportEnabled):
     try:
         import numpy  # noqa: F401
         import scipy  # noqa: F401
@@ -0,0 +1,472 @@
+"""Utilities for measuring performance of Slicer features in a reproducible way.
+
+Benchmarks are registered in a :class:`BenchmarkRegistry` and run with warm-up and
+repeated measurements. Results can be saved as JSON and compared to results of
+a previous run (baseline) to detect performance regressions::
+
+    import slicer.benchmark
+
+    @slicer.benchmark.registry.register(tags=["scene"])
+    def clearScene():
+        slicer.mrmlScene.Clear()
+
+    results = slicer.benchmark.registry.run(repeat=10)
+    slicer.benchmark.saveResults(results, "results.json")
+    comparisons = slicer.benchmark.compareResults(results, slicer.benchmark.loadResults("baseline.json"))
+    print(slicer.benchmark.formatComparisons(comparisons))
+
+This module only depends on the Python standard library, so it can also be used outside
+of the Slicer application, for example for measuring application startup time or for comparing
+result files from the command line::
+
+    python benchmark.py results.json --baseline baseline.json --threshold 0.1
+"""
+
+import fnmatch
+import json
+import logging
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+
+RESULTS_FORMAT_VERSION = 1
+
+BENCHMARK_OUTPUT_DIRECTORY_ENVIRONMENT_VARIABLE = "SLICER_BENCHMARK_OUTPUT_DIRECTORY"
+BENCHMARK_BASELINE_DIRECTORY_ENVIRONMENT_VARIABLE = "SLICER_BENCHMARK_BASELINE_DIRECTORY"
+
+
+def percentile(values, percent):
+    """Return the percentile of the values, using linear interpolation between the closest ranks.
+
+    >>> percentile([1, 2, 3, 4], 50)
+    2.5
+    >>> percentile([5, 1, 3], 100)
+    5
+    """
+    if not values:
+        raise ValueError("percentile requires at least one value")
+    sortedValues = sorted(values)
+    position = (len(sortedValues) - 1) * percent / 100.0
+    lowerIndex = math.floor(position)
+    upperIndex = math.ceil(position)
+    if lowerIndex == upperIndex:
+        return sortedValues[lowerIndex]
+    return sortedValues[lowerIndex] + (sortedValues[upperIndex] - sortedValues[lowerIndex]) * (position - lowerIndex)
+
+
+def resetPeakMemory():
+    """Reset the peak resident memory size of the process.
+
+    Only supported on Linux. Returns True if the peak was reset.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as file:
+            file.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peakMemory():
+    """Return the peak resident memory size of the process in bytes.
+
+    Returns None if it cannot be determined on this platform.
+    """
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    maximumResidentSize = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on other platforms
+    return maximumResidentSize if sys.platform == "darwin" else maximumResidentSize * 1024
+
+
+class BenchmarkResult:
+    """Measured durations (in seconds) of a benchmark and statistics computed from them."""
+
+    def __init__(self, name, durations, peakMemory=None, tags=None, properties=None):
+        """
+        :param name: unique name of the benchmark
+        :param durations: list of measured durations in seconds (warm-up runs are not included)
+        :param peakMemory: peak resident memory size of the process in bytes during the measurement
+        :param tags: list of tags of the benchmark
+        :param properties: dictionary of additional information (e.g., image size)
+        """
+        self.name = name
+        self.durations = list(durations)
+        self.peakMemory = peakMemory
+        self.tags = list(tags or [])
+        self.properties = dict(properties or {})
+
+    @property
+    def mean(self):
+        return statistics.mean(self.durations)
+
+    @property
+    def median(self):
+        return statistics.median(self.durations)
+
+    @property
+    def minimum(self):
+        return min(self.durations)
+
+    @property
+    def maximum(self):
+        return max(self.durations)
+
+    @property
+    def standardDeviation(self):
+        return statistics.stdev(self.durations) if len(self.durations) > 1 else 0.0
+
+    def percentile(self, percent):
+        return percentile(self.durations, percent)
+
+    def statistic(self, name):
+        """Get a statistic by name: mean, median, min, max, stdev, or pNN (percentile, such as p90)."""
+        if name in ["mean", "median"]:
+            return getattr(self, name)
+        if name == "min":
+            return self.minimum
+        if name == "max":
+            return self.maximum
+        if name == "stdev":
+            return self.standardDeviation
+        if name.startswith("p") and name[1:].isdigit():
+            return self.percentile(int(name[1:]))
+        raise ValueError(f"Unknown statistic: {name}")
+
+    def toDict(self):
+        return {
+            "name": self.name,
+            "tags": self.tags,
+            "properties": self.properties,
+            "durations": self.durations,
+            "statistics": {name: self.statistic(name) for name in ["mean", "median", "min", "max", "stdev", "p90", "p95"]},
+            "peakMemory": self.peakMemory,
+        }
+
+    @staticmethod
+    def fromDict(resultDict):
+        return BenchmarkResult(
+            resultDict["name"],
+            resultDict["durations"],
+            peakMemory=resultDict.get("peakMemory"),
+            tags=resultDict.get("tags"),
+            properties=resultDict.get("properties"))
+
+    def __str__(self):
+        text = (f"{self.name}: median {1000.0 * self.median:.2f} ms, mean {1000.0 * self.mean:.2f} ms"
+                f" +/- {1000.0 * self.standardDeviation:.2f} ms, p90 {1000.0 * self.percentile(90):.2f} ms"
+                f" ({len(self.durations)} runs)")
+        if self.peakMemory is not None:
+            text += f", peak memory {self.peakMemory / 2**20:.1f} MiB"
+        return text
+
+
+class Benchmark:
+    """Operation whose execution time is measured.
+
+    The benchmark function is called `warmup` times without measuring the execution time,
+    then `repeat` times measuring the execution time of each call.
+
+    If `measuresOwnDuration` is enabled then the function must return the measured duration
+    in seconds, which allows measuring only part of the work done in the function (for example,
+    not including preparation of input data). Otherwise the return value is ignored.
+    """
+
+    def __init__(self, name, function, setup=None, teardown=None, warmup=1, repeat=5,
+                 tags=None, properties=None, description=None, measureMemory=True, measuresOwnDuration=False):
+        """
+        :param name: unique name of the benchmark
+        :param function: function to measure. If `setup` is specified then its return value is passed to the function.
+        :param setup: optional function that is called once before the warm-up and measured runs.
+        :param teardown: optional function that is called once after the measured runs
+          (with the return value of `setup`, if specified), even if the benchmark failed.
+        :param warmup: default number of runs before the measurement
+        :param repeat: default number of measured runs
+        :param tags: list of tags, which can be used for selecting benchmarks to run
+        :param properties: dictionary of additional information stored in the result
+        :param description: human-readable description
+        :param measureMemory: record peak memory usage of the process during the measured runs
+        :param measuresOwnDuration: the function returns the measured duration in seconds,
+          which is recorded instead of the execution time of the function call
+        """
+        self.name = name
+        self.function = function
+        self.setup = setup
+        self.teardown = teardown
+        self.warmup = warmup
+        self.repeat = repeat
+        self.tags = list(tags or [])
+        self.properties = dict(properties or {})
+        self.description = description or function.__doc__
+        self.measureMemory = measureMemory
+        self.measuresOwnDuration = measuresOwnDuration
+
+    def run(self, warmup=None, repeat=None):
+        """Run the benchmark and return a :class:`BenchmarkResult`.
+
+        :param warmup: number of runs before the measurement (default: value set in the constructor)
+        :param repeat: number of measured runs (default: value set in the constructor)
+        """
+        warmup = self.warmup if warmup is None else warmup
+        repeat = self.repeat if repeat is None else repeat
+        if repeat < 1:
+            raise ValueError("At least one measured run is required")
+
+        if self.setup is not None:
+            context = self.setup()
+            arguments = [context]
+        else:
+            arguments = []
+        try:
+            for _ in range(warmup):
+                self.function(*arguments)
+
+            if self.measureMemory:
+                resetPeakMemory()
+            durations = []
+            for _ in range(repeat):
+                startTime = time.perf_counter()
+                measuredDuration = self.function(*arguments)
+                duration = time.perf_counter() - startTime
+                if self.measuresOwnDuration:
+                    if isinstance(measuredDuration, bool) or not isinstance(measuredDuration, (int, float)):
+                        raise TypeError(f"Benchmark {self.name} must return the measured duration in seconds, got {measuredDuration!r}")
+                    duration = float(measuredDuration)
+                durations.append(duration)
+            memory = peakMemory() if self.measureMemory else None
+        finally:
+            if self.teardown is not None:
+                self.teardown(*arguments)
+
+        return BenchmarkResult(self.name, durations, peakMemory=memory, tags=self.tags, properties=self.properties)
+
+
+class BenchmarkRegistry:
+    """Collection of benchmarks that can be selected by name pattern and tags and run together."""
+
+    def __init__(self):
+        self._benchmarks = {}
+
+    def add(self, benchmark):
+        """Add a :class:`Benchmark` to the registry."""
+        if benchmark.name in self._benchmarks:
+            raise ValueError(f"Benchmark {benchmark.name} is already registered")
+        self._benchmarks[benchmark.name] = benchmark
+        return benchmark
+
+    def remove(self, name):
+        del self._benchmarks[name]
+
+    def register(self, name=None, **kwargs):
+        """Decorator for registering a function as benchmark.
+
+        Keyword arguments are passed to the :class:`Benchmark` constructor.
+        The function is returned unchanged, so it can still be called directly.
+        """
+
+        def decorator(function):
+            self.add(Benchmark(name or function.__name__, function, **kwargs))
+            return function
+
+        return decorator
+
+    def benchmarks(self, pattern=None, tags=None):
+        """Get list of registered benchmarks.
+
+        :param pattern: only include benchmarks with name matching this shell-style wildcard pattern
+        :param tags: only include benchmarks that have all these tags
+        """
+        selectedBenchmarks = []
+        for benchmark in self._benchmarks.values():
+            if pattern and not fnmatch.fnmatchcase(benchmark.name, pattern):
+                continue
+            if tags and not set(tags).issubset(benchmark.tags):
+                continue
+            selectedBenchmarks.append(benchmark)
+        return selectedBenchmarks
+
+    def run(self, pattern=None, tags=None, warmup=None, repeat=None):
+        """Run selected benchmarks and return the list of :class:`BenchmarkResult`."""
+        results = []
+        for benchmark in self.benchmarks(pattern, tags):
+            logging.info(f"Running benchmark {benchmark.name}")
+            result = benchmark.run(warmup, repeat)
+            logging.info(str(result))
+            results.append(result)
+        return results
+
+
+registry = BenchmarkRegistry()
+"""Default benchmark registry."""
+
+
+def environmentInformation():
+    """Return information about the computer and application that is stored with the results."""
+    information = {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpuCount": os.cpu_count(),
+        "python": platform.python_version(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    # Do not import slicer, as this module may be used outside of the application
+    slicerModule = sys.modules.get("slicer")
+    app = getattr(slicerModule, "app", None)
+    if app is not None:
+        information["applicationVersion"] = app.applicationVersion
+        information["revision"] = app.revision
+    return information
+
+
+def saveResults(results, path, metadata=None):
+    """Save benchmark results to a JSON file.
+
+    :param results: list of :class:`BenchmarkResult`
+    :param path: output file path
+    :param metadata: additional information to store (e.g., build options)
+    """
+    content = {
+        "formatVersion": RESULTS_FORMAT_VERSION,
+        "environment": environmentInformation(),
+        "metadata": metadata or {},
+        "results": [result.toDict() for result in results],
+    }
+    with open(path, "w") as file:
+        json.dump(content, file, indent=2)
+
+
+def loadResults(path):
+    """Load benchmark results from a JSON file saved by :func:`saveResults`.
+
+    :return: list of :class:`BenchmarkResult`
+    """
+    with open(path) as file:
+        content = json.load(file)
+    if content.get("formatVersion", 0) > RESULTS_FORMAT_VERSION:
+        raise ValueError(f"Unsupported benchmark results format version in {path}")
+    return [BenchmarkResult.fromDict(resultDict) for resultDict in content["results"]]
+
+
+class BenchmarkComparison:
+    """Comparison of a benchmark result to a baseline result."""
+
+    def __init__(self, name, value, baselineValue, threshold):
+        self.name = name
+        self.value = value
+        self.baselineValue = baselineValue
+        self.threshold = threshold
+
+    @property
+    def relativeChange(self):
+        """Relative change compared to the baseline (positive means slower)."""
+        if self.value is None or self.baselineValue is None:
+            return None
+        if self.baselineValue == 0:
+            return 0.0 if self.value == 0 else math.inf
+        return (self.value - self.baselineValue) / self.baselineValue
+
+    @property
+    def regression(self):
+        return self.relativeChange is not None and self.relativeChange > self.threshold
+
+    @property
+    def improvement(self):
+        return self.relativeChange is not None and self.relativeChange < -self.threshold
+
+    def __str__(self):
+        if self.baselineValue is None:
+            return f"{self.name}: {1000.0 * self.value:.2f} ms (no baseline)"
+        if self.value is None:
+            return f"{self.name}: missing (baseline {1000.0 * self.baselineValue:.2f} ms)"
+        status = "REGRESSION" if self.regression else "improvement" if self.improvement else "ok"
+        return (f"{self.name}: {1000.0 * self.value:.2f} ms, baseline {1000.0 * self.baselineValue:.2f} ms"
+                f" ({100.0 * self.relativeChange:+.1f}%) {status}")
+
+
+def compareResults(results, baselineResults, threshold=0.1, statistic="median"):
+    """Compare benchmark results to baseline results.
+
+    :param results: list of :class:`BenchmarkResult`
+    :param baselineResults: list of :class:`BenchmarkResult` of a previous run
+    :param threshold: relative slowdown (0.1 = 10%) above which a result is flagged as regression
+    :param statistic: statistic to compare (mean, median, min, max, or pNN percentile)
+    :return: list of :class:`BenchmarkComparison`, one for each benchmark in any of the result lists
+    """
+    values = {result.name: result.statistic(statistic) for result in results}
+    baselineValues = {result.name: result.statistic(statistic) for result in baselineResults}
+    names = list(values) + [name for name in baselineValues if name not in values]
+    return [BenchmarkComparison(name, values.get(name), baselineValues.get(name), threshold) for name in names]
+
+
+def formatComparisons(comparisons):
+    """Return human-readable summary of benchmark comparisons."""
+    lines = [str(comparison) for comparison in comparisons]
+    regressions = [comparison for comparison in comparisons if comparison.regression]
+    lines.append(f"{len(regressions)} regression(s) in {len(comparisons)} benchmark(s)")
+    return "\n".join(lines)
+
+
+def reportResults(results, name, threshold=0.1, statistic="median"):
+    """Save and compare results of automated tests, as configured by environment variables.
+
+    If the environment variable ``SLICER_BENCHMARK_OUTPUT_DIRECTORY`` is set then the results are
+    saved into ``<name>.json`` in that directory. If ``SLICER_BENCHMARK_BASELINE_DIRECTORY`` is set
+    and contains ``<name>.json`` then the results are compared to it.
+
+    :return: list of :class:`BenchmarkComparison` (empty if there is no baseline)
+    """
+    outputDirectory = os.environ.get(BENCHMARK_OUTPUT_DIRECTORY_ENVIRONMENT_VARIABLE)
+    if outputDirectory:
+        os.makedirs(outputDirectory, exist_ok=True)
+        saveResults(results, os.path.join(outputDirectory, f"{name}.json"))
+    baselineDirectory = os.environ.get(BENCHMARK_BASELINE_DIRECTORY_ENVIRONMENT_VARIABLE)
+    if not baselineDirectory:
+        return []
+    baselinePath = os.path.join(baselineDirectory, f"{name}.json")
+    if not os.path.exists(baselinePath):
+        logging.warning(f"Benchmark baseline {baselinePath} not found")
+        return []
+    comparisons = compareResults(results, loadResults(baselinePath), threshold, statistic)
+    logging.info(formatComparisons(comparisons))
+    return comparisons
+
+
+def main(argv=None):
+    """Compare benchmark result files from the command line.
+
+    Returns non-zero exit code if there is a regression.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Display and compare Slicer benchmark results.")
+    parser.add_argument("results", help="benchmark results JSON file")
+    parser.add_argument("--baseline", help="benchmark results JSON file to compare to")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown that is reported as regression (default: 0.1)")
+    parser.add_argument("--statistic", default="median", help="compared statistic: mean, median, min, max, or pNN (default: median)")
+    args = parser.parse_args(argv)
+
+    results = loadResults(args.results)
+    if not args.baseline:
+        for result in results:
+            print(result)
+        return 0
+    comparisons = compareResults(results, loadResults(args.baseline), args.threshold, args.statistic)
+    print(formatComparisons(comparisons))
+    return 1 if any(comparison.regression for comparison in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -59,7 +59,7 @@ def runSync(module, node=None, parameters=None, delete_temporary_files=True, upd
     update_display: show output nodes after completion
     hide_window: whether to hide the CLI process window (Windows only, True by default).
     """
-    return run(module, node=node, parameters=parameters, wait_for_completion=True, delete_temporary_files=delete_temporary_files, update_display=update_display)
+    return run(module, node=node, parameters=parameters, wait_for_completion=True, delete_temporary_files=delete_temporary_files, update_display=update_display, hide_window=hide_window)
 
 
 def run(module, node=None, parameters=None, wait_for_completion=False, delete_temporary_files=True, update_display=True, hide_window=True):
@@ -99,4 +99,220 @@ def run(module, node=None, parameters=None, wait_for_completion=False, delete_te
 
 
 def cancel(node):
-    print("Not yet implemented")
+    """Request cancellation of the CLI execution associated with the
+    vtkMRMLCommandLineModuleNode ``node``.
+    Nothing is done if the CLI is not scheduled or running. The node status
+    changes to Cancelled once the execution is stopped.
+    """
+    if node and node.IsBusy():
+        node.Cancel()
+
+
+class CLIJobError(RuntimeError):
+    """Exception set on the future of a :class:`CLIJob` completed with errors."""
+
+    def __init__(self, job):
+        super().__init__(f"CLI '{job.node.GetName()}' completed with errors: {job.node.GetErrorText()}")
+        self.job = job
+
+
+class CLIJob:
+    """Execution of a CLI submitted to a :class:`CLIJobQueue`.
+
+    The job is the result of its future (or is available as the ``job`` attribute of
+    the :class:`CLIJobError` exception) and gives access to the parameter node and
+    to the timing of the execution.
+    """
+
+    def __init__(self, module, parameters=None, node=None):
+        import concurrent.futures
+        import time
+
+        self.module = module
+        self.parameters = parameters
+        self.node = node
+        self.temporaryNode = node is None
+        self.future = concurrent.futures.Future()
+        self.submitTime = time.time()
+        self.startTime = None
+        self.endTime = None
+        self.observerTag = None
+
+    @property
+    def status(self):
+        """Status of the parameter node (e.g "Scheduled", "Running", "Completed") or "Pending" if the job is not started yet."""
+        return self.node.GetStatusString() if self.startTime is not None else "Pending"
+
+    @property
+    def waitingTime(self):
+        """Time in seconds between submission and start of the job, None if not started yet."""
+        return self.startTime - self.submitTime if self.startTime is not None else None
+
+    @property
+    def executionTime(self):
+        """Time in seconds between start and end of the job, None if not completed yet."""
+        return self.endTime - self.startTime if self.endTime is not None and self.startTime is not None else None
+
+
+class CLIJobQueue:
+    """Run many CLI executions with a limit on the number of concurrent executions.
+
+    Jobs are started in submission order on the main thread, using :func:`run` without
+    waiting for completion, and are completed when the status of their parameter node
+    changes. Application events must therefore be processed for the jobs to progress,
+    either by returning to the application event loop or by calling :func:`wait`.
+
+    Example::
+
+      queue = slicer.cli.CLIJobQueue(max_concurrent_jobs=4)
+      futures = [
+          queue.submit(slicer.modules.n4itkbiasfieldcorrection, {"inputImageName": volume, "outputImageName": outputVolume})
+          for volume, outputVolume in zip(inputVolumes, outputVolumes)
+      ]
+      queue.wait()
+      for future in futures:
+          job = future.result()
+          print(f"{job.node.GetName()}: {job.executionTime:.1f}s")
+
+    Futures are :class:`concurrent.futures.Future` objects, they can be awaited in coroutines
+    after wrapping them using :func:`asyncio.wrap_future`. Cancelling a future (or calling
+    :func:`cancel`) removes a pending job from the queue and cancels a running job.
+
+    Parameter nodes created by the queue are removed from the scene when the job is done,
+    unless ``remove_temporary_nodes`` is False.
+    """
+
+    def __init__(self, max_concurrent_jobs=None, delete_temporary_files=True, update_display=False, hide_window=True, remove_temporary_nodes=True):
+        """
+        :param max_concurrent_jobs: maximum number of jobs running at the same time (number of CPUs by default).
+        :param delete_temporary_files: remove temp files created during execution.
+        :param update_display: show output nodes after completion.
+        :param hide_window: whether to hide the CLI process window (Windows only).
+        :param remove_temporary_nodes: remove parameter nodes created for submitted jobs when they are done.
+        """
+        import collections
+        import os
+
+        self.maxConcurrentJobs = max_concurrent_jobs or os.cpu_count() or 1
+        self.deleteTemporaryFiles = delete_temporary_files
+        self.updateDisplay = update_display
+        self.hideWindow = hide_window
+        self.removeTemporaryNodes = remove_temporary_nodes
+        self._pendingJobs = collections.deque()
+        self._runningJobs = []
+
+    @property
+    def numberOfPendingJobs(self):
+        return len(self._pendingJobs)
+
+    @property
+    def numberOfRunningJobs(self):
+        return len(self._runningJobs)
+
+    def submit(self, module, parameters=None, node=None):
+        """Add a CLI execution to the queue and return its future.
+
+        :param module: CLI module to run (e.g ``slicer.modules.resamplescalarvolume``).
+        :param parameters: dictionary of parameters for cli (see :func:`setNodeParameters`).
+        :param node: existing parameter node. If None, a temporary node is created when the job starts.
+        """
+        job = CLIJob(module, parameters, node)
+        job.future.add_done_callback(lambda future, job=job: self._onFutureDone(job))
+        self._pendingJobs.append(job)
+        self._startJobs()
+        return job.future
+
+    def cancel(self, future):
+        """Cancel the job associated with ``future``, whether it is pending or running."""
+        if future.cancel():
+            # Pending job, removed from the queue in _onFutureDone
+            return
+        for job in self._runningJobs:
+            if job.future is future:
+                cancel(job.node)
+                return
+
+    def cancelAll(self):
+        """Cancel all pending and running jobs."""
+        for job in list(self._pendingJobs) + list(self._runningJobs):
+            self.cancel(job.future)
+
+    def wait(self, timeout=None):
+        """Process application events until all jobs are done.
+
+        :param timeout: maximum time to wait in seconds (no limit by default).
+        :return: True if all jobs are done, False if the timeout expired.
+        """
+        import time
+
+        import slicer
+
+        startTime = time.time()
+        while self._pendingJobs or self._runningJobs:
+            if timeout is not None and time.time() - startTime > timeout:
+                return False
+            slicer.app.processEvents()
+            time.sleep(0.01)
+        return True
+
+    def _startJobs(self):
+        import time
+
+        import slicer
+
+        while self._pendingJobs and len(self._runningJobs) < self.maxConcurrentJobs:
+            job = self._pendingJobs.popleft()
+            if not job.future.set_running_or_notify_cancel():
+                # Cancelled before starting
+                continue
+            try:
+                if job.node is None:
+                    job.node = createNode(job.module)
+                    if job.node is None:
+                        raise RuntimeError(f"Failed to create parameter node for CLI module '{job.module.name}'")
+                job.observerTag = job.node.AddObserver(
+                    slicer.vtkMRMLCommandLineModuleNode.StatusModifiedEvent,
+                    lambda caller, event, job=job: self._onStatusModified(job))
+                self._runningJobs.append(job)
+                job.startTime = time.time()
+                run(job.module, job.node, job.parameters, wait_for_completion=False,
+                    delete_temporary_files=self.deleteTemporaryFiles, update_display=self.updateDisplay, hide_window=self.hideWindow)
+            except Exception as e:
+                self._finishJob(job)
+                job.future.set_exception(e)
+
+    def _onStatusModified(self, job):
+        import concurrent.futures
+
+        node = job.node
+        status = node.GetStatus()
+        if status == node.Cancelled:
+            self._finishJob(job)
+            job.future.set_exception(concurrent.futures.CancelledError())
+        elif status == node.CompletedWithErrors:
+            self._finishJob(job)
+            job.future.set_exception(CLIJobError(job))
+        elif status == node.Completed:
+            self._finishJob(job)
+            job.future.set_result(job)
+        else:
+            return
+        self._startJobs()
+
+    def _onFutureDone(self, job):
+        if job.future.cancelled() and job in self._pendingJobs:
+            self._pendingJobs.remove(job)
+
+    def _finishJob(self, job):
+        import time
+
+        import slicer
+
+        job.endTime = time.time()
+        if job in self._runningJobs:
+            self._runningJobs.remove(job)
+        if job.observerTag is not None:
+            job.node.RemoveObserver(job.observerTag)
+            job.observerTag = None
+        if job.temporaryNode and self.removeTemporaryNodes and job.node is not None and job.node.GetScene():
+            slicer.mrmlScene.RemoveNode(job.node)
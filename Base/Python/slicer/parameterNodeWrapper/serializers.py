@@ -2,6 +2,7 @@
 
 import abc
 import collections
+import contextlib
 import enum
 import importlib
 import logging
@@ -493,6 +494,9 @@ class ObservedList(collections.abc.MutableSequence):
     A list-like object that updates its associated parameter node when the container is updated.
     Modification operations are supported (append, +=, __setitem__, etc), but non-modifying list
     operations are not (+, *) as it would be too easy to accidentally make non-observable changes.
+
+    Only the elements that have changed (and the length of the list) are written to the parameter node.
+    Use :func:`batchModify` to make many changes with a single write and a single Modified event.
     """
 
     def __init__(self, parameterNode, listSerializer, name, startingValue):
@@ -500,6 +504,8 @@ class ObservedList(collections.abc.MutableSequence):
         self._serializer = listSerializer
         self._name = name
         self._list = startingValue
+        self._dirtyIndices = set()
+        self._batchModifyDepth = 0
 
     def __repr__(self) -> str:
         return str(self)
@@ -507,15 +513,54 @@ class ObservedList(collections.abc.MutableSequence):
     def __str__(self):
         return f"ObservedList({str(self._list)})"
 
-    def _saveList(self) -> None:
+    @contextlib.contextmanager
+    def batchModify(self):
+        """
+        Context manager that defers writing to the parameter node until the end of the block.
+        All changed elements are then written at once, invoking a single Modified event.
+
+        Example::
+
+            with parameterNode.myList.batchModify() as myList:
+                for i in range(1000):
+                    myList.append(i)
+        """
+        self._batchModifyDepth += 1
         try:
-            self._serializer.write(self._parameterNode, self._name, self._list)
+            yield self
         finally:
-            # resetting the _list here helps if there are nested lists and someone does something like
-            #    m = parameterNode.listOfLists
-            #    m.append([1]) <-- this will seamlessly become an ObservedList so the next line works
-            #    m[0][0] = 2
+            self._batchModifyDepth -= 1
+            if self._batchModifyDepth == 0:
+                self._saveList()
+
+    def _saveList(self, dirtyIndices=()) -> None:
+        self._dirtyIndices.update(dirtyIndices)
+        if self._batchModifyDepth > 0:
+            return
+        indices = sorted(index for index in self._dirtyIndices if index < len(self._list))
+        self._dirtyIndices.clear()
+        try:
+            self._serializer.writeElements(self._parameterNode, self._name, self._list, indices)
+        except Exception:
+            # values were not written, restore all values from the parameter node
             self._list = self._serializer.read(self._parameterNode, self._name)._list
+            raise
+        # re-reading the written elements here helps if there are nested lists and someone does something like
+        #    m = parameterNode.listOfLists
+        #    m.append([1]) <-- this will seamlessly become an ObservedList so the next line works
+        #    m[0][0] = 2
+        for index in indices:
+            self._list[index] = self._serializer.readElement(self._parameterNode, self._name, index)
+
+    def _firstIndex(self, index) -> int:
+        """Non-negative index of the first element affected by an index (that may be negative or a slice)."""
+        if isinstance(index, slice):
+            indices = range(*index.indices(len(self._list)))
+            return min(indices) if indices else min(max(indices.start, 0), len(self._list))
+        return min(max(index if index >= 0 else index + len(self._list), 0), len(self._list))
+
+    def _indicesFrom(self, firstIndex):
+        return range(firstIndex, len(self._list))
 
     def __eq__(self, other) -> bool:
         if isinstance(other, ObservedList):
@@ -530,16 +575,23 @@ class ObservedList(collections.abc.MutableSequence):
         return self._list.__getitem__(index)
 
     def __delitem__(self, index):
+        firstIndex = self._firstIndex(index)
         self._list.__delitem__(index)
-        self._saveList()
+        self._saveList(self._indicesFrom(firstIndex))
 
     def __setitem__(self, index, item):
+        firstIndex = self._firstIndex(index)
         self._list.__setitem__(index, item)
-        self._saveList()
+        if isinstance(index, slice):
+            # slice assignment may change the length of the list
+            self._saveList(self._indicesFrom(firstIndex))
+        else:
+            self._saveList([firstIndex])
 
     def __iadd__(self, other):
+        oldLen = len(self._list)
         self._list.__iadd__(other)
-        self._saveList()
+        self._saveList(range(oldLen, len(self._list)))
         return self
 
     def __add__(self, other):
@@ -549,8 +601,9 @@ class ObservedList(collections.abc.MutableSequence):
         raise NotImplementedError("Adding an ObservedList is not supported. However, += is supported.")
 
     def __imul__(self, other):
+        oldLen = len(self._list)
         self._list.__imul__(other)
-        self._saveList()
+        self._saveList(range(oldLen, len(self._list)))
         return self
 
     def __mul__(self, other):
@@ -561,23 +614,27 @@ class ObservedList(collections.abc.MutableSequence):
 
     def append(self, item) -> None:
         self._list.append(item)
-        self._saveList()
+        self._saveList([len(self._list) - 1])
 
     def extend(self, other) -> None:
+        oldLen = len(self._list)
         self._list.extend(other)
-        self._saveList()
+        self._saveList(range(oldLen, len(self._list)))
 
     def insert(self, index, item) -> None:
+        firstIndex = self._firstIndex(index)
         self._list.insert(index, item)
-        self._saveList()
+        self._saveList(self._indicesFrom(firstIndex))
 
     def remove(self, item) -> None:
+        firstIndex = self._list.index(item)
         self._list.remove(item)
-        self._saveList()
+        self._saveList(self._indicesFrom(firstIndex))
 
     def pop(self, i=-1):
+        firstIndex = self._firstIndex(i)
         val = self._list.pop(i)
-        self._saveList()
+        self._saveList(self._indicesFrom(firstIndex))
         return val
 
     def clear(self) -> None:
@@ -586,11 +643,11 @@ class ObservedList(collections.abc.MutableSequence):
 
     def sort(self, *args, **kwargs) -> None:
         self._list.sort(*args, **kwargs)
-        self._saveList()
+        self._saveList(range(len(self._list)))
 
     def reverse(self) -> None:
         self._list.reverse()
-        self._saveList()
+        self._saveList(range(len(self._list)))
 
 
 @parameterNodeSerializer
@@ -666,6 +723,52 @@ class ListSerializer(Serializer):
                     self.write(parameterNode, name, oldValues)
                 raise
 
+    def writeElements(self, parameterNode, name: str, values, indices, length: int | None = None) -> None:
+        """
+        Writes the elements of values at the given indices and the length of the list.
+        Elements of the parameter node's list at other indices are assumed to be already up to date.
+        Elements beyond the length of the list are removed.
+
+        :param values: the list, or any object that returns the element at each of the given indices
+            (such as a dict that maps the index to the element).
+        :param length: length of the list, `len(values)` if not specified.
+        """
+
+        def paramName(index):
+            return self._paramName(name, index)
+
+        with slicer.util.NodeModify(parameterNode):
+            existed = self.isIn(parameterNode, name)
+            oldLen = self._len(parameterNode, name)
+            newLen = len(values) if length is None else length
+            oldValues = {index: self._elementSerializer.read(parameterNode, paramName(index))
+                         for index in indices if index < oldLen}
+            try:
+                for index in indices:
+                    self._elementSerializer.write(parameterNode, paramName(index), values[index])
+
+                if newLen != oldLen or not existed:
+                    self._setLen(parameterNode, name, newLen)
+                # unset any items that we no longer have indices for
+                for index in range(newLen, oldLen):
+                    self._elementSerializer.remove(parameterNode, paramName(index))
+            except Exception:
+                # reset our state back to what it was on exception
+                for index in indices:
+                    if index in oldValues:
+                        self._elementSerializer.write(parameterNode, paramName(index), oldValues[index])
+                    else:
+                        self._elementSerializer.remove(parameterNode, paramName(index))
+                if existed:
+                    self._setLen(parameterNode, name, oldLen)
+                else:
+                    self._lenSerializer.remove(parameterNode, self._lenName(name))
+                raise
+
+    def readElement(self, parameterNode, name: str, index: int):
+        """Reads a single element of the list."""
+        return self._elementSerializer.read(parameterNode, self._paramName(name, index))
+
     def read(self, parameterNode, name):
         def paramName(index):
             return self._paramName(name, index)
@@ -761,13 +864,34 @@ class TupleSerializer(Serializer):
 
 
 class ObservedDict(collections.abc.MutableMapping):
-    """A dict-like class that will write values to a parameter node on change."""
+    """
+    A dict-like class that will write values to a parameter node on change.
+
+    Only the items that have changed (and the number of items) are written to the parameter node.
+    Use :func:`batchModify` to make many changes with a single write and a single Modified event.
+    """
 
     def __init__(self, parameterNode, dictSerializer, name, startingValue):
         self._parameterNode = parameterNode
         self._serializer = dictSerializer
         self._name = name
-        self._dict = startingValue
+        self._setDict(startingValue)
+        self._dirtyIndices = set()
+        self._batchModifyDepth = 0
+
+    def _setDict(self, dictionary) -> None:
+        self._dict = dictionary
+        # Keys in insertion order and the index of each key, which is the index of the item in the parameter node
+        self._keys = list(dictionary)
+        self._keyIndices = {key: index for index, key in enumerate(self._keys)}
+
+    def _removeKey(self, key) -> int:
+        """Removes the key from the key index and returns its former index."""
+        index = self._keyIndices.pop(key)
+        del self._keys[index]
+        for shiftedIndex in range(index, len(self._keys)):
+            self._keyIndices[self._keys[shiftedIndex]] = shiftedIndex
+        return index
 
     def __repr__(self) -> str:
         return str(self)
@@ -775,11 +899,36 @@ class ObservedDict(collections.abc.MutableMapping):
     def __str__(self) -> str:
         return f"ObservedDict({str(self._dict)})"
 
-    def _saveDict(self) -> None:
+    @contextlib.contextmanager
+    def batchModify(self):
+        """
+        Context manager that defers writing to the parameter node until the end of the block.
+        All changed items are then written at once, invoking a single Modified event.
+        """
+        self._batchModifyDepth += 1
         try:
-            self._serializer.write(self._parameterNode, self._name, self._dict)
+            yield self
         finally:
-            self._dict = self._serializer.read(self._parameterNode, self._name)
+            self._batchModifyDepth -= 1
+            if self._batchModifyDepth == 0:
+                self._saveDict()
+
+    def _saveDict(self, dirtyIndices=()) -> None:
+        self._dirtyIndices.update(dirtyIndices)
+        if self._batchModifyDepth > 0:
+            return
+        items = {index: (self._keys[index], self._dict[self._keys[index]])
+                 for index in self._dirtyIndices if index < len(self._keys)}
+        self._dirtyIndices.clear()
+        try:
+            self._serializer.writeElements(self._parameterNode, self._name, items, len(self._keys))
+        except Exception:
+            # values were not written, restore all values from the parameter node
+            self._setDict(self._serializer.read(self._parameterNode, self._name)._dict)
+            raise
+        for index in items:
+            key, value = self._serializer.readElement(self._parameterNode, self._name, index)
+            self._dict[key] = value
 
     def __eq__(self, other) -> bool:
         if isinstance(other, ObservedDict):
@@ -798,11 +947,17 @@ class ObservedDict(collections.abc.MutableMapping):
 
     def __delitem__(self, key):
         del self._dict[key]
-        self._saveDict()
+        index = self._removeKey(key)
+        self._saveDict(range(index, len(self._keys)))
 
     def __setitem__(self, key, value):
+        index = self._keyIndices.get(key)
+        if index is None:
+            index = len(self._keys)
+            self._keys.append(key)
+            self._keyIndices[key] = index
         self._dict[key] = value
-        self._saveDict()
+        self._saveDict([index])
 
     def __contains__(self, key):
         return key in self._dict
@@ -824,16 +979,21 @@ class ObservedDict(collections.abc.MutableMapping):
 
     def pop(self, key):
         ret = self._dict.pop(key)
-        self._saveDict()
+        index = self._removeKey(key)
+        self._saveDict(range(index, len(self._keys)))
         return ret
 
     def popitem(self):
         ret = self._dict.popitem()
+        # the last inserted item is removed
+        del self._keyIndices[self._keys.pop()]
         self._saveDict()
         return ret
 
     def clear(self):
         self._dict.clear()
+        self._keys.clear()
+        self._keyIndices.clear()
         self._saveDict()
 
 
@@ -875,6 +1035,20 @@ class DictSerializer(Serializer):
     def write(self, parameterNode, name: str, dictionary) -> None:
         self._serializer.write(parameterNode, name, dictionary.items())
 
+    def writeElements(self, parameterNode, name: str, items, length: int) -> None:
+        """
+        Writes the changed items of the dictionary and the number of items.
+        Items of the parameter node's dictionary at other indices are assumed to be already up to date.
+
+        :param items: dict that maps the (insertion order) index of each changed item to its (key, value) tuple.
+        :param length: number of items in the dictionary.
+        """
+        self._serializer.writeElements(parameterNode, name, items, sorted(items), length)
+
+    def readElement(self, parameterNode, name: str, index: int):
+        """Reads a single (key, value) item of the dictionary."""
+        return self._serializer.readElement(parameterNode, name, index)
+
     def read(self, parameterNode, name: str):
         tuples = self._serializer.read(parameterNode, name)
         return ObservedDict(parameterNode, self, name, dict(tuples))
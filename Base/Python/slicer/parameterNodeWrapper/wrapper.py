@@ -80,25 +80,25 @@ class _ParameterWrapper:
     def supportsCaching(self) -> bool:
         return self.parameter.supportsCaching()
 
+    def invalidate(self) -> None:
+        """Non-cached parameters are always read from the parameter node, so there is nothing to invalidate."""
+        pass
+
 
 class _CachedParameterWrapper(_ParameterWrapper):
     def __init__(self, parameter: _Parameter, parameterNode):
         super().__init__(parameter, parameterNode)
         self._value = self.parameter.read(self.parameterNode)
-        # Important: We don't want to increase the reference to self here by including it in the AddObserver callback.
-        # This would prevent the object from being garbage collected, and the observers from being removed when the object goes out of scope.
-        # Instead, we create a weakref to self and use it in a lambda function.
-        _selfWeakRef = weakref.ref(self)
-        self._observerTag: int = parameterNode.AddObserver(vtk.vtkCommand.ModifiedEvent,
-                                                           lambda caller, event: _selfWeakRef()._onModified(caller, event))
+        self._valid: bool = True
         self._currentlyWriting: bool = False
 
-    def __del__(self):
-        self.parameterNode.RemoveObserver(self._observerTag)
-
-    def _onModified(self, caller, event):
+    def invalidate(self) -> None:
+        """
+        Marks the cached value as outdated, it is read from the parameter node on next access.
+        Called by the parameter node observer when the serialized value of this parameter changed.
+        """
         if not self._currentlyWriting:
-            self._value = self.parameter.read(self.parameterNode)
+            self._valid = False
 
     def write(self, value) -> None:
         self._currentlyWriting = True
@@ -109,6 +109,7 @@ class _CachedParameterWrapper(_ParameterWrapper):
             with slicer.util.NodeModify(self.parameterNode):
                 super().write(value)
                 self._value = self.parameter.read(self.parameterNode)
+                self._valid = True
         finally:
             self._currentlyWriting = False
 
@@ -117,9 +118,100 @@ class _CachedParameterWrapper(_ParameterWrapper):
         Gets the value of this parameter in the given parameter node.
         Caches the value for efficiency.
         """
+        if not self._valid:
+            self._value = self.parameter.read(self.parameterNode)
+            self._valid = True
         return self._value
 
 
+class _ParameterNodeObserver:
+    """
+    Observes modifications of the parameter node on behalf of a parameterNodeWrapper instance.
+
+    A single observer is shared by all cached parameters and connected GUIs of the wrapper.
+    The serialized values and node references of the wrapper's parameters are cached by name,
+    so that on each modification only the parameters whose stored data actually changed are reported as dirty.
+    Parameters of the node that do not belong to the wrapper are neither read nor stored.
+    """
+
+    def __init__(self, wrapper, parameterNode, prefix: str | None = None):
+        self.parameterNode = parameterNode
+        self._prefix: str = prefix or ""
+        self._basenames: set[str] = {parameterInfo.basename for parameterInfo in wrapper.allParameters.values()}
+        # Serialized parameter values and node reference IDs of the wrapper's parameters,
+        # keyed by parameter name and reference role, respectively
+        self._parameterValues: dict[str, str] = {}
+        self._nodeReferenceIDs: dict[str, tuple[str, ...]] = {}
+        self.dirtyParameters()
+        # Important: We don't want to increase the reference to the wrapper or self here by including it in the AddObserver callback.
+        # This would prevent the objects from being garbage collected, and the observer from being removed when they go out of scope.
+        # Instead, we create weakrefs and use them in a lambda function.
+        wrapperWeakRef = weakref.ref(wrapper)
+        selfWeakRef = weakref.ref(self)
+        self._observerTag: int = parameterNode.AddObserver(
+            vtk.vtkCommand.ModifiedEvent,
+            lambda caller, event: _ParameterNodeObserver._onModified(selfWeakRef(), wrapperWeakRef()))
+
+    def __del__(self):
+        self.parameterNode.RemoveObserver(self._observerTag)
+
+    def _basename(self, name: str) -> str | None:
+        """Returns the basename of the wrapper's parameter that stores data under the given name, if any."""
+        if not name.startswith(self._prefix):
+            return None
+        # Serializers of composite types store their elements as "<name>.<something>"
+        basename = name[len(self._prefix):].split(".", 1)[0]
+        return basename if basename in self._basenames else None
+
+    def dirtyParameters(self) -> set[str]:
+        """
+        Returns the basenames of the parameters whose serialized values or node references
+        changed since the last call, and updates the cached values of those parameters.
+        """
+        dirty = set()
+
+        parameterNames = set()
+        for name in self.parameterNode.GetParameterNames():
+            basename = self._basename(name)
+            if basename is None:
+                continue
+            parameterNames.add(name)
+            value = self.parameterNode.GetParameter(name)
+            if self._parameterValues.get(name) != value:
+                self._parameterValues[name] = value
+                dirty.add(basename)
+
+        roles = set()
+        for roleIndex in range(self.parameterNode.GetNumberOfNodeReferenceRoles()):
+            role = self.parameterNode.GetNthNodeReferenceRole(roleIndex)
+            basename = self._basename(role)
+            if basename is None:
+                continue
+            roles.add(role)
+            referenceIDs = tuple(self.parameterNode.GetNthNodeReferenceID(role, referenceIndex)
+                                 for referenceIndex in range(self.parameterNode.GetNumberOfNodeReferences(role)))
+            if self._nodeReferenceIDs.get(role) != referenceIDs:
+                self._nodeReferenceIDs[role] = referenceIDs
+                dirty.add(basename)
+
+        # Removed parameters and reference roles
+        for cachedValues, currentNames in ((self._parameterValues, parameterNames), (self._nodeReferenceIDs, roles)):
+            if len(cachedValues) != len(currentNames):
+                for name in cachedValues.keys() - currentNames:
+                    del cachedValues[name]
+                    dirty.add(self._basename(name))
+
+        return dirty
+
+    @staticmethod
+    def _onModified(observer, wrapper):
+        if observer is None or wrapper is None:
+            return
+        dirty = observer.dirtyParameters()
+        if dirty:
+            _onParametersModified(wrapper, dirty)
+
+
 def _makeProperty(name: str):
     return property(
         lambda self: getattr(self, f"_{name}_impl").read(),
@@ -142,6 +234,8 @@ def _initMethod(self, parameterNode, prefix: str | None = None):
         else:
             setattr(self, f"_{parameterInfo.basename}_impl", _ParameterWrapper(parameter, parameterNode))
 
+    self._parameterNodeObserver = _ParameterNodeObserver(self, parameterNode, prefix)
+
 
 def _checkParamName(paramNodeWrapInstanceOrClass, paramName: str):
     topname, subname = splitPossiblyDottedName(paramName)
@@ -178,7 +272,17 @@ def _makeGuiToParamCallback(self, paramName, connector):
     return callback
 
 
-def _updateGUIFromParameterNode(self):
+def _onParametersModified(self, dirtyParameters: set[str]):
+    for basename in dirtyParameters:
+        getattr(self, f"_{basename}_impl").invalidate()
+    _updateGUIFromParameterNode(self, dirtyParameters)
+
+
+def _updateGUIFromParameterNode(self, dirtyParameters: set[str] | None = None):
+    """
+    Writes parameter values to the connected widgets.
+    If dirtyParameters is specified then only widgets of those (top level) parameters are updated.
+    """
     if self._updatingGUIFromParameterNode:
         return
     try:
@@ -186,7 +290,8 @@ def _updateGUIFromParameterNode(self):
         with slicer.util.NodeModify(self):
             for guiMapping in self._parameterGUIs.values():
                 for paramName, connector in guiMapping.items():
-                    connector.write(self.getValue(paramName))
+                    if dirtyParameters is None or splitPossiblyDottedName(paramName)[0] in dirtyParameters:
+                        connector.write(self.getValue(paramName))
     finally:
         self._updatingGUIFromParameterNode = False
 
@@ -209,7 +314,7 @@ def _connectParametersToGui(self, mapping):
         connector.write(self.getValue(paramName))
         connector.onChanged(_makeGuiToParamCallback(self, paramName, connector))
 
-    self.AddObserver(vtk.vtkCommand.ModifiedEvent, lambda caller, event: _updateGUIFromParameterNode(self))
+    # GUI is updated from the parameter node observer that is added in the constructor
     return tag
 
 
@@ -0,0 +1,322 @@
+"""Indexed queries over the subject hierarchy.
+
+Finding subject hierarchy items by UID, attribute, or level with :class:`vtkMRMLSubjectHierarchyNode`
+methods requires walking the whole hierarchy, which becomes slow when it is done repeatedly
+(for example for each loaded DICOM series) on scenes with thousands of items.
+
+:class:`SubjectHierarchyIndex` keeps lookup tables of item UIDs and attributes, which are kept
+up-to-date by observing item added, removed, and modified events of the subject hierarchy node::
+
+    import slicer.subjecthierarchy
+
+    shIndex = slicer.subjecthierarchy.getSubjectHierarchyIndex()
+    studyItemID = shIndex.itemByUID(slicer.vtkMRMLSubjectHierarchyConstants.GetDICOMUIDName(), studyInstanceUID)
+    for itemIDs in shIndex.iterSubtree(studyItemID, level="Series"):
+        print(itemIDs)
+
+Events are only recorded when they are received and lookup tables are updated when the next query is made,
+therefore the index adds negligible overhead to subject hierarchy changes. If the subject hierarchy is modified
+in a batch (events are compressed) or the scene is closed or imported then the index is rebuilt at the next query.
+"""
+
+import vtk
+
+import slicer
+from slicer.util import VTKObservationMixin
+
+
+class SubjectHierarchyIndex(VTKObservationMixin):
+    """Lookup tables for finding subject hierarchy items by UID, attribute, or level.
+
+    Query results are sorted lists of item IDs. Lookup tables are updated incrementally
+    from subject hierarchy item events, so queries do not need to walk the hierarchy.
+    Call :py:meth:`cleanup` when the index is no longer needed to remove the observers.
+    """
+
+    def __init__(self, scene=None):
+        VTKObservationMixin.__init__(self)
+        self.scene = scene if scene is not None else slicer.mrmlScene
+        self.shNode = None
+
+        # Item ID -> (UIDs dictionary, attributes dictionary)
+        self._items = {}
+        # (UID name, UID value) -> set of item IDs
+        self._uidIndex = {}
+        # UID name -> {UID list entry -> set of item IDs}, created on first use for each UID name
+        self._uidListIndex = {}
+        # Attribute name -> {attribute value -> set of item IDs}
+        self._attributeIndex = {}
+
+        # Items that are added or modified since the last query
+        self._pendingItemIDs = set()
+        # If True, then the index is rebuilt at the next query
+        self._invalid = True
+        # Number of times the index was rebuilt from the whole hierarchy (for testing and profiling)
+        self.rebuildCount = 0
+
+        for event in [slicer.vtkMRMLScene.EndCloseEvent, slicer.vtkMRMLScene.EndImportEvent, slicer.vtkMRMLScene.EndRestoreEvent]:
+            self.addObserver(self.scene, event, self.onSceneUpdated)
+
+    def cleanup(self):
+        """Remove all observers and lookup tables."""
+        self.removeObservers()
+        self.shNode = None
+        self.invalidate()
+
+    def invalidate(self):
+        """Discard all lookup tables, they are rebuilt at the next query."""
+        self._invalid = True
+        self._items.clear()
+        self._uidIndex.clear()
+        self._uidListIndex.clear()
+        self._attributeIndex.clear()
+        self._pendingItemIDs.clear()
+
+    #
+    # Queries
+    #
+
+    def items(self):
+        """Return IDs of all items in the hierarchy (except the scene item)."""
+        self._update()
+        return sorted(self._items)
+
+    def itemUIDs(self, itemID):
+        """Return UIDs of an item as a dictionary (UID name -> UID value)."""
+        self._update()
+        return dict(self._items[itemID][0]) if itemID in self._items else {}
+
+    def itemAttributes(self, itemID):
+        """Return attributes of an item as a dictionary (attribute name -> attribute value)."""
+        self._update()
+        return dict(self._items[itemID][1]) if itemID in self._items else {}
+
+    def itemsByUID(self, uidName, uidValue):
+        """Return IDs of items that have the UID value (exact match)."""
+        self._update()
+        return sorted(self._uidIndex.get((uidName, uidValue), ()))
+
+    def itemByUID(self, uidName, uidValue):
+        """Return ID of the first item that has the UID value (exact match).
+
+        Same as :py:meth:`vtkMRMLSubjectHierarchyNode.GetItemByUID`, returns invalid item ID if not found.
+        """
+        itemIDs = self.itemsByUID(uidName, uidValue)
+        return itemIDs[0] if itemIDs else slicer.vtkMRMLSubjectHierarchyNode.GetInvalidItemID()
+
+    def itemsByUIDListEntry(self, uidName, uidValue):
+        """Return IDs of items that have the UID value in their space-separated UID list.
+
+        This is the indexed version of :py:meth:`vtkMRMLSubjectHierarchyNode.GetItemByUIDList`,
+        for example for finding the series item that contains a DICOM instance UID.
+        """
+        self._update()
+        uidListIndex = self._uidListIndex.get(uidName)
+        if uidListIndex is None:
+            uidListIndex = {}
+            for itemID, (uids, _) in self._items.items():
+                for entry in uids.get(uidName, "").split():
+                    uidListIndex.setdefault(entry, set()).add(itemID)
+            self._uidListIndex[uidName] = uidListIndex
+        return sorted(uidListIndex.get(uidValue, ()))
+
+    def itemsByAttribute(self, attributeName, attributeValue=None):
+        """Return IDs of items that have the attribute.
+
+        :param attributeValue: if specified then only items with this attribute value are returned.
+        """
+        self._update()
+        valueIndex = self._attributeIndex.get(attributeName, {})
+        if attributeValue is not None:
+            return sorted(valueIndex.get(attributeValue, ()))
+        return sorted(set().union(*valueIndex.values()))
+
+    def itemsByLevel(self, level):
+        """Return IDs of items of a hierarchy level (such as ``Patient``, ``Study``, or ``Folder``)."""
+        levelAttributeName = slicer.vtkMRMLSubjectHierarchyConstants.GetSubjectHierarchyLevelAttributeName()
+        return self.itemsByAttribute(levelAttributeName, level)
+
+    def iterSubtree(self, parentItemID=None, recursive=True, batchSize=1000, level=None, attributes=None):
+        """Iterate through items under a parent item, in batches.
+
+        All child items are retrieved with a single :py:meth:`vtkMRMLSubjectHierarchyNode.GetItemChildren` call
+        and filtering is done using the lookup tables, so no per-item subject hierarchy calls are made.
+
+        :param parentItemID: ID of the parent item. If None then the scene item is used (all items are iterated).
+        :param recursive: if True then all descendants of the parent item are included, otherwise only direct children.
+        :param batchSize: maximum number of item IDs in each yielded list.
+        :param level: only include items of this hierarchy level.
+        :param attributes: only include items that have all these attributes (dictionary of attribute name -> value;
+          value of None matches any value).
+        :return: iterator of lists of item IDs, in the depth-first order of the hierarchy.
+        """
+        if batchSize < 1:
+            raise ValueError("batchSize must be positive")
+        self._update()
+        shNode = self.shNode
+        if parentItemID is None:
+            parentItemID = shNode.GetSceneItemID()
+        childItemIDs = vtk.vtkIdList()
+        shNode.GetItemChildren(parentItemID, childItemIDs, recursive)
+        itemIDs = [childItemIDs.GetId(index) for index in range(childItemIDs.GetNumberOfIds())]
+
+        filters = dict(attributes) if attributes else {}
+        if level is not None:
+            filters[slicer.vtkMRMLSubjectHierarchyConstants.GetSubjectHierarchyLevelAttributeName()] = level
+        if filters:
+            matchingItemIDs = None
+            for attributeName, attributeValue in filters.items():
+                valueIndex = self._attributeIndex.get(attributeName, {})
+                if attributeValue is None:
+                    attributeItemIDs = set().union(*valueIndex.values())
+                else:
+                    attributeItemIDs = valueIndex.get(attributeValue, set())
+                matchingItemIDs = attributeItemIDs if matchingItemIDs is None else matchingItemIDs & attributeItemIDs
+            itemIDs = [itemID for itemID in itemIDs if itemID in matchingItemIDs]
+
+        for startIndex in range(0, len(itemIDs), batchSize):
+            yield itemIDs[startIndex:startIndex + batchSize]
+
+    def __len__(self):
+        self._update()
+        return len(self._items)
+
+    def __contains__(self, itemID):
+        self._update()
+        return itemID in self._items
+
+    #
+    # Index maintenance
+    #
+
+    def _update(self):
+        """Bring lookup tables up-to-date before a query."""
+        if self._invalid:
+            self._rebuild()
+        elif self._pendingItemIDs:
+            pendingItemIDs = self._pendingItemIDs
+            self._pendingItemIDs = set()
+            for itemID in pendingItemIDs:
+                self._unindexItem(itemID)
+                self._indexItem(itemID)
+
+    def _rebuild(self):
+        self.invalidate()
+        self._setSubjectHierarchyNode(self.scene.GetSubjectHierarchyNode())
+        if self.shNode is None:
+            raise RuntimeError("Subject hierarchy is not available in the scene")
+        allItemIDs = vtk.vtkIdList()
+        self.shNode.GetItemChildren(self.shNode.GetSceneItemID(), allItemIDs, True)
+        for index in range(allItemIDs.GetNumberOfIds()):
+            self._indexItem(allItemIDs.GetId(index))
+        self._invalid = False
+        self.rebuildCount += 1
+
+    def _setSubjectHierarchyNode(self, shNode):
+        if shNode is self.shNode:
+            return
+        if self.shNode is not None:
+            self.removeObservers(self.onItemChanged)
+            self.removeObservers(self.onItemRemoved)
+            self.removeObservers(self.onResolve)
+        self.shNode = shNode
+        if shNode is None:
+            return
+        for event in [shNode.SubjectHierarchyItemAddedEvent, shNode.SubjectHierarchyItemModifiedEvent, shNode.SubjectHierarchyItemUIDAddedEvent]:
+            self.addObserver(shNode, event, self.onItemChanged)
+        self.addObserver(shNode, shNode.SubjectHierarchyItemRemovedEvent, self.onItemRemoved)
+        for event in [shNode.SubjectHierarchyStartResolveEvent, shNode.SubjectHierarchyEndResolveEvent]:
+            self.addObserver(shNode, event, self.onResolve)
+
+    def _indexItem(self, itemID):
+        shNode = self.shNode
+        if itemID == shNode.GetSceneItemID():
+            return
+        uids = {uidName: shNode.GetItemUID(itemID, uidName) for uidName in shNode.GetItemUIDNames(itemID)}
+        attributes = {name: shNode.GetItemAttribute(itemID, name) for name in shNode.GetItemAttributeNames(itemID)}
+        self._items[itemID] = (uids, attributes)
+        for uidName, uidValue in uids.items():
+            self._uidIndex.setdefault((uidName, uidValue), set()).add(itemID)
+            uidListIndex = self._uidListIndex.get(uidName)
+            if uidListIndex is not None:
+                for entry in uidValue.split():
+                    uidListIndex.setdefault(entry, set()).add(itemID)
+        for attributeName, attributeValue in attributes.items():
+            self._attributeIndex.setdefault(attributeName, {}).setdefault(attributeValue, set()).add(itemID)
+
+    def _unindexItem(self, itemID):
+        record = self._items.pop(itemID, None)
+        if record is None:
+            return
+        uids, attributes = record
+        for uidName, uidValue in uids.items():
+            self._discard(self._uidIndex, (uidName, uidValue), itemID)
+            uidListIndex = self._uidListIndex.get(uidName)
+            if uidListIndex is not None:
+                for entry in uidValue.split():
+                    self._discard(uidListIndex, entry, itemID)
+        for attributeName, attributeValue in attributes.items():
+            valueIndex = self._attributeIndex[attributeName]
+            self._discard(valueIndex, attributeValue, itemID)
+            if not valueIndex:
+                del self._attributeIndex[attributeName]
+
+    @staticmethod
+    def _discard(index, key, itemID):
+        itemIDs = index.get(key)
+        if itemIDs is None:
+            return
+        itemIDs.discard(itemID)
+        if not itemIDs:
+            del index[key]
+
+    #
+    # Event handlers
+    #
+
+    @vtk.calldata_type(vtk.VTK_LONG)
+    def onItemChanged(self, caller, event, itemID):
+        if self._invalid:
+            return
+        if itemID is None:
+            # Events were compressed (invoked without item ID)
+            self.invalidate()
+            return
+        self._pendingItemIDs.add(itemID)
+
+    @vtk.calldata_type(vtk.VTK_LONG)
+    def onItemRemoved(self, caller, event, itemID):
+        if self._invalid:
+            return
+        if itemID is None:
+            self.invalidate()
+            return
+        self._pendingItemIDs.discard(itemID)
+        self._unindexItem(itemID)
+
+    def onResolve(self, caller, event):
+        # Items are created and modified in bulk while the hierarchy is resolved
+        self.invalidate()
+
+    def onSceneUpdated(self, caller, event):
+        self.invalidate()
+
+
+_subjectHierarchyIndices = {}
+
+
+def getSubjectHierarchyIndex(scene=None):
+    """Return the shared :class:`SubjectHierarchyIndex` of a scene.
+
+    The index is created at the first call and then kept up-to-date, so repeated
+    queries from different modules share the same lookup tables.
+
+    :param scene: MRML scene. If None then ``slicer.mrmlScene`` is used.
+    """
+    if scene is None:
+        scene = slicer.mrmlScene
+    shIndex = _subjectHierarchyIndices.get(scene)
+    if shIndex is None:
+        shIndex = SubjectHierarchyIndex(scene)
+        _subjectHierarchyIndices[scene] = shIndex
+    return shIndex
@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+
+import slicer.benchmark
+from slicer.benchmark import Benchmark, BenchmarkRegistry, BenchmarkResult
+
+
+class SlicerBenchmarkTests(unittest.TestCase):
+
+    def test_percentile(self):
+        self.assertEqual(slicer.benchmark.percentile([3, 1, 2], 0), 1)
+        self.assertEqual(slicer.benchmark.percentile([3, 1, 2], 50), 2)
+        self.assertEqual(slicer.benchmark.percentile([3, 1, 2], 100), 3)
+        self.assertAlmostEqual(slicer.benchmark.percentile([1, 2, 3, 4], 90), 3.7)
+        with self.assertRaises(ValueError):
+            slicer.benchmark.percentile([], 50)
+
+    def test_result_statistics(self):
+        result = BenchmarkResult("test", [0.4, 0.1, 0.3, 0.2])
+        self.assertAlmostEqual(result.mean, 0.25)
+        self.assertAlmostEqual(result.median, 0.25)
+        self.assertEqual(result.statistic("min"), 0.1)
+        self.assertEqual(result.statistic("max"), 0.4)
+        self.assertAlmostEqual(result.statistic("p50"), 0.25)
+        with self.assertRaises(ValueError):
+            result.statistic("unknown")
+
+    def test_run(self):
+        calls = []
+
+        def setup():
+            calls.append("setup")
+            return "context"
+
+        def function(context):
+            self.assertEqual(context, "context")
+            calls.append("run")
+
+        def teardown(context):
+            calls.append("teardown")
+
+        result = Benchmark("test", function, setup=setup, teardown=teardown, warmup=2, repeat=3).run()
+        self.assertEqual(calls, ["setup"] + ["run"] * 5 + ["teardown"])
+        self.assertEqual(len(result.durations), 3)
+
+        # Returned value is used as measured duration
+        result = Benchmark("reported", lambda: 2.5, warmup=0, measuresOwnDuration=True).run(repeat=2)
+        self.assertEqual(result.durations, [2.5, 2.5])
+        with self.assertRaises(TypeError):
+            Benchmark("reportedBool", lambda: True, warmup=0, measuresOwnDuration=True).run(repeat=1)
+
+        # Returned value is ignored by default
+        for returnValue in [True, False, object(), 2.5]:
+            result = Benchmark("notReported", lambda returnValue=returnValue: returnValue, warmup=0).run(repeat=2)
+            self.assertEqual(len(result.durations), 2)
+            for duration in result.durations:
+                self.assertIsInstance(duration, float)
+                self.assertLess(duration, 1.0)
+
+    def test_teardown_on_error(self):
+        calls = []
+
+        def function(context):
+            raise RuntimeError("failed")
+
+        benchmark = Benchmark("failing", function, setup=lambda: None, teardown=lambda context: calls.append("teardown"))
+        with self.assertRaises(RuntimeError):
+            benchmark.run()
+        self.assertEqual(calls, ["teardown"])
+
+    def test_registry(self):
+        registry = BenchmarkRegistry()
+
+        @registry.register(tags=["scene", "headless"], warmup=0, repeat=2)
+        def loadScene():
+            pass
+
+        registry.add(Benchmark("render", lambda: None, tags=["rendering"]))
+        with self.assertRaises(ValueError):
+            registry.add(Benchmark("render", lambda: None))
+
+        self.assertEqual([benchmark.name for benchmark in registry.benchmarks()], ["loadScene", "render"])
+        self.assertEqual([benchmark.name for benchmark in registry.benchmarks(tags=["headless"])], ["loadScene"])
+        self.assertEqual([benchmark.name for benchmark in registry.benchmarks(pattern="ren*")], ["render"])
+
+        results = registry.run(tags=["scene"])
+        self.assertEqual(len(results), 1)
+        self.assertEqual(len(results[0].durations), 2)
+
+    def test_save_load_compare(self):
+        results = [
+            BenchmarkResult("fast", [1.0, 1.0, 1.0], peakMemory=1000, tags=["a"], properties={"size": 10}),
+            BenchmarkResult("slow", [2.0, 2.0, 2.0]),
+        ]
+        with tempfile.TemporaryDirectory() as tempDirectory:
+            path = os.path.join(tempDirectory, "results.json")
+            slicer.benchmark.saveResults(results, path, metadata={"build": "Release"})
+            loadedResults = slicer.benchmark.loadResults(path)
+        self.assertEqual([result.name for result in loadedResults], ["fast", "slow"])
+        self.assertEqual(loadedResults[0].durations, [1.0, 1.0, 1.0])
+        self.assertEqual(loadedResults[0].peakMemory, 1000)
+        self.assertEqual(loadedResults[0].properties, {"size": 10})
+
+        currentResults = [
+            BenchmarkResult("fast", [1.05, 1.05, 1.05]),
+            BenchmarkResult("slow", [2.5, 2.5, 2.5]),
+            BenchmarkResult("new", [1.0]),
+        ]
+        comparisons = {comparison.name: comparison for comparison in slicer.benchmark.compareResults(currentResults, loadedResults, threshold=0.1)}
+        self.assertFalse(comparisons["fast"].regression)
+        self.assertTrue(comparisons["slow"].regression)
+        self.assertAlmostEqual(comparisons["slow"].relativeChange, 0.25)
+        self.assertFalse(comparisons["new"].regression)
+        self.assertIsNone(comparisons["new"].baselineValue)
+        self.assertIn("1 regression(s)", slicer.benchmark.formatComparisons(list(comparisons.values())))
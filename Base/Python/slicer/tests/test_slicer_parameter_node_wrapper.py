@@ -751,6 +751,34 @@ class TypedParameterNodeTest(unittest.TestCase):
         self.assertEqual(param.a[1], ["c"])
         self.assertEqual(list(param.a.items()), [(0, ["a", "b", "q", "r"]), (1, ["c"])])
 
+    def test_dict_changed_items(self):
+        @parameterNodeWrapper
+        class ParameterNodeType:
+            d: dict[str, int]
+
+        param = ParameterNodeType(newParameterNode())
+        d = param.d
+        for i in range(5):
+            d[str(i)] = i
+
+        # only the changed item is written
+        param.parameterNode.SetParameter("d.1.1", "-1")
+        d["3"] = 30
+        self.assertEqual(param.parameterNode.GetParameter("d.1.1"), "-1")
+        self.assertEqual(param.parameterNode.GetParameter("d.3.1"), "30")
+
+        # insertion order is kept when items are removed, replaced, and added
+        del d["1"]
+        d["0"] = 10
+        d["5"] = 5
+        self.assertEqual(2, d.pop("2"))
+        self.assertEqual(("5", 5), d.popitem())
+        d["6"] = 6
+        self.assertEqual(list(d.items()), [("0", 10), ("3", 30), ("4", 4), ("6", 6)])
+        self.assertEqual(list(param.d.items()), [("0", 10), ("3", 30), ("4", 4), ("6", 6)])
+        self.assertEqual(param.parameterNode.GetParameter("d.len"), "4")
+        self.assertFalse(param.parameterNode.HasParameter("d.4.0"))
+
     def test_node(self):
         @parameterNodeWrapper
         class ParameterNodeType:
@@ -1031,6 +1059,60 @@ class TypedParameterNodeTest(unittest.TestCase):
         param.i = 7
         self.assertEqual(6, callback.called)
 
+    def test_list_batch_modify(self):
+        class _Callback:
+            def __init__(self):
+                self.called = 0
+
+            def call(self, caller, event):
+                self.called += 1
+
+        callback = _Callback()
+
+        @parameterNodeWrapper
+        class ParameterNodeType:
+            p: list[int]
+            d: dict[str, int]
+
+        param = ParameterNodeType(newParameterNode())
+        tag = param.AddObserver(vtk.vtkCommand.ModifiedEvent, callback.call)
+
+        with param.p.batchModify() as p:
+            for i in range(100):
+                p.append(i)
+            p[0] = 100
+            del p[1]
+        self.assertEqual(1, callback.called)
+        self.assertEqual(param.p, [100] + list(range(2, 100)))
+        self.assertEqual(param.parameterNode.GetParameter("p.len"), "99")
+        self.assertFalse(param.parameterNode.HasParameter("p.99"))
+
+        with param.d.batchModify() as d:
+            for i in range(10):
+                d[str(i)] = i
+            del d["0"]
+        self.assertEqual(2, callback.called)
+        self.assertEqual(list(param.d.items()), [(str(i), i) for i in range(1, 10)])
+
+        # only the changed element is written
+        p = param.p
+        param.parameterNode.SetParameter("p.5", "-5")
+        p[6] = 6
+        self.assertEqual(param.parameterNode.GetParameter("p.5"), "-5")
+
+        # invalid values are not written
+        with self.assertRaises(TypeError):
+            with param.p.batchModify() as p:
+                p.append(1)
+                p.append("invalid")
+        self.assertEqual(len(param.p), 99)
+
+        param2 = ParameterNodeType(param.parameterNode)
+        self.assertEqual(param2.p, param.p)
+        self.assertEqual(param2.d, param.d)
+
+        param.RemoveObserver(tag)
+
     def test_validators(self):
         @parameterNodeWrapper
         class ParameterNodeType:
@@ -1134,6 +1216,101 @@ class TypedParameterNodeTest(unittest.TestCase):
         self.assertEqual(param2.x, 7)
         self.assertEqual(param2.y, [8, 99])
 
+    def test_dirty_parameters(self):
+        @parameterNodeWrapper
+        class ParameterNodeType:
+            x: int
+            y: list[int]
+            model: vtkMRMLModelNode
+
+        parameterNode = newParameterNode()
+        param = ParameterNodeType(parameterNode)
+        self.assertEqual(param.x, 0)
+        self.assertEqual(param.y, [])
+
+        # Only the parameter that was changed in the parameter node is read again
+        parameterNode.SetParameter("x", "5")
+        self.assertFalse(param._x_impl._valid)
+        self.assertTrue(param._y_impl._valid)
+        self.assertTrue(param._model_impl._valid)
+        self.assertEqual(param.x, 5)
+
+        param.y.append(2)
+        self.assertTrue(param._x_impl._valid)
+        self.assertEqual(param.y, [2])
+
+        model = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLModelNode")
+        parameterNode.SetNodeReferenceID("model", model.GetID())
+        self.assertTrue(param._x_impl._valid)
+        self.assertFalse(param._model_impl._valid)
+        self.assertIs(param.model, model)
+
+        slicer.mrmlScene.RemoveNode(model)
+        self.assertIsNone(param.model)
+
+        # Modified event without any change does not invalidate anything
+        parameterNode.Modified()
+        self.assertTrue(param._x_impl._valid)
+        self.assertTrue(param._y_impl._valid)
+        self.assertTrue(param._model_impl._valid)
+
+    def test_dirty_parameters_gui(self):
+        import qt
+
+        @parameterNodeWrapper
+        class ParameterNodeType:
+            x: int
+            s: str
+            y: list[int]
+
+        parameterNode = newParameterNode()
+        param = ParameterNodeType(parameterNode)
+
+        # Record the values that are written to each widget
+        xSpinBox = qt.QSpinBox()
+        sLineEdit = qt.QLineEdit()
+        connectors = {"x": createGuiConnector(xSpinBox, int), "s": createGuiConnector(sLineEdit, str)}
+        writtenValues = {"x": [], "s": []}
+        for name, connector in connectors.items():
+            def recordingWrite(value, name=name, write=connector.write):
+                writtenValues[name].append(value)
+                write(value)
+            connector.write = recordingWrite
+        param.connectParametersToGui(connectors)
+        self.assertEqual(writtenValues, {"x": [0], "s": [""]})
+
+        def takeWrittenValues():
+            values = {name: list(values) for name, values in writtenValues.items()}
+            for values in writtenValues.values():
+                values.clear()
+            return values
+
+        takeWrittenValues()
+        param.x = 4
+        self.assertEqual(takeWrittenValues(), {"x": [4], "s": []})
+        self.assertEqual(xSpinBox.value, 4)
+
+        parameterNode.SetParameter("s", "abc")
+        self.assertEqual(takeWrittenValues(), {"x": [], "s": ["abc"]})
+        self.assertEqual(sLineEdit.text, "abc")
+
+        # Changing one widget does not update the other
+        xSpinBox.value = 7
+        self.assertEqual(param.x, 7)
+        self.assertEqual(takeWrittenValues()["s"], [])
+
+        # Parameters without connected widgets and parameters that are not part of the wrapper do not update any widget
+        param.y.append(3)
+        parameterNode.SetParameter("unrelated", "1")
+        parameterNode.Modified()
+        self.assertEqual(takeWrittenValues(), {"x": [], "s": []})
+        self.assertNotIn("unrelated", param._parameterNodeObserver._parameterValues)
+
+        # Removing a parameter from the node is detected, the widget shows the default value
+        parameterNode.UnsetParameter("s")
+        self.assertEqual(takeWrittenValues(), {"x": [], "s": [""]})
+        self.assertEqual(sLineEdit.text, "")
+
     def timing_test_timeit_read_int(self):
         """
         Manual test function that prints some benchmark timings.
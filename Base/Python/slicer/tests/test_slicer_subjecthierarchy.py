@@ -0,0 +1,109 @@
+import unittest
+
+import slicer
+import slicer.subjecthierarchy
+from slicer.subjecthierarchy import SubjectHierarchyIndex
+
+
+class SlicerSubjectHierarchyIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        slicer.mrmlScene.Clear(0)
+        self.shNode = slicer.mrmlScene.GetSubjectHierarchyNode()
+        self.uidName = slicer.vtkMRMLSubjectHierarchyConstants.GetDICOMUIDName()
+        self.shIndex = SubjectHierarchyIndex(slicer.mrmlScene)
+
+    def tearDown(self):
+        self.shIndex.cleanup()
+        slicer.mrmlScene.Clear(0)
+
+    def createPatient(self, patientIndex, numberOfStudies=2, numberOfSeries=3):
+        shNode = self.shNode
+        patientItemID = shNode.CreateSubjectItem(shNode.GetSceneItemID(), f"Patient{patientIndex}")
+        shNode.SetItemUID(patientItemID, self.uidName, f"P{patientIndex}")
+        for studyIndex in range(numberOfStudies):
+            studyItemID = shNode.CreateStudyItem(patientItemID, f"Study{studyIndex}")
+            shNode.SetItemUID(studyItemID, self.uidName, f"P{patientIndex}.S{studyIndex}")
+            for seriesIndex in range(numberOfSeries):
+                seriesItemID = shNode.CreateHierarchyItem(studyItemID, f"Series{seriesIndex}", "Series")
+                seriesUID = f"P{patientIndex}.S{studyIndex}.{seriesIndex}"
+                shNode.SetItemUID(seriesItemID, self.uidName, seriesUID)
+                shNode.SetItemUID(seriesItemID, slicer.vtkMRMLSubjectHierarchyConstants.GetDICOMInstanceUIDName(),
+                                  f"{seriesUID}.1 {seriesUID}.2")
+                shNode.SetItemAttribute(seriesItemID, "Modality", "CT" if seriesIndex == 0 else "MR")
+        return patientItemID
+
+    def test_lookup(self):
+        patientItemIDs = [self.createPatient(patientIndex) for patientIndex in range(3)]
+
+        self.assertEqual(self.shIndex.itemByUID(self.uidName, "P1"), patientItemIDs[1])
+        self.assertEqual(self.shIndex.itemByUID(self.uidName, "P1.S1"), self.shNode.GetItemByUID(self.uidName, "P1.S1"))
+        self.assertEqual(self.shIndex.itemByUID(self.uidName, "missing"), slicer.vtkMRMLSubjectHierarchyNode.GetInvalidItemID())
+        self.assertEqual(self.shIndex.itemsByLevel("Patient"), sorted(patientItemIDs))
+        self.assertEqual(len(self.shIndex.itemsByLevel("Series")), 3 * 2 * 3)
+        self.assertEqual(len(self.shIndex.itemsByAttribute("Modality", "CT")), 3 * 2)
+        self.assertEqual(len(self.shIndex.itemsByAttribute("Modality")), 3 * 2 * 3)
+        self.assertEqual(self.shIndex.itemAttributes(self.shIndex.itemByUID(self.uidName, "P0.S0.0"))["Modality"], "CT")
+
+        instanceUIDName = slicer.vtkMRMLSubjectHierarchyConstants.GetDICOMInstanceUIDName()
+        self.assertEqual(self.shIndex.itemsByUIDListEntry(instanceUIDName, "P2.S1.2.2"),
+                         [self.shNode.GetItemByUIDList(instanceUIDName, "P2.S1.2.2")])
+        self.assertEqual(self.shIndex.rebuildCount, 1)
+
+    def test_incremental_update(self):
+        self.createPatient(0)
+        self.assertEqual(len(self.shIndex.itemsByLevel("Patient")), 1)
+
+        # Added items
+        patientItemID = self.createPatient(1)
+        self.assertEqual(self.shIndex.itemByUID(self.uidName, "P1"), patientItemID)
+
+        # Modified UID and attribute
+        seriesItemID = self.shIndex.itemByUID(self.uidName, "P1.S0.1")
+        self.shNode.SetItemUID(seriesItemID, self.uidName, "P1.S0.1-renamed")
+        self.shNode.SetItemAttribute(seriesItemID, "Modality", "CT")
+        self.assertEqual(self.shIndex.itemsByUID(self.uidName, "P1.S0.1"), [])
+        self.assertEqual(self.shIndex.itemByUID(self.uidName, "P1.S0.1-renamed"), seriesItemID)
+        self.assertIn(seriesItemID, self.shIndex.itemsByAttribute("Modality", "CT"))
+        self.shNode.RemoveItemAttribute(seriesItemID, "Modality")
+        self.assertNotIn(seriesItemID, self.shIndex.itemsByAttribute("Modality"))
+
+        # Removed branch
+        self.shNode.RemoveItem(patientItemID)
+        self.assertEqual(self.shIndex.itemsByUID(self.uidName, "P1"), [])
+        self.assertEqual(self.shIndex.itemsByUID(self.uidName, "P1.S1.0"), [])
+        self.assertEqual(len(self.shIndex.itemsByLevel("Series")), 2 * 3)
+
+        # No full rebuild was needed
+        self.assertEqual(self.shIndex.rebuildCount, 1)
+
+        # Compressed events and closing the scene invalidate the index
+        wasModified = self.shNode.StartModify()
+        self.shNode.SetItemUID(self.shIndex.itemByUID(self.uidName, "P0"), self.uidName, "P0-renamed")
+        self.shNode.EndModify(wasModified)
+        self.assertNotEqual(self.shIndex.itemByUID(self.uidName, "P0-renamed"), slicer.vtkMRMLSubjectHierarchyNode.GetInvalidItemID())
+        slicer.mrmlScene.Clear(0)
+        self.assertEqual(len(self.shIndex), 0)
+
+    def test_iterSubtree(self):
+        patientItemIDs = [self.createPatient(patientIndex) for patientIndex in range(2)]
+
+        allItemIDs = [itemID for batch in self.shIndex.iterSubtree() for itemID in batch]
+        self.assertEqual(len(allItemIDs), 2 * (1 + 2 + 2 * 3))
+
+        batches = list(self.shIndex.iterSubtree(patientItemIDs[0], batchSize=4))
+        self.assertEqual([len(batch) for batch in batches], [4, 4])
+        self.assertEqual(len(next(self.shIndex.iterSubtree(patientItemIDs[0], recursive=False))), 2)
+
+        seriesItemIDs = [itemID for batch in self.shIndex.iterSubtree(patientItemIDs[1], level="Series", attributes={"Modality": "MR"})
+                         for itemID in batch]
+        self.assertEqual(len(seriesItemIDs), 2 * 2)
+        for itemID in seriesItemIDs:
+            self.assertEqual(self.shNode.GetItemAttribute(itemID, "Modality"), "MR")
+            self.assertTrue(self.shNode.GetItemUID(itemID, self.uidName).startswith("P1."))
+
+    def test_getSubjectHierarchyIndex(self):
+        shIndex = slicer.subjecthierarchy.getSubjectHierarchyIndex()
+        self.assertIs(shIndex, slicer.subjecthierarchy.getSubjectHierarchyIndex(slicer.mrmlScene))
+        patientItemID = self.createPatient(0, numberOfStudies=1, numberOfSeries=1)
+        self.assertEqual(shIndex.itemByUID(self.uidName, "P0"), patientItemID)
@@ -157,23 +157,33 @@ def importClassesFromDirectory(directory, dest_module_name, type_info, filematch
     if cache_key in __import_classes_cache:
         return
 
-    import glob, os, re, fnmatch
+    import functools, glob, os, re, fnmatch, sys
+
+    # If supported by the destination module (e.g "slicer" started with lazy import
+    # enabled), the modules are only imported when one of their objects is first accessed.
+    registerLazyImport = getattr(sys.modules[dest_module_name], "_registerLazyImport", None)
 
     re_filematch = re.compile(fnmatch.translate(filematch))
     for fname in glob.glob(os.path.join(directory, filematch)):
         if not re_filematch.match(os.path.basename(fname)):
             continue
-        try:
-            from_module_name = os.path.splitext(os.path.basename(fname))[0]
-            importModuleObjects(from_module_name, dest_module_name, type_info)
-        except ImportError as detail:
-            import sys
-
-            print(detail, file=sys.stderr)
+        from_module_name = os.path.splitext(os.path.basename(fname))[0]
+        importFunction = functools.partial(_importModuleObjectsOrPrintError, from_module_name, dest_module_name, type_info)
+        if registerLazyImport is None or not registerLazyImport(importFunction):
+            importFunction()
 
     __import_classes_cache.add(cache_key)
 
 
+def _importModuleObjectsOrPrintError(from_module_name, dest_module_name, type_info):
+    try:
+        importModuleObjects(from_module_name, dest_module_name, type_info)
+    except ImportError as detail:
+        import sys
+
+        print(detail, file=sys.stderr)
+
+
 def importModuleObjects(from_module_name, dest_module_name, type_info):
     """Import object of type 'type_info' (str or type) from module identified
     by 'from_module_name' into the module identified by 'dest_module_name'.
@@ -184,8 +194,9 @@ def importModuleObjects(from_module_name, dest_module_name, type_info):
 
     dest_module = sys.modules[dest_module_name]
 
-    # Skip if module has already been loaded
-    if from_module_name in dir(dest_module):
+    # Skip if module has already been loaded. Lookup is done in the module dictionary
+    # to avoid resolving attributes registered for lazy import.
+    if from_module_name in vars(dest_module):
         return
 
     # Obtain a reference to the module identified by 'from_module_name'
@@ -2151,12 +2162,163 @@ def arrayFromSegmentInternalBinaryLabelmap(segmentationNode, segmentId):
     return narray
 
 
+def _referenceVolumeNodeForSegmentation(segmentationNode, referenceVolumeNode=None):
+    """Return the volume node that defines the geometry of segmentation arrays.
+
+    :raises RuntimeError: if no reference volume is specified and the segmentation does not have one either.
+    """
+    import slicer
+
+    if referenceVolumeNode:
+        return referenceVolumeNode
+    referenceVolumeNode = segmentationNode.GetNodeReference(slicer.vtkMRMLSegmentationNode.GetReferenceImageGeometryReferenceRole())
+    if not referenceVolumeNode:
+        raise RuntimeError("No reference volume is found in the input segmentationNode, therefore a valid referenceVolumeNode input is required.")
+    return referenceVolumeNode
+
+
+def _segmentIdsAsList(segmentIds):
+    """Return segment IDs as a list. A single segment ID may be specified as a string."""
+    if isinstance(segmentIds, str):
+        return [segmentIds]
+    return list(segmentIds)
+
+
+def _vtkStringArrayFromList(values):
+    import vtk
+
+    valuesArray = vtk.vtkStringArray()
+    valuesArray.SetNumberOfValues(len(values))
+    for valueIndex, value in enumerate(values):
+        valuesArray.SetValue(valueIndex, value)
+    return valuesArray
+
+
+def _arrayFromSegmentsInReferenceGeometry(segmentationNode, segmentIds, referenceVolumeNode, labelValues=None):
+    """Return merged labelmap of the specified segments as a numpy array, in the geometry of the reference volume.
+
+    Segments are merged and resampled directly into a ``vtkOrientedImageData``, no nodes are added to the scene.
+    The returned array refers to the voxels of this temporary image, therefore no additional copy is made.
+
+    :param labelValues: label value of each segment in the output. If not specified then label values 1..N are used.
+    :raises RuntimeError: in case of failure
+    """
+    import slicer
+    import vtk
+    import vtk.util.numpy_support
+
+    if not segmentationNode.GetSegmentation().CreateRepresentation(slicer.vtkSegmentationConverter.GetSegmentationBinaryLabelmapRepresentationName()):
+        raise RuntimeError("Unable to convert segmentation to binary labelmap representation.")
+
+    labelValuesArray = None
+    if labelValues is not None:
+        labelValuesArray = vtk.vtkIntArray()
+        for labelValue in labelValues:
+            labelValuesArray.InsertNextValue(int(labelValue))
+
+    mergedLabelmap = slicer.vtkOrientedImageData()
+    slicer.vtkSlicerSegmentationsModuleLogic.GenerateMergedLabelmapInReferenceGeometry(
+        segmentationNode, referenceVolumeNode, _vtkStringArrayFromList(segmentIds),
+        slicer.vtkSegmentation.EXTENT_REFERENCE_GEOMETRY, mergedLabelmap, labelValuesArray)
+    scalars = mergedLabelmap.GetPointData().GetScalars()
+    if not scalars:
+        raise RuntimeError("Export of segment failed.")
+
+    nshape = tuple(reversed(mergedLabelmap.GetDimensions()))
+    return vtk.util.numpy_support.vtk_to_numpy(scalars).reshape(nshape)
+
+
+def _labelmapFromArrayInReferenceGeometry(narray, referenceVolumeNode, labelValues=None):
+    """Copy a numpy array into a new ``vtkOrientedImageData`` that has the geometry of the reference volume.
+
+    Voxels are copied in one pass, label values are normalized during the copy:
+
+    - If ``labelValues`` is not specified then all positive voxel values are set to 1.
+    - Otherwise voxels that do not have any of the specified label values are set to 0.
+    """
+    import numpy as np
+    import slicer
+    import vtk
+    import vtk.util.numpy_support
+
+    if len(narray.shape) != 3:
+        raise RuntimeError("Unsupported numpy array shape: " + str(narray.shape) + " expected (K,J,I)")
+
+    labelmap = slicer.vtkOrientedImageData()
+    labelmap.SetExtent(0, narray.shape[2] - 1, 0, narray.shape[1] - 1, 0, narray.shape[0] - 1)
+    if labelValues is None or (min(labelValues) >= 0 and max(labelValues) < 256):
+        labelmap.AllocateScalars(vtk.VTK_UNSIGNED_CHAR, 1)
+    else:
+        labelmap.AllocateScalars(vtk.VTK_SHORT, 1)
+    ijkToRas = vtk.vtkMatrix4x4()
+    referenceVolumeNode.GetIJKToRASMatrix(ijkToRas)
+    labelmap.SetGeometryFromImageToWorldMatrix(ijkToRas)
+
+    labelmapArray = vtk.util.numpy_support.vtk_to_numpy(labelmap.GetPointData().GetScalars()).reshape(narray.shape)
+    if labelValues is None:
+        np.greater(narray, 0, out=labelmapArray)
+    else:
+        np.copyto(labelmapArray, narray, casting="unsafe")
+        # Voxels that do not belong to any of the segments must not remain in the shared labelmap
+        labelmapArray[np.isin(narray, labelValues, invert=True)] = 0
+    return labelmap
+
+
+def _setLabelmapToSegments(labelmap, segmentationNode, labelValueToSegmentId, referenceVolumeNode, newSegmentNames=None):
+    """Set a multi-label image as the shared binary labelmap layer of the specified segments.
+
+    Segments keep the label value that they have in the image, therefore voxels do not need to be remapped.
+    Segments that do not exist yet are created. The segmentation node is modified only once.
+
+    :param newSegmentNames: optional dict that specifies name of new segments by label value.
+    :return: dict that maps label values to IDs of the updated segments.
+    :raises RuntimeError: in case of failure
+    """
+    import slicer
+    import vtk
+
+    segmentation = segmentationNode.GetSegmentation()
+    binaryLabelmapName = slicer.vtkSegmentationConverter.GetSegmentationBinaryLabelmapRepresentationName()
+    if segmentation.GetSourceRepresentationName() != binaryLabelmapName:
+        raise RuntimeError("Source representation of the segmentation node " + segmentationNode.GetName() + " is not binary labelmap.")
+
+    # Reference volume and segmentation may be in different coordinate systems
+    if referenceVolumeNode.GetParentTransformNode() is not segmentationNode.GetParentTransformNode():
+        referenceToSegmentationTransform = vtk.vtkGeneralTransform()
+        slicer.vtkMRMLTransformNode.GetTransformBetweenNodes(
+            referenceVolumeNode.GetParentTransformNode(), segmentationNode.GetParentTransformNode(), referenceToSegmentationTransform)
+        slicer.vtkOrientedImageDataResample.TransformOrientedImage(labelmap, referenceToSegmentationTransform)
+
+    if not segmentationNode.GetDisplayNode():
+        segmentationNode.CreateDefaultDisplayNodes()
+
+    updatedSegmentIds = {}
+    with NodeModify(segmentationNode):
+        for labelValue, segmentId in labelValueToSegmentId.items():
+            segment = segmentation.GetSegment(segmentId) if segmentId else None
+            if segment:
+                segmentation.ClearSegment(segmentId)
+            else:
+                segmentName = newSegmentNames.get(labelValue, "") if newSegmentNames else ""
+                segmentId = segmentation.AddEmptySegment(segmentId or "", segmentName or segmentId or "")
+                segment = segmentation.GetSegment(segmentId)
+                if not segment:
+                    raise RuntimeError(f"Failed to add segment for label value {labelValue}.")
+            segment.SetLabelValue(int(labelValue))
+            segment.AddRepresentation(binaryLabelmapName, labelmap)
+            updatedSegmentIds[labelValue] = segmentId
+    return updatedSegmentIds
+
+
 def arrayFromSegmentBinaryLabelmap(segmentationNode, segmentId, referenceVolumeNode=None):
     """Return voxel array of a segment's binary labelmap representation as numpy array.
 
     :param segmentationNode: source segmentation node.
     :param segmentId: ID of the source segment.
       Can be determined from segment name by calling ``segmentationNode.GetSegmentation().GetSegmentIdBySegmentName(segmentName)``.
+      If a list of segment IDs is specified then all the segments are returned in a single array,
+      voxels of the N-th segment in the list have the value N. This is the same as calling :py:meth:`arrayFromSegmentation`
+      with the list of segment IDs.
     :param referenceVolumeNode: a volume node that determines geometry (origin, spacing, axis directions, extents) of the array.
       If not specified then the volume that was used for setting the segmentation's geometry is used as reference volume.
 
@@ -2167,40 +2329,24 @@ def arrayFromSegmentBinaryLabelmap(segmentationNode, segmentId, referenceVolumeN
 
     To get voxels of a segment as a modifiable numpy array, you can use :py:meth:`arrayFromSegmentInternalBinaryLabelmap`.
     """
-
-    import slicer
-    import vtk
-
-    # Get reference volume
-    if not referenceVolumeNode:
-        referenceVolumeNode = segmentationNode.GetNodeReference(slicer.vtkMRMLSegmentationNode.GetReferenceImageGeometryReferenceRole())
-        if not referenceVolumeNode:
-            raise RuntimeError("No reference volume is found in the input segmentationNode, therefore a valid referenceVolumeNode input is required.")
-
-    # Export segment as vtkImageData (via temporary labelmap volume node)
-    segmentIds = vtk.vtkStringArray()
-    segmentIds.InsertNextValue(segmentId)
-    labelmapVolumeNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLLabelMapVolumeNode", "__temp__")
-    try:
-        if not slicer.modules.segmentations.logic().ExportSegmentsToLabelmapNode(segmentationNode, segmentIds, labelmapVolumeNode, referenceVolumeNode):
-            raise RuntimeError("Export of segment failed.")
-        narray = slicer.util.arrayFromVolume(labelmapVolumeNode)
-    finally:
-        if labelmapVolumeNode.GetDisplayNode():
-            slicer.mrmlScene.RemoveNode(labelmapVolumeNode.GetDisplayNode().GetColorNode())
-        slicer.mrmlScene.RemoveNode(labelmapVolumeNode)
-
-    return narray
+    if not isinstance(segmentId, str):
+        return arrayFromSegmentation(segmentationNode, list(segmentId), referenceVolumeNode)
+    referenceVolumeNode = _referenceVolumeNodeForSegmentation(segmentationNode, referenceVolumeNode)
+    return _arrayFromSegmentsInReferenceGeometry(segmentationNode, [segmentId], referenceVolumeNode)
 
 
 def updateSegmentBinaryLabelmapFromArray(narray, segmentationNode, segmentId, referenceVolumeNode=None):
     """Sets binary labelmap representation of a segment from a numpy array.
 
     :param narray: voxel array, containing 0 outside the segment, 1 inside the segment.
+      Any positive value is considered to be inside the segment.
     :param segmentationNode: segmentation node that will be updated.
     :param segmentId: ID of the segment that will be updated.
       Can be determined from segment name by calling ``segmentationNode.GetSegmentation().GetSegmentIdBySegmentName(segmentName)``.
-    :param referenceVolumeNode: a volume node that determines geometry (origin, spacing, axis directions, extents) of the array.
+      If a list of segment IDs is specified then all the segments are updated from the array in one step:
+      voxels with the value N are assigned to the N-th segment in the list. This is the same as calling
+      :py:meth:`updateSegmentationFromArray` with the list of segment IDs.
+    :param referenceVolumeNode: a volume node that determines geometry (origin, spacing, axis directions) of the array.
       If not specified then the volume that was used for setting the segmentation's geometry is used as reference volume.
 
     :raises RuntimeError: in case of failure
@@ -2208,36 +2354,128 @@ def updateSegmentBinaryLabelmapFromArray(narray, segmentationNode, segmentId, re
     .. warning::
       Voxels values are deep-copied, therefore if the numpy array is modified after calling this method, segmentation node will not change.
     """
+    if not isinstance(segmentId, str):
+        updateSegmentationFromArray(narray, segmentationNode, list(segmentId), referenceVolumeNode)
+        return
+    referenceVolumeNode = _referenceVolumeNodeForSegmentation(segmentationNode, referenceVolumeNode)
+    labelmap = _labelmapFromArrayInReferenceGeometry(narray, referenceVolumeNode)
+    _setLabelmapToSegments(labelmap, segmentationNode, {1: segmentId}, referenceVolumeNode)
 
-    # Export segment as vtkImageData (via temporary labelmap volume node)
-    import slicer
-    import vtk
 
-    # Get reference volume
-    if not referenceVolumeNode:
-        referenceVolumeNode = segmentationNode.GetNodeReference(slicer.vtkMRMLSegmentationNode.GetReferenceImageGeometryReferenceRole())
-        if not referenceVolumeNode:
-            raise RuntimeError("No reference volume is found in the input segmentationNode, therefore a valid referenceVolumeNode input is required.")
+def _validateSegmentLabelValues(labelValues):
+    """Check that label values can be stored in the merged labelmap, which has ``VTK_SHORT`` scalar type.
 
-    # Update segment in segmentation
-    labelmapVolumeNode = slicer.modules.volumes.logic().CreateAndAddLabelVolume(referenceVolumeNode, "__temp__")
-    try:
-        if narray.min() >= 0 and narray.max() <= 1:
-            # input array seems to be valid, use it as is (faster)
-            updateVolumeFromArray(labelmapVolumeNode, narray)
-        else:
-            # need to normalize the data because the label value must be 1
-            import numpy as np
-
-            narrayNormalized = np.zeros(narray.shape, np.uint8)
-            narrayNormalized[narray > 0] = 1
-            updateVolumeFromArray(labelmapVolumeNode, narrayNormalized)
-        segmentIds = vtk.vtkStringArray()
-        segmentIds.InsertNextValue(segmentId)
-        if not slicer.modules.segmentations.logic().ImportLabelmapToSegmentationNode(labelmapVolumeNode, segmentationNode, segmentIds):
-            raise RuntimeError("Importing of segment failed.")
-    finally:
-        slicer.mrmlScene.RemoveNode(labelmapVolumeNode)
+    :raises ValueError: if a label value is not positive or larger than 32767.
+    """
+    import numpy as np
+
+    maximumLabelValue = np.iinfo(np.int16).max
+    for labelValue in labelValues:
+        if labelValue <= 0 or labelValue > maximumLabelValue:
+            raise ValueError(f"Label value {labelValue} is out of range, label values of segments must be between 1 and {maximumLabelValue}")
+
+
+def _labelValueToSegmentIdMap(segmentationNode, segmentIds):
+    """Return segment IDs as a dict that maps label values to segment IDs.
+
+    If segment IDs are specified as a list then label value N corresponds to the N-th segment ID.
+    If segment IDs are not specified then all segments of the segmentation are used.
+
+    :raises ValueError: if a label value is out of the supported range.
+    """
+    if segmentIds is None:
+        segmentIds = list(segmentationNode.GetSegmentation().GetSegmentIDs())
+    if isinstance(segmentIds, dict):
+        labelValueToSegmentId = dict(segmentIds)
+    else:
+        labelValueToSegmentId = {labelIndex + 1: segmentId for labelIndex, segmentId in enumerate(_segmentIdsAsList(segmentIds))}
+    _validateSegmentLabelValues(labelValueToSegmentId.keys())
+    return labelValueToSegmentId
+
+
+def arrayFromSegmentation(segmentationNode, segmentIds=None, referenceVolumeNode=None):
+    """Return all or selected segments of a segmentation as a multi-label numpy array.
+
+    :param segmentationNode: source segmentation node.
+    :param segmentIds: segments to export. If not specified then all segments are exported, voxels of the N-th segment have the value N.
+      If a list of segment IDs is specified then voxels of the N-th segment in the list have the value N.
+      If a dict is specified then it maps label values to segment IDs.
+    :param referenceVolumeNode: a volume node that determines geometry (origin, spacing, axis directions, extents) of the array.
+      If not specified then the volume that was used for setting the segmentation's geometry is used as reference volume.
+    :return: voxel array of ``int16`` type. Where segments overlap, the voxel value is set from the last segment.
+    :raises ValueError: if a label value is not in the range of 1 to 32767.
+    :raises RuntimeError: in case of failure
+
+    All segments are merged and resampled in one step, without adding any nodes to the scene.
+    Voxels values are copied, therefore changing the returned numpy array has no effect on the source segmentation.
+    The modified array can be written back to the segmentation by calling :py:meth:`updateSegmentationFromArray`.
+
+    .. code-block:: python
+
+      labelmapArray = slicer.util.arrayFromSegmentation(segmentationNode, referenceVolumeNode=volumeNode)
+    """
+    referenceVolumeNode = _referenceVolumeNodeForSegmentation(segmentationNode, referenceVolumeNode)
+    labelValueToSegmentId = _labelValueToSegmentIdMap(segmentationNode, segmentIds)
+    if not labelValueToSegmentId:
+        # Empty segment list would mean all segments, therefore return an empty labelmap explicitly
+        import numpy as np
+
+        return np.zeros(tuple(reversed(referenceVolumeNode.GetImageData().GetDimensions())), np.int16)
+    return _arrayFromSegmentsInReferenceGeometry(
+        segmentationNode, list(labelValueToSegmentId.values()), referenceVolumeNode, list(labelValueToSegmentId.keys()))
+
+
+def updateSegmentationFromArray(narray, segmentationNode, segmentIds=None, referenceVolumeNode=None):
+    """Create or update segments of a segmentation from a multi-label numpy array.
+
+    :param narray: voxel array, each voxel value is the label value of a segment (0 is background).
+    :param segmentationNode: segmentation node that will be updated.
+    :param segmentIds: determines which segment is updated from each label value.
+      If a list of segment IDs is specified then voxels with the value N are assigned to the N-th segment in the list.
+      If a dict is specified then it maps label values to segment IDs.
+      Segments that do not exist in the segmentation are created.
+      If not specified then voxels with the value N are assigned to the N-th segment of the segmentation and
+      new segments (named ``Label_N``) are created for label values that exceed the number of segments.
+    :param referenceVolumeNode: a volume node that determines geometry (origin, spacing, axis directions) of the array.
+      If not specified then the volume that was used for setting the segmentation's geometry is used as reference volume.
+    :return: dict that maps label values to IDs of the updated segments.
+    :raises ValueError: if a label value of an updated segment is not in the range of 1 to 32767.
+    :raises RuntimeError: in case of failure
+
+    All segments are stored in a single shared labelmap layer, keeping their label values from the array,
+    and the segmentation node is modified only once. No nodes are added to the scene.
+    Voxels that do not belong to any of the updated segments are ignored.
+
+    .. warning::
+      Voxels values are deep-copied, therefore if the numpy array is modified after calling this method, segmentation node will not change.
+
+    .. code-block:: python
+
+      slicer.util.updateSegmentationFromArray(labelmapArray, segmentationNode, referenceVolumeNode=volumeNode)
+    """
+    import numpy as np
+
+    referenceVolumeNode = _referenceVolumeNodeForSegmentation(segmentationNode, referenceVolumeNode)
+    newSegmentNames = None
+    if segmentIds is None:
+        existingSegmentIds = list(segmentationNode.GetSegmentation().GetSegmentIDs())
+        labelValues = [int(labelValue) for labelValue in np.unique(narray) if labelValue > 0]
+        _validateSegmentLabelValues(labelValues)
+        labelValueToSegmentId = {}
+        newSegmentNames = {}
+        for labelValue in labelValues:
+            if labelValue <= len(existingSegmentIds):
+                labelValueToSegmentId[labelValue] = existingSegmentIds[labelValue - 1]
+            else:
+                labelValueToSegmentId[labelValue] = None
+                newSegmentNames[labelValue] = f"Label_{labelValue}"
+    else:
+        labelValueToSegmentId = _labelValueToSegmentIdMap(segmentationNode, segmentIds)
+    if not labelValueToSegmentId:
+        return {}
+
+    labelmap = _labelmapFromArrayInReferenceGeometry(narray, referenceVolumeNode, list(labelValueToSegmentId.keys()))
+    return _setLabelmapToSegments(labelmap, segmentationNode, labelValueToSegmentId, referenceVolumeNode, newSegmentNames)
 
 
 def arrayFromMarkupsControlPoints(markupsNode, world=False):
@@ -2249,16 +2487,17 @@ def arrayFromMarkupsControlPoints(markupsNode, world=False):
     The returned array is just a copy and so any modification in the array will not affect the markup node.
 
     To modify markup control points based on a numpy array, use :py:meth:`updateMarkupsControlPointsFromArray`.
+    To get all control point properties (orientation, label, flags) at once, use :py:meth:`arraysFromMarkupsControlPoints`.
     """
-    numberOfControlPoints = markupsNode.GetNumberOfControlPoints()
-    import numpy as np
+    import vtk.util.numpy_support
 
-    narray = np.zeros([numberOfControlPoints, 3])
-    for controlPointIndex in range(numberOfControlPoints):
-        if world:
-            markupsNode.GetNthControlPointPositionWorld(controlPointIndex, narray[controlPointIndex, :])
-        else:
-            markupsNode.GetNthControlPointPosition(controlPointIndex, narray[controlPointIndex, :])
+    points = vtk.vtkPoints()
+    points.SetDataTypeToDouble()
+    if world:
+        markupsNode.GetControlPointPositionsWorld(points)
+    else:
+        markupsNode.GetControlPointPositions(points)
+    narray = vtk.util.numpy_support.vtk_to_numpy(points.GetData()).reshape(-1, 3)
     return narray
 
 
@@ -2269,6 +2508,8 @@ def updateMarkupsControlPointsFromArray(markupsNode, narray, world=False):
     :raises RuntimeError: in case of failure
 
     All previous content of the node is deleted.
+
+    To set other control point properties (orientation, label, flags) at once, use :py:meth:`updateMarkupsControlPointsFromArrays`.
     """
     narrayshape = narray.shape
     if narrayshape == (0,):
@@ -2276,27 +2517,158 @@ def updateMarkupsControlPointsFromArray(markupsNode, narray, world=False):
         return
     if len(narrayshape) != 2 or narrayshape[1] != 3:
         raise RuntimeError("Unsupported numpy array shape: " + str(narrayshape) + " expected (N,3)")
-    numberOfControlPoints = narrayshape[0]
-    oldNumberOfControlPoints = markupsNode.GetNumberOfControlPoints()
-    # Update existing control points
+    points = _vtkPointsFromNumpyArray(narray)
+    if world:
+        markupsNode.SetControlPointPositionsWorld(points)
+    else:
+        markupsNode.SetControlPointPositions(points)
+
+
+def _vtkPointsFromNumpyArray(narray):
+    """Return a vtkPoints object containing a deep copy of an Nx3 numpy array, in double precision."""
+    import numpy as np
+    import vtk.util.numpy_support
+
+    points = vtk.vtkPoints()
+    pointsArray = np.ascontiguousarray(narray, dtype=np.float64).reshape(-1, 3)
+    points.SetData(vtk.util.numpy_support.numpy_to_vtk(pointsArray, deep=True))
+    return points
+
+
+_markupsControlPointFlags = {
+    "selected": ("GetControlPointSelectedFlags", "SetControlPointSelectedFlags"),
+    "locked": ("GetControlPointLockedFlags", "SetControlPointLockedFlags"),
+    "visibility": ("GetControlPointVisibilityFlags", "SetControlPointVisibilityFlags"),
+}
+
+
+def arraysFromMarkupsControlPoints(markupsNode, world=False):
+    """Return all control point properties of a markups node as a dictionary of numpy arrays.
+
+    :param world: if set to True then the control points positions are returned in world coordinate system
+      (effect of parent transform to the node is applied). Orientations are always returned in node coordinate system.
+
+    The returned dictionary contains these items, each with one row for each control point:
+
+    - ``positions``: control point positions (Nx3 float array)
+    - ``orientations``: control point orientation matrices (Nx3x3 float array)
+    - ``labels``: control point labels (string array of size N)
+    - ``selected``, ``locked``, ``visibility``: control point flags (boolean array of size N)
+
+    Properties are retrieved using bulk methods of the markups node, which is much faster than
+    querying control points one by one when the node contains many points.
+
+    The returned arrays are just copies and so any modification in the arrays will not affect the markup node.
+    The dictionary can be passed to :py:meth:`updateMarkupsControlPointsFromArrays` to set all properties at once:
+
+    .. code-block:: python
+
+      arrays = slicer.util.arraysFromMarkupsControlPoints(pointListNode)
+      arrays["selected"] = arrays["positions"][:, 2] > 0
+      slicer.util.updateMarkupsControlPointsFromArrays(pointListNode, **arrays)
+    """
+    import numpy as np
+    import vtk.util.numpy_support
+
+    arrays = {"positions": arrayFromMarkupsControlPoints(markupsNode, world)}
+
+    orientations = vtk.vtkDoubleArray()
+    markupsNode.GetControlPointOrientationMatrices(orientations)
+    arrays["orientations"] = vtk.util.numpy_support.vtk_to_numpy(orientations).reshape(-1, 3, 3)
+
+    labels = vtk.vtkStringArray()
+    markupsNode.GetControlPointLabels(labels)
+    arrays["labels"] = np.array([labels.GetValue(index) for index in range(labels.GetNumberOfValues())], dtype=str)
+
+    for name, (getterName, _) in _markupsControlPointFlags.items():
+        flags = vtk.vtkUnsignedCharArray()
+        getattr(markupsNode, getterName)(flags)
+        arrays[name] = vtk.util.numpy_support.vtk_to_numpy(flags).astype(bool)
+
+    return arrays
+
+
+def updateMarkupsControlPointsFromArrays(markupsNode, positions=None, orientations=None, labels=None,
+                                         selected=None, locked=None, visibility=None, world=False):
+    """Set control point properties in a markups node from numpy arrays, in a single batched modification.
+
+    :param positions: control point positions (Nx3 array). If specified then control points are added or removed
+      to match the number of rows, same way as in :py:meth:`updateMarkupsControlPointsFromArray`.
+    :param orientations: control point orientation matrices in node coordinate system (Nx3x3 or Nx9 array).
+    :param labels: control point labels (sequence of N strings).
+    :param selected: control point selected flags (array of N values, non-zero means True).
+    :param locked: control point locked flags (array of N values, non-zero means True).
+    :param visibility: control point visibility flags (array of N values, non-zero means True).
+    :param world: if set to True then positions are expected in world coordinate system.
+    :raises RuntimeError: in case of failure
+
+    Properties that are not specified are left unchanged. All arrays except ``positions`` must have
+    one row for each control point (after positions are updated). All arrays are validated before
+    the node is modified, so the node is left unchanged if any of them is invalid.
+
+    All properties are set using bulk methods of the markups node within a single
+    ``StartModify``/``EndModify`` block, so observers are notified only once and
+    curve, interaction handle, and measurements are updated only once.
+
+    .. code-block:: python
+
+      import numpy as np
+      positions = np.random.uniform(-50, 50, size=[10000, 3])
+      slicer.util.updateMarkupsControlPointsFromArrays(pointListNode, positions=positions,
+        labels=[f"P{index}" for index in range(len(positions))], locked=np.ones(len(positions)))
+    """
+    import numpy as np
+    import vtk.util.numpy_support
+
+    # Validate all inputs before modifying the node, so that the node is left unchanged in case of an error
+    if positions is not None:
+        positions = np.asarray(positions)
+        if positions.shape == (0,):
+            numberOfControlPoints = 0
+        elif len(positions.shape) == 2 and positions.shape[1] == 3:
+            numberOfControlPoints = positions.shape[0]
+        else:
+            raise RuntimeError("Unsupported numpy array shape: " + str(positions.shape) + " expected (N,3)")
+    else:
+        numberOfControlPoints = markupsNode.GetNumberOfControlPoints()
+
+    orientationsVtk = None
+    if orientations is not None:
+        orientationsArray = np.ascontiguousarray(orientations, dtype=np.float64)
+        if orientationsArray.shape not in [(numberOfControlPoints, 3, 3), (numberOfControlPoints, 9)]:
+            raise RuntimeError(f"Unsupported orientations array shape: {orientationsArray.shape} expected ({numberOfControlPoints},3,3)")
+        orientationsVtk = vtk.util.numpy_support.numpy_to_vtk(orientationsArray.reshape(-1, 9), deep=True)
+
+    labelsVtk = None
+    if labels is not None:
+        if len(labels) != numberOfControlPoints:
+            raise RuntimeError(f"Unsupported number of labels: {len(labels)} expected {numberOfControlPoints}")
+        labelsVtk = vtk.vtkStringArray()
+        labelsVtk.SetNumberOfValues(numberOfControlPoints)
+        for index, label in enumerate(labels):
+            labelsVtk.SetValue(index, str(label))
+
+    flagsVtk = {}
+    for name, flags in [("selected", selected), ("locked", locked), ("visibility", visibility)]:
+        if flags is None:
+            continue
+        flagsArray = (np.asarray(flags) != 0).astype(np.uint8)
+        if flagsArray.shape != (numberOfControlPoints,):
+            raise RuntimeError(f"Unsupported {name} array shape: {flagsArray.shape} expected ({numberOfControlPoints},)")
+        flagsVtk[name] = vtk.util.numpy_support.numpy_to_vtk(flagsArray, deep=True)
+
     wasModify = markupsNode.StartModify()
     try:
-        for controlPointIndex in range(min(numberOfControlPoints, oldNumberOfControlPoints)):
-            if world:
-                markupsNode.SetNthControlPointPositionWorld(controlPointIndex, narray[controlPointIndex, :])
-            else:
-                markupsNode.SetNthControlPointPosition(controlPointIndex, narray[controlPointIndex, :])
-        if numberOfControlPoints >= oldNumberOfControlPoints:
-            # Add new points to the markup node
-            for controlPointIndex in range(oldNumberOfControlPoints, numberOfControlPoints):
-                if world:
-                    markupsNode.AddControlPointWorld(narray[controlPointIndex, :])
-                else:
-                    markupsNode.AddControlPoint(narray[controlPointIndex, :])
-        else:
-            # Remove extra point from the markup node
-            for controlPointIndex in range(oldNumberOfControlPoints, numberOfControlPoints, -1):
-                markupsNode.RemoveNthControlPoint(controlPointIndex - 1)
+        if positions is not None:
+            updateMarkupsControlPointsFromArray(markupsNode, positions, world)
+        if orientationsVtk is not None and not markupsNode.SetControlPointOrientationMatrices(orientationsVtk):
+            raise RuntimeError("Failed to set control point orientations")
+        if labelsVtk is not None and not markupsNode.SetControlPointLabels(labelsVtk):
+            raise RuntimeError("Failed to set control point labels")
+        for name, flagsArrayVtk in flagsVtk.items():
+            _, setterName = _markupsControlPointFlags[name]
+            if not getattr(markupsNode, setterName)(flagsArrayVtk):
+                raise RuntimeError(f"Failed to set control point {name} flags")
     finally:
         markupsNode.EndModify(wasModify)
 
@@ -2651,27 +3023,36 @@ def dataframeFromTable(tableNode):
             import pandas as pd
     except ImportError:
         raise ImportError("Failed to convert to pandas dataframe. Please install pandas by running `slicer.util.pip_install('pandas')`")
-    dataframe = pd.DataFrame()
+    import vtk
+    import vtk.util.numpy_support
+
     vtable = tableNode.GetTable()
+    columns = {}
     for columnIndex in range(vtable.GetNumberOfColumns()):
         vcolumn = vtable.GetColumn(columnIndex)
-        column = []
         numberOfComponents = vcolumn.GetNumberOfComponents()
-        if numberOfComponents == 1:
+        narray = None
+        if isinstance(vcolumn, vtk.vtkDataArray) and vcolumn.GetDataType() != vtk.VTK_BIT:
+            # Numeric column: copy the whole array at once
+            narray = vtk.util.numpy_support.vtk_to_numpy(vcolumn).copy()
+        if narray is not None and numberOfComponents == 1:
             # most common, simple case
-            for rowIndex in range(vcolumn.GetNumberOfValues()):
-                column.append(vcolumn.GetValue(rowIndex))
+            column = narray
+        elif narray is not None:
+            # rare case: column contains multiple components, store them as a list in each row
+            column = narray.reshape(-1, numberOfComponents).tolist()
         else:
-            # rare case: column contains multiple components
-            valueIndex = 0
-            for rowIndex in range(vcolumn.GetNumberOfTuples()):
-                item = []
-                for componentIndex in range(numberOfComponents):
-                    item.append(vcolumn.GetValue(valueIndex))
-                    valueIndex += 1
-                column.append(item)
-        dataframe[vcolumn.GetName()] = column
-    return dataframe
+            # string, variant, and bit arrays cannot be mapped to numpy arrays directly
+            getValue = vcolumn.GetValue
+            values = [getValue(valueIndex) for valueIndex in range(vcolumn.GetNumberOfValues())]
+            if numberOfComponents == 1:
+                column = values
+            else:
+                column = [values[valueIndex:valueIndex + numberOfComponents]
+                          for valueIndex in range(0, len(values), numberOfComponents)]
+        columns[vcolumn.GetName()] = column
+    # Create the dataframe in one step to avoid reallocating it for each inserted column
+    return pd.DataFrame(columns)
 
 
 def dataframeFromMarkups(markupsNode):
@@ -3607,7 +3988,7 @@ def computeChecksum(algo, filePath):
 
     Supported hashing algorithms are SHA256, SHA512, and MD5.
 
-    It internally reads the file by chunk of 8192 bytes.
+    It internally reads the file by chunk of 1 MiB.
 
     :raises ValueError: if algo is unknown.
     :raises IOError: if filePath does not exist.
@@ -3620,7 +4001,7 @@ def computeChecksum(algo, filePath):
     with open(filePath, "rb") as content:
         hash = hashlib.new(algo)
         while True:
-            chunk = content.read(8192)
+            chunk = content.read(1024 * 1024)
             if not chunk:
                 break
             hash.update(chunk)
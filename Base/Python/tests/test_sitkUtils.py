@@ -16,6 +16,57 @@ class SitkUtilsTests(unittest.TestCase):
         with unittest.mock.patch.object(su, "IsMRMLIDImageIOAvailable", return_value=False):
             self._test_SimpleITK_SlicerPushPull()
 
+    def test_SimpleITK_SlicerPushPullWithoutMRMLIDImageIOUsingFile(self):
+        with unittest.mock.patch.object(su, "IsMRMLIDImageIOAvailable", return_value=False), \
+                unittest.mock.patch.object(su, "_canTransferUsingArray", return_value=False):
+            self._test_SimpleITK_SlicerPushPull()
+
+    def test_SimpleITK_SlicerPushPullTransferMethods(self):
+        """Verify that all transfer methods give the same result and report their speed."""
+        import time
+        import numpy as np
+        import SampleData
+        import SimpleITK as sitk
+
+        volumeNode = SampleData.downloadSample("MRHead")
+
+        transferMethods = {
+            "array": (su._pullVolumeFromSlicerUsingArray, su._pushVolumeToSlicerUsingArray),
+            "file": (su._pullVolumeFromSlicerUsingFile, su._pushVolumeToSlicerUsingFile),
+        }
+        if su.IsMRMLIDImageIOAvailable():
+            transferMethods["MRMLIDImageIO"] = (
+                lambda node: sitk.ReadImage(su.GetSlicerITKReadWriteAddress(node)),
+                lambda image, node: sitk.WriteImage(image, su.GetSlicerITKReadWriteAddress(node)),
+            )
+
+        referenceImage = su._pullVolumeFromSlicerUsingFile(volumeNode)
+        # Use a non-trivial geometry to check the LPS/RAS conversion
+        referenceImage.SetDirection((0.0, 1.0, 0.0, 0.0, 0.0, -1.0, -1.0, 0.0, 0.0))
+        referenceImage.SetOrigin((10.0, -20.0, 30.0))
+
+        for methodName, (pullVolume, pushVolume) in transferMethods.items():
+            pushedNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLScalarVolumeNode", "pushed-" + methodName)
+
+            startTime = time.time()
+            pushVolume(referenceImage, pushedNode)
+            pushTime = time.time() - startTime
+
+            startTime = time.time()
+            pulledImage = pullVolume(pushedNode)
+            pullTime = time.time() - startTime
+
+            print(f"{methodName} transfer: push {pushTime:.3f}s, pull {pullTime:.3f}s")
+
+            np.testing.assert_allclose(pushedNode.GetOrigin(), (-10.0, 20.0, 30.0))
+            np.testing.assert_allclose(pulledImage.GetOrigin(), referenceImage.GetOrigin())
+            np.testing.assert_allclose(pulledImage.GetSpacing(), referenceImage.GetSpacing())
+            np.testing.assert_allclose(pulledImage.GetDirection(), referenceImage.GetDirection(), atol=1e-6)
+            np.testing.assert_array_equal(sitk.GetArrayViewFromImage(pulledImage), sitk.GetArrayViewFromImage(referenceImage))
+            np.testing.assert_array_equal(slicer.util.arrayFromVolume(pushedNode), sitk.GetArrayViewFromImage(referenceImage))
+
+        slicer.mrmlScene.Clear(0)
+
     def _test_SimpleITK_SlicerPushPull(self):
         """Download the MRHead node"""
         import SampleData
@@ -145,6 +145,7 @@ public:
 
   /// Provides access to protected vtkMRMLMarkupsNode::SetControlPointLabelsWorld
   bool SetControlPointLabels(vtkStringArray* labels, vtkPoints* points);
+  using Superclass::SetControlPointLabels;
 
   /// Constrain points to a specified model surface
   /// Projection to surface is constrained by maximumSearchRadius, specified as a percentage of the model's
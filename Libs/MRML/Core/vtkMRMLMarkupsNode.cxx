@@ -37,6 +37,7 @@
 #include <vtkBoundingBox.h>
 #include <vtkCellLocator.h>
 #include <vtkCollection.h>
+#include <vtkDataArray.h>
 #include <vtkParallelTransportFrame.h>
 #include <vtkGeneralTransform.h>
 #include <vtkMatrix3x3.h>
@@ -567,6 +568,29 @@ vtkMRMLMarkupsNode::ControlPoint* vtkMRMLMarkupsNode::GetNthControlPointCustomLo
   return controlPoint;
 }
 
+//---------------------------------------------------------------------------
+bool vtkMRMLMarkupsNode::CheckControlPointArray(vtkAbstractArray* array, int numberOfComponents, const char* failedMethodName)
+{
+  if (!array)
+  {
+    vtkErrorMacro("vtkMRMLMarkupsNode::" << failedMethodName << " failed: invalid input array");
+    return false;
+  }
+  if (array->GetNumberOfComponents() != numberOfComponents)
+  {
+    vtkErrorMacro("vtkMRMLMarkupsNode::" << failedMethodName << " failed: input array has " << array->GetNumberOfComponents() << " components, expected "
+                                         << numberOfComponents);
+    return false;
+  }
+  if (array->GetNumberOfTuples() != this->GetNumberOfControlPoints())
+  {
+    vtkErrorMacro("vtkMRMLMarkupsNode::" << failedMethodName << " failed: input array has " << array->GetNumberOfTuples() << " tuples, expected "
+                                         << this->GetNumberOfControlPoints() << " (number of control points)");
+    return false;
+  }
+  return true;
+}
+
 //---------------------------------------------------------------------------
 int vtkMRMLMarkupsNode::GetNumberOfControlPoints()
 {
@@ -2542,6 +2566,248 @@ void vtkMRMLMarkupsNode::GetControlPointPositionsWorld(vtkPoints* points)
   }
 }
 
+//---------------------------------------------------------------------------
+void vtkMRMLMarkupsNode::SetControlPointPositions(vtkPoints* points, bool setUndefinedPoints /*=true*/)
+{
+  if (!points)
+  {
+    this->RemoveAllControlPoints();
+    return;
+  }
+
+  int wasModified = this->StartModify();
+  this->IsUpdatingPoints = true;
+
+  vtkIdType numberOfPoints = points->GetNumberOfPoints();
+  int numberOfExistingControlPoints = std::min(this->GetNumberOfControlPoints(), static_cast<int>(numberOfPoints));
+  double position[3] = { 0.0, 0.0, 0.0 };
+  bool positionModified = false;
+  for (int pointIndex = 0; pointIndex < numberOfExistingControlPoints; pointIndex++)
+  {
+    // Update control point directly instead of using SetNthControlPointPosition to avoid
+    // updating the display node scalar range for each point.
+    ControlPoint* controlPoint = this->ControlPoints[static_cast<size_t>(pointIndex)];
+    int oldPositionStatus = controlPoint->PositionStatus;
+    if (!setUndefinedPoints && oldPositionStatus != PositionDefined)
+    {
+      continue;
+    }
+    points->GetPoint(pointIndex, position);
+    if (oldPositionStatus == PositionDefined //
+        && controlPoint->Position[0] == position[0] && controlPoint->Position[1] == position[1] && controlPoint->Position[2] == position[2])
+    {
+      // no change
+      continue;
+    }
+    std::copy_n(position, 3, controlPoint->Position);
+    controlPoint->PositionStatus = PositionDefined;
+    positionModified = true;
+    int n = pointIndex;
+    this->InvokeCustomModifiedEvent(vtkMRMLMarkupsNode::PointModifiedEvent, static_cast<void*>(&n));
+    if (oldPositionStatus != PositionDefined)
+    {
+      this->InvokeCustomModifiedEvent(vtkMRMLMarkupsNode::PointPositionDefinedEvent, static_cast<void*>(&n));
+    }
+    if (oldPositionStatus == PositionMissing)
+    {
+      this->InvokeCustomModifiedEvent(vtkMRMLMarkupsNode::PointPositionNonMissingEvent, static_cast<void*>(&n));
+    }
+  }
+  for (vtkIdType pointIndex = numberOfExistingControlPoints; pointIndex < numberOfPoints; pointIndex++)
+  {
+    // need to add a new point
+    vtkMRMLMarkupsNode::AddControlPoint(vtkVector3d(points->GetPoint(pointIndex)));
+  }
+  while (this->GetNumberOfControlPoints() > numberOfPoints)
+  {
+    this->RemoveNthControlPoint(this->GetNumberOfControlPoints() - 1);
+  }
+
+  if (positionModified)
+  {
+    this->StorableModifiedTime.Modified();
+    if (this->GetDisplayNode())
+    {
+      this->GetDisplayNode()->UpdateScalarRange();
+    }
+  }
+
+  this->IsUpdatingPoints = false;
+  // No need to call UpdateAllMeasurements(), because it is automatically
+  // called in EndModify().
+  this->EndModify(wasModified);
+}
+
+//---------------------------------------------------------------------------
+void vtkMRMLMarkupsNode::GetControlPointPositions(vtkPoints* points)
+{
+  if (!points)
+  {
+    return;
+  }
+  int numberOfControlPoints = this->GetNumberOfControlPoints();
+  points->SetNumberOfPoints(numberOfControlPoints);
+  for (int controlPointIndex = 0; controlPointIndex < numberOfControlPoints; controlPointIndex++)
+  {
+    points->SetPoint(controlPointIndex, this->ControlPoints[static_cast<size_t>(controlPointIndex)]->Position);
+  }
+}
+
+//---------------------------------------------------------------------------
+bool vtkMRMLMarkupsNode::SetControlPointOrientationMatrices(vtkDataArray* orientationMatrices)
+{
+  if (!this->CheckControlPointArray(orientationMatrices, 9, "SetControlPointOrientationMatrices"))
+  {
+    return false;
+  }
+
+  int wasModified = this->StartModify();
+  int numberOfControlPoints = this->GetNumberOfControlPoints();
+  double orientationMatrix[9] = { 1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0 };
+  bool orientationModified = false;
+  for (int controlPointIndex = 0; controlPointIndex < numberOfControlPoints; controlPointIndex++)
+  {
+    ControlPoint* controlPoint = this->ControlPoints[static_cast<size_t>(controlPointIndex)];
+    orientationMatrices->GetTuple(controlPointIndex, orientationMatrix);
+    if (std::equal(orientationMatrix, orientationMatrix + 9, controlPoint->OrientationMatrix))
+    {
+      // no change
+      continue;
+    }
+    std::copy_n(orientationMatrix, 9, controlPoint->OrientationMatrix);
+    orientationModified = true;
+    int n = controlPointIndex;
+    this->InvokeCustomModifiedEvent(vtkMRMLMarkupsNode::PointModifiedEvent, static_cast<void*>(&n));
+  }
+  if (orientationModified)
+  {
+    this->StorableModifiedTime.Modified();
+  }
+  this->EndModify(wasModified);
+  return true;
+}
+
+//---------------------------------------------------------------------------
+void vtkMRMLMarkupsNode::GetControlPointOrientationMatrices(vtkDataArray* orientationMatrices)
+{
+  if (!orientationMatrices)
+  {
+    vtkErrorMacro("GetControlPointOrientationMatrices failed: invalid output array");
+    return;
+  }
+  int numberOfControlPoints = this->GetNumberOfControlPoints();
+  orientationMatrices->SetNumberOfComponents(9);
+  orientationMatrices->SetNumberOfTuples(numberOfControlPoints);
+  for (int controlPointIndex = 0; controlPointIndex < numberOfControlPoints; controlPointIndex++)
+  {
+    orientationMatrices->SetTuple(controlPointIndex, this->ControlPoints[static_cast<size_t>(controlPointIndex)]->OrientationMatrix);
+  }
+}
+
+//---------------------------------------------------------------------------
+bool vtkMRMLMarkupsNode::SetControlPointLabels(vtkStringArray* labels)
+{
+  if (!this->CheckControlPointArray(labels, 1, "SetControlPointLabels"))
+  {
+    return false;
+  }
+  int wasModified = this->StartModify();
+  int numberOfControlPoints = this->GetNumberOfControlPoints();
+  for (int controlPointIndex = 0; controlPointIndex < numberOfControlPoints; controlPointIndex++)
+  {
+    this->SetNthControlPointLabel(controlPointIndex, labels->GetValue(controlPointIndex));
+  }
+  this->EndModify(wasModified);
+  return true;
+}
+
+//---------------------------------------------------------------------------
+bool vtkMRMLMarkupsNode::SetControlPointFlags(vtkDataArray* flags, bool ControlPoint::*flag, const char* failedMethodName)
+{
+  if (!this->CheckControlPointArray(flags, 1, failedMethodName))
+  {
+    return false;
+  }
+
+  // Interaction handle position and measurements are updated in EndModify if any point is modified
+  int wasModified = this->StartModify();
+  int numberOfControlPoints = this->GetNumberOfControlPoints();
+  bool flagModified = false;
+  for (int controlPointIndex = 0; controlPointIndex < numberOfControlPoints; controlPointIndex++)
+  {
+    ControlPoint* controlPoint = this->ControlPoints[static_cast<size_t>(controlPointIndex)];
+    bool value = (flags->GetComponent(controlPointIndex, 0) != 0.0);
+    if (controlPoint->*flag == value)
+    {
+      // no change
+      continue;
+    }
+    controlPoint->*flag = value;
+    flagModified = true;
+    int n = controlPointIndex;
+    this->InvokeCustomModifiedEvent(vtkMRMLMarkupsNode::PointModifiedEvent, static_cast<void*>(&n));
+  }
+  if (flagModified)
+  {
+    this->StorableModifiedTime.Modified();
+  }
+  this->EndModify(wasModified);
+  return true;
+}
+
+//---------------------------------------------------------------------------
+void vtkMRMLMarkupsNode::GetControlPointFlags(vtkDataArray* flags, bool ControlPoint::*flag, const char* failedMethodName)
+{
+  if (!flags)
+  {
+    vtkErrorMacro("vtkMRMLMarkupsNode::" << failedMethodName << " failed: invalid output array");
+    return;
+  }
+  int numberOfControlPoints = this->GetNumberOfControlPoints();
+  flags->SetNumberOfComponents(1);
+  flags->SetNumberOfTuples(numberOfControlPoints);
+  for (int controlPointIndex = 0; controlPointIndex < numberOfControlPoints; controlPointIndex++)
+  {
+    flags->SetComponent(controlPointIndex, 0, this->ControlPoints[static_cast<size_t>(controlPointIndex)]->*flag ? 1.0 : 0.0);
+  }
+}
+
+//---------------------------------------------------------------------------
+bool vtkMRMLMarkupsNode::SetControlPointSelectedFlags(vtkDataArray* flags)
+{
+  return this->SetControlPointFlags(flags, &ControlPoint::Selected, "SetControlPointSelectedFlags");
+}
+
+//---------------------------------------------------------------------------
+void vtkMRMLMarkupsNode::GetControlPointSelectedFlags(vtkDataArray* flags)
+{
+  this->GetControlPointFlags(flags, &ControlPoint::Selected, "GetControlPointSelectedFlags");
+}
+
+//---------------------------------------------------------------------------
+bool vtkMRMLMarkupsNode::SetControlPointLockedFlags(vtkDataArray* flags)
+{
+  return this->SetControlPointFlags(flags, &ControlPoint::Locked, "SetControlPointLockedFlags");
+}
+
+//---------------------------------------------------------------------------
+void vtkMRMLMarkupsNode::GetControlPointLockedFlags(vtkDataArray* flags)
+{
+  this->GetControlPointFlags(flags, &ControlPoint::Locked, "GetControlPointLockedFlags");
+}
+
+//---------------------------------------------------------------------------
+bool vtkMRMLMarkupsNode::SetControlPointVisibilityFlags(vtkDataArray* flags)
+{
+  return this->SetControlPointFlags(flags, &ControlPoint::Visibility, "SetControlPointVisibilityFlags");
+}
+
+//---------------------------------------------------------------------------
+void vtkMRMLMarkupsNode::GetControlPointVisibilityFlags(vtkDataArray* flags)
+{
+  this->GetControlPointFlags(flags, &ControlPoint::Visibility, "GetControlPointVisibilityFlags");
+}
+
 //---------------------------------------------------------------------------
 bool vtkMRMLMarkupsNode::SetControlPointLabelsWorld(vtkStringArray* labels, vtkPoints* points, std::string separator /*=""*/)
 {
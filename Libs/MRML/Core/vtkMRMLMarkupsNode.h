@@ -68,6 +68,7 @@ class vtkMRMLUnitNode;
 ///
 /// \sa vtkMRMLMarkupsDisplayNode
 
+class vtkAbstractArray;
 class vtkAlgorithmOutput;
 class vtkCollection;
 class vtkDataArray;
@@ -321,6 +322,26 @@ public:
   /// Get a copy of all control point positions in world coordinate system
   void GetControlPointPositionsWorld(vtkPoints* points);
 
+  ///@{
+  /// Set/Get all control point positions in node coordinate system at once.
+  /// Setting positions follows the same rules as SetControlPointPositionsWorld.
+  /// All changes are made within a single batched modification, therefore
+  /// the curve, interaction handle, and measurements are updated only once
+  /// and observers receive a single set of modified events.
+  void SetControlPointPositions(vtkPoints* points, bool setUndefinedPoints = true);
+  void GetControlPointPositions(vtkPoints* points);
+  ///@}
+
+  ///@{
+  /// Set/Get orientation matrices of all control points at once, in node coordinate system.
+  /// The array must have 9 components (3x3 matrix elements in row-major order)
+  /// and one tuple for each control point.
+  /// Set returns false if the array is invalid or the number of tuples does not
+  /// match the number of control points.
+  bool SetControlPointOrientationMatrices(vtkDataArray* orientationMatrices);
+  void GetControlPointOrientationMatrices(vtkDataArray* orientationMatrices);
+  ///@}
+
   ///@{
   /// Add a new control point, returning the point index, -1 on failure.
   int AddControlPoint(vtkVector3d point, std::string label = std::string());
@@ -583,8 +604,27 @@ public:
   void SetNthControlPointLabel(int n, std::string label);
   ///@}
 
-  /// Get all control point labels at once.
+  ///@{
+  /// Set/Get all control point labels at once.
+  /// Set returns false if the number of labels does not match the number of control points.
+  bool SetControlPointLabels(vtkStringArray* labels);
   void GetControlPointLabels(vtkStringArray* labels);
+  ///@}
+
+  ///@{
+  /// Set/Get Selected, Locked, or Visibility flag of all control points at once.
+  /// The array must have a single component and one tuple for each control point.
+  /// Non-zero values are interpreted as true. Get methods store 0 and 1 values.
+  /// Set methods return false if the array is invalid or the number of tuples does not
+  /// match the number of control points.
+  /// All changes are made within a single batched modification.
+  bool SetControlPointSelectedFlags(vtkDataArray* flags);
+  void GetControlPointSelectedFlags(vtkDataArray* flags);
+  bool SetControlPointLockedFlags(vtkDataArray* flags);
+  void GetControlPointLockedFlags(vtkDataArray* flags);
+  bool SetControlPointVisibilityFlags(vtkDataArray* flags);
+  void GetControlPointVisibilityFlags(vtkDataArray* flags);
+  ///@}
 
   ///@{
   /// Get/Set the Description flag on the Nth control point,
@@ -942,6 +982,16 @@ protected:
   /// If control point does not exist then an error is logged with the supplied failedMethodName.
   ControlPoint* GetNthControlPointCustomLog(int n, const char* failedMethodName);
 
+  /// Check that the array has the expected number of components and one tuple for each control point.
+  /// Logs an error and returns false if the array cannot be used for setting all control point properties.
+  bool CheckControlPointArray(vtkAbstractArray* array, int numberOfComponents, const char* failedMethodName);
+
+  ///@{
+  /// Helpers for setting/getting a boolean property of all control points at once.
+  bool SetControlPointFlags(vtkDataArray* flags, bool ControlPoint::*flag, const char* failedMethodName);
+  void GetControlPointFlags(vtkDataArray* flags, bool ControlPoint::*flag, const char* failedMethodName);
+  ///@}
+
   /// Set the id of the nth control point.
   /// The goal is to keep this ID unique, so it's
   /// managed by the markups node.
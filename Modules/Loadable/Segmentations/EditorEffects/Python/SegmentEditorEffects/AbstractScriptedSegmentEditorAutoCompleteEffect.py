@@ -1,6 +1,7 @@
 import logging
 
 import ctk
+import numpy as np
 import qt
 import vtk
 
@@ -46,6 +47,22 @@ class AbstractScriptedSegmentEditorAutoCompleteEffect(AbstractScriptedSegmentEdi
         self.clippedMasterImageData = None
         self.clippedMaskImageData = None
 
+        # Set to True in effects that can reuse results of the previous computation.
+        # If enabled then the merged labelmap is kept between preview updates and only the region
+        # where input segments changed is regenerated. The same merged labelmap object is passed to
+        # computePreviewLabelmap each time, and the effect can check mergedLabelmapFullyRegenerated,
+        # mergedLabelmapModifiedExtent, and mergedLabelmapSeedsRemoved to decide what to recompute.
+        # The effect must not modify the merged labelmap.
+        self.incrementalPreviewUpdate = False
+        self.mergedLabelmap = None
+        self.mergedLabelmapFullyRegenerated = True
+        self.mergedLabelmapModifiedExtent = None
+        self.mergedLabelmapSeedsRemoved = False
+        self.segmentMaskSnapshots = {}  # map from segment ID to (labelmap MTime, label value, extent, mask array)
+
+        # Labelmap shared by all preview segments
+        self.previewLabelmap = None
+
         # Observation for auto-update
         self.observedSegmentation = None
         self.segmentationNodeObserverTags = []
@@ -314,6 +331,9 @@ class AbstractScriptedSegmentEditorAutoCompleteEffect(AbstractScriptedSegmentEdi
         self.selectedSegmentModifiedTimes = {}
         self.clippedMasterImageData = None
         self.clippedMaskImageData = None
+        self.mergedLabelmap = None
+        self.segmentMaskSnapshots = {}
+        self.previewLabelmap = None
         self.updateGUIFromMRML()
 
     def onCancel(self):
@@ -553,42 +573,227 @@ class AbstractScriptedSegmentEditorAutoCompleteEffect(AbstractScriptedSegmentEdi
         # TODO: This will no longer be required when we can use the segment editor to set multiple segments
         # as the closed surfaces will be converted as necessary by the segmentation logic.
 
-        mergedImage = slicer.vtkOrientedImageData()
-        segmentationNode.GenerateMergedLabelmapForAllSegments(
-            mergedImage,
-            vtkSegmentationCore.vtkSegmentation.EXTENT_UNION_OF_EFFECTIVE_SEGMENTS, self.mergedLabelmapGeometryImage, self.selectedSegmentIds)
+        if self.incrementalPreviewUpdate:
+            self.updateMergedLabelmap(segmentationNode)
+            mergedImage = self.mergedLabelmap
+        else:
+            mergedImage = slicer.vtkOrientedImageData()
+            segmentationNode.GenerateMergedLabelmapForAllSegments(
+                mergedImage,
+                vtkSegmentationCore.vtkSegmentation.EXTENT_UNION_OF_EFFECTIVE_SEGMENTS, self.mergedLabelmapGeometryImage, self.selectedSegmentIds)
 
         outputLabelmap = slicer.vtkOrientedImageData()
         self.computePreviewLabelmap(mergedImage, outputLabelmap)
 
-        if previewNode.GetSegmentation().GetNumberOfSegments() != self.selectedSegmentIds.GetNumberOfValues():
-            # first update (or number of segments changed), need a full reinitialization
-            previewNode.GetSegmentation().RemoveAllSegments()
+        self.updatePreviewSegments(previewNode, segmentationNode, outputLabelmap)
 
-        for index in range(self.selectedSegmentIds.GetNumberOfValues()):
-            segmentID = self.selectedSegmentIds.GetValue(index)
+        # If the preview was reset, we need to restore the visibility options
+        self.setPreviewOpacity(previewOpacity)
+        self.setPreviewShow3D(previewShow3D)
 
-            previewSegment = previewNode.GetSegmentation().GetSegment(segmentID)
-            if not previewSegment:
-                inputSegment = segmentationNode.GetSegmentation().GetSegment(segmentID)
+        self.updateGUIFromMRML()
+
+    def updatePreviewSegments(self, previewNode, segmentationNode, outputLabelmap):
+        """Show the computed labelmap in the preview segments.
+
+        All preview segments share a single labelmap (label value of the n-th selected segment is n + 1).
+        After the first update, the shared labelmap is updated in place, so that all preview segments
+        are updated with a single modified event.
+        """
+        import vtkSegmentationCorePython as vtkSegmentationCore
 
+        previewSegmentation = previewNode.GetSegmentation()
+        binaryLabelmapName = vtkSegmentationCore.vtkSegmentationConverter.GetSegmentationBinaryLabelmapRepresentationName()
+        numberOfSegments = self.selectedSegmentIds.GetNumberOfValues()
+
+        reinitializationNeeded = (self.previewLabelmap is None or previewSegmentation.GetNumberOfSegments() != numberOfSegments)
+        if not reinitializationNeeded:
+            for index in range(numberOfSegments):
+                previewSegment = previewSegmentation.GetSegment(self.selectedSegmentIds.GetValue(index))
+                if not previewSegment or previewSegment.GetRepresentation(binaryLabelmapName) is not self.previewLabelmap:
+                    reinitializationNeeded = True
+                    break
+
+        if reinitializationNeeded:
+            # first update (or segments changed), need a full reinitialization
+            previewSegmentation.RemoveAllSegments()
+            self.previewLabelmap = outputLabelmap
+            for index in range(numberOfSegments):
+                segmentID = self.selectedSegmentIds.GetValue(index)
+                inputSegment = segmentationNode.GetSegmentation().GetSegment(segmentID)
                 previewSegment = vtkSegmentationCore.vtkSegment()
                 previewSegment.SetName(inputSegment.GetName())
                 previewSegment.SetColor(inputSegment.GetColor())
-                previewNode.GetSegmentation().AddSegment(previewSegment, segmentID)
-
-            labelValue = index + 1  # n-th segment label value = n + 1 (background label value is 0)
-            previewSegment.AddRepresentation(vtkSegmentationCore.vtkSegmentationConverter.GetSegmentationBinaryLabelmapRepresentationName(), outputLabelmap)
-            previewSegment.SetLabelValue(labelValue)
+                previewSegment.AddRepresentation(binaryLabelmapName, self.previewLabelmap)
+                previewSegment.SetLabelValue(index + 1)  # n-th segment label value = n + 1 (background label value is 0)
+                previewSegmentation.AddSegment(previewSegment, segmentID)
+        else:
+            # Replace content of the shared labelmap without invoking modified events for each change
+            wasSourceRepresentationModifiedEnabled = previewSegmentation.SetSourceRepresentationModifiedEnabled(False)
+            self.previewLabelmap.ShallowCopy(outputLabelmap)
+            previewSegmentation.SetSourceRepresentationModifiedEnabled(wasSourceRepresentationModifiedEnabled)
+            self.previewLabelmap.Modified()
 
+        for index in range(numberOfSegments):
             # Automatically hide result segments that are background (all eight corners are non-zero)
-            previewNode.GetDisplayNode().SetSegmentVisibility3D(segmentID, not self.isBackgroundLabelmap(outputLabelmap, labelValue))
+            previewNode.GetDisplayNode().SetSegmentVisibility3D(self.selectedSegmentIds.GetValue(index),
+                                                               not self.isBackgroundLabelmap(self.previewLabelmap, index + 1))
 
-        # If the preview was reset, we need to restore the visibility options
-        self.setPreviewOpacity(previewOpacity)
-        self.setPreviewShow3D(previewShow3D)
+    def updateMergedLabelmap(self, segmentationNode):
+        """Update mergedLabelmap from the selected segments.
 
-        self.updateGUIFromMRML()
+        Only the region where the selected segments changed since the last update is regenerated.
+        The whole labelmap is regenerated if it does not exist yet or if segment labelmap geometry
+        does not match the merged labelmap geometry (in this case the segments need resampling).
+
+        Sets mergedLabelmapFullyRegenerated, mergedLabelmapModifiedExtent (None if not modified),
+        and mergedLabelmapSeedsRemoved (True if any voxel was removed from a segment).
+        """
+        import vtkSegmentationCorePython as vtkSegmentationCore
+
+        segmentation = segmentationNode.GetSegmentation()
+        binaryLabelmapName = vtkSegmentationCore.vtkSegmentationConverter.GetSegmentationBinaryLabelmapRepresentationName()
+
+        fullUpdate = (self.mergedLabelmap is None
+                      or not slicer.vtkOrientedImageDataResample.DoExtentsMatch(self.mergedLabelmap, self.mergedLabelmapGeometryImage))
+        modifiedExtent = None
+        seedsRemoved = False
+        segmentMaskSnapshots = {}
+        for index in range(self.selectedSegmentIds.GetNumberOfValues()):
+            segmentID = self.selectedSegmentIds.GetValue(index)
+            segment = segmentation.GetSegment(segmentID)
+            labelmap = segment.GetRepresentation(binaryLabelmapName) if segment else None
+            labelmapMTime = labelmap.GetMTime() if labelmap else 0
+            labelValue = segment.GetLabelValue() if segment else 0
+            previousSnapshot = self.segmentMaskSnapshots.get(segmentID)
+            if previousSnapshot and previousSnapshot[0] == labelmapMTime and previousSnapshot[1] == labelValue:
+                segmentMaskSnapshots[segmentID] = previousSnapshot
+                continue
+            snapshot = self.getSegmentMask(labelmap, labelValue)
+            if snapshot is None:
+                # Segment needs resampling, only the full update is supported
+                fullUpdate = True
+                break
+            extent, mask = snapshot
+            segmentMaskSnapshots[segmentID] = (labelmapMTime, labelValue, extent, mask)
+            if fullUpdate:
+                continue
+            if previousSnapshot is None:
+                fullUpdate = True
+                continue
+            changedExtent, removed = self.getMaskDifference(previousSnapshot[2], previousSnapshot[3], extent, mask)
+            seedsRemoved = seedsRemoved or removed
+            modifiedExtent = self.getExtentUnion(modifiedExtent, changedExtent)
+
+        if fullUpdate:
+            self.mergedLabelmap = slicer.vtkOrientedImageData()
+            segmentationNode.GenerateMergedLabelmapForAllSegments(
+                self.mergedLabelmap,
+                vtkSegmentationCore.vtkSegmentation.EXTENT_UNION_OF_EFFECTIVE_SEGMENTS, self.mergedLabelmapGeometryImage, self.selectedSegmentIds)
+            # Snapshots are not available if full update was forced by a segment that needs resampling
+            self.segmentMaskSnapshots = segmentMaskSnapshots if len(segmentMaskSnapshots) == self.selectedSegmentIds.GetNumberOfValues() else {}
+            self.mergedLabelmapFullyRegenerated = True
+            self.mergedLabelmapModifiedExtent = list(self.mergedLabelmap.GetExtent())
+            self.mergedLabelmapSeedsRemoved = True
+            return
+
+        self.segmentMaskSnapshots = segmentMaskSnapshots
+        self.mergedLabelmapFullyRegenerated = False
+        self.mergedLabelmapModifiedExtent = modifiedExtent
+        self.mergedLabelmapSeedsRemoved = seedsRemoved
+        if modifiedExtent is None:
+            return
+
+        # Regenerate the modified region and copy it into the merged labelmap
+        modifiedRegionGeometry = slicer.vtkOrientedImageData()
+        modifiedRegionGeometry.DeepCopy(self.mergedLabelmapGeometryImage)
+        modifiedRegionGeometry.SetExtent(modifiedExtent)
+        modifiedRegion = slicer.vtkOrientedImageData()
+        segmentationNode.GenerateMergedLabelmapForAllSegments(
+            modifiedRegion,
+            vtkSegmentationCore.vtkSegmentation.EXTENT_UNION_OF_EFFECTIVE_SEGMENTS, modifiedRegionGeometry, self.selectedSegmentIds)
+        self.getImageArray(self.mergedLabelmap)[self.getExtentSlices(self.mergedLabelmap.GetExtent(), modifiedExtent)] = \
+            self.getImageArray(modifiedRegion)
+        self.mergedLabelmap.Modified()
+
+    def getSegmentMask(self, labelmap, labelValue):
+        """Get mask of a segment within the merged labelmap extent.
+
+        :return: tuple of extent and boolean mask array (both None if the segment is empty),
+          or None if the segment labelmap has different geometry than the merged labelmap.
+        """
+        if labelmap is None or labelmap.GetPointData().GetScalars() is None:
+            return (None, None)
+        if not slicer.vtkOrientedImageDataResample.DoGeometriesMatch(labelmap, self.mergedLabelmapGeometryImage):
+            return None
+        extent = self.getExtentIntersection(labelmap.GetExtent(), self.mergedLabelmapGeometryImage.GetExtent())
+        if extent is None:
+            return (None, None)
+        mask = self.getImageArray(labelmap)[self.getExtentSlices(labelmap.GetExtent(), extent)] == labelValue
+        return (extent, mask)
+
+    def getMaskDifference(self, previousExtent, previousMask, extent, mask):
+        """Get the extent of voxels that differ between two segment masks.
+
+        :return: tuple of extent of changed voxels (None if there is no change) and
+          a boolean value that is True if any voxel was removed from the segment.
+        """
+        unionExtent = self.getExtentUnion(previousExtent, extent)
+        if unionExtent is None:
+            return (None, False)
+        shape = (unionExtent[5] - unionExtent[4] + 1, unionExtent[3] - unionExtent[2] + 1, unionExtent[1] - unionExtent[0] + 1)
+        previousUnionMask = np.zeros(shape, dtype=bool)
+        if previousExtent is not None:
+            previousUnionMask[self.getExtentSlices(unionExtent, previousExtent)] = previousMask
+        unionMask = np.zeros(shape, dtype=bool)
+        if extent is not None:
+            unionMask[self.getExtentSlices(unionExtent, extent)] = mask
+        changedVoxels = previousUnionMask != unionMask
+        if not changedVoxels.any():
+            return (None, False)
+        removed = bool((previousUnionMask & ~unionMask).any())
+        changedExtent = []
+        for kjiAxesToReduce, offset in [((0, 1), unionExtent[0]), ((0, 2), unionExtent[2]), ((1, 2), unionExtent[4])]:
+            changedIndices = np.nonzero(changedVoxels.any(axis=kjiAxesToReduce))[0]
+            changedExtent += [int(changedIndices[0]) + offset, int(changedIndices[-1]) + offset]
+        return (changedExtent, removed)
+
+    @staticmethod
+    def getImageArray(imageData):
+        """Get voxels of a single-component image as a numpy array (indexed as [k, j, i]) that shares memory with the image."""
+        import vtk.util.numpy_support
+
+        dimensions = imageData.GetDimensions()
+        return vtk.util.numpy_support.vtk_to_numpy(imageData.GetPointData().GetScalars()).reshape(
+            dimensions[2], dimensions[1], dimensions[0])
+
+    @staticmethod
+    def getExtentSlices(imageExtent, extent):
+        """Get index of a sub-extent in an array returned by getImageArray."""
+        return (slice(extent[4] - imageExtent[4], extent[5] - imageExtent[4] + 1),
+                slice(extent[2] - imageExtent[2], extent[3] - imageExtent[2] + 1),
+                slice(extent[0] - imageExtent[0], extent[1] - imageExtent[0] + 1))
+
+    @staticmethod
+    def getExtentIntersection(extent1, extent2):
+        """Get intersection of two extents. Returns None if they do not intersect."""
+        intersection = [max(extent1[0], extent2[0]), min(extent1[1], extent2[1]),
+                        max(extent1[2], extent2[2]), min(extent1[3], extent2[3]),
+                        max(extent1[4], extent2[4]), min(extent1[5], extent2[5])]
+        if intersection[0] > intersection[1] or intersection[2] > intersection[3] or intersection[4] > intersection[5]:
+            return None
+        return intersection
+
+    @staticmethod
+    def getExtentUnion(extent1, extent2):
+        """Get the smallest extent that contains both extents. None means empty extent."""
+        if extent1 is None:
+            return list(extent2) if extent2 is not None else None
+        if extent2 is None:
+            return list(extent1)
+        return [min(extent1[0], extent2[0]), max(extent1[1], extent2[1]),
+                min(extent1[2], extent2[2]), max(extent1[3], extent2[3]),
+                min(extent1[4], extent2[4]), max(extent1[5], extent2[5])]
 
 
 ResultPreviewNodeReferenceRole = "SegmentationResultPreview"
@@ -25,6 +25,7 @@ class SegmentEditorGrowFromSeedsEffect(AbstractScriptedSegmentEditorAutoComplete
         self.minimumNumberOfSegmentsWithEditableArea = 1  # if mask is specified then one input segment is sufficient
         self.clippedMasterImageDataRequired = True  # source volume intensities are used by this effect
         self.clippedMaskImageDataRequired = True  # masking is used
+        self.incrementalPreviewUpdate = True  # grow-cut filter can reuse its previous result when seeds are added
         self.growCutFilter = None
 
     def clone(self):
@@ -126,6 +127,9 @@ class SegmentEditorGrowFromSeedsEffect(AbstractScriptedSegmentEditorAutoComplete
                 # No masking is used.
                 # Background segment is expected to surround region of interest, so narrower margin is enough.
                 self.extentGrowthRatio = 0.20
+        elif self.mergedLabelmapSeedsRemoved:
+            # Previous result can only be reused if seeds were added
+            self.growCutFilter.Reset()
 
         if self.scriptedEffect.parameterDefined("SeedLocalityFactor"):
             seedLocalityFactor = self.scriptedEffect.doubleParameter("SeedLocalityFactor")
@@ -43,6 +43,7 @@ class SegmentationsModuleTest2(unittest.TestCase):
         self.TestSection_MarginEffects()
         self.TestSection_MaskingSettings()
         self.TestSection_GrowFromSeedsEffect()
+        self.TestSection_GrowFromSeedsIncrementalPreview()
         logging.info("Test finished")
 
     # ------------------------------------------------------------------------------
@@ -566,3 +567,79 @@ class SegmentationsModuleTest2(unittest.TestCase):
 
         self.checkSegmentVoxelCount(0, 215)  # Segment 1
         self.checkSegmentVoxelCount(1, 785)  # Segment 2
+
+    # ------------------------------------------------------------------------------
+    def TestSection_GrowFromSeedsIncrementalPreview(self):
+        logging.info("Running test on incremental preview update of grow from seeds effect")
+
+        self.segmentation.RemoveAllSegments()
+        segment1Id = self.segmentation.AddEmptySegment("Segment_1")
+        segment2Id = self.segmentation.AddEmptySegment("Segment_2")
+        self.segmentEditorNode.SetOverwriteMode(self.segmentEditorNode.OverwriteAllSegments)
+        self.paintSeed(segment1Id, [3, 5, 4, 5, 3, 5])
+        self.paintSeed(segment2Id, [0, 2, 0, 2, 0, 5])
+
+        growFromSeedsEffect = slicer.modules.segmenteditor.widgetRepresentation().self().editor.effectByName("Grow from seeds").self()
+        growFromSeedsEffect.onPreview()
+        self.assertTrue(growFromSeedsEffect.mergedLabelmapFullyRegenerated)
+
+        # Add seed within the current merged labelmap extent: only the seed region is regenerated
+        newSeedExtent = [0, 1, 4, 5, 0, 1]
+        self.paintSeed(segment2Id, newSeedExtent)
+        growFromSeedsEffect.onPreview()
+        self.assertFalse(growFromSeedsEffect.mergedLabelmapFullyRegenerated)
+        self.assertEqual(growFromSeedsEffect.mergedLabelmapModifiedExtent, newSeedExtent)
+        self.assertFalse(growFromSeedsEffect.mergedLabelmapSeedsRemoved)
+        incrementalVoxelCounts = self.getPreviewVoxelCounts(growFromSeedsEffect, [segment1Id, segment2Id])
+
+        # Incremental result must match full recomputation
+        growFromSeedsEffect.onCancel()
+        growFromSeedsEffect.onPreview()
+        self.assertTrue(growFromSeedsEffect.mergedLabelmapFullyRegenerated)
+        self.assertEqual(self.getPreviewVoxelCounts(growFromSeedsEffect, [segment1Id, segment2Id]), incrementalVoxelCounts)
+
+        # Remove the seed: previous grow-cut result cannot be reused
+        self.paintSeed(segment2Id, newSeedExtent, self.paintEffect.ModificationModeRemove)
+        growFromSeedsEffect.onPreview()
+        self.assertFalse(growFromSeedsEffect.mergedLabelmapFullyRegenerated)
+        self.assertEqual(growFromSeedsEffect.mergedLabelmapModifiedExtent, newSeedExtent)
+        self.assertTrue(growFromSeedsEffect.mergedLabelmapSeedsRemoved)
+        incrementalVoxelCounts = self.getPreviewVoxelCounts(growFromSeedsEffect, [segment1Id, segment2Id])
+
+        growFromSeedsEffect.onCancel()
+        growFromSeedsEffect.onPreview()
+        self.assertEqual(self.getPreviewVoxelCounts(growFromSeedsEffect, [segment1Id, segment2Id]), incrementalVoxelCounts)
+
+        # All preview segments share the same labelmap
+        previewSegmentation = growFromSeedsEffect.getPreviewNode().GetSegmentation()
+        self.assertIs(previewSegmentation.GetSegment(segment1Id).GetRepresentation(self.binaryLabelmapReprName),
+                      previewSegmentation.GetSegment(segment2Id).GetRepresentation(self.binaryLabelmapReprName))
+        growFromSeedsEffect.onCancel()
+
+    def paintSeed(self, segmentId, extent, modificationMode=None):
+        paintModifierLabelmap = vtkSegmentationCore.vtkOrientedImageData()
+        paintModifierLabelmap.SetImageToWorldMatrix(self.ijkToRas)
+        paintModifierLabelmap.SetExtent(extent)
+        paintModifierLabelmap.AllocateScalars(vtk.VTK_UNSIGNED_CHAR, 1)
+        paintModifierLabelmap.GetPointData().GetScalars().Fill(1)
+        self.segmentEditorNode.SetSelectedSegmentID(segmentId)
+        if modificationMode is None:
+            modificationMode = self.paintEffect.ModificationModeAdd
+        self.paintEffect.modifySelectedSegmentByLabelmap(paintModifierLabelmap, modificationMode)
+
+    def getPreviewVoxelCounts(self, effect, segmentIds):
+        previewNode = effect.getPreviewNode()
+        self.assertIsNotNone(previewNode)
+        voxelCounts = []
+        for segmentId in segmentIds:
+            labelmap = slicer.vtkOrientedImageData()
+            previewNode.GetBinaryLabelmapRepresentation(segmentId, labelmap)
+            imageStat = vtk.vtkImageAccumulate()
+            imageStat.SetInputData(labelmap)
+            imageStat.SetComponentExtent(0, 4, 0, 0, 0, 0)
+            imageStat.SetComponentOrigin(0, 0, 0)
+            imageStat.SetComponentSpacing(1, 1, 1)
+            imageStat.IgnoreZeroOn()
+            imageStat.Update()
+            voxelCounts.append(imageStat.GetVoxelCount())
+        return voxelCounts
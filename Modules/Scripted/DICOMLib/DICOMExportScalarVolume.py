@@ -93,16 +93,8 @@ class DICOMExportScalarVolume:
         # TODO: make this a callback for a gui progress dialog
         print(string)
 
-    def export(self):
-        """
-        Export the volume data using the ITK-based utility
-        TODO: confirm that resulting file is valid - may need to change the CLI
-        to include more parameters or do a new implementation ctk/DCMTK
-        See:
-        https://sourceforge.net/apps/mediawiki/gdcm/index.php?title=Writing_DICOM
-        TODO: add more parameters to the CLI and/or find a different
-        mechanism for creating the DICOM files
-        """
+    def cliParameters(self):
+        """Return parameters of the CreateDICOMSeries CLI module that writes the volume into DICOM files."""
         cliparameters = {}
         # Patient
         cliparameters["patientName"] = self.tags["Patient Name"]
@@ -149,6 +141,19 @@ class DICOMExportScalarVolume:
 
         cliparameters["dicomDirectory"] = self.directory
         cliparameters["dicomPrefix"] = self.filenamePrefix
+        return cliparameters
+
+    def export(self):
+        """
+        Export the volume data using the ITK-based utility
+        TODO: confirm that resulting file is valid - may need to change the CLI
+        to include more parameters or do a new implementation ctk/DCMTK
+        See:
+        https://sourceforge.net/apps/mediawiki/gdcm/index.php?title=Writing_DICOM
+        TODO: add more parameters to the CLI and/or find a different
+        mechanism for creating the DICOM files
+        """
+        cliparameters = self.cliParameters()
 
         #
         # run the task (in the background)
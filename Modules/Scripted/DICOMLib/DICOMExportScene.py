@@ -1,8 +1,15 @@
 import logging
 import os
+import queue
+import shutil
+import struct
 import tempfile
+import threading
+import time
+import zipfile
 
 import ctk
+import qt
 import vtk
 
 import slicer
@@ -36,10 +43,24 @@ class DICOMExportScene:
 
     """
 
-    def __init__(self, referenceFile=None, saveDirectoryPath=None):
+    # Number of digits used for storing the zip file size in the private tags.
+    # The size is only known after the scene is compressed, therefore a fixed-width
+    # placeholder is written in the header first and it is filled in at the end.
+    zipSizeDigits = 10
+
+    # Size of the blocks that are read from the scene files and written to the output file
+    chunkSize = 1024 * 1024
+
+    # Maximum number of compressed chunks that are buffered between the compression and the file writing
+    maximumQueuedChunks = 16
+
+    def __init__(self, referenceFile=None, saveDirectoryPath=None, progressCallback=None):
         self.referenceFile = referenceFile
         self.saveDirectoryPath = saveDirectoryPath
 
+        # Progress handler. Accepts a progress message and returns `True` if export should continue.
+        self.progressCallback = progressCallback
+
         # The value is set to the path of the created Slicer Data Bundle DICOM file
         # when the export is completed.
         self.sdbFile = None
@@ -57,8 +78,11 @@ class DICOMExportScene:
         self.optionalTags = {}
 
     def progress(self, string):
-        # TODO: make this a callback for a gui progress dialog
-        logging.info(string)
+        """Report progress. Returns `False` if the export was cancelled."""
+        if self.progressCallback is None:
+            logging.info(string)
+            return True
+        return self.progressCallback(string)
 
     def export(self):
         # Perform export
@@ -69,13 +93,16 @@ class DICOMExportScene:
         """
         Export the scene data:
         - first to a directory using the utility in the mrmlScene
-        - create a zip file using the application logic
-        - create secondary capture based on the sample dataset
-        - add the zip file as a private creator tag
-        TODO: confirm that resulting file is valid - may need to change the CLI
-        to include more parameters or do a new implementation ctk/DCMTK
-        See:
-        https://sourceforge.net/apps/mediawiki/gdcm/index.php?title=Writing_DICOM
+        - create secondary capture based on the sample dataset, with the scene size left as a placeholder
+        - compress the directory in a background thread and stream the zip data
+          into the output file as a private tag, while the secondary capture header is created
+        - fill in the scene size in the header
+
+        The zip file is never written to disk on its own, the compressed data is appended
+        directly to the output file. The bundle must be the last element of the file
+        so that it can be found by seeking from the end of the file.
+
+        :raises UserWarning: if the export is cancelled using the progress callback.
         """
 
         # set up temp directories and files
@@ -84,10 +111,13 @@ class DICOMExportScene:
         else:
             saveDirectoryPath = self.saveDirectoryPath
         saveDirectoryPath = saveDirectoryPath.replace("\\", "/")
-        zipFile = os.path.join(saveDirectoryPath, "scene.zip")
+        bundleParentDir = tempfile.mkdtemp("", "sceneBundle", saveDirectoryPath)
+        bundleDir = os.path.join(bundleParentDir, "scene")
         dumpFile = os.path.join(saveDirectoryPath, "dump.dcm")
         templateFile = os.path.join(saveDirectoryPath, "template.dcm")
-        self.sdbFile = os.path.join(saveDirectoryPath, "SlicerDataBundle.dcm")
+        headerFile = os.path.join(saveDirectoryPath, "header.dcm")
+        sdbFile = os.path.join(saveDirectoryPath, "SlicerDataBundle.dcm")
+        self.sdbFile = None
 
         # get the screen image if not specified
         if self.imageFile is None:
@@ -102,20 +132,73 @@ class DICOMExportScene:
         imageReader.SetFileName(imageFile)
         imageReader.Update()
 
-        # save the scene to the temp dir
-        self.progress("Saving scene into MRB...")
-        if not slicer.mrmlScene.WriteToMRB(zipFile, imageReader.GetOutput()):
-            logging.error("Failed to save scene into MRB file: " + zipFile)
-            return False
+        try:
+            # save the scene to the temp dir
+            if not self.progress("Saving scene into data bundle directory..."):
+                raise UserWarning("Export was cancelled, the scene was not saved.")
+            os.mkdir(bundleDir)
+            if not slicer.mrmlScene.SaveSceneToSlicerDataBundleDirectory(bundleDir, imageReader.GetOutput()):
+                logging.error("Failed to save scene into data bundle directory: " + bundleDir)
+                return False
+
+            with open(sdbFile, "wb") as outputFile:
+                # Start compressing the scene right away, chunks are buffered until the header is ready
+                chunks = queue.Queue(maxsize=self.maximumQueuedChunks)
+                cancelRequested = threading.Event()
+                totalSize = DICOMExportScene._directorySize(bundleDir)
+                readSize = [0]
+                compressor = threading.Thread(
+                    target=DICOMExportScene._zipDirectory,
+                    args=(bundleDir, chunks, cancelRequested, readSize, self.chunkSize),
+                    daemon=True)
+                compressor.start()
+                try:
+                    self.writeHeader(imageFile, dumpFile, templateFile, headerFile, outputFile)
+                    zipSize = self.writeBundle(outputFile, chunks, cancelRequested, readSize, totalSize)
+                finally:
+                    cancelRequested.set()
+                    # Unblock the compressor if it is waiting for free space in the queue
+                    while compressor.is_alive():
+                        try:
+                            chunks.get(timeout=0.1)
+                        except queue.Empty:
+                            pass
+                    compressor.join()
+
+                self.progress("Updating scene size in DICOM header...")
+                self.updateZipSize(outputFile, zipSize)
+
+        except BaseException:
+            if os.path.exists(sdbFile):
+                os.remove(sdbFile)
+            raise
+
+        finally:
+            self.progress("Deleting temporary files...")
+            shutil.rmtree(bundleParentDir, ignore_errors=True)
+            for filePath in [dumpFile, templateFile, headerFile]:
+                if os.path.exists(filePath):
+                    os.remove(filePath)
+            if not self.imageFile:
+                # Temporary imageFile was created automatically
+                os.remove(imageFile)
+
+        self.sdbFile = sdbFile
+        self.progress("Done")
+        return True
 
-        zipSize = os.path.getsize(zipFile)
+    def writeHeader(self, imageFile, dumpFile, templateFile, headerFile, outputFile):
+        """Create the secondary capture data set, without the scene data, and copy it to the output file.
 
+        The private creator string and the zip size tag contain a zero-filled placeholder of
+        fixed width (see `zipSizeDigits`), which is replaced by `updateZipSize`.
+        """
         # Get or create template DICOM dump
         self.progress("Making dicom reference file...")
         if self.referenceFile:
             # A reference file is created, use that as template
             logging.info("Using reference file " + str(self.referenceFile))
-            args = ["--print-all", "--write-pixel", saveDirectoryPath, self.referenceFile]
+            args = ["--print-all", "--write-pixel", os.path.dirname(dumpFile), self.referenceFile]
             dumpByteArray = DICOMLib.DICOMCommand("dcmdump", args).start()
             dump = str(dumpByteArray.data(), encoding="utf-8")
         else:
@@ -126,10 +209,11 @@ class DICOMExportScene:
         # hack: encode the file zip file size as part of the creator string
         # because none of the normal types (UL, DS, LO) seem to survive
         # the dump2dcm step (possibly due to the Unknown nature of the private tag)
-        creatorString = f"3D Slicer {zipSize}"
+        # The zip data element (cadb,1010) is not added here, it is appended to the end of the file.
+        zipSizePlaceholder = "0" * self.zipSizeDigits
+        creatorString = f"3D Slicer {zipSizePlaceholder}"
         candygram = f"""(cadb,0010) LO [{creatorString}]           #  {len(creatorString)}, 1 PrivateCreator
-(cadb,1008) LO [{zipSize}]                                         #   4, 1 Unknown Tag & Data
-(cadb,1010) OB ={zipFile}                                          #  {zipSize}, 1 Unknown Tag & Data
+(cadb,1008) LO [{zipSizePlaceholder}]                                         #  {len(zipSizePlaceholder)}, 1 Unknown Tag & Data
 """
         dump = dump + candygram
 
@@ -139,13 +223,13 @@ class DICOMExportScene:
         fp.write(dump)
         fp.close()
 
-        # Create DICOM template file from dump, embedding the scene mrb file
-        self.progress("Encapsulating scene in DICOM dump...")
+        # Create DICOM template file from dump
+        self.progress("Creating DICOM template...")
         args = [dumpFile, templateFile, "--generate-new-uids", "--overwrite-uids", "--ignore-errors"]
         DICOMLib.DICOMCommand("dump2dcm", args).start()
 
         # Create the Secondary Capture data set by adding a screenshot and some more custom fields
-        # cmd = "img2dcm -k 'SeriesDescription=Slicer Data Bundle' -df %s/template.dcm %s %s" % (saveDirectoryPath, imageFile, self.sdbFile)
+        # cmd = "img2dcm -k 'SeriesDescription=Slicer Data Bundle' -df %s/template.dcm %s %s" % (saveDirectoryPath, imageFile, headerFile)
         seriesDescription = "Slicer Data Bundle" if self.seriesDescription is None else str(self.seriesDescription)
 
         args = ["-k", f"SeriesDescription={seriesDescription}"]
@@ -161,22 +245,122 @@ class DICOMExportScene:
             args += ["-k", f"{str(key)}={str(value)}"]
 
         args += [
-            "--dataset-from", templateFile,  # input DICOM file (generated by dump2dcm, already contains the MRB)
+            "--dataset-from", templateFile,  # input DICOM file (generated by dump2dcm)
             imageFile,  # thumbnail
-            self.sdbFile]  # output file
-        self.progress("Creating DICOM binary file...")
+            headerFile]  # output file
+        if not self.progress("Creating DICOM header..."):
+            raise UserWarning("Export was cancelled, DICOM file is incomplete.")
         DICOMLib.DICOMCommand("img2dcm", args).start()
 
-        self.progress("Deleting temporary files...")
-        os.remove(zipFile)
-        os.remove(dumpFile)
-        os.remove(templateFile)
-        if not self.imageFile:
-            # Temporary imageFile was created automatically
-            os.remove(imageFile)
+        with open(headerFile, "rb") as fp:
+            header = fp.read()
+        # Private tags are stored after the pixel data, so the placeholders are found near the end of the file
+        self._creatorValueOffset = header.rfind(creatorString.encode()) + len("3D Slicer ")
+        self._zipSizeValueOffset = header.rfind(b"\xdb\xca\x08\x10LO") + 8
+        if self._creatorValueOffset < len("3D Slicer ") or self._zipSizeValueOffset < 8:
+            raise ValueError(f"Scene size placeholder is not found in DICOM header {headerFile}")
+        outputFile.write(header)
 
-        self.progress("Done")
-        return True
+        # Header of the zip data element: tag, VR, reserved bytes, and length (filled in by updateZipSize).
+        # The file is encoded as explicit VR little endian (encapsulated JPEG pixel data).
+        outputFile.write(struct.pack("<HH2sHI", 0xcadb, 0x1010, b"OB", 0, 0))
+        self._zipDataOffset = outputFile.tell()
+
+    def writeBundle(self, outputFile, chunks, cancelRequested, readSize, totalSize):
+        """Write compressed chunks to the output file until the compressor is finished.
+
+        Progress is reported while writing and the application remains responsive.
+
+        :return: Size of the written zip data in bytes.
+        :raises UserWarning: if the export is cancelled using the progress callback.
+        """
+        zipSize = 0
+        lastProgressTime = 0.0
+        while True:
+            try:
+                chunk = chunks.get(timeout=0.1)
+            except queue.Empty:
+                chunk = b""
+            if isinstance(chunk, Exception):
+                raise chunk
+            if chunk is None:
+                # compression completed
+                break
+            outputFile.write(chunk)
+            zipSize += len(chunk)
+            if time.time() - lastProgressTime > 0.5:
+                lastProgressTime = time.time()
+                percentDone = 100 * readSize[0] // totalSize if totalSize > 0 else 100
+                if not self.progress(f"Compressing scene into DICOM file... {percentDone}%"):
+                    cancelRequested.set()
+                    raise UserWarning("Export was cancelled, DICOM file is incomplete.")
+                slicer.app.processEvents(qt.QEventLoop.ExcludeUserInputEvents)
+        if zipSize % 2 == 1:
+            # DICOM element values must have even length
+            outputFile.write(b"\0")
+        return zipSize
+
+    def updateZipSize(self, outputFile, zipSize):
+        """Replace the zip size placeholders and set the zip data element length in the output file."""
+        zipSizeString = str(zipSize).zfill(self.zipSizeDigits)
+        if len(zipSizeString) > self.zipSizeDigits or zipSize + 1 > 0xFFFFFFFF:
+            raise ValueError(f"Scene is too large to be stored in a DICOM file ({zipSize} bytes)")
+        outputFile.seek(self._creatorValueOffset)
+        outputFile.write(zipSizeString.encode())
+        outputFile.seek(self._zipSizeValueOffset)
+        outputFile.write(zipSizeString.encode())
+        outputFile.seek(self._zipDataOffset - 4)
+        outputFile.write(struct.pack("<I", zipSize + zipSize % 2))
+        outputFile.seek(0, os.SEEK_END)
+
+    @staticmethod
+    def _directorySize(directory):
+        return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(directory) for name in names)
+
+    @staticmethod
+    def _zipDirectory(directory, chunks, cancelRequested, readSize, chunkSize):
+        """Compress the directory into a zip stream and put the compressed data into the chunks queue.
+
+        Entry names are relative to the parent of the directory, same as in MRB files.
+        This function runs in a background thread, the queue is closed by `None`
+        or by the exception that stopped compression.
+        """
+
+        class ChunkWriter:
+            # Non-seekable stream (zipfile writes data descriptors after each entry)
+            def write(self, data):
+                while True:
+                    if cancelRequested.is_set():
+                        raise UserWarning("Export was cancelled")
+                    try:
+                        chunks.put(bytes(data), timeout=0.1)
+                        return len(data)
+                    except queue.Full:
+                        pass
+
+            def flush(self):
+                pass
+
+        try:
+            parentDir = os.path.dirname(directory)
+            with zipfile.ZipFile(ChunkWriter(), "w", zipfile.ZIP_DEFLATED) as zipFile:
+                for root, dirNames, fileNames in os.walk(directory):
+                    dirNames.sort()
+                    zipFile.write(root, os.path.relpath(root, parentDir))
+                    for fileName in sorted(fileNames):
+                        filePath = os.path.join(root, fileName)
+                        zipInfo = zipfile.ZipInfo.from_file(filePath, os.path.relpath(filePath, parentDir))
+                        zipInfo.compress_type = zipfile.ZIP_DEFLATED
+                        with open(filePath, "rb") as source, zipFile.open(zipInfo, "w") as destination:
+                            while data := source.read(chunkSize):
+                                if cancelRequested.is_set():
+                                    raise UserWarning("Export was cancelled")
+                                destination.write(data)
+                                readSize[0] += len(data)
+            chunks.put(None)
+        except Exception as e:
+            if not cancelRequested.is_set():
+                chunks.put(e)
 
     def dumpFromTags(self, tags):
         # Template is originally from dcmtk (dcmdata\data\SC.dump),
@@ -1,6 +1,7 @@
 import logging
 
 import slicer
+import slicer.subjecthierarchy
 
 #########################################################
 #
@@ -89,6 +90,74 @@ class DICOMPlugin:
         self.tags["seriesDescription"] = "0008,103E"
         self.tags["seriesNumber"] = "0020,0011"
         self.tags["frameOfReferenceUID"] = "0020,0052"
+        # examineSeriesIndependently can be set to True by subclasses if examining
+        # a list of series gives the same loadables as examining each series separately
+        # (and concatenating and sorting the results using sortLoadables).
+        # This allows examining the series concurrently, see DICOMUtils.getLoadablesFromFileLists.
+        self.examineSeriesIndependently = False
+        # examineThreadSafe can be set to True by subclasses if examineForImport can run
+        # in a worker thread. Such plugins must not access slicer.dicomDatabase, the MRML scene, or widgets
+        # during examination, but they must get tag values using tagValue() and tagValueExists(), which return
+        # values that are pre-fetched on the main thread (for all tags listed in self.tags).
+        self.examineThreadSafe = False
+        # tag values pre-fetched by prefetchTagValues, by (file, upper-case tag), None if the tag is not in the file
+        self.prefetchedTagValues = {}
+
+    def prefetchTagValues(self, fileLists):
+        """Read values of all tags in self.tags for all files from the DICOM database.
+        Values are retrieved from the tag cache of the database using bulk queries,
+        values that are not cached are read one by one.
+        Must be called from the main thread, before examining the files in worker threads.
+        """
+        from DICOMLib import DICOMUtils
+
+        db = slicer.dicomDatabase
+        files = [file for fileList in fileLists for file in fileList]
+        tags = sorted({tag.upper() for tag in self.tags.values()})
+        tagValues = DICOMUtils.getFileTagValuesFromDatabase(files, tags, db)
+        for file in files:
+            for tag in tags:
+                if (file, tag) not in tagValues:
+                    value = db.fileValue(file, tag)
+                    if value == "" and not db.fileValueExists(file, tag):
+                        value = None
+                    tagValues[(file, tag)] = value
+        self.prefetchedTagValues.update(tagValues)
+
+    def clearPrefetchedTagValues(self):
+        self.prefetchedTagValues = {}
+
+    def _prefetchedTagValue(self, file, tag):
+        """Return (found, value) of a pre-fetched tag value.
+        Raises RuntimeError if the value was not pre-fetched and it is called from a worker thread.
+        """
+        try:
+            return True, self.prefetchedTagValues[(file, tag.upper())]
+        except KeyError:
+            import threading
+
+            if threading.current_thread() is not threading.main_thread():
+                raise RuntimeError(f"Tag {tag} of {file} was not pre-fetched, it cannot be read from the DICOM database in a worker thread")
+            return False, None
+
+    def tagValue(self, file, tag):
+        """Return value of a tag of a file, as pre-fetched by prefetchTagValues.
+        If the value was not pre-fetched then it is read from the DICOM database,
+        which is only allowed on the main thread.
+        """
+        found, value = self._prefetchedTagValue(file, tag)
+        if not found:
+            return slicer.dicomDatabase.fileValue(file, tag)
+        return value if value is not None else ""
+
+    def tagValueExists(self, file, tag):
+        """Return True if the tag is present in the file. Thread-safe version of `slicer.dicomDatabase.fileValueExists`,
+        see tagValue.
+        """
+        found, value = self._prefetchedTagValue(file, tag)
+        if not found:
+            return slicer.dicomDatabase.fileValueExists(file, tag)
+        return value is not None
 
     def findPrivateTag(self, ds, group, element, privateCreator):
         """Helper function to get private tag from private creator name.
@@ -150,6 +219,12 @@ class DICOMPlugin:
         """
         return []
 
+    def sortLoadables(self, loadables):
+        """Return the loadables in the order as they should be presented to the user.
+        Used when the loadables of multiple series are merged. The default implementation keeps the original order.
+        """
+        return loadables
+
     def examine(self, fileList):
         """Backwards compatibility function for examineForImport
         (renamed on introducing examineForExport to avoid confusion)
@@ -178,6 +253,20 @@ class DICOMPlugin:
         """
         return ""
 
+    def defaultSeriesNodeNameForFile(self, file):
+        """Generate a name suitable for use as a mrml node name based
+        on the series level data of a file of the series.
+        Unlike defaultSeriesNodeName, it can be used in worker threads, see tagValue.
+        """
+        seriesDescription = self.tagValue(file, self.tags["seriesDescription"])
+        seriesNumber = self.tagValue(file, self.tags["seriesNumber"])
+        name = seriesDescription
+        if seriesDescription == "":
+            name = "Unnamed Series"
+        if seriesNumber != "":
+            name = seriesNumber + ": " + name
+        return name
+
     def defaultSeriesNodeName(self, seriesUID):
         """Generate a name suitable for use as a mrml node name based
         on the series level data in the database
@@ -248,6 +337,8 @@ class DICOMPlugin:
         shn = slicer.vtkMRMLSubjectHierarchyNode.GetSubjectHierarchyNode(slicer.mrmlScene)
         pluginHandlerSingleton = slicer.qSlicerSubjectHierarchyPluginHandler.instance()
         sceneItemID = shn.GetSceneItemID()
+        # Use indexed lookup, as searching by UID in the hierarchy is slow when many series are loaded
+        shIndex = slicer.subjecthierarchy.getSubjectHierarchyIndex()
 
         # Set up subject hierarchy item
         seriesItemID = shn.CreateItem(sceneItemID, dataNode)
@@ -299,13 +390,13 @@ class DICOMPlugin:
             # The DICOM browser uses the study instance UID as patient ID directly, but this would not work in the subject hierarchy, because
             # then the DICOM UID of the patient and study tag would be the same, so we add a prefix ("Patient-").
             patientId = "Patient-" + studyInstanceUid
-        patientItemID = shn.GetItemByUID(slicer.vtkMRMLSubjectHierarchyConstants.GetDICOMUIDName(), patientId)
+        patientItemID = shIndex.itemByUID(slicer.vtkMRMLSubjectHierarchyConstants.GetDICOMUIDName(), patientId)
         studyId = slicer.dicomDatabase.fileValue(firstFile, tags["studyID"])
-        studyItemID = shn.GetItemByUID(slicer.vtkMRMLSubjectHierarchyConstants.GetDICOMUIDName(), studyInstanceUid)
+        studyItemID = shIndex.itemByUID(slicer.vtkMRMLSubjectHierarchyConstants.GetDICOMUIDName(), studyInstanceUid)
         slicer.vtkSlicerSubjectHierarchyModuleLogic.InsertDicomSeriesInHierarchy(shn, patientId, studyInstanceUid, seriesInstanceUid)
 
         if not patientItemID:
-            patientItemID = shn.GetItemByUID(slicer.vtkMRMLSubjectHierarchyConstants.GetDICOMUIDName(), patientId)
+            patientItemID = shIndex.itemByUID(slicer.vtkMRMLSubjectHierarchyConstants.GetDICOMUIDName(), patientId)
             if patientItemID:
                 # Add attributes for DICOM tags
                 patientName = slicer.dicomDatabase.fileValue(firstFile, tags["patientName"])
@@ -332,7 +423,7 @@ class DICOMPlugin:
                 shn.SetItemName(patientItemID, patientItemName)
 
         if not studyItemID:
-            studyItemID = shn.GetItemByUID(slicer.vtkMRMLSubjectHierarchyConstants.GetDICOMUIDName(), studyInstanceUid)
+            studyItemID = shIndex.itemByUID(slicer.vtkMRMLSubjectHierarchyConstants.GetDICOMUIDName(), studyInstanceUid)
             if studyItemID:
                 # Add attributes for DICOM tags
                 studyDescription = slicer.dicomDatabase.fileValue(firstFile, tags["studyDescription"])
@@ -350,11 +350,21 @@ class DICOMStoreSCPProcess(DICOMProcess):
 class DICOMListener(DICOMStoreSCPProcess):
     """helper class that uses storscp process including indexing
     into Slicer DICOMdatabase.
+
+    Received files are collected in an ingest queue and indexed in batches:
+    a batch is indexed when ``ingestWindowSec`` has elapsed since the first file
+    of the batch has been received, or when the batch reaches ``maximumBatchSize`` files.
+    File callbacks are called once per batch, which limits database refreshes in the GUI.
+    Paths of received files are stored in a pending list file in the incoming folder
+    until they are indexed, so that files are not lost if the listener is restarted.
+
     TODO: down the line we might have ctkDICOMListener perform
     this task as a QObject callable from PythonQt
     """
 
-    def __init__(self, database, fileToBeAddedCallback=None, fileAddedCallback=None):
+    PENDING_FILES_LIST_FILENAME = "pendingFiles.txt"
+
+    def __init__(self, database, fileToBeAddedCallback=None, fileAddedCallback=None, incomingPort=None):
         self.dicomDatabase = database
         self.indexer = ctk.ctkDICOMIndexer()
         # Enable background indexing to improve performance.
@@ -372,6 +382,17 @@ class DICOMListener(DICOMStoreSCPProcess):
         self.delayedAutoUpdateTimer.interval = autoUpdateDelaySec * 1000
         self.delayedAutoUpdateTimer.connect("timeout()", self.completeIncomingFilesIndexing)
 
+        # Received files that are not yet passed to the indexer
+        self.pendingFiles = []
+        # Received files are collected for at most this long before they are indexed as a batch.
+        self.ingestWindowSec = 1.0
+        # A batch is indexed immediately if this many files are pending.
+        self.maximumBatchSize = 100
+        self.ingestTimer = qt.QTimer()
+        self.ingestTimer.setSingleShot(True)
+        self.ingestTimer.interval = self.ingestWindowSec * 1000
+        self.ingestTimer.connect("timeout()", self.ingestPendingFiles)
+
         # List of received files that are being indexed
         self.incomingFiles = []
         # After self.incomingFiles reaches maximumIncomingFiles, indexing will be forced
@@ -388,14 +409,79 @@ class DICOMListener(DICOMStoreSCPProcess):
         if not os.path.exists(databaseDirectory):
             os.mkdir(databaseDirectory)
         incomingDir = databaseDirectory + "/incoming"
-        super().__init__(incomingDataDir=incomingDir)
+        super().__init__(incomingDataDir=incomingDir, incomingPort=incomingPort)
+        self.pendingFilesListPath = os.path.join(self.incomingDataDir, self.PENDING_FILES_LIST_FILENAME)
 
     def __del__(self):
         super().__del__()
 
+    def start(self, cmd=None, args=None):
+        super().start(cmd, args)
+        # Index files that were received but not indexed before the listener was last stopped
+        previouslyPendingFiles = self.readPendingFilesList()
+        if previouslyPendingFiles:
+            logging.info(f"DICOM listener resumes indexing of {len(previouslyPendingFiles)} previously received files")
+            self.pendingFiles += [filePath for filePath in previouslyPendingFiles if filePath not in self.pendingFiles]
+            self.ingestTimer.start()
+
+    def stop(self):
+        super().stop()
+        # Index files that are already received. The pending list is kept until indexing is completed.
+        if getattr(self, "pendingFiles", None):
+            self.ingestTimer.stop()
+            self.ingestPendingFiles()
+        if getattr(self, "incomingFiles", None):
+            self.delayedAutoUpdateTimer.stop()
+            self.completeIncomingFilesIndexing()
+
     def readFromStandardOutput(self):
         super().readFromStandardOutput(readLineCallback=self.processStdoutLine)
 
+    def readPendingFilesList(self):
+        """Return the list of received files that have not been indexed yet, as recorded in the pending list file."""
+        if not os.path.exists(self.pendingFilesListPath):
+            return []
+        with open(self.pendingFilesListPath, encoding="utf-8") as pendingFilesList:
+            filePaths = [line.rstrip("\n") for line in pendingFilesList]
+        return [filePath for filePath in dict.fromkeys(filePaths) if filePath and os.path.exists(filePath)]
+
+    def writePendingFilesList(self, filePaths):
+        """Replace content of the pending list file."""
+        if not filePaths:
+            if os.path.exists(self.pendingFilesListPath):
+                os.remove(self.pendingFilesListPath)
+            return
+        temporaryPath = self.pendingFilesListPath + ".tmp"
+        with open(temporaryPath, "w", encoding="utf-8") as pendingFilesList:
+            pendingFilesList.writelines(filePath + "\n" for filePath in filePaths)
+        os.replace(temporaryPath, self.pendingFilesListPath)
+
+    def ingestPendingFiles(self):
+        """Pass all pending files to the indexer in a single batch."""
+        if not self.pendingFiles:
+            return
+        batch = self.pendingFiles
+        self.pendingFiles = []
+        logging.debug(f"indexing batch of {len(batch)} files")
+        if self.fileToBeAddedCallback:
+            self.fileToBeAddedCallback()
+        self.indexer.addListOfFiles(self.dicomDatabase, batch, True)
+        self.incomingFiles += batch
+        if len(self.incomingFiles) < self.maximumIncomingFiles:
+            self.delayedAutoUpdateTimer.start()
+        else:
+            # Limit of pending incoming files is reached, complete indexing of files
+            # that we have received so far.
+            self.delayedAutoUpdateTimer.stop()
+            self.completeIncomingFilesIndexing()
+        self.lastFileAdded = batch[-1]
+        if self.fileAddedCallback:
+            logging.debug("calling callback...")
+            self.fileAddedCallback()
+            logging.debug("callback done")
+        else:
+            logging.debug("no callback")
+
     def completeIncomingFilesIndexing(self):
         """Complete indexing of all incoming files and remove them from the incoming folder."""
         logging.debug(f"Complete indexing for indexing to complete for {len(self.incomingFiles)} files.")
@@ -404,8 +490,11 @@ class DICOMListener(DICOMStoreSCPProcess):
 
         self.indexer.waitForImportFinished()
         for dicomFilePath in self.incomingFiles:
-            os.remove(dicomFilePath)
+            if os.path.exists(dicomFilePath):
+                os.remove(dicomFilePath)
         self.incomingFiles = []
+        # Only files that are not passed to the indexer yet remain in the pending list
+        self.writePendingFilesList(self.pendingFiles)
 
     def processStdoutLine(self, line):
         searchTag = "# dcmdump (1/1): "
@@ -413,25 +502,18 @@ class DICOMListener(DICOMStoreSCPProcess):
         if tagStart != -1:
             dicomFilePath = line[tagStart + len(searchTag) :].strip()
             slicer.dicomFilePath = dicomFilePath
-            logging.debug("indexing: %s " % dicomFilePath)
-            if self.fileToBeAddedCallback:
-                self.fileToBeAddedCallback()
-            self.indexer.addFile(self.dicomDatabase, dicomFilePath, True)
-            self.incomingFiles.append(dicomFilePath)
-            if len(self.incomingFiles) < self.maximumIncomingFiles:
-                self.delayedAutoUpdateTimer.start()
-            else:
-                # Limit of pending incoming files is reached, complete indexing of files
-                # that we have received so far.
-                self.delayedAutoUpdateTimer.stop()
-                self.completeIncomingFilesIndexing()
-            self.lastFileAdded = dicomFilePath
-            if self.fileAddedCallback:
-                logging.debug("calling callback...")
-                self.fileAddedCallback()
-                logging.debug("callback done")
-            else:
-                logging.debug("no callback")
+            logging.debug("received: %s " % dicomFilePath)
+            self.pendingFiles.append(dicomFilePath)
+            # Record the file as pending until indexing is completed
+            with open(self.pendingFilesListPath, "a", encoding="utf-8") as pendingFilesList:
+                pendingFilesList.write(dicomFilePath + "\n")
+            if len(self.pendingFiles) >= self.maximumBatchSize:
+                self.ingestTimer.stop()
+                self.ingestPendingFiles()
+            elif not self.ingestTimer.isActive():
+                # The window starts at the first file of the batch, so that a continuous
+                # stream of files does not postpone indexing indefinitely.
+                self.ingestTimer.start()
 
 
 class DICOMSender:
@@ -609,6 +609,63 @@ def seriesUIDsForFiles(files):
     return seriesUIDs
 
 
+# ------------------------------------------------------------------------------
+def createSyntheticCTStudy(directory, numberOfSeries, numberOfSlices):
+    """Write a small synthetic CT study into the directory, for testing.
+
+    Each series contains numberOfSlices 16x16 slices with 1 mm spacing.
+    Returns the list of written file paths.
+    """
+    import numpy as np
+    import pydicom
+    from pydicom.uid import ExplicitVRLittleEndian, generate_uid
+
+    ctImageStorage = "1.2.840.10008.5.1.4.1.1.2"
+    studyInstanceUID = generate_uid()
+    frameOfReferenceUID = generate_uid()
+    filePaths = []
+    for seriesIndex in range(numberOfSeries):
+        seriesInstanceUID = generate_uid()
+        for sliceIndex in range(numberOfSlices):
+            fileMeta = pydicom.dataset.FileMetaDataset()
+            fileMeta.MediaStorageSOPClassUID = ctImageStorage
+            fileMeta.MediaStorageSOPInstanceUID = generate_uid()
+            fileMeta.TransferSyntaxUID = ExplicitVRLittleEndian
+
+            ds = pydicom.dataset.Dataset()
+            ds.file_meta = fileMeta
+            ds.SOPClassUID = ctImageStorage
+            ds.SOPInstanceUID = fileMeta.MediaStorageSOPInstanceUID
+            ds.PatientName = "Synthetic^CT"
+            ds.PatientID = "SyntheticCT"
+            ds.StudyInstanceUID = studyInstanceUID
+            ds.SeriesInstanceUID = seriesInstanceUID
+            ds.FrameOfReferenceUID = frameOfReferenceUID
+            ds.Modality = "CT"
+            ds.SeriesNumber = seriesIndex + 1
+            ds.SeriesDescription = f"Series {seriesIndex + 1}"
+            ds.InstanceNumber = sliceIndex + 1
+            ds.ImagePositionPatient = [0.0, 0.0, float(sliceIndex)]
+            ds.ImageOrientationPatient = [1.0, 0.0, 0.0, 0.0, 1.0, 0.0]
+            ds.PixelSpacing = [1.0, 1.0]
+            ds.SliceThickness = 1.0
+            ds.Rows = 16
+            ds.Columns = 16
+            ds.SamplesPerPixel = 1
+            ds.PhotometricInterpretation = "MONOCHROME2"
+            ds.BitsAllocated = 16
+            ds.BitsStored = 16
+            ds.HighBit = 15
+            ds.PixelRepresentation = 1
+            ds.RescaleIntercept = 0.0
+            ds.RescaleSlope = 1.0
+            ds.PixelData = np.full((ds.Rows, ds.Columns), sliceIndex, dtype=np.int16).tobytes()
+            filePath = os.path.join(directory, f"series{seriesIndex:03d}_slice{sliceIndex:03d}.dcm")
+            pydicom.dcmwrite(filePath, ds, write_like_original=False)
+            filePaths.append(filePath)
+    return filePaths
+
+
 # ------------------------------------------------------------------------------
 class LoadDICOMFilesToDatabase:
     """Context manager to conveniently load DICOM files downloaded zipped from the internet"""
@@ -650,7 +707,7 @@ class LoadDICOMFilesToDatabase:
 # TODO: more consistency checks:
 # - is there gantry tilt?
 # - are the orientations the same for all slices?
-def getSortedImageFiles(filePaths: list[str], epsilon: float = 0.01) -> tuple[list[str], dict[str, str], str]:
+def getSortedImageFiles(filePaths: list[str], epsilon: float = 0.01, fileValue=None) -> tuple[list[str], dict[str, str], str]:
     """Sort DICOM image files in increasing slice order (IS direction) corresponding to a series
 
     Use the first file to get the ImageOrientationPatient for the
@@ -659,9 +716,14 @@ def getSortedImageFiles(filePaths: list[str], epsilon: float = 0.01) -> tuple[li
 
     :param filePaths : Paths of the local DICOM files to sort.
     :param epsilon: Maximum difference in distance between slices to consider spacing uniform.
+    :param fileValue: Function `fileValue(filePath, tag)` that returns a tag value of a file.
+      Defaults to `slicer.dicomDatabase.fileValue`. DICOM plugins that examine files in worker threads
+      use `DICOMPlugin.tagValue`.
 
     :return: Tuple of (files, distances, warningText)
     """
+    if fileValue is None:
+        fileValue = slicer.dicomDatabase.fileValue
     warningText = ""
     if len(filePaths) == 0:
         return filePaths, {}, warningText
@@ -673,15 +735,15 @@ def getSortedImageFiles(filePaths: list[str], epsilon: float = 0.01) -> tuple[li
     tags["numberOfFrames"] = "0028,0008"
     tags["seriesUID"] = "0020,000E"
 
-    seriesUID = slicer.dicomDatabase.fileValue(filePaths[0], tags["seriesUID"])
+    seriesUID = fileValue(filePaths[0], tags["seriesUID"])
 
-    if slicer.dicomDatabase.fileValue(filePaths[0], tags["numberOfFrames"]) not in ["", "1"]:
+    if fileValue(filePaths[0], tags["numberOfFrames"]) not in ["", "1"]:
         warningText += "Multi-frame image. If slice orientation or spacing is non-uniform then the image may be displayed incorrectly. Use with caution.\n"
 
     # Make sure first file contains valid geometry
     ref = {}
     for tag in [tags["position"], tags["orientation"]]:
-        value = slicer.dicomDatabase.fileValue(filePaths[0], tag)
+        value = fileValue(filePaths[0], tag)
         if not value or value == "":
             warningText += "Reference image in series does not contain geometry information. Please use caution.\n"
             return filePaths, {}, warningText
@@ -700,8 +762,8 @@ def getSortedImageFiles(filePaths: list[str], epsilon: float = 0.01) -> tuple[li
     sortList = []
     missingGeometry = False
     for file in filePaths:
-        positionStr = slicer.dicomDatabase.fileValue(file, tags["position"])
-        orientationStr = slicer.dicomDatabase.fileValue(file, tags["orientation"])
+        positionStr = fileValue(file, tags["position"])
+        orientationStr = fileValue(file, tags["orientation"])
         if not positionStr or positionStr == "" or not orientationStr or orientationStr == "":
             missingGeometry = True
             break
@@ -798,8 +860,98 @@ def getDefaultPluginClassNames():
 
 
 # ------------------------------------------------------------------------------
-def getLoadablesFromFileLists(fileLists, pluginClassNames=None, messages=None, progressCallback=None, pluginInstances=None):
-    """Take list of file lists, return loadables by plugin dictionary"""
+def getFileTagValuesFromDatabase(filePaths, tags, database=None):
+    """Get values of DICOM tags of many files using a few bulk queries of the DICOM database tag cache.
+
+    This is much faster than calling `fileValue` for each file and tag, as tag values of all
+    imported files are cached in the database at import time (see `tagsToPrecache`).
+    Files that are not found in the database and tags that are not cached are not included in the result.
+
+    :param filePaths: List of file paths (as returned by `filesForSeries`).
+    :param tags: List of tags (such as "0020,000E").
+    :param database: DICOM database (defaults to `slicer.dicomDatabase`).
+    :return: Dictionary mapping (filePath, tag) to value. Value is None if the tag is not present in the file.
+    """
+    import sqlite3
+
+    # Special values stored in the tag cache by ctkDICOMDatabase
+    tagNotInInstance = "__TAG_NOT_IN_INSTANCE__"
+    valueIsEmptyString = "__VALUE_IS_EMPTY_STRING__"
+    # Limit number of parameters in a query (SQLite may be built with a limit of 999)
+    queryBatchSize = 500
+
+    if database is None:
+        database = slicer.dicomDatabase
+    databaseFilePath = database.databaseFilename
+    tagCacheFilePath = os.path.join(os.path.dirname(databaseFilePath), "ctkDICOMTagCache.sql")
+    if not os.path.isfile(databaseFilePath) or not os.path.isfile(tagCacheFilePath) or not filePaths or not tags:
+        return {}
+    databaseDirectory = os.path.dirname(databaseFilePath)
+    normalizedFilePaths = {os.path.normcase(os.path.normpath(filePath)): filePath for filePath in filePaths}
+    tagsByName = {tag.upper(): tag for tag in tags}
+
+    def batches(values):
+        values = list(values)
+        for startIndex in range(0, len(values), queryBatchSize):
+            yield values[startIndex:startIndex + queryBatchSize]
+
+    # Map SOP instance UIDs to file paths, querying all instances of the series of the files
+    seriesUIDs = {database.seriesForFile(filePath) for filePath in filePaths}
+    filePathByInstanceUID = {}
+    connection = sqlite3.connect(f"file:{databaseFilePath}?mode=ro", uri=True)
+    try:
+        for seriesUIDsBatch in batches(seriesUIDs):
+            rows = connection.execute(
+                f"SELECT SOPInstanceUID, Filename FROM Images WHERE SeriesInstanceUID IN ({','.join('?' * len(seriesUIDsBatch))})",
+                seriesUIDsBatch)
+            for instanceUID, fileName in rows:
+                # File names of files in the database directory are stored relative to the database directory
+                fileName = os.path.normcase(os.path.normpath(os.path.join(databaseDirectory, fileName)))
+                if fileName in normalizedFilePaths:
+                    filePathByInstanceUID[instanceUID] = normalizedFilePaths[fileName]
+    finally:
+        connection.close()
+
+    tagValues = {}
+    connection = sqlite3.connect(f"file:{tagCacheFilePath}?mode=ro", uri=True)
+    try:
+        tagParameters = ",".join("?" * len(tagsByName))
+        for instanceUIDsBatch in batches(filePathByInstanceUID):
+            rows = connection.execute(
+                f"SELECT SOPInstanceUID, Tag, Value FROM TagCache WHERE SOPInstanceUID IN ({','.join('?' * len(instanceUIDsBatch))})"
+                f" AND UPPER(Tag) IN ({tagParameters})",
+                instanceUIDsBatch + list(tagsByName))
+            for instanceUID, tag, value in rows:
+                if value == tagNotInInstance:
+                    value = None
+                elif value == valueIsEmptyString or value is None:
+                    value = ""
+                tagValues[(filePathByInstanceUID[instanceUID], tagsByName[tag.upper()])] = value
+    finally:
+        connection.close()
+    return tagValues
+
+
+# ------------------------------------------------------------------------------
+def getLoadablesFromFileLists(fileLists, pluginClassNames=None, messages=None, progressCallback=None, pluginInstances=None, numberOfWorkers=None):
+    """Take list of file lists, return loadables by plugin dictionary.
+
+    Examination is split into tasks by plugin and, for plugins that set `examineSeriesIndependently`,
+    also by series. Tasks of plugins that set `examineThreadSafe` may run in a pool of worker threads
+    (tag values for these plugins are pre-fetched on the calling thread), all other tasks run in the calling thread.
+    Results are merged in the order of `pluginClassNames` and `fileLists`, so the returned dictionary
+    is the same as if all plugins were run one after the other.
+
+    :param progressCallback: Callback function `progressCallback(pluginClassName, percentageCompleted)`
+      that is called each time a task is completed, if it returns True then examination is cancelled.
+      Plugins that are not fully examined when cancelled are not included in the results.
+    :param pluginInstances: Dictionary of plugin instances by plugin class name. Missing instances are added to it.
+    :param numberOfWorkers: Maximum number of worker threads that examine tasks of thread-safe plugins.
+      If set to `None` then the "DICOM/examineNumberOfWorkers" application setting is used (defaults to number of CPUs, at most 4).
+      If set to 1 then all tasks run in the calling thread.
+    """
+    import concurrent.futures
+
     detailedLogging = slicer.util.settingsValue("DICOM/detailedLogging", False, converter=slicer.util.toBool)
     loadablesByPlugin = {}
     loadEnabled = False
@@ -813,30 +965,112 @@ def getLoadablesFromFileLists(fileLists, pluginClassNames=None, messages=None, p
     if pluginInstances is None:
         pluginInstances = {}
 
-    for step, pluginClassName in enumerate(pluginClassNames):
+    if numberOfWorkers is None:
+        numberOfWorkers = slicer.util.settingsValue("DICOM/examineNumberOfWorkers", min(4, os.cpu_count() or 1), converter=int)
+    numberOfWorkers = max(1, numberOfWorkers)
+
+    # Split the work into tasks: (pluginClassName, fileLists)
+    tasks = []
+    for pluginClassName in pluginClassNames:
         if pluginClassName not in pluginInstances:
             pluginInstances[pluginClassName] = slicer.modules.dicomPlugins[pluginClassName]()
         plugin = pluginInstances[pluginClassName]
-        if progressCallback:
-            cancelled = progressCallback(pluginClassName, step * 100 / len(pluginClassNames))
-            if cancelled:
-                break
+        if plugin.examineSeriesIndependently and len(fileLists) > 1:
+            tasks += [(pluginClassName, [files]) for files in fileLists]
+        else:
+            tasks.append((pluginClassName, fileLists))
+
+    def examine(pluginClassName, taskFileLists):
+        plugin = pluginInstances[pluginClassName]
+        if detailedLogging:
+            logging.debug("Examine for import using " + pluginClassName)
+        loadables = plugin.examineForImport(taskFileLists)
+        # If regular method is not overridden (so returns empty list), try old function
+        # Ensuring backwards compatibility: examineForImport used to be called examine
+        if not loadables:
+            loadables = plugin.examine(taskFileLists)
+        return loadables
+
+    # Results of the tasks, in the same order as the tasks
+    results = [None] * len(tasks)
+    failedPluginClassNames = set()
+    numberOfCompletedTasks = 0
+    cancelled = False
+
+    def taskCompleted(taskIndex, future):
+        nonlocal cancelled, numberOfCompletedTasks
+        pluginClassName = tasks[taskIndex][0]
+        numberOfCompletedTasks += 1
         try:
-            if detailedLogging:
-                logging.debug("Examine for import using " + pluginClassName)
-            loadablesByPlugin[plugin] = plugin.examineForImport(fileLists)
-            # If regular method is not overridden (so returns empty list), try old function
-            # Ensuring backwards compatibility: examineForImport used to be called examine
-            if not loadablesByPlugin[plugin]:
-                loadablesByPlugin[plugin] = plugin.examine(fileLists)
-            loadEnabled = loadEnabled or loadablesByPlugin[plugin] != []
+            results[taskIndex] = future.result()
         except Exception as e:
-            import traceback
+            # Only report the first failure of each plugin
+            if pluginClassName not in failedPluginClassNames:
+                import traceback
+
+                traceback.print_exc()
+                logging.error("DICOM Plugin failed: %s" % str(e))
+                failedPluginClassNames.add(pluginClassName)
+                if messages:
+                    messages.append("Plugin failed: %s." % pluginClassName)
+        if progressCallback and not cancelled:
+            cancelled = progressCallback(pluginClassName, numberOfCompletedTasks * 100 / len(tasks))
+
+    def examineInCallingThread(taskIndices):
+        for taskIndex in taskIndices:
+            future = concurrent.futures.Future()
+            try:
+                future.set_result(examine(*tasks[taskIndex]))
+            except Exception as e:
+                future.set_exception(e)
+            taskCompleted(taskIndex, future)
+            if cancelled:
+                break
+
+    # Plugins that are not thread-safe may use the DICOM database (which can only be accessed
+    # from the thread that opened it) or other Qt objects, therefore they are examined in the calling thread.
+    # Tag values for thread-safe plugins are pre-fetched using bulk queries, which is faster than
+    # querying each tag of each file even if the plugin is examined in the calling thread.
+    threadSafePluginClassNames = {pluginClassName for pluginClassName in pluginClassNames
+                                  if pluginInstances[pluginClassName].examineThreadSafe}
+    workerPluginClassNames = threadSafePluginClassNames if numberOfWorkers > 1 else set()
+    workerTaskIndices = [taskIndex for taskIndex, task in enumerate(tasks) if task[0] in workerPluginClassNames]
+    callingThreadTaskIndices = [taskIndex for taskIndex, task in enumerate(tasks) if task[0] not in workerPluginClassNames]
+
+    for pluginClassName in threadSafePluginClassNames:
+        pluginInstances[pluginClassName].prefetchTagValues(fileLists)
+    try:
+        if not workerTaskIndices:
+            examineInCallingThread(callingThreadTaskIndices)
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=numberOfWorkers) as executor:
+                futureToTaskIndex = {executor.submit(examine, *tasks[taskIndex]): taskIndex for taskIndex in workerTaskIndices}
+                # Examine with the other plugins while the worker threads are busy
+                examineInCallingThread(callingThreadTaskIndices)
+                if not cancelled:
+                    for future in concurrent.futures.as_completed(futureToTaskIndex):
+                        taskCompleted(futureToTaskIndex[future], future)
+                        if cancelled:
+                            break
+                if cancelled:
+                    for pendingFuture in futureToTaskIndex:
+                        pendingFuture.cancel()
+    finally:
+        for pluginClassName in threadSafePluginClassNames:
+            pluginInstances[pluginClassName].clearPrefetchedTagValues()
 
-            traceback.print_exc()
-            logging.error("DICOM Plugin failed: %s" % str(e))
-            if messages:
-                messages.append("Plugin failed: %s." % pluginClassName)
+    # Merge results in a deterministic order
+    for pluginClassName in pluginClassNames:
+        plugin = pluginInstances[pluginClassName]
+        pluginResults = [results[taskIndex] for taskIndex, task in enumerate(tasks) if task[0] == pluginClassName]
+        if pluginClassName in failedPluginClassNames or any(result is None for result in pluginResults):
+            # failed or cancelled
+            continue
+        if len(pluginResults) == 1:
+            loadablesByPlugin[plugin] = pluginResults[0]
+        else:
+            loadablesByPlugin[plugin] = plugin.sortLoadables([loadable for result in pluginResults for loadable in result])
+        loadEnabled = loadEnabled or loadablesByPlugin[plugin] != []
 
     return loadablesByPlugin, loadEnabled
 
@@ -140,6 +140,12 @@ class DICOMPatcherWidget(ScriptedLoadableModuleWidget):
 
         parametersFormLayout.addRow("Specify character set", characterSetLayout)
 
+        self.incrementalCheckBox = qt.QCheckBox()
+        self.incrementalCheckBox.checked = False
+        self.incrementalCheckBox.setToolTip(_("If checked, then files that have not changed since the last patching into the same output directory"
+                                              " (with the same options) are not written again."))
+        parametersFormLayout.addRow(_("Only patch new or modified files"), self.incrementalCheckBox)
+
         self.anonymizeDicomCheckBox = qt.QCheckBox()
         self.anonymizeDicomCheckBox.checked = False
         self.anonymizeDicomCheckBox.setToolTip(_("If checked, then some patient identifiable information will be removed from the patched DICOM files."
@@ -153,6 +159,13 @@ class DICOMPatcherWidget(ScriptedLoadableModuleWidget):
         self.patchButton.toolTip = _("Fix DICOM files in input directory and write them to output directory")
         parametersFormLayout.addRow(self.patchButton)
 
+        #
+        # Dry run Button
+        #
+        self.dryRunButton = qt.QPushButton(_("Dry run"))
+        self.dryRunButton.toolTip = _("Report what files would be created and what fields would be changed, without writing any files")
+        parametersFormLayout.addRow(self.dryRunButton)
+
         #
         # Import Button
         #
@@ -162,6 +175,7 @@ class DICOMPatcherWidget(ScriptedLoadableModuleWidget):
 
         # connections
         self.patchButton.connect("clicked(bool)", self.onPatchButton)
+        self.dryRunButton.connect("clicked(bool)", self.onDryRunButton)
         self.importButton.connect("clicked(bool)", self.onImportButton)
 
         self.statusLabel = qt.QPlainTextEdit()
@@ -178,6 +192,12 @@ class DICOMPatcherWidget(ScriptedLoadableModuleWidget):
         pass
 
     def onPatchButton(self):
+        self.patch(dryRun=False)
+
+    def onDryRunButton(self):
+        self.patch(dryRun=True)
+
+    def patch(self, dryRun):
         with slicer.util.tryWithErrorDisplay(_("Unexpected error."), waitCursor=True):
             import tempfile
 
@@ -212,7 +232,8 @@ class DICOMPatcherWidget(ScriptedLoadableModuleWidget):
                 self.logic.addRule("Anonymize")
             if self.normalizeFileNamesCheckBox.checked:
                 self.logic.addRule("NormalizeFileNames")
-            self.logic.patchDicomDir(self.inputDirSelector.currentPath, self.outputDirSelector.currentPath)
+            self.logic.patchDicomDir(self.inputDirSelector.currentPath, self.outputDirSelector.currentPath, numberOfWorkers=min(8, os.cpu_count() or 1),
+                                     incremental=self.incrementalCheckBox.checked, dryRun=dryRun)
 
     def onImportButton(self):
         self.logic.importDicomDir(self.outputDirSelector.currentPath)
@@ -229,6 +250,11 @@ class DICOMPatcherWidget(ScriptedLoadableModuleWidget):
 
 
 class DICOMPatcherRule:
+    # Set to True in rules that read or modify pixel data (or change the transfer syntax).
+    # If none of the rules need pixel data then only the header is parsed and
+    # pixel data is copied to the output file without decoding.
+    modifiesPixelData = False
+
     def __init__(self, parameters=None):
         self.logCallback = None
         self.parameters = parameters
@@ -253,6 +279,17 @@ class DICOMPatcherRule:
     def generateOutputFilePath(self, ds, filepath):
         return filepath
 
+    def getState(self):
+        """Return identifiers generated by the rule (JSON-serializable), to be stored in the manifest.
+        Rules that generate random identifiers implement this method and setState so that
+        files that are patched in an incremental run get the same identifiers as files patched in previous runs.
+        """
+        return None
+
+    def setState(self, state):
+        """Restore identifiers generated in a previous run. Called after processStart."""
+        pass
+
 
 
 
@@ -264,15 +301,28 @@ class ForceSamePatientNameIdInEachDirectory(DICOMPatcherRule):
 
     def processStart(self, inputRootDir, outputRootDir):
         self.patientIndex = 0
+        # Patient name and ID of each directory: currentSubDir -> [patientName, patientID]
+        self.patientByDirectory = {}
 
     def processDirectory(self, currentSubDir):
+        self.currentSubDir = currentSubDir
         self.firstFileInDirectory = True
         self.patientIndex += 1
 
+    def getState(self):
+        return {"patientByDirectory": self.patientByDirectory}
+
+    def setState(self, state):
+        self.patientByDirectory = dict(state.get("patientByDirectory", {}))
+
     def processDataSet(self, ds):
         import pydicom
 
-        if self.firstFileInDirectory:
+        if self.firstFileInDirectory and self.currentSubDir in self.patientByDirectory:
+            # Use the same patient name and ID as in the previous run
+            self.firstFileInDirectory = False
+            self.patientName, self.patientID = self.patientByDirectory[self.currentSubDir]
+        elif self.firstFileInDirectory:
             # Get patient name and ID for this folder and save it
             self.firstFileInDirectory = False
             if ds.PatientName:
@@ -283,6 +333,7 @@ class ForceSamePatientNameIdInEachDirectory(DICOMPatcherRule):
                 self.patientID = ds.PatientID
             else:
                 self.patientID = pydicom.uid.generate_uid(None)
+            self.patientByDirectory[self.currentSubDir] = [str(self.patientName), str(self.patientID)]
         # Set the same patient name and ID as the first file in the directory
         ds.PatientName = self.patientName
         ds.PatientID = self.patientID
@@ -295,18 +346,29 @@ class ForceSameSeriesInstanceUidInEachDirectory(DICOMPatcherRule):
 
     def processStart(self, inputRootDir, outputRootDir):
         self.seriesIndex = 0
+        # Generated series instance UID of each directory: currentSubDir -> seriesInstanceUID
+        self.seriesInstanceUIDByDirectory = {}
 
     def processDirectory(self, currentSubDir):
+        self.currentSubDir = currentSubDir
         self.firstFileInDirectory = True
         self.seriesIndex += 1
 
+    def getState(self):
+        return {"seriesInstanceUIDByDirectory": self.seriesInstanceUIDByDirectory}
+
+    def setState(self, state):
+        self.seriesInstanceUIDByDirectory = dict(state.get("seriesInstanceUIDByDirectory", {}))
+
     def processDataSet(self, ds):
         import pydicom
 
         if self.firstFileInDirectory:
-            # Get seriesInstanceUID for this folder and save it
+            # Get seriesInstanceUID for this folder (reuse the one generated in a previous run) and save it
             self.firstFileInDirectory = False
-            self.seriesInstanceUID = pydicom.uid.generate_uid(None)
+            if self.currentSubDir not in self.seriesInstanceUIDByDirectory:
+                self.seriesInstanceUIDByDirectory[self.currentSubDir] = pydicom.uid.generate_uid(None)
+            self.seriesInstanceUID = self.seriesInstanceUIDByDirectory[self.currentSubDir]
         # Set the same patient name and ID as the first file in the directory
         ds.SeriesInstanceUID = self.seriesInstanceUID
 
@@ -326,14 +388,32 @@ class GenerateMissingIDs(DICOMPatcherRule):
         self.numberOfSeriesInStudyMap = {}
         # All files without a patient ID will be assigned to the same patient
         self.randomPatientID = pydicom.uid.generate_uid(None)
+        # Random study and series UIDs of each directory: currentSubDir -> [studyUID, seriesInstanceUID]
+        self.randomUIDsByDirectory = {}
 
     def processDirectory(self, currentSubDir):
         import pydicom
 
-        # Assume that all files in a directory belongs to the same study
-        self.randomStudyUID = pydicom.uid.generate_uid(None)
-        # Assume that all files in a directory belongs to the same series
-        self.randomSeriesInstanceUID = pydicom.uid.generate_uid(None)
+        if currentSubDir not in self.randomUIDsByDirectory:
+            # Assume that all files in a directory belongs to the same study and series
+            self.randomUIDsByDirectory[currentSubDir] = [pydicom.uid.generate_uid(None), pydicom.uid.generate_uid(None)]
+        self.randomStudyUID, self.randomSeriesInstanceUID = self.randomUIDsByDirectory[currentSubDir]
+
+    def getState(self):
+        return {
+            "patientIDToRandomIDMap": self.patientIDToRandomIDMap,
+            "studyUIDToRandomUIDMap": self.studyUIDToRandomUIDMap,
+            "seriesUIDToRandomUIDMap": self.seriesUIDToRandomUIDMap,
+            "randomPatientID": self.randomPatientID,
+            "randomUIDsByDirectory": self.randomUIDsByDirectory,
+        }
+
+    def setState(self, state):
+        self.patientIDToRandomIDMap = dict(state.get("patientIDToRandomIDMap", {}))
+        self.studyUIDToRandomUIDMap = dict(state.get("studyUIDToRandomUIDMap", {}))
+        self.seriesUIDToRandomUIDMap = dict(state.get("seriesUIDToRandomUIDMap", {}))
+        self.randomPatientID = state.get("randomPatientID", self.randomPatientID)
+        self.randomUIDsByDirectory = dict(state.get("randomUIDsByDirectory", {}))
 
     def processDataSet(self, ds):
         import pydicom
@@ -533,14 +613,32 @@ class Anonymize(DICOMPatcherRule):
         self.numberOfSeriesInStudyMap = {}
         # All files without a patient ID will be assigned to the same patient
         self.randomPatientID = pydicom.uid.generate_uid(None)
+        # Random study and series UIDs of each directory: currentSubDir -> [studyUID, seriesInstanceUID]
+        self.randomUIDsByDirectory = {}
 
     def processDirectory(self, currentSubDir):
         import pydicom
 
-        # Assume that all files in a directory belongs to the same study
-        self.randomStudyUID = pydicom.uid.generate_uid(None)
-        # Assume that all files in a directory belongs to the same series
-        self.randomSeriesInstanceUID = pydicom.uid.generate_uid(None)
+        if currentSubDir not in self.randomUIDsByDirectory:
+            # Assume that all files in a directory belongs to the same study and series
+            self.randomUIDsByDirectory[currentSubDir] = [pydicom.uid.generate_uid(None), pydicom.uid.generate_uid(None)]
+        self.randomStudyUID, self.randomSeriesInstanceUID = self.randomUIDsByDirectory[currentSubDir]
+
+    def getState(self):
+        return {
+            "patientIDToRandomIDMap": self.patientIDToRandomIDMap,
+            "studyUIDToRandomUIDMap": self.studyUIDToRandomUIDMap,
+            "seriesUIDToRandomUIDMap": self.seriesUIDToRandomUIDMap,
+            "randomPatientID": self.randomPatientID,
+            "randomUIDsByDirectory": self.randomUIDsByDirectory,
+        }
+
+    def setState(self, state):
+        self.patientIDToRandomIDMap = dict(state.get("patientIDToRandomIDMap", {}))
+        self.studyUIDToRandomUIDMap = dict(state.get("studyUIDToRandomUIDMap", {}))
+        self.seriesUIDToRandomUIDMap = dict(state.get("seriesUIDToRandomUIDMap", {}))
+        self.randomPatientID = state.get("randomPatientID", self.randomPatientID)
+        self.randomUIDsByDirectory = dict(state.get("randomUIDsByDirectory", {}))
 
     def processDataSet(self, ds):
         import pydicom
@@ -616,6 +714,14 @@ class SplitUltrasoundSeriesByInstanceNumber(DICOMPatcherRule):
     def processStart(self, inputRootDir, outputRootDir):
         self.seriesInstanceUidAndInstanceNumberToNewSeriesInstanceUidMap = {}
 
+    def getState(self):
+        return {"newSeriesInstanceUIDs": [[seriesInstanceUID, str(instanceNumber), newSeriesInstanceUID] for (seriesInstanceUID, instanceNumber), newSeriesInstanceUID
+                                          in self.seriesInstanceUidAndInstanceNumberToNewSeriesInstanceUidMap.items()]}
+
+    def setState(self, state):
+        for seriesInstanceUID, instanceNumber, newSeriesInstanceUID in state.get("newSeriesInstanceUIDs", []):
+            self.seriesInstanceUidAndInstanceNumberToNewSeriesInstanceUidMap[(seriesInstanceUID, instanceNumber)] = newSeriesInstanceUID
+
     def processDataSet(self, ds):
         import pydicom
 
@@ -627,7 +733,7 @@ class SplitUltrasoundSeriesByInstanceNumber(DICOMPatcherRule):
             return
 
         # Get the new series instance UID for this series instance UID and instance number
-        seriesInstanceUidAndInstanceNumber = (ds.SeriesInstanceUID, ds.InstanceNumber)
+        seriesInstanceUidAndInstanceNumber = (str(ds.SeriesInstanceUID), str(ds.InstanceNumber))
         if seriesInstanceUidAndInstanceNumber not in self.seriesInstanceUidAndInstanceNumberToNewSeriesInstanceUidMap:
             self.seriesInstanceUidAndInstanceNumberToNewSeriesInstanceUidMap[seriesInstanceUidAndInstanceNumber] = pydicom.uid.generate_uid(None)
 
@@ -683,6 +789,9 @@ class DICOMPatcherLogic(ScriptedLoadableModuleLogic):
     https://github.com/Slicer/Slicer/blob/main/Base/Python/slicer/ScriptedLoadableModule.py
     """
 
+    # Name of the file in the output directory that describes the result of the last patching run
+    manifestFileName = "DICOMPatcherManifest.json"
+
     def __init__(self):
         ScriptedLoadableModuleLogic.__init__(self)
         self.logCallback = None
@@ -704,7 +813,7 @@ class DICOMPatcherLogic(ScriptedLoadableModuleLogic):
         if self.logCallback:
             self.logCallback(text)
 
-    def patchDicomDir(self, inputDirPath, outputDirPath):
+    def patchDicomDir(self, inputDirPath, outputDirPath, numberOfWorkers=1, logBatchSize=100, incremental=False, dryRun=False):
         """
         Since CTK (rightly) requires certain basic information [1] before it can import
         data files that purport to be dicom, this code patches the files in a directory
@@ -717,67 +826,279 @@ class DICOMPatcherLogic(ScriptedLoadableModuleLogic):
         same study of the same patient.  Also that each instance (file) is an
         independent (multiframe) series.
 
-        [1] https://github.com/commontk/CTK/blob/16aa09540dcb59c6eafde4d9a88dfee1f0948edc/Libs/DICOM/Core/ctkDICOMDatabase.cpp#L1283-L1287
-        """
-
-        import pydicom
+        Files are read and written by a pool of ``numberOfWorkers`` worker threads, while
+        patching rules are applied on the calling thread, in the same order as files are
+        found in the directory tree. Therefore rules that keep state (for example, per-directory
+        patient name and ID) produce the same result regardless of the number of workers.
 
-        self.addLog("DICOM patching started...")
-        logging.debug("DICOM patch input directory: " + inputDirPath)
-        logging.debug("DICOM patch output directory: " + outputDirPath)
+        If none of the patching rules modify pixel data then only the DICOM header is parsed
+        and pixel data is copied into the output file as is, without reading it into a dataset.
 
-        for rule in self.patchingRules:
-            rule.logCallback = self.addLog
-            rule.processStart(inputDirPath, outputDirPath)
+        A manifest file (see ``manifestFileName``) is written into the output directory that records
+        size, modification time and output path of each patched input file and the rules that were applied.
+        If ``incremental`` is enabled then input files that have not changed since the previous run
+        (and were patched with the same rules into the same output file) are not written again.
+        Unchanged files are still passed to the patching rules (so that rules that keep state,
+        such as output file naming, give the same result as a full run), which only requires
+        reading the header if none of the rules modify pixel data.
+        Identifiers generated by the rules (for example, per-directory series instance UID or
+        anonymized patient ID) are stored in the manifest and reused in incremental runs, so that
+        new files that are added to an already patched directory get the same identifiers as the files
+        that were patched before. Output files of input files that were deleted since the previous run are removed.
 
-        for root, subFolders, files in os.walk(inputDirPath):
-            currentSubDir = os.path.relpath(root, inputDirPath)
-            rootOutput = os.path.join(outputDirPath, currentSubDir)
+        If ``dryRun`` is enabled then only file headers are read, rules are applied, but no files are written.
+        The returned report describes what would be changed.
 
-            # Notify rules that processing of a new subdirectory started
-            for rule in self.patchingRules:
-                rule.processDirectory(currentSubDir)
+        Log messages are collected and reported in batches of ``logBatchSize`` files.
 
-            for file in files:
-                filePath = os.path.join(root, file)
-                self.addLog("Examining %s..." % os.path.join(currentSubDir, file))
+        :return: list of dictionaries, one for each DICOM file, with keys "inputPath", "outputPath",
+          "status" ("new", "modified", "unchanged", or "removed" compared to the manifest of the previous run)
+          and "modifiedTags" (list of tags modified by the rules; only computed in dry run mode).
 
-                skipFileRequestingRule = None
-                for rule in self.patchingRules:
-                    if rule.skipFile(currentSubDir):
-                        skipFileRequestingRule = rule
-                        break
-                if skipFileRequestingRule:
-                    self.addLog("  Rule " + rule.__class__.__name__ + " requested to skip this file.")
-                    continue
+        [1] https://github.com/commontk/CTK/blob/16aa09540dcb59c6eafde4d9a88dfee1f0948edc/Libs/DICOM/Core/ctkDICOMDatabase.cpp#L1283-L1287
+        """
 
-                try:
-                    ds = pydicom.dcmread(filePath)
-                except (OSError, pydicom.filereader.InvalidDicomError):
-                    self.addLog("  Not DICOM file. Skipped.")
-                    continue
+        import collections
+        import concurrent.futures
 
-                self.addLog("  Patching...")
+        self.addLog("DICOM patching started..." if not dryRun else "DICOM patching dry run started...")
+        logging.debug("DICOM patch input directory: " + inputDirPath)
+        logging.debug("DICOM patch output directory: " + outputDirPath)
 
+        numberOfWorkers = max(1, numberOfWorkers)
+        headerOnly = not any(rule.modifiesPixelData for rule in self.patchingRules)
+        if headerOnly:
+            logging.debug("DICOM patch: none of the rules modify pixel data, pixel data is copied without parsing")
+
+        rulesDescription = [{"name": rule.__class__.__name__, "parameters": rule.parameters} for rule in self.patchingRules]
+        previousManifest = self.readManifest(outputDirPath)
+        previousFiles = {}
+        previousRuleStates = []
+        if previousManifest and previousManifest.get("rules") == rulesDescription:
+            previousFiles = previousManifest.get("files", {})
+            previousRuleStates = previousManifest.get("ruleStates", [])
+        elif previousManifest:
+            logging.debug("DICOM patch: patching rules changed since the previous run, all files are patched again")
+        manifestFiles = {}
+        report = []
+
+        logLines = []
+
+        def addBatchedLog(text):
+            logLines.append(text)
+
+        def flushLog():
+            if logLines:
+                self.addLog("\n".join(logLines))
+                logLines.clear()
+
+        for ruleIndex, rule in enumerate(self.patchingRules):
+            rule.logCallback = addBatchedLog
+            rule.processStart(inputDirPath, outputDirPath)
+            if incremental and ruleIndex < len(previousRuleStates) and previousRuleStates[ruleIndex] is not None:
+                rule.setState(previousRuleStates[ruleIndex])
+
+        # Limit the number of files that are read ahead or waiting to be written
+        maxPendingFiles = numberOfWorkers * 4
+        pendingReads = collections.deque()
+        pendingWrites = collections.deque()
+        numberOfProcessedFiles = 0
+
+        def patchNextFile():
+            nonlocal numberOfProcessedFiles
+            event, currentSubDir, file, readFuture = pendingReads.popleft()
+            if event == "directory":
+                # Notify rules that processing of a new subdirectory started
+                for rule in self.patchingRules:
+                    rule.processDirectory(currentSubDir)
+                return
+            # Use the same path format on all platforms and no "./" prefix for files in the root directory
+            relativeInputPath = os.path.normpath(os.path.join(currentSubDir, file)).replace(os.sep, "/")
+            addBatchedLog("Examining %s..." % relativeInputPath)
+            ds, pixelDataOffset, fileStat = readFuture.result()
+            if ds is None:
+                addBatchedLog("  Not DICOM file. Skipped.")
+            else:
+                originalElements = self._dataSetElementValues(ds) if dryRun else None
                 for rule in self.patchingRules:
                     rule.processDataSet(ds)
-
-                patchedFilePath = os.path.abspath(os.path.join(rootOutput, file))
+                patchedFilePath = os.path.abspath(os.path.join(outputDirPath, currentSubDir, file))
                 for rule in self.patchingRules:
                     patchedFilePath = rule.generateOutputFilePath(ds, patchedFilePath)
 
-                ######################################################
-                # Write
-
-                dirName = os.path.dirname(patchedFilePath)
-                if not os.path.exists(dirName):
-                    os.makedirs(dirName)
+                manifestEntry = {
+                    "size": fileStat.st_size,
+                    "mtime": fileStat.st_mtime_ns,
+                    "outputPath": os.path.relpath(patchedFilePath, outputDirPath),
+                }
+                manifestFiles[relativeInputPath] = manifestEntry
+                if relativeInputPath not in previousFiles:
+                    status = "new"
+                elif previousFiles[relativeInputPath] == manifestEntry and os.path.exists(patchedFilePath):
+                    status = "unchanged"
+                else:
+                    status = "modified"
+                reportEntry = {"inputPath": relativeInputPath, "outputPath": patchedFilePath, "status": status, "modifiedTags": []}
+                report.append(reportEntry)
+
+                if dryRun:
+                    patchedElements = self._dataSetElementValues(ds)
+                    reportEntry["modifiedTags"] = sorted(
+                        tag for tag in originalElements.keys() | patchedElements.keys()
+                        if originalElements.get(tag) != patchedElements.get(tag))
+                    addBatchedLog(f"  Would write {status} file: {patchedFilePath}")
+                    if reportEntry["modifiedTags"]:
+                        addBatchedLog("  Modified tags: " + ", ".join(reportEntry["modifiedTags"]))
+                elif incremental and status == "unchanged":
+                    addBatchedLog("  Unchanged since previous run. Skipped.")
+                else:
+                    filePath = os.path.join(inputDirPath, relativeInputPath)
+                    pendingWrites.append(executor.submit(self._writePatchedFile, ds, filePath, pixelDataOffset, patchedFilePath))
+            while pendingWrites and (pendingWrites[0].done() or len(pendingWrites) > maxPendingFiles):
+                addBatchedLog("  Created DICOM file: %s" % pendingWrites.popleft().result())
+            numberOfProcessedFiles += 1
+            if numberOfProcessedFiles % logBatchSize == 0:
+                flushLog()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=numberOfWorkers) as executor:
+            for root, subFolders, files in os.walk(inputDirPath):
+                currentSubDir = os.path.relpath(root, inputDirPath)
+                pendingReads.append(("directory", currentSubDir, None, None))
+                for file in files:
+                    filePath = os.path.join(root, file)
+                    skipFileRequestingRule = None
+                    for rule in self.patchingRules:
+                        if rule.skipFile(filePath):
+                            skipFileRequestingRule = rule
+                            break
+                    if skipFileRequestingRule:
+                        addBatchedLog(f"Rule {skipFileRequestingRule.__class__.__name__} requested to skip {os.path.join(currentSubDir, file)}.")
+                        continue
+                    pendingReads.append(("file", currentSubDir, file, executor.submit(self._readDataSet, filePath, headerOnly or dryRun)))
+                    while len(pendingReads) > maxPendingFiles:
+                        patchNextFile()
+            while pendingReads:
+                patchNextFile()
+            while pendingWrites:
+                addBatchedLog("  Created DICOM file: %s" % pendingWrites.popleft().result())
+
+        # Remove output files of input files that were deleted since the previous run
+        # (unless the same output file is written for another input file)
+        currentOutputPaths = {os.path.normcase(os.path.abspath(reportEntry["outputPath"])) for reportEntry in report}
+        for relativeInputPath, previousEntry in (previousManifest.get("files", {}) if previousManifest else {}).items():
+            if relativeInputPath in manifestFiles:
+                continue
+            removedFilePath = os.path.abspath(os.path.join(outputDirPath, previousEntry["outputPath"]))
+            report.append({"inputPath": relativeInputPath, "outputPath": removedFilePath, "status": "removed", "modifiedTags": []})
+            if os.path.normcase(removedFilePath) in currentOutputPaths or not os.path.exists(removedFilePath):
+                continue
+            if dryRun:
+                addBatchedLog(f"Would remove output of deleted input file {relativeInputPath}: {removedFilePath}")
+            else:
+                os.remove(removedFilePath)
+                addBatchedLog(f"Removed output of deleted input file {relativeInputPath}: {removedFilePath}")
+
+        flushLog()
+
+        statusCounts = collections.Counter(reportEntry["status"] for reportEntry in report)
+        summary = (f"{statusCounts['new']} new, {statusCounts['modified']} modified, {statusCounts['unchanged']} unchanged,"
+                   f" {statusCounts['removed']} removed DICOM files")
+        if dryRun:
+            self.addLog(f"DICOM patching dry run completed ({summary}). No files were written.")
+        else:
+            ruleStates = [rule.getState() for rule in self.patchingRules]
+            self.writeManifest(outputDirPath, {"version": 1, "rules": rulesDescription, "files": manifestFiles, "ruleStates": ruleStates})
+            self.addLog(f"DICOM patching completed ({summary}). Patched files are written to:\n{outputDirPath}")
+        return report
+
+    def readManifest(self, outputDirPath):
+        """Read manifest of a previous patching run from the output directory.
+
+        :return: manifest dictionary or None if not found or invalid.
+        """
+        import json
+
+        manifestFilePath = os.path.join(outputDirPath, self.manifestFileName)
+        if not os.path.exists(manifestFilePath):
+            return None
+        try:
+            with open(manifestFilePath, encoding="utf8") as manifestFile:
+                manifest = json.load(manifestFile)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Failed to read DICOM patcher manifest {manifestFilePath}: {e}")
+            return None
+        if manifest.get("version") != 1:
+            logging.warning(f"Unsupported DICOM patcher manifest version in {manifestFilePath}")
+            return None
+        return manifest
+
+    def writeManifest(self, outputDirPath, manifest):
+        import json
+
+        os.makedirs(outputDirPath, exist_ok=True)
+        manifestFilePath = os.path.join(outputDirPath, self.manifestFileName)
+        # Write to a temporary file first so that an interrupted write does not corrupt the previous manifest
+        with open(manifestFilePath + ".tmp", "w", encoding="utf8") as manifestFile:
+            json.dump(manifest, manifestFile, indent=1)
+        os.replace(manifestFilePath + ".tmp", manifestFilePath)
+
+    @staticmethod
+    def _dataSetElementValues(ds):
+        """Get string representation of all top-level data element values (including file meta information),
+        indexed by element keyword (or tag, for private elements)
+        """
+        elementValues = {}
+        for dataset in [ds.file_meta, ds] if hasattr(ds, "file_meta") else [ds]:
+            for element in dataset:
+                elementValues[element.keyword or str(element.tag)] = str(element.value)
+        return elementValues
+
+    @staticmethod
+    def _readDataSet(filePath, headerOnly):
+        """Read DICOM file. Called from worker threads.
+
+        :return: tuple of (dataset, pixelDataOffset, fileStat). If ``headerOnly`` is enabled then
+          reading stops before pixel data and pixelDataOffset is the file position where
+          pixel data element starts (otherwise it is None). Dataset is None if the file
+          is not a DICOM file.
+        """
+        import pydicom
 
-                self.addLog("  Writing DICOM...")
-                pydicom.dcmwrite(patchedFilePath, ds)
-                self.addLog("  Created DICOM file: %s" % patchedFilePath)
+        try:
+            with open(filePath, "rb") as file:
+                fileStat = os.fstat(file.fileno())
+                ds = pydicom.dcmread(file, stop_before_pixels=headerOnly)
+                if not headerOnly:
+                    return ds, None, fileStat
+                if ds.file_meta.get("TransferSyntaxUID") == pydicom.uid.DeflatedExplicitVRLittleEndian:
+                    # The dataset is compressed as a whole, pixel data cannot be copied separately
+                    file.seek(0)
+                    return pydicom.dcmread(file), None, fileStat
+                return ds, file.tell(), fileStat
+        except (OSError, pydicom.errors.InvalidDicomError):
+            return None, None, None
+
+    @staticmethod
+    def _writePatchedFile(ds, inputFilePath, pixelDataOffset, patchedFilePath):
+        """Write patched dataset to file. Called from worker threads.
+
+        If pixelDataOffset is specified then the dataset only contains the header and
+        the rest of the input file (starting with the pixel data element) is appended unchanged.
+        """
+        import pydicom
+        import shutil
 
-        self.addLog(f"DICOM patching completed. Patched files are written to:\n{outputDirPath}")
+        dirName = os.path.dirname(patchedFilePath)
+        os.makedirs(dirName, exist_ok=True)
+        if pixelDataOffset is None:
+            pydicom.dcmwrite(patchedFilePath, ds)
+            return patchedFilePath
+        with open(patchedFilePath, "wb") as outputFile:
+            pydicom.dcmwrite(outputFile, ds)
+            with open(inputFilePath, "rb") as inputFile:
+                inputFile.seek(pixelDataOffset)
+                shutil.copyfileobj(inputFile, outputFile)
+        return patchedFilePath
 
     def importDicomDir(self, outputDirPath):
         """Utility function to import DICOM files from a directory"""
@@ -807,6 +1128,10 @@ class DICOMPatcherTest(ScriptedLoadableModuleTest):
         """Run as few or as many tests as needed here."""
         self.setUp()
         self.test_DICOMPatcher1()
+        self.setUp()
+        self.test_DICOMPatcherParallel()
+        self.setUp()
+        self.test_DICOMPatcherIncremental()
 
     def test_DICOMPatcher1(self):
         """Ideally you should have several levels of tests.  At the lowest level
@@ -870,7 +1195,7 @@ class DICOMPatcherTest(ScriptedLoadableModuleTest):
         self.delayDisplay("Verify generated files")
 
         expectedWalk = []
-        expectedWalk.append([["pa000"], []])
+        expectedWalk.append([["pa000"], [logic.manifestFileName]])
         expectedWalk.append([["st000"], []])
         expectedWalk.append([["se000"], []])
         expectedWalk.append([[], ["000.dcm"]])
@@ -887,3 +1212,157 @@ class DICOMPatcherTest(ScriptedLoadableModuleTest):
         import shutil
 
         shutil.rmtree(testDir)
+
+    def test_DICOMPatcherParallel(self):
+        """Verify that patching with multiple workers gives the same result as sequential patching,
+        including rules that keep per-directory state.
+        """
+
+        import filecmp
+        import tempfile
+        import pydicom
+
+        testDir = tempfile.mkdtemp(prefix="DICOMPatcherParallelTest-", dir=slicer.app.temporaryPath)
+        inputTestDir = testDir + "/input"
+
+        self.delayDisplay("Generate test files")
+
+        for patientIndex in range(3):
+            patientDir = f"{inputTestDir}/patient{patientIndex}"
+            os.makedirs(patientDir)
+            for instanceIndex in range(5):
+                testFileDICOMFilename = f"{patientDir}/image{instanceIndex}.dcm"
+                file_meta = pydicom.dataset.Dataset()
+                file_meta.MediaStorageSOPClassUID = "1.2.840.10008.5.1.4.1.1.2"  # CT Image Storage
+                file_meta.MediaStorageSOPInstanceUID = f"1.2.3.{patientIndex}.{instanceIndex}"
+                file_meta.ImplementationClassUID = "1.2.3.4"
+                file_meta.TransferSyntaxUID = pydicom.uid.ImplicitVRLittleEndian
+                ds = pydicom.dataset.FileDataset(testFileDICOMFilename, {}, file_meta=file_meta, preamble=b"\0" * 128)
+                ds.PatientName = f"Test^Patient{patientIndex}-{instanceIndex}"
+                ds.PatientID = f"{patientIndex}-{instanceIndex}"
+                ds.StudyInstanceUID = f"1.2.3.{patientIndex}"
+                ds.SeriesInstanceUID = f"1.2.3.{patientIndex}.1"
+                ds.Rows = 2
+                ds.Columns = 2
+                ds.BitsAllocated = 16
+                ds.BitsStored = 16
+                ds.HighBit = 15
+                ds.PixelRepresentation = 0
+                ds.SamplesPerPixel = 1
+                ds.PhotometricInterpretation = "MONOCHROME2"
+                ds.PixelData = bytes([instanceIndex, patientIndex] * 4)
+                ds.is_little_endian = True
+                ds.is_implicit_VR = True
+                ds.save_as(testFileDICOMFilename)
+
+        self.delayDisplay("Patch input files")
+
+        for numberOfWorkers in [1, 4]:
+            logic = DICOMPatcherLogic()
+            logic.addRule("ForceSamePatientNameIdInEachDirectory")
+            logic.addRule("NormalizeFileNames")
+            logic.patchDicomDir(inputTestDir, f"{testDir}/output{numberOfWorkers}", numberOfWorkers=numberOfWorkers)
+
+        self.delayDisplay("Verify generated files")
+
+        numberOfFiles = 0
+        for root, subFolders, files in os.walk(f"{testDir}/output4"):
+            patientNameIds = set()
+            for file in files:
+                if file == DICOMPatcherLogic.manifestFileName:
+                    continue
+                filePath = os.path.join(root, file)
+                numberOfFiles += 1
+                # Header is patched: all files in the directory have the same patient name and ID
+                ds = pydicom.dcmread(filePath)
+                patientNameIds.add((str(ds.PatientName), ds.PatientID))
+                # Pixel data is kept as is
+                self.assertEqual(ds.PixelData[1], int(ds.PatientID.split("-")[0]))
+                # Same output as sequential processing
+                sequentialFilePath = os.path.join(f"{testDir}/output1", os.path.relpath(filePath, f"{testDir}/output4"))
+                self.assertTrue(filecmp.cmp(filePath, sequentialFilePath, shallow=False))
+            self.assertLessEqual(len(patientNameIds), 1)
+        self.assertEqual(numberOfFiles, 15)
+
+        self.delayDisplay("Clean up")
+
+        import shutil
+
+        shutil.rmtree(testDir)
+
+    def test_DICOMPatcherIncremental(self):
+        """Verify dry run, skipping of unchanged files, consistent generated identifiers, and removal of outputs
+        of deleted files when patching into the same output directory again.
+        """
+
+        import tempfile
+        import pydicom
+
+        testDir = tempfile.mkdtemp(prefix="DICOMPatcherIncrementalTest-", dir=slicer.app.temporaryPath)
+        inputTestDir = testDir + "/input"
+        outputTestDir = testDir + "/output"
+        os.makedirs(inputTestDir)
+
+        def writeTestFile(fileName):
+            testFileDICOMFilename = f"{inputTestDir}/{fileName}"
+            file_meta = pydicom.dataset.Dataset()
+            file_meta.MediaStorageSOPClassUID = "1.2.840.10008.5.1.4.1.1.2"  # CT Image Storage
+            file_meta.MediaStorageSOPInstanceUID = pydicom.uid.generate_uid()
+            file_meta.ImplementationClassUID = "1.2.3.4"
+            file_meta.TransferSyntaxUID = pydicom.uid.ImplicitVRLittleEndian
+            ds = pydicom.dataset.FileDataset(testFileDICOMFilename, {}, file_meta=file_meta, preamble=b"\0" * 128)
+            ds.PatientName = "Test^Firstname"
+            ds.PatientID = ""
+            ds.is_little_endian = True
+            ds.is_implicit_VR = True
+            ds.save_as(testFileDICOMFilename)
+
+        writeTestFile("DICOMFile1.dcm")
+        writeTestFile("DICOMFile2.dcm")
+
+        logic = DICOMPatcherLogic()
+        logic.addRule("ForceSamePatientNameIdInEachDirectory")
+        logic.addRule("ForceSameSeriesInstanceUidInEachDirectory")
+
+        def patchedIdentifiers():
+            identifiers = set()
+            for fileName in os.listdir(outputTestDir):
+                if fileName.endswith(".dcm"):
+                    ds = pydicom.dcmread(os.path.join(outputTestDir, fileName))
+                    identifiers.add((ds.PatientID, ds.SeriesInstanceUID))
+            return identifiers
+
+        self.delayDisplay("Dry run")
+        report = logic.patchDicomDir(inputTestDir, outputTestDir, dryRun=True)
+        self.assertEqual([entry["status"] for entry in report], ["new", "new"])
+        self.assertIn("PatientID", report[0]["modifiedTags"])
+        self.assertFalse(os.path.exists(outputTestDir))
+
+        self.delayDisplay("Patch all files")
+        report = logic.patchDicomDir(inputTestDir, outputTestDir, incremental=True)
+        self.assertEqual([entry["status"] for entry in report], ["new", "new"])
+        self.assertTrue(os.path.exists(os.path.join(outputTestDir, logic.manifestFileName)))
+
+        self.delayDisplay("Patch new files only")
+        writeTestFile("DICOMFile3.dcm")
+        report = logic.patchDicomDir(inputTestDir, outputTestDir, incremental=True)
+        statusByFile = {entry["inputPath"]: entry["status"] for entry in report}
+        self.assertEqual(statusByFile, {"DICOMFile1.dcm": "unchanged", "DICOMFile2.dcm": "unchanged", "DICOMFile3.dcm": "new"})
+        self.assertTrue(os.path.exists(os.path.join(outputTestDir, "DICOMFile3.dcm")))
+        # The new file gets the same generated patient ID and series instance UID as the files patched before
+        self.assertEqual(len(patchedIdentifiers()), 1)
+
+        self.delayDisplay("Remove output of deleted files")
+        os.remove(os.path.join(inputTestDir, "DICOMFile2.dcm"))
+        report = logic.patchDicomDir(inputTestDir, outputTestDir, incremental=True)
+        statusByFile = {entry["inputPath"]: entry["status"] for entry in report}
+        self.assertEqual(statusByFile, {"DICOMFile1.dcm": "unchanged", "DICOMFile2.dcm": "removed", "DICOMFile3.dcm": "unchanged"})
+        self.assertFalse(os.path.exists(os.path.join(outputTestDir, "DICOMFile2.dcm")))
+        self.assertEqual(sorted(logic.readManifest(outputTestDir)["files"]), ["DICOMFile1.dcm", "DICOMFile3.dcm"])
+        self.assertEqual(len(patchedIdentifiers()), 1)
+
+        self.delayDisplay("Clean up")
+
+        import shutil
+
+        shutil.rmtree(testDir)
@@ -31,6 +31,7 @@ class DICOMEnhancedUSVolumePluginClass(DICOMPlugin):
         self.tags["photometricInterpretation"] = "0028,0004"
 
         self.detailedLogging = False
+        self.examineSeriesIndependently = True
 
     def examine(self, fileLists):
         """Returns a list of DICOMLoadable instances
@@ -1,6 +1,5 @@
 import logging
 
-import numpy
 import pydicom as dicom
 import vtk
 import vtk.util.numpy_support
@@ -37,6 +36,7 @@ class DICOMGeAbusPluginClass(DICOMPlugin):
 
         # Accepted private creator identifications
         self.privateCreators = ["U-Systems", "General Electric Company 01"]
+        self.examineSeriesIndependently = True
 
     def examine(self, fileLists):
         """Returns a list of DICOMLoadable instances
@@ -279,26 +279,22 @@ class DICOMGeAbusPluginClass(DICOMPlugin):
         displacements = vtk.util.numpy_support.vtk_to_numpy(gridImage.GetPointData().GetScalars()).reshape(nshape)
 
         # Get displacements
-        from math import sin, cos
-
+        # All sampling points are computed at once (as numpy arrays in KJI order, matching the displacement grid)
         ijkToRas = vtk.vtkMatrix4x4()
         volumeNode.GetIJKToRASMatrix(ijkToRas)
+        ijkToRasArray = slicer.util.arrayFromVTKMatrix(ijkToRas)
         spacing = volumeNode.GetSpacing()
         center_IJK = [(extent[0] + extent[1]) / 2.0, extent[2], (extent[4] + extent[5]) / 2.0]
-        sourcePoints_RAS = numpy.zeros(shape=samplingPoints_shape)
-        targetPoints_RAS = numpy.zeros(shape=samplingPoints_shape)
-        for k in range(samplingPoints_shape[2]):
-            for j in range(samplingPoints_shape[1]):
-                for i in range(samplingPoints_shape[0]):
-                    samplingPoint_IJK = [gridAxesIJK[0][i], gridAxesIJK[1][j], gridAxesIJK[2][k], 1]
-                    sourcePoint_RAS = np.array(ijkToRas.MultiplyPoint(samplingPoint_IJK)[:3])
-                    radius = probeRadius - (samplingPoint_IJK[1] - center_IJK[1]) * spacing[1]
-                    angleRad = (samplingPoint_IJK[0] - center_IJK[0]) * spacing[0] / probeRadius
-                    targetPoint_RAS = np.array([
-                        -radius * sin(angleRad),
-                        radius * cos(angleRad) - probeRadius,
-                        spacing[2] * (samplingPoint_IJK[2] - center_IJK[2])])
-                    displacements[k][j][i] = targetPoint_RAS - sourcePoint_RAS
+        samplingPointsK, samplingPointsJ, samplingPointsI = np.meshgrid(
+            np.array(gridAxesIJK[2], dtype=float), np.array(gridAxesIJK[1], dtype=float), np.array(gridAxesIJK[0], dtype=float), indexing="ij")
+        samplingPoints_IJK = np.stack([samplingPointsI, samplingPointsJ, samplingPointsK, np.ones_like(samplingPointsI)], axis=-1)
+        sourcePoints_RAS = (samplingPoints_IJK @ ijkToRasArray.T)[..., :3]
+        radius = probeRadius - (samplingPointsJ - center_IJK[1]) * spacing[1]
+        angleRad = (samplingPointsI - center_IJK[0]) * spacing[0] / probeRadius
+        displacements[..., 0] = -radius * np.sin(angleRad) - sourcePoints_RAS[..., 0]
+        displacements[..., 1] = radius * np.cos(angleRad) - probeRadius - sourcePoints_RAS[..., 1]
+        displacements[..., 2] = spacing[2] * (samplingPointsK - center_IJK[2]) - sourcePoints_RAS[..., 2]
+        slicer.util.arrayFromGridTransformModified(gridTransform)
 
         return gridTransform
 
@@ -43,6 +43,7 @@ class DICOMImageSequencePluginClass(DICOMPlugin):
         self.tags["orientation"] = "0020,0037"
 
         self.detailedLogging = False
+        self.examineSeriesIndependently = True
 
     def examine(self, fileLists):
         """Returns a list of DICOMLoadable instances
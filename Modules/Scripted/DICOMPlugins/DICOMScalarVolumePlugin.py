@@ -38,6 +38,12 @@ class DICOMScalarVolumePluginClass(DICOMPlugin):
         self.orientationEpsilon = orientationEpsilon
         self.acquisitionModeling = None
         self.defaultStudyID = "SLICER10001"  # TODO: What should be the new study ID?
+        self.examineSeriesIndependently = True
+        # examineFiles only uses tag values that are listed in self.tags (see tagValue).
+        # Subclasses that override examination (e.g., in extensions) may use the DICOM database directly,
+        # so they are only considered thread-safe if they set examineThreadSafe explicitly.
+        self.examineThreadSafe = (type(self).examineForImport is DICOMScalarVolumePluginClass.examineForImport
+                                  and type(self).examineFiles is DICOMScalarVolumePluginClass.examineFiles)
 
         self.tags["sopClassUID"] = "0008,0016"
         self.tags["photometricInterpretation"] = "0028,0004"
@@ -167,9 +173,11 @@ class DICOMScalarVolumePluginClass(DICOMPlugin):
                 loadables += loadablesForFiles
                 self.cacheLoadables(files, loadablesForFiles)
 
+        return self.sortLoadables(loadables)
+
+    def sortLoadables(self, loadables):
         # sort the loadables by series number if possible
         loadables.sort(key=cmp_to_key(lambda x, y: self.seriesSorter(x, y)))
-
         return loadables
 
     def cleanNodeName(self, value):
@@ -190,8 +198,7 @@ class DICOMScalarVolumePluginClass(DICOMPlugin):
         files parameter.
         """
 
-        seriesUID = slicer.dicomDatabase.fileValue(files[0], self.tags["seriesUID"])
-        seriesName = self.defaultSeriesNodeName(seriesUID)
+        seriesName = self.defaultSeriesNodeNameForFile(files[0])
 
         # default loadable includes all files for series
         allFilesLoadable = DICOMLoadable()
@@ -245,7 +252,7 @@ class DICOMScalarVolumePluginClass(DICOMPlugin):
         for file in allFilesLoadable.files:
             # check for subseries values
             for tag in subseriesTags:
-                value = slicer.dicomDatabase.fileValue(file, self.tags[tag])
+                value = self.tagValue(file, self.tags[tag])
                 value = value.replace(",", "_")  # remove commas so it can be used as an index
 
                 if tag not in subseriesValues:
@@ -320,19 +327,20 @@ class DICOMScalarVolumePluginClass(DICOMPlugin):
             newFiles = []
             excludedLoadable = False
             for file in loadable.files:
-                if slicer.dicomDatabase.fileValueExists(file, self.tags["pixelData"]):
+                if self.tagValueExists(file, self.tags["pixelData"]):
                     newFiles.append(file)
-                if slicer.dicomDatabase.fileValue(file, self.tags["sopClassUID"]) == "1.2.840.10008.5.1.4.1.1.66.4":
+                sopClassUID = self.tagValue(file, self.tags["sopClassUID"])
+                if sopClassUID == "1.2.840.10008.5.1.4.1.1.66.4":
                     excludedLoadable = True
                     if "DICOMSegmentationPlugin" not in slicer.modules.dicomPlugins:
                         logging.warning("Please install Quantitative Reporting extension to enable loading of DICOM Segmentation objects")
-                elif slicer.dicomDatabase.fileValue(file, self.tags["sopClassUID"]) == "1.2.840.10008.5.1.4.1.1.481.3":
+                elif sopClassUID == "1.2.840.10008.5.1.4.1.1.481.3":
                     excludedLoadable = True
                     if "DicomRtImportExportPlugin" not in slicer.modules.dicomPlugins:
                         logging.warning("Please install SlicerRT extension to enable loading of DICOM RT Structure Set objects")
             if len(newFiles) > 0 and not excludedLoadable:
                 loadable.files = newFiles
-                loadable.grayscale = ("MONOCHROME" in slicer.dicomDatabase.fileValue(newFiles[0], self.tags["photometricInterpretation"]))
+                loadable.grayscale = ("MONOCHROME" in self.tagValue(newFiles[0], self.tags["photometricInterpretation"]))
                 newLoadables.append(loadable)
             elif excludedLoadable:
                 continue
@@ -342,7 +350,7 @@ class DICOMScalarVolumePluginClass(DICOMPlugin):
                 # them through with a warning and low confidence
                 loadable.warning += _("There is no pixel data attribute for the DICOM objects, but they might be readable as secondary capture images.")
                 loadable.confidence = 0.2
-                loadable.grayscale = ("MONOCHROME" in slicer.dicomDatabase.fileValue(loadable.files[0], self.tags["photometricInterpretation"]))
+                loadable.grayscale = ("MONOCHROME" in self.tagValue(loadable.files[0], self.tags["photometricInterpretation"]))
                 newLoadables.append(loadable)
         loadables = newLoadables
 
@@ -352,7 +360,7 @@ class DICOMScalarVolumePluginClass(DICOMPlugin):
         # then adjust confidence values based on warnings
         #
         for loadable in loadables:
-            loadable.files, _distances, loadable.warning = DICOMUtils.getSortedImageFiles(loadable.files, self.spacingEpsilon)
+            loadable.files, _distances, loadable.warning = DICOMUtils.getSortedImageFiles(loadable.files, self.spacingEpsilon, self.tagValue)
 
         loadablesBetterThanAllFiles = []
         if allFilesLoadable.warning != "":
@@ -833,10 +841,8 @@ class DICOMScalarVolumePluginClass(DICOMPlugin):
             # populate the grid so that each corner of each slice
             # is mapped from the source corner to the target corner
             displacements = slicer.util.arrayFromGridTransform(gridTransform)
-            for sliceIndex in range(slices):
-                for row in range(2):
-                    for column in range(2):
-                        displacements[sliceIndex][row][column] = targetCorners[sliceIndex][row][column] - sourceCorners[sliceIndex][row][column]
+            displacements[:] = targetCorners - sourceCorners
+            slicer.util.arrayFromGridTransformModified(gridTransform)
 
         def sliceCornersFromDICOM(self, volumeNode):
             """Calculate the RAS position of each of the four corners of each
@@ -897,11 +903,10 @@ class DICOMScalarVolumePluginClass(DICOMPlugin):
             ijkToRAS = vtk.vtkMatrix4x4()
             volumeNode.GetIJKToRASMatrix(ijkToRAS)
             columns, rows, slices = volumeNode.GetImageData().GetDimensions()
-            corners = numpy.zeros(shape=[slices, 2, 2, 3])
-            for sliceIndex in range(slices):
-                for column in range(2):
-                    for row in range(2):
-                        corners[sliceIndex][row][column] = numpy.array(ijkToRAS.MultiplyPoint([column * columns, row * rows, sliceIndex, 1])[:3])
+            # corner points in IJK, indexed as [slice][row][column]
+            cornerSliceIndices, cornerRows, cornerColumns = numpy.meshgrid(numpy.arange(slices), [0, rows], [0, columns], indexing="ij")
+            corners_IJK = numpy.stack([cornerColumns, cornerRows, cornerSliceIndices, numpy.ones_like(cornerColumns)], axis=-1)
+            corners = (corners_IJK @ slicer.util.arrayFromVTKMatrix(ijkToRAS).T)[..., :3]
             return corners
 
         def cornersToWorld(self, volumeNode, corners):
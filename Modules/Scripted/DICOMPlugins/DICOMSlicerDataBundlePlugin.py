@@ -29,6 +29,7 @@ class DICOMSlicerDataBundlePluginClass(DICOMPlugin):
         self.tags["candygram"] = "cadb,0010"
         self.tags["zipSize"] = "cadb,1008"
         self.tags["zipData"] = "cadb,1010"
+        self.examineSeriesIndependently = True
 
     def examineForImport(self, fileLists):
         """Returns a list of DICOMLoadable instances
@@ -229,10 +230,27 @@ class DICOMSlicerDataBundlePluginClass(DICOMPlugin):
             tags["SeriesNumber"] = exportable.tag("SeriesNumber")
             tags["ContentDate"] = exportable.tag("ContentDate")
 
-        # Perform export
-        exporter = DICOMExportScene(referenceFile, exportable.directory)
+        # Perform export, with a cancellable progress dialog if the application has a main window
+        progressDialog = None
+        progressCallback = None
+        if slicer.util.mainWindow():
+            progressDialog = slicer.util.createProgressDialog(value=0, maximum=0, windowTitle=_("Exporting scene..."))
+
+            def progressCallback(message):
+                progressDialog.labelText = message
+                slicer.app.processEvents()
+                return not progressDialog.wasCanceled
+
+        exporter = DICOMExportScene(referenceFile, exportable.directory, progressCallback)
         exporter.optionalTags = tags
-        exporter.export()
+        try:
+            if not exporter.export():
+                return _("Failed to export scene as Slicer data bundle")
+        except UserWarning:
+            return _("Export of scene as Slicer data bundle was cancelled")
+        finally:
+            if progressDialog:
+                progressDialog.close()
 
         # Success
         return ""
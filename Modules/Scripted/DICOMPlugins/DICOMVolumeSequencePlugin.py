@@ -149,6 +149,54 @@ class DICOMVolumeSequencePluginClass(DICOMPlugin):
 
         return datetime.datetime(year, month, day, hour, minute, second, microsecond)
 
+    @staticmethod
+    def frameDataNode(masterSequenceNode, volumeSequenceNode, sequenceItemIndex):
+        """Return the data node of the volume sequence that is displayed at the given item of the master sequence."""
+        if volumeSequenceNode is masterSequenceNode:
+            return volumeSequenceNode.GetNthDataNode(sequenceItemIndex)
+        indexValue = masterSequenceNode.GetNthIndexValue(sequenceItemIndex)
+        dataNode = volumeSequenceNode.GetDataNodeAtValue(indexValue, True)
+        if not dataNode:
+            # Use the closest previous item, same way as the sequence browser does
+            dataNode = volumeSequenceNode.GetDataNodeAtValue(indexValue, False)
+        return dataNode
+
+    def exportFrames(self, masterSequenceNode, volumeSequenceNode, framesParameters):
+        """Write each frame into DICOM files by running CreateDICOMSeries CLI modules concurrently.
+
+        For each running CLI a temporary volume node is added to the scene, which shares the voxels
+        of the data node in the sequence (no voxel data is copied).
+
+        :param framesParameters: list of CreateDICOMSeries CLI parameters, one item for each item of the master sequence.
+        :return: error message, empty string on success.
+        """
+        if not hasattr(slicer.modules, "createdicomseries"):
+            return _("CreateDICOMSeries module is not found")
+
+        exportQueue = slicer.cli.CLIJobQueue()
+        futures = []
+        for sequenceItemIndex, frameParameters in enumerate(framesParameters):
+            dataNode = self.frameDataNode(masterSequenceNode, volumeSequenceNode, sequenceItemIndex)
+            if not dataNode or not dataNode.IsA("vtkMRMLScalarVolumeNode"):
+                exportQueue.cancelAll()
+                exportQueue.wait()
+                return _("Item {index} of the sequence is not a scalar volume").format(index=sequenceItemIndex)
+            frameVolumeNode = slicer.mrmlScene.AddNewNodeByClass(dataNode.GetClassName(), slicer.mrmlScene.GetUniqueNameByString("__tmp__"))
+            frameVolumeNode.SetHideFromEditors(True)
+            frameVolumeNode.CopyContent(dataNode, False)
+            frameParameters = dict(frameParameters)
+            frameParameters["inputVolume"] = frameVolumeNode.GetID()
+            future = exportQueue.submit(slicer.modules.createdicomseries, frameParameters)
+            future.add_done_callback(lambda future, frameVolumeNode=frameVolumeNode: slicer.mrmlScene.RemoveNode(frameVolumeNode))
+            futures.append(future)
+        exportQueue.wait()
+
+        failedItemIndices = [str(sequenceItemIndex) for sequenceItemIndex, future in enumerate(futures)
+                             if future.cancelled() or future.exception()]
+        if failedItemIndices:
+            return _("Failed to export items {indices} of the sequence").format(indices=", ".join(failedItemIndices))
+        return ""
+
     def export(self, exportables):
         for exportable in exportables:
             # Get volume node to export
@@ -217,9 +265,8 @@ class DICOMVolumeSequencePluginClass(DICOMPlugin):
                 return error
             # TODO: more tag checks
 
-            sequenceItemCount = sequenceBrowserNode.GetMasterSequenceNode().GetNumberOfDataNodes()
-            originalSelectedSequenceItemNumber = sequenceBrowserNode.GetSelectedItemNumber()
-            masterVolumeNode = sequenceBrowserNode.GetMasterSequenceNode()
+            masterSequenceNode = sequenceBrowserNode.GetMasterSequenceNode()
+            sequenceItemCount = masterSequenceNode.GetNumberOfDataNodes()
 
             # initialize content datetime from series datetime
             contentStartDate = exportable.tag("SeriesDate")
@@ -244,20 +291,26 @@ class DICOMVolumeSequencePluginClass(DICOMPlugin):
             directory = directoryDir.absolutePath()
             logging.info("Export scalar volume '" + volumeNode.GetName() + "' to directory " + directory)
 
+            # Generate CLI parameters of all frames up front
+            framesParameters = []
             for sequenceItemIndex in range(sequenceItemCount):
-                # Switch to next item in the series
-                sequenceBrowserNode.SetSelectedItemNumber(sequenceItemIndex)
-                slicer.app.processEvents()
                 # Compute content date&time
                 # TODO: verify that unit in sequence node is "second" (and convert to seconds if not)
-                timeOffsetSec = float(masterVolumeNode.GetNthIndexValue(sequenceItemIndex)) - float(masterVolumeNode.GetNthIndexValue(0))
+                timeOffsetSec = float(masterSequenceNode.GetNthIndexValue(sequenceItemIndex)) - float(masterSequenceNode.GetNthIndexValue(0))
                 contentDatetime = contentStartDatetime + datetime.timedelta(seconds=timeOffsetSec)
                 tags["Content Date"] = contentDatetime.strftime("%Y%m%d")
                 tags["Content Time"] = contentDatetime.strftime("%H%M%S.%f")
-                # Perform export
                 filenamePrefix = f"IMG_{sequenceItemIndex:04d}_"
+                # Window/level of the proxy node's display node is used for all frames
                 exporter = DICOMExportScalarVolume(tags["Study ID"], volumeNode, tags, directory, filenamePrefix)
-                exporter.export()
+                framesParameters.append(exporter.cliParameters())
+
+            # Write frames in parallel. Frames are read directly from the sequence, without changing the selected
+            # item in the sequence browser.
+            error = self.exportFrames(masterSequenceNode, volumeSequenceNode, framesParameters)
+            if error:
+                logging.error(error)
+                return error
 
         # Success
         return ""
@@ -276,6 +276,17 @@ class EndoscopyWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
         advancedFormLayout.addRow(saveExportModelButton)
         self.saveExportModelButton = saveExportModelButton
 
+        # Button for exporting the camera trajectory as sequences
+        exportSequencesButton = qt.QPushButton(_("Export as sequences"))
+        exportSequencesButton.toolTip = _(
+            "Export the camera and cursor transform of each frame of the flythrough as sequences,"
+            " for replaying or capturing the flythrough.",
+        )
+        exportSequencesButton.enabled = False
+        exportSequencesButton.connect("clicked()", self.onExportSequencesButtonClicked)
+        advancedFormLayout.addRow(exportSequencesButton)
+        self.exportSequencesButton = exportSequencesButton
+
     def cleanup(self):
         """Called when the application closes and the module widget is destroyed."""
         self.setInputCurve(None)
@@ -346,9 +357,18 @@ class EndoscopyWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
         self.flythroughCollapsibleButton.enabled = enable
         self.advancedCollapsibleButton.enabled = enable
         self.saveExportModelButton.enabled = enable
+        self.exportSequencesButton.enabled = enable
 
         self.frameSlider.maximum = max(0, numberOfControlPoints - 2)
 
+        self.updateKeyframeButtons()
+
+        # If there is no input curve available (e.g scene close), stop playblack
+        if not self.inputCurve:
+            self.setPlaybackEnabled(False)
+
+    def updateKeyframeButtons(self):
+        """Update the keyframe buttons that depend on the current frame."""
         resampledCurvePointIndex = int(self.frameSlider.value)
         deletable = resampledCurvePointIndex in self.logic.cameraOrientationResampledCurveIndices
         self.deleteOrientationButton.enabled = deletable
@@ -371,10 +391,6 @@ class EndoscopyWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
             lastResampledCurvePointIndex is not None and lastResampledCurvePointIndex != resampledCurvePointIndex,
         )
 
-        # If there is no input curve available (e.g scene close), stop playblack
-        if not self.inputCurve:
-            self.setPlaybackEnabled(False)
-
     def onInputCurveControlPointModified(self, *_unused):
         if self.inputCurve.GetAttribute(slicer.vtkMRMLMarkupsDisplayNode.GetMovingMarkupIndexAttributeName()):
             return
@@ -460,6 +476,10 @@ class EndoscopyWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
         )
         logging.debug("-> Model created")
 
+    def onExportSequencesButtonClicked(self):
+        with slicer.util.tryWithErrorDisplay(_("Failed to export flythrough sequences."), waitCursor=True):
+            self.logic.exportTrajectoryToSequences(frameSkip=self.skip)
+
     def flyToNext(self):
         currentStep = int(self.frameSlider.value)
         nextStep = currentStep + self.skip + 1
@@ -471,8 +491,9 @@ class EndoscopyWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
         """Apply the resampledCurvePointIndex-th step in the path to the global camera"""
         self.logic.updateCameraFromOrientationAtIndex(resampledCurvePointIndex)
 
-        # Update UI
-        self.updateWidgetFromMRML()
+        # Update UI. Only the keyframe buttons depend on the current frame, the rest of the
+        # widget is updated when the input curve or the path is modified.
+        self.updateKeyframeButtons()
 
     @staticmethod
     def _viewNodeIDFromCameraNode(cameraNode):
@@ -590,6 +611,14 @@ class EndoscopyLogic:
     NODE_PATH_VIEW_ANGLE_ATTRIBUTE_NAME = "Endoscopy.Path.ViewAngle"
     DEFAULT_CAMERA_VIEW_ANGLE = 30.0
 
+    # Camera parameters and cursor transform of each step of the flythrough
+    TRAJECTORY_DTYPE = np.dtype([
+        ("position", np.float64, (3,)),
+        ("focalPoint", np.float64, (3,)),
+        ("viewUp", np.float64, (3,)),
+        ("cursorMatrix", np.float64, (4, 4)),
+    ])
+
     def __init__(self, dl=0.5):
         self.dl = dl  # desired world space step size (in mm)
         self.inputCurve = None
@@ -599,6 +628,15 @@ class EndoscopyLogic:
         self.resampledCurve = slicer.vtkMRMLMarkupsCurveNode()
         self.cameraOrientationResampledCurveIndices = []
 
+        # World position and distance along the resampled curve of each of its control points, computed once each
+        # time the path is resampled so that distance <-> index lookups do not require curve length computations.
+        self.resampledCurvePoints = np.zeros((0, 3))
+        self.resampledCurveDistances = np.zeros((0,))
+
+        # Precomputed flythrough trajectory, updated each time the orientations are interpolated so that
+        # updating the camera for a given step only requires array lookups.
+        self.trajectory = np.zeros((0,), dtype=EndoscopyLogic.TRAJECTORY_DTYPE)
+
         self.updatingControlPoints = False
 
     def getNumberOfControlPoints(self):
@@ -675,11 +713,12 @@ class EndoscopyLogic:
             self.resampledCurve.SetName(f"Resampled-{inputCurve.GetName()}")
 
             self.resampledCurve.RemoveAllControlPoints()
-            points = np.zeros((resampledPoints.GetNumberOfPoints(), 3))
+            self.resampledCurve.SetControlPointPositionsWorld(resampledPoints)
 
-            for resampledCurvePointIndex in range(resampledPoints.GetNumberOfPoints()):
-                resampledPoints.GetPoint(resampledCurvePointIndex, points[resampledCurvePointIndex])
-                self.resampledCurve.AddControlPointWorld(*points[resampledCurvePointIndex])
+        points = np.array(vtk.util.numpy_support.vtk_to_numpy(resampledPoints.GetData()), dtype=float).reshape(-1, 3)
+        self.resampledCurvePoints = points
+        self.resampledCurveDistances = EndoscopyLogic.cumulativeDistancesOfControlPoints(self.resampledCurve)
+        self.trajectory = np.zeros((len(points) if len(points) > 1 else 0,), dtype=EndoscopyLogic.TRAJECTORY_DTYPE)
 
         # Find a plane that approximately includes the points of the resampled curve,
         # so that we can use its normal to define the "up" direction. This is somewhat
@@ -692,9 +731,13 @@ class EndoscopyLogic:
 
         self.updatingControlPoints = False
 
-    def interpolateOrientationsForControlPoints(self, cameraOrientations):
+    def interpolateOrientationsForControlPoints(self, cameraOrientations, distanceRange=None):
         """Interpolate the user-supplied orientations to compute (and assign) an orientation to every control point of
         the resampledCurve.
+
+        If `distanceRange` is specified as a `(start, end)` tuple, only the orientations of the control points whose
+        distance along the resampledCurve is within that range are updated. This is used when adding or removing a
+        keyframe, which only affects the interval between the neighboring keyframes.
         """
 
         # Configure a vtkQuaternionInterpolator using the user's supplied orientations.
@@ -714,9 +757,7 @@ class EndoscopyLogic:
         self.cameraOrientationResampledCurveIndices = []
         for distanceAlongResampledCurve in distances:
             if distanceAlongResampledCurve in cameraOrientations.keys():
-                resampledCurvePointIndex = EndoscopyLogic.indexOfControlPointForDistanceAlongCurve(
-                    self.resampledCurve, distanceAlongResampledCurve,
-                )
+                resampledCurvePointIndex = self.indexOfControlPointForDistance(distanceAlongResampledCurve)
                 self.cameraOrientationResampledCurveIndices.append(resampledCurvePointIndex)
                 worldOrientation = cameraOrientations[distanceAlongResampledCurve]
                 relativeOrientation = EndoscopyLogic.worldOrientationToRelative(
@@ -729,31 +770,66 @@ class EndoscopyLogic:
 
             quaternionInterpolator.AddQuaternion(distanceAlongResampledCurve, quaternion)
 
+        # Default orientations require at least two control points to define the forward direction.
+        if self.resampledCurve.GetNumberOfControlPoints() < 2:
+            return
+
+        # Select the control points to update
+        if distanceRange is None:
+            firstIndex, endIndex = 0, len(self.resampledCurveDistances)
+        else:
+            firstIndex, endIndex = (
+                np.searchsorted(self.resampledCurveDistances, distanceRange[0], side="left"),
+                np.searchsorted(self.resampledCurveDistances, distanceRange[1], side="right"),
+            )
+        if firstIndex >= endIndex:
+            return
+
         # Use the configured vtkQuaternionInterpolator to pre-compute orientations for the resampledCurve.
-        with slicer.util.NodeModify(self.resampledCurve):
-            for resampledCurvePointIndex in range(self.resampledCurve.GetNumberOfControlPoints()):
-                distanceAlongResampledCurve = EndoscopyLogic.distanceAlongCurveOfNthControlPoint(
-                    self.resampledCurve, resampledCurvePointIndex,
-                )
-                quaternion = np.zeros((4,))
-                quaternionInterpolator.InterpolateQuaternion(distanceAlongResampledCurve, quaternion)
+        relativeQuaternions = np.zeros((endIndex - firstIndex, 4))
+        for index, distanceAlongResampledCurve in enumerate(self.resampledCurveDistances[firstIndex:endIndex]):
+            quaternionInterpolator.InterpolateQuaternion(distanceAlongResampledCurve, relativeQuaternions[index])
 
-                relativeOrientation = EndoscopyLogic.quaternionToOrientation(quaternion)
+        defaultMatrices3x3 = EndoscopyLogic.defaultOrientationMatrices3x3(
+            self.resampledCurvePoints, self.planeNormal, self.resampledCurve.GetCurveClosed(),
+        )[firstIndex:endIndex]
+        worldMatrices3x3 = np.matmul(EndoscopyLogic.quaternionsToMatrices3x3(relativeQuaternions), defaultMatrices3x3)
+        worldOrientations = EndoscopyLogic.matrices3x3ToOrientations(worldMatrices3x3)
 
-                worldOrientation = EndoscopyLogic.relativeOrientationToWorld(
-                    self.resampledCurve, resampledCurvePointIndex, relativeOrientation, self.planeNormal,
-                )
+        self._updateTrajectory(firstIndex, endIndex, worldMatrices3x3)
 
+        with slicer.util.NodeModify(self.resampledCurve):
+            for resampledCurvePointIndex, worldOrientation in enumerate(worldOrientations, start=firstIndex):
                 self.resampledCurve.SetNthControlPointOrientation(resampledCurvePointIndex, worldOrientation)
 
+    def _updateTrajectory(self, firstIndex, endIndex, worldMatrices3x3):
+        """Update the camera parameters and cursor transform of steps `firstIndex` to `endIndex - 1`
+        from the world orientation matrices of the corresponding resampledCurve control points.
+        """
+        positions = self.resampledCurvePoints
+        if self.resampledCurve.GetCurveClosed():
+            nextPositions = np.roll(positions, -1, axis=0)
+        else:
+            # The last step looks further along the direction of the last segment.
+            nextPositions = np.concatenate([positions[1:], 2.0 * positions[-1:] - positions[-2:-1]])
+        positions = positions[firstIndex:endIndex]
+        forward = worldMatrices3x3[:, :, 2]
+        focalDistances = np.linalg.norm(nextPositions[firstIndex:endIndex] - positions, axis=1)
+
+        trajectory = self.trajectory[firstIndex:endIndex]
+        trajectory["position"] = positions
+        trajectory["focalPoint"] = positions + forward * (focalDistances / np.linalg.norm(forward, axis=1))[:, np.newaxis]
+        trajectory["viewUp"] = worldMatrices3x3[:, :, 1]
+        trajectory["cursorMatrix"] = 0.0
+        trajectory["cursorMatrix"][:, :3, :3] = worldMatrices3x3
+        trajectory["cursorMatrix"][:, :3, 3] = positions
+        trajectory["cursorMatrix"][:, 3, 3] = 1.0
+
     def saveOrientationAtIndex(self, resampledCurvePointIndex):
         inputCurve = self.inputCurve
-        resampledCurve = self.resampledCurve
 
         # Compute CameraOrientations dictionary key
-        distanceAlongResampledCurve = EndoscopyLogic.distanceAlongCurveOfNthControlPoint(
-            resampledCurve, resampledCurvePointIndex,
-        )
+        distanceAlongResampledCurve = float(self.resampledCurveDistances[resampledCurvePointIndex])
 
         # Compute CameraOrientations dictionary value
         cameraNode = EndoscopyLogic.getCameraFromInputCurve(inputCurve)
@@ -768,13 +844,14 @@ class EndoscopyLogic:
         cameraOrientations[distanceAlongResampledCurve] = worldOrientation
 
         EndoscopyLogic.setInputCurveCameraOrientations(inputCurve, cameraOrientations)
-        self.interpolateOrientationsForControlPoints(cameraOrientations)
+        self.interpolateOrientationsForControlPoints(
+            cameraOrientations, self._keyframeInterval(cameraOrientations, distanceAlongResampledCurve),
+        )
 
         return cameraOrientations
 
     def removeOrientationAtIndex(self, resampledCurvePointIndexToDelete):
         inputCurve = self.inputCurve
-        resampledCurve = self.resampledCurve
 
         cameraOrientations = EndoscopyLogic.getCameraOrientationsFromInputCurve(inputCurve)
 
@@ -785,54 +862,58 @@ class EndoscopyLogic:
 
         # We must freeze the cameraOrientations.keys() generator at the start (by converting it to a list) because we
         # delete from the cameraOrientations Python dict in this loop.
+        distanceRange = None
         for distanceAlongResampledCurve in list(cameraOrientations.keys()):
-            resampledCurvePointIndex = EndoscopyLogic.indexOfControlPointForDistanceAlongCurve(
-                resampledCurve, distanceAlongResampledCurve,
-            )
+            resampledCurvePointIndex = self.indexOfControlPointForDistance(distanceAlongResampledCurve)
             if resampledCurvePointIndex == resampledCurvePointIndexToDelete:
                 del cameraOrientations[distanceAlongResampledCurve]
+                distanceRange = self._keyframeInterval(cameraOrientations, distanceAlongResampledCurve)
                 break
 
         EndoscopyLogic.setInputCurveCameraOrientations(inputCurve, cameraOrientations)
-        self.interpolateOrientationsForControlPoints(cameraOrientations)
+        self.interpolateOrientationsForControlPoints(cameraOrientations, distanceRange)
 
         return cameraOrientations
 
+    def indexOfControlPointForDistance(self, distanceAlongResampledCurve):
+        """Return the index of the resampledCurve control point closest to the given distance along the curve."""
+        distances = self.resampledCurveDistances
+        if len(distances) == 0:
+            return 0
+        index = int(np.searchsorted(distances, distanceAlongResampledCurve))
+        if index == len(distances) or (
+            index > 0 and distanceAlongResampledCurve - distances[index - 1] < distances[index] - distanceAlongResampledCurve
+        ):
+            index -= 1
+        return index
+
+    def _keyframeInterval(self, cameraOrientations, distanceAlongResampledCurve):
+        """Return the `(start, end)` distances of the neighboring keyframes (or curve ends) around the given
+        distance. Adding or removing a keyframe at that distance only affects orientations within this interval.
+        """
+        distances = sorted({0.0} | set(cameraOrientations.keys()) | {self.resampledCurve.GetCurveLengthWorld()})
+        start = max((distance for distance in distances if distance < distanceAlongResampledCurve), default=0.0)
+        end = min((distance for distance in distances if distance > distanceAlongResampledCurve), default=distances[-1])
+        return (start, end)
+
     def updateCameraFromOrientationAtIndex(self, resampledCurvePointIndex):
         """Apply the resampledCurvePointIndex-th step in the path to the camera"""
 
         inputCurve = self.inputCurve
-        resampledCurve = self.resampledCurve
 
-        if (
-            resampledCurve is None
-            or not 0 <= resampledCurvePointIndex < resampledCurve.GetNumberOfControlPoints()
-        ):
+        if not 0 <= resampledCurvePointIndex < len(self.trajectory):
             return
 
-        cameraPosition = np.zeros((3,))
-        resampledCurve.GetNthControlPointPositionWorld(resampledCurvePointIndex, cameraPosition)
-
-        focalPoint = np.zeros((3,))
-        resampledCurve.GetNthControlPointPositionWorld(resampledCurvePointIndex + 1, focalPoint)
-
-        worldOrientation = np.zeros((4,))
-        resampledCurve.GetNthControlPointOrientation(resampledCurvePointIndex, worldOrientation)
-
-        worldMatrix3x3 = EndoscopyLogic.orientationToMatrix3x3(worldOrientation)
-        worldMatrix4x4 = EndoscopyLogic.buildCameraMatrix4x4(cameraPosition, worldMatrix3x3)
-
-        adjustedFocalPoint = cameraPosition + worldMatrix3x3[:, 2] * (
-            np.linalg.norm(focalPoint - cameraPosition) / np.linalg.norm(worldMatrix3x3[:, 2])
-        )
+        step = self.trajectory[resampledCurvePointIndex]
+        worldMatrix4x4 = slicer.util.vtkMatrixFromArray(step["cursorMatrix"])
 
         # Update the camera
         cameraNode = EndoscopyLogic.getCameraFromInputCurve(inputCurve)
         if cameraNode:
             with slicer.util.NodeModify(cameraNode):
-                cameraNode.SetPosition(*cameraPosition)
-                cameraNode.SetFocalPoint(*adjustedFocalPoint)
-                cameraNode.SetViewUp(*worldMatrix3x3[:, 1])
+                cameraNode.SetPosition(*step["position"])
+                cameraNode.SetFocalPoint(*step["focalPoint"])
+                cameraNode.SetViewUp(*step["viewUp"])
 
             cameraNode.ResetClippingRange()
 
@@ -843,6 +924,56 @@ class EndoscopyLogic:
 
         return worldMatrix4x4
 
+    def exportTrajectoryToSequences(self, transformSequenceNode=None, cameraSequenceNode=None, frameSkip=0):
+        """Write the flythrough trajectory into sequences, with one item for every `frameSkip + 1` step.
+
+        The transform sequence contains the cursor transform and the camera sequence the camera position, focal
+        point, view up and view angle of each step. Sequence nodes that are not specified are created.
+
+        This allows replaying (for example using the Sequences module) or capturing (for example using the
+        Screen Capture module) the flythrough without recomputing the camera parameters at each frame.
+
+        :return: tuple of transform and camera sequence nodes.
+        """
+        inputCurve = self.inputCurve
+        if transformSequenceNode is None:
+            transformSequenceNode = slicer.mrmlScene.AddNewNodeByClass(
+                "vtkMRMLSequenceNode",
+                slicer.mrmlScene.GenerateUniqueName(f"TransformSequence-{inputCurve.GetName()}"),
+            )
+        if cameraSequenceNode is None:
+            cameraSequenceNode = slicer.mrmlScene.AddNewNodeByClass(
+                "vtkMRMLSequenceNode",
+                slicer.mrmlScene.GenerateUniqueName(f"CameraSequence-{inputCurve.GetName()}"),
+            )
+
+        # Temporary nodes, copied into the sequences for each step
+        transformNode = slicer.vtkMRMLLinearTransformNode()
+        cameraNode = slicer.vtkMRMLCameraNode()
+        cameraNode.SetViewAngle(EndoscopyLogic.getCameraViewAngleFromInputCurve(inputCurve))
+        cursorMatrix = vtk.vtkMatrix4x4()
+
+        with slicer.util.NodeModify(transformSequenceNode), slicer.util.NodeModify(cameraSequenceNode):
+            for sequenceNode in [transformSequenceNode, cameraSequenceNode]:
+                sequenceNode.RemoveAllDataNodes()
+                sequenceNode.SetIndexName("frame")
+                sequenceNode.SetIndexUnit("")
+
+            for resampledCurvePointIndex in range(0, len(self.trajectory), frameSkip + 1):
+                step = self.trajectory[resampledCurvePointIndex]
+                indexValue = str(resampledCurvePointIndex)
+
+                slicer.util.updateVTKMatrixFromArray(cursorMatrix, step["cursorMatrix"])
+                transformNode.SetMatrixTransformToParent(cursorMatrix)
+                transformSequenceNode.SetDataNodeAtValue(transformNode, indexValue)
+
+                cameraNode.SetPosition(*step["position"])
+                cameraNode.SetFocalPoint(*step["focalPoint"])
+                cameraNode.SetViewUp(*step["viewUp"])
+                cameraSequenceNode.SetDataNodeAtValue(cameraNode, indexValue)
+
+        return transformSequenceNode, cameraSequenceNode
+
     @staticmethod
     def setInputCurveCamera(inputCurve, cameraNode):
         if not inputCurve:
@@ -976,6 +1107,26 @@ class EndoscopyLogic:
         distance = curve.GetCurveLengthWorld(0, numberOfCurvePoints)
         return distance
 
+    @staticmethod
+    def cumulativeDistancesOfControlPoints(curve):
+        """Return the distance along the curve of every control point, as a numpy array.
+
+        This gives the same values as :func:`distanceAlongCurveOfNthControlPoint` but the curve length is
+        accumulated once for the whole curve instead of being recomputed from the start for each control point.
+        """
+        numberOfControlPoints = curve.GetNumberOfControlPoints()
+        if numberOfControlPoints == 0:
+            return np.zeros((0,))
+        curvePoints = slicer.util.arrayFromMarkupsCurvePoints(curve, world=True)
+        cumulativeCurveLengths = np.concatenate(
+            ([0.0], np.cumsum(np.linalg.norm(np.diff(curvePoints, axis=0), axis=1))),
+        )
+        curvePointIndices = [
+            curve.GetCurvePointIndexFromControlPointIndex(controlPointIndex)
+            for controlPointIndex in range(numberOfControlPoints)
+        ]
+        return cumulativeCurveLengths[np.clip(curvePointIndices, 0, len(cumulativeCurveLengths) - 1)]
+
     @staticmethod
     def indexOfControlPointForDistanceAlongCurve(curve, distanceAlongInputCurve):
         indexOfControlPoint = (
@@ -1015,6 +1166,77 @@ class EndoscopyLogic:
         orientation[0] = vtkQ.GetRotationAngleAndAxis(orientation[1:4])
         return orientation
 
+    @staticmethod
+    def defaultOrientationMatrices3x3(points, planeNormal, closed):
+        """Vectorized version of :func:`getDefaultOrientation` returning the orientation matrices of all the
+        `points` (an array of shape (N, 3) with N >= 2) as an array of shape (N, 3, 3).
+        """
+        if closed:
+            forward = np.roll(points, -1, axis=0) - points
+        else:
+            forward = np.empty_like(points)
+            forward[:-1] = points[1:] - points[:-1]
+            # The last point has the same orientation as its previous point.
+            forward[-1] = forward[-2]
+        forward /= np.linalg.norm(forward, axis=1)[:, np.newaxis]
+        left = np.cross(planeNormal, forward)
+        left /= np.linalg.norm(left, axis=1)[:, np.newaxis]
+        up = np.cross(forward, left)
+        return np.stack([left, up, forward], axis=2)
+
+    @staticmethod
+    def quaternionsToMatrices3x3(quaternions):
+        """Convert an array of shape (N, 4) of scalar-first quaternions to an array of shape (N, 3, 3) of rotation
+        matrices.
+        """
+        quaternions = quaternions / np.linalg.norm(quaternions, axis=1)[:, np.newaxis]
+        w, x, y, z = quaternions.T
+        return np.stack(
+            [
+                np.stack([1.0 - 2.0 * (y * y + z * z), 2.0 * (x * y - w * z), 2.0 * (x * z + w * y)], axis=1),
+                np.stack([2.0 * (x * y + w * z), 1.0 - 2.0 * (x * x + z * z), 2.0 * (y * z - w * x)], axis=1),
+                np.stack([2.0 * (x * z - w * y), 2.0 * (y * z + w * x), 1.0 - 2.0 * (x * x + y * y)], axis=1),
+            ],
+            axis=1,
+        )
+
+    @staticmethod
+    def matrices3x3ToOrientations(matrices3x3):
+        """Convert an array of shape (N, 3, 3) of rotation matrices to an array of shape (N, 4) of axis-angle
+        orientations, with the angle in [0, pi].
+        """
+        numberOfMatrices = len(matrices3x3)
+        diagonal = np.diagonal(matrices3x3, axis1=1, axis2=2)
+        trace = diagonal.sum(axis=1)
+        # Select the numerically most stable formula for each matrix (largest of the trace and diagonal elements)
+        choices = np.concatenate([diagonal, trace[:, np.newaxis]], axis=1).argmax(axis=1)
+        quaternions = np.empty((numberOfMatrices, 4))
+        for i in range(3):
+            selected = choices == i
+            m = matrices3x3[selected]
+            j, k = (i + 1) % 3, (i + 2) % 3
+            quaternions[selected, 0] = m[:, k, j] - m[:, j, k]
+            quaternions[selected, 1 + i] = 1.0 - trace[selected] + 2.0 * m[:, i, i]
+            quaternions[selected, 1 + j] = m[:, j, i] + m[:, i, j]
+            quaternions[selected, 1 + k] = m[:, k, i] + m[:, i, k]
+        selected = choices == 3
+        m = matrices3x3[selected]
+        quaternions[selected, 0] = 1.0 + trace[selected]
+        quaternions[selected, 1] = m[:, 2, 1] - m[:, 1, 2]
+        quaternions[selected, 2] = m[:, 0, 2] - m[:, 2, 0]
+        quaternions[selected, 3] = m[:, 1, 0] - m[:, 0, 1]
+        quaternions /= np.linalg.norm(quaternions, axis=1)[:, np.newaxis]
+        quaternions[quaternions[:, 0] < 0.0] *= -1.0
+
+        orientations = np.zeros((numberOfMatrices, 4))
+        orientations[:, 0] = 2.0 * np.arccos(np.clip(quaternions[:, 0], -1.0, 1.0))
+        axisNorms = np.linalg.norm(quaternions[:, 1:], axis=1)
+        rotated = axisNorms > 0.0
+        orientations[rotated, 1:] = quaternions[rotated, 1:] / axisNorms[rotated, np.newaxis]
+        # Identity rotation: use an arbitrary axis
+        orientations[~rotated, 1] = 1.0
+        return orientations
+
     @staticmethod
     def multiplyOrientations(leftOrientation, rightOrientation):
         return EndoscopyLogic.matrix3x3ToOrientation(
@@ -1,6 +1,13 @@
+import logging
+import os
+import time
+
+import numpy as np
 import qt
-import slicer
+import vtk
 
+import slicer
+import slicer.benchmark
 from slicer.ScriptedLoadableModule import *
 
 
@@ -17,6 +24,11 @@ class PerformanceTests(ScriptedLoadableModule):
         parent.contributors = ["Steve Pieper (Isomics)"]
         parent.helpText = """
     Module to run interactive performance tests on the core of slicer.
+    Results can be saved as JSON and compared to results of a previous run to detect regressions.
+    Benchmarks that do not need the application main window (tagged as "headless") can be run
+    from the command line, for example with offscreen rendering:
+    <pre>QT_QPA_PLATFORM=offscreen Slicer --no-main-window --python-code "import PerformanceTests;
+    PerformanceTests.PerformanceTestsLogic().runBenchmarks(tags=['headless'], outputPath='results.json'); slicer.util.exit()"</pre>
     """
         parent.acknowledgementText = """
     This file was based on work originally developed by Jean-Christophe Fillion-Robin, Kitware Inc.
@@ -33,12 +45,17 @@ and others.  This work was partially funded by NIH grant 3P41RR013218-12S1.
 class PerformanceTestsWidget(ScriptedLoadableModuleWidget):
     def setup(self):
         ScriptedLoadableModuleWidget.setup(self)
-        tests = (
-            ("Get Sample Data", self.downloadMRHead),
-            ("Reslicing", self.reslicing),
-            ("Crosshair Jump", self.crosshairJump),
+        self.logic = PerformanceTestsLogic()
+        self.results = []
+
+        tests = [("Get Sample Data", self.downloadMRHead)]
+        for benchmark in self.logic.registry.benchmarks():
+            tests.append((benchmark.name, lambda name=benchmark.name: self.runBenchmark(name)))
+        tests += [
             ("Memory Check", self.memoryCheck),
-        )
+            ("Save Results...", self.saveResults),
+            ("Compare To Baseline...", self.compareToBaseline),
+        ]
 
         for test in tests:
             b = qt.QPushButton(test[0])
@@ -55,6 +72,13 @@ class PerformanceTestsWidget(ScriptedLoadableModuleWidget):
         # Add spacer to layout
         self.layout.addStretch(1)
 
+    def logMessage(self, message):
+        print(message)
+        self.log.insertHtml("<i>%s</i>" % message)
+        self.log.insertPlainText("\n")
+        self.log.ensureCursorVisible()
+        self.log.repaint()
+
     def downloadMRHead(self):
         import SampleData
 
@@ -71,94 +95,38 @@ class PerformanceTestsWidget(ScriptedLoadableModuleWidget):
             self.log.repaint()
         self.log.ensureCursorVisible()
 
-    def timeSteps(self, iters, f):
-        import time
-
-        elapsedTime = 0
-        for i in range(iters):
-            startTime = time.time()
-            f()
-            slicer.app.processEvents()
-            endTime = time.time()
-            elapsedTime += endTime - startTime
-        fps = int(iters / elapsedTime)
-        result = f"fps = {fps:g} ({1000./fps:g} ms per frame)"
-        print(result)
-        self.log.insertHtml("<i>%s</i>" % result)
-        self.log.insertPlainText("\n")
-        self.log.ensureCursorVisible()
-        self.log.repaint()
-
-    def reslicing(self, iters=100):
-        """go into a loop that stresses the reslice performance"""
-        import time
-        import math
-        import numpy as np
-
-        sliceNode = slicer.util.getNode("vtkMRMLSliceNodeRed")
-        dims = sliceNode.GetDimensions()
-        elapsedTime = 0
-        sliceOffset = 5
-        offsetSteps = 10
-        numerOfSweeps = math.ceil(iters / offsetSteps)
-        renderingTimesSec = np.zeros(numerOfSweeps * offsetSteps * 2)
-        sampleIndex = 0
-        startOffset = sliceNode.GetSliceOffset()
-        for i in range(numerOfSweeps):
-            for offset in [sliceOffset] * offsetSteps + [-sliceOffset] * offsetSteps:
-                startTime = time.time()
-                sliceNode.SetSliceOffset(sliceNode.GetSliceOffset() + offset)
-                slicer.app.processEvents()
-                endTime = time.time()
-                renderingTimesSec[sampleIndex] = endTime - startTime
-                sampleIndex += 1
-        sliceNode.SetSliceOffset(startOffset)
-
-        resultTableName = slicer.mrmlScene.GetUniqueNameByString("Reslice performance")
-        resultTableNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLTableNode", resultTableName)
-        slicer.util.updateTableFromArray(resultTableNode, renderingTimesSec, "Rendering time [s]")
-
-        renderingTimeMean = np.mean(renderingTimesSec)
-        renderingTimeStd = np.std(renderingTimesSec)
-        result = ("%d x %d, fps = %.1f (%.1f +/- %.2f ms per frame) - see details in table '%s'"
-                  % (dims[0], dims[1], 1.0 / renderingTimeMean, 1000. * renderingTimeMean, 1000. * renderingTimeStd, resultTableNode.GetName()))
-        print(result)
-        self.log.insertHtml("<i>%s</i>" % result)
-        self.log.insertPlainText("\n")
-        self.log.ensureCursorVisible()
-        self.log.repaint()
+    def runBenchmark(self, name):
+        benchmark = self.logic.registry.benchmarks(pattern=name)[0]
+        if "clearsScene" in benchmark.tags and not slicer.util.confirmOkCancelDisplay(
+                f"Benchmark {name} clears the scene. Continue?"):
+            return
+        with slicer.util.tryWithErrorDisplay(f"Benchmark {name} failed.", waitCursor=True):
+            result = benchmark.run()
+            # Replace previous result of the same benchmark
+            self.results = [previousResult for previousResult in self.results if previousResult.name != name] + [result]
+            resultTableNode = self.logic.addResultTable(result)
+            self.logMessage(f"{result} - see details in table '{resultTableNode.GetName()}'")
 
-    def crosshairJump(self, iters=15):
-        """go into a loop that stresses jumping to slices by moving crosshair"""
-        import time
+    def saveResults(self):
+        if not self.results:
+            self.logMessage("No benchmark results to save")
+            return
+        path = qt.QFileDialog.getSaveFileName(None, "Save benchmark results", "", "JSON files (*.json)")
+        if not path:
+            return
+        slicer.benchmark.saveResults(self.results, path)
+        self.logMessage(f"Benchmark results saved to {path}")
 
-        sliceNode = slicer.util.getNode("vtkMRMLSliceNodeRed")
-        dims = sliceNode.GetDimensions()
-        layoutManager = slicer.app.layoutManager()
-        sliceViewNames = layoutManager.sliceViewNames()
-        # Order of slice view names is random, prefer 'Red' slice to make results more predictable
-        firstSliceViewName = "Red" if "Red" in sliceViewNames else sliceViewNames[0]
-        firstSliceWidget = layoutManager.sliceWidget(firstSliceViewName)
-        elapsedTime = 0
-        startPoint = (int(dims[0] * 0.3), int(dims[1] * 0.3))
-        endPoint = (int(dims[0] * 0.6), int(dims[1] * 0.6))
-        for i in range(iters):
-            startTime = time.time()
-            slicer.util.clickAndDrag(firstSliceWidget, button=None, modifiers=["Shift"], start=startPoint, end=endPoint, steps=2)
-            slicer.app.processEvents()
-            endTime1 = time.time()
-            slicer.util.clickAndDrag(firstSliceWidget, button=None, modifiers=["Shift"], start=endPoint, end=startPoint, steps=2)
-            slicer.app.processEvents()
-            endTime2 = time.time()
-            delta = ((endTime1 - startTime) + (endTime2 - endTime1)) / 2.0
-            elapsedTime += delta
-        fps = int(iters / elapsedTime)
-        result = "number of slice views = %d, fps = %g (%g ms per frame)" % (len(sliceViewNames), fps, 1000.0 / fps)
-        print(result)
-        self.log.insertHtml("<i>%s</i>" % result)
-        self.log.insertPlainText("\n")
-        self.log.ensureCursorVisible()
-        self.log.repaint()
+    def compareToBaseline(self):
+        if not self.results:
+            self.logMessage("No benchmark results to compare")
+            return
+        path = qt.QFileDialog.getOpenFileName(None, "Load baseline benchmark results", "", "JSON files (*.json)")
+        if not path:
+            return
+        comparisons = slicer.benchmark.compareResults(self.results, slicer.benchmark.loadResults(path))
+        for line in slicer.benchmark.formatComparisons(comparisons).split("\n"):
+            self.logMessage(line)
 
     def memoryCallback(self):
         if self.sysInfoWindow.visible:
@@ -182,19 +150,325 @@ class PerformanceTestsWidget(ScriptedLoadableModuleWidget):
         self.memoryCallback()
 
 
-class sliceLogicTest:
+#
+# PerformanceTestsLogic
+#
+
+
+class PerformanceTestsLogic(ScriptedLoadableModuleLogic):
+    """Benchmarks of core Slicer operations.
+
+    Benchmarks tagged as "view" use the views of the application main window,
+    benchmarks tagged as "headless" create their own views or do not render at all.
+    Benchmarks tagged as "reference" measure slow legacy code paths for comparison and are not run by the tests.
+    """
+
+    # Reslicing moves the slice back and forth: `resliceOffsetSteps` steps of `resliceOffset` mm in each direction.
+    resliceOffset = 5
+    resliceOffsetSteps = 10
+
+    # Number of control points in markups benchmarks
+    markupsNumberOfControlPoints = [10000, 100000]
+
     def __init__(self):
-        self.step = 0
-        self.sliceLogic = slicer.vtkMRMLSliceLayerLogic()
-        self.sliceLogic.SetMRMLScene(slicer.mrmlScene)
-        self.sliceNode = slicer.vtkMRMLSliceNode()
-        self.sliceNode.SetLayoutName("Black")
-        slicer.mrmlScene.AddNode(self.sliceNode)
-        self.sliceLogic.SetSliceNode(self.sliceNode)
-
-    def stepSliceLogic(self):
-        self.sliceNode.SetSliceOffset(-1 * self.step * 10)
-        self.step = 1 ^ self.step
-
-    def testSliceLogic(self, iters):
-        timeSteps(iters, self.stepSliceLogic)
+        ScriptedLoadableModuleLogic.__init__(self)
+        self.registry = slicer.benchmark.BenchmarkRegistry()
+        self.registerBenchmarks()
+
+    def registerBenchmarks(self):
+        Benchmark = slicer.benchmark.Benchmark
+        self.registry.add(Benchmark(
+            "Reslicing", self.resliceStep, setup=self.setupLayoutReslicing, teardown=self.teardownReslicing,
+            warmup=2, repeat=100, tags=["view", "reslicing"],
+            description="Move the slice of the Red slice view back and forth"))
+        self.registry.add(Benchmark(
+            "CrosshairJump", self.crosshairJumpStep, setup=self.setupCrosshairJump,
+            warmup=1, repeat=15, tags=["view"], measuresOwnDuration=True,
+            description="Jump to slices in all slice views by moving the crosshair in the first slice view"))
+        self.registry.add(Benchmark(
+            "HeadlessReslicing", self.resliceStep, setup=self.setupStandaloneReslicing, teardown=self.teardownReslicing,
+            warmup=2, repeat=100, tags=["headless", "reslicing"],
+            description="Move the slice back and forth in a slice view that is not part of the view layout"))
+        self.registry.add(Benchmark(
+            "HeadlessSliceLogicTimeStep", self.sliceLogicTimeStep, setup=self.setupSliceLogic, teardown=self.teardownSliceLogic,
+            warmup=2, repeat=100, tags=["headless", "reslicing"],
+            description="Update the reslice pipeline of a slice logic, without rendering"))
+        self.registry.add(Benchmark(
+            "HeadlessSceneLoading", self.sceneLoadingStep, setup=self.setupSceneLoading, teardown=self.teardownSceneLoading,
+            warmup=1, repeat=5, tags=["headless", "scene", "clearsScene"], measuresOwnDuration=True,
+            description="Load a scene bundle containing a volume and a model"))
+        for numberOfControlPoints in self.markupsNumberOfControlPoints:
+            self.registry.add(Benchmark(
+                f"HeadlessMarkupsBulkImport{numberOfControlPoints}", self.markupsBulkImportStep,
+                setup=lambda n=numberOfControlPoints: self.setupMarkups(n), teardown=self.teardownMarkups,
+                warmup=1, repeat=5, tags=["headless", "markups"], properties={"numberOfControlPoints": numberOfControlPoints},
+                measuresOwnDuration=True,
+                description="Set positions, orientations, labels, and flags of all markups control points from numpy arrays"))
+            self.registry.add(Benchmark(
+                f"HeadlessMarkupsBulkExport{numberOfControlPoints}", self.markupsBulkExportStep,
+                setup=lambda n=numberOfControlPoints: self.setupMarkups(n), teardown=self.teardownMarkups,
+                warmup=1, repeat=5, tags=["headless", "markups"], properties={"numberOfControlPoints": numberOfControlPoints},
+                description="Get positions, orientations, labels, and flags of all markups control points as numpy arrays"))
+        numberOfControlPoints = self.markupsNumberOfControlPoints[0]
+        self.registry.add(Benchmark(
+            f"HeadlessMarkupsPerPointImport{numberOfControlPoints}", self.markupsPerPointImportStep,
+            setup=lambda: self.setupMarkups(numberOfControlPoints), teardown=self.teardownMarkups,
+            warmup=0, repeat=1, tags=["markups", "reference"], properties={"numberOfControlPoints": numberOfControlPoints},
+            measuresOwnDuration=True,
+            description="Reference for bulk import: set the same control point properties one point at a time"))
+
+    def runBenchmarks(self, pattern=None, tags=None, warmup=None, repeat=None, outputPath=None, baselinePath=None, threshold=0.1):
+        """Run selected benchmarks, optionally save the results and compare them to a baseline.
+
+        Benchmarks that need the views of the main window are skipped if there is no main window.
+
+        :param pattern: only run benchmarks with name matching this shell-style wildcard pattern
+        :param tags: only run benchmarks that have all these tags
+        :param warmup: override the number of warm-up runs
+        :param repeat: override the number of measured runs
+        :param outputPath: save results to this JSON file
+        :param baselinePath: compare results to results in this JSON file
+        :param threshold: relative slowdown that is reported as regression
+        :return: list of results and list of comparisons (empty if no baseline is specified)
+        """
+        results = []
+        for benchmark in self.registry.benchmarks(pattern, tags):
+            if "view" in benchmark.tags and not slicer.app.layoutManager():
+                logging.warning(f"Benchmark {benchmark.name} skipped: it requires the application main window")
+                continue
+            result = benchmark.run(warmup, repeat)
+            logging.info(str(result))
+            results.append(result)
+        if outputPath:
+            slicer.benchmark.saveResults(results, outputPath)
+        comparisons = []
+        if baselinePath:
+            comparisons = slicer.benchmark.compareResults(results, slicer.benchmark.loadResults(baselinePath), threshold)
+            logging.info(slicer.benchmark.formatComparisons(comparisons))
+        return results, comparisons
+
+    @staticmethod
+    def addResultTable(result):
+        """Add a table node containing all measured durations of a benchmark result."""
+        resultTableName = slicer.mrmlScene.GetUniqueNameByString(f"{result.name} performance")
+        resultTableNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLTableNode", resultTableName)
+        slicer.util.updateTableFromArray(resultTableNode, np.array(result.durations), "Time [s]")
+        return resultTableNode
+
+    @staticmethod
+    def addBenchmarkVolume():
+        """Add a synthetic volume that benchmarks can use without downloading data."""
+        k, j, i = np.mgrid[0:130, 0:256, 0:256]
+        voxels = ((i * j) % 251 + k * 3).astype(np.int16)
+        ijkToRAS = vtk.vtkMatrix4x4()
+        ijkToRAS.SetElement(2, 2, 1.3)
+        return slicer.util.addVolumeFromArray(voxels, ijkToRAS, name="PerformanceTestsVolume")
+
+    def resliceStep(self, context):
+        sliceNode = context["sliceNode"]
+        direction = 1 if (context["step"] // self.resliceOffsetSteps) % 2 == 0 else -1
+        context["step"] += 1
+        sliceNode.SetSliceOffset(sliceNode.GetSliceOffset() + direction * self.resliceOffset)
+        if context.get("sliceView"):
+            context["sliceView"].forceRender()
+        slicer.app.processEvents()
+
+    def setupLayoutReslicing(self):
+        sliceNode = slicer.util.getNode("vtkMRMLSliceNodeRed")
+        return {"sliceNode": sliceNode, "startOffset": sliceNode.GetSliceOffset(), "step": 0}
+
+    def setupStandaloneReslicing(self):
+        volumeNode = self.addBenchmarkVolume()
+        # View owner node manages this view instead of the layout manager
+        viewOwnerNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLScriptedModuleNode")
+        sliceNode = slicer.vtkMRMLSliceNode()
+        sliceNode.SetName("PerformanceTests")
+        sliceNode.SetLayoutName("PerformanceTests")
+        sliceNode.SetLayoutLabel("PT")
+        sliceNode.SetOrientation("Axial")
+        sliceNode.SetAndObserveParentLayoutNodeID(viewOwnerNode.GetID())
+        sliceNode = slicer.mrmlScene.AddNode(sliceNode)
+        sliceWidget = slicer.qMRMLSliceWidget()
+        sliceWidget.setMRMLScene(slicer.mrmlScene)
+        sliceWidget.setMRMLSliceNode(sliceNode)
+        sliceWidget.resize(512, 512)
+        sliceWidget.sliceLogic().GetSliceCompositeNode().SetBackgroundVolumeID(volumeNode.GetID())
+        sliceWidget.show()
+        sliceWidget.sliceLogic().FitSliceToAll()
+        return {"sliceNode": sliceNode, "startOffset": sliceNode.GetSliceOffset(), "step": 0,
+                "sliceView": sliceWidget.sliceView(), "sliceWidget": sliceWidget,
+                "nodes": [volumeNode, viewOwnerNode, sliceWidget.sliceLogic().GetSliceCompositeNode(), sliceNode]}
+
+    def teardownReslicing(self, context):
+        context["sliceNode"].SetSliceOffset(context["startOffset"])
+        sliceWidget = context.get("sliceWidget")
+        if sliceWidget:
+            sliceWidget.hide()
+            sliceWidget.setMRMLScene(None)
+            sliceWidget.deleteLater()
+        for node in context.get("nodes", []):
+            slicer.mrmlScene.RemoveNode(node)
+
+    def setupCrosshairJump(self):
+        sliceNode = slicer.util.getNode("vtkMRMLSliceNodeRed")
+        dims = sliceNode.GetDimensions()
+        layoutManager = slicer.app.layoutManager()
+        sliceViewNames = layoutManager.sliceViewNames()
+        # Order of slice view names is random, prefer 'Red' slice to make results more predictable
+        firstSliceViewName = "Red" if "Red" in sliceViewNames else sliceViewNames[0]
+        return {
+            "sliceWidget": layoutManager.sliceWidget(firstSliceViewName),
+            "startPoint": (int(dims[0] * 0.3), int(dims[1] * 0.3)),
+            "endPoint": (int(dims[0] * 0.6), int(dims[1] * 0.6)),
+        }
+
+    @staticmethod
+    def crosshairJumpStep(context):
+        """Jump forward and back, return the average time of a jump."""
+        sliceWidget, startPoint, endPoint = context["sliceWidget"], context["startPoint"], context["endPoint"]
+        startTime = time.perf_counter()
+        slicer.util.clickAndDrag(sliceWidget, button=None, modifiers=["Shift"], start=startPoint, end=endPoint, steps=2)
+        slicer.app.processEvents()
+        slicer.util.clickAndDrag(sliceWidget, button=None, modifiers=["Shift"], start=endPoint, end=startPoint, steps=2)
+        slicer.app.processEvents()
+        return (time.perf_counter() - startTime) / 2.0
+
+    def setupSliceLogic(self):
+        volumeNode = self.addBenchmarkVolume()
+        sliceLogic = slicer.vtkMRMLSliceLogic()
+        sliceLogic.SetMRMLApplicationLogic(slicer.app.applicationLogic())
+        sliceLogic.SetMRMLScene(slicer.mrmlScene)
+        sliceNode = sliceLogic.AddSliceNode("PerformanceTests")
+        sliceNode.SetDimensions(512, 512, 1)
+        sliceLogic.GetSliceCompositeNode().SetBackgroundVolumeID(volumeNode.GetID())
+        sliceLogic.FitSliceToAll()
+        return {"sliceLogic": sliceLogic, "step": 0, "nodes": [volumeNode, sliceLogic.GetSliceCompositeNode(), sliceNode]}
+
+    @staticmethod
+    def sliceLogicTimeStep(context):
+        sliceLogic = context["sliceLogic"]
+        sliceLogic.GetSliceNode().SetSliceOffset(-10 * context["step"])
+        context["step"] = 1 ^ context["step"]
+        sliceLogic.GetImageDataConnection().GetProducer().Update()
+
+    @staticmethod
+    def teardownSliceLogic(context):
+        context["sliceLogic"].SetMRMLScene(None)
+        for node in context["nodes"]:
+            slicer.mrmlScene.RemoveNode(node)
+
+    def setupSceneLoading(self):
+        slicer.mrmlScene.Clear()
+        self.addBenchmarkVolume()
+        sphere = vtk.vtkSphereSource()
+        sphere.SetThetaResolution(400)
+        sphere.SetPhiResolution(400)
+        sphere.SetRadius(50)
+        sphere.Update()
+        modelNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLModelNode", "PerformanceTestsModel")
+        modelNode.SetAndObservePolyData(sphere.GetOutput())
+        modelNode.CreateDefaultDisplayNodes()
+        sceneFilePath = os.path.join(slicer.app.temporaryPath, "PerformanceTestsScene.mrb")
+        if not slicer.util.saveScene(sceneFilePath):
+            raise RuntimeError(f"Failed to save scene to {sceneFilePath}")
+        slicer.mrmlScene.Clear()
+        return sceneFilePath
+
+    @staticmethod
+    def sceneLoadingStep(sceneFilePath):
+        slicer.mrmlScene.Clear()
+        startTime = time.perf_counter()
+        slicer.util.loadScene(sceneFilePath)
+        return time.perf_counter() - startTime
+
+    @staticmethod
+    def teardownSceneLoading(sceneFilePath):
+        slicer.mrmlScene.Clear()
+        os.remove(sceneFilePath)
+
+    @staticmethod
+    def setupMarkups(numberOfControlPoints):
+        markupsNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLMarkupsFiducialNode", "PerformanceTestsMarkups")
+        markupsNode.CreateDefaultDisplayNodes()
+        rng = np.random.default_rng(0)
+        arrays = {
+            "positions": rng.uniform(-100, 100, size=[numberOfControlPoints, 3]),
+            "orientations": np.tile(np.eye(3), (numberOfControlPoints, 1, 1)),
+            "labels": [f"P-{index}" for index in range(numberOfControlPoints)],
+            "selected": rng.integers(0, 2, numberOfControlPoints).astype(bool),
+            "locked": rng.integers(0, 2, numberOfControlPoints).astype(bool),
+            "visibility": rng.integers(0, 2, numberOfControlPoints).astype(bool),
+        }
+        slicer.util.updateMarkupsControlPointsFromArrays(markupsNode, **arrays)
+        return {"markupsNode": markupsNode, "arrays": arrays, "step": 0}
+
+    @staticmethod
+    def nextMarkupsArrays(context):
+        """Return control point properties that differ from current values, so that every point is modified."""
+        context["step"] += 1
+        arrays = dict(context["arrays"])
+        arrays["positions"] = arrays["positions"] + context["step"]
+        for name in ["selected", "locked", "visibility"]:
+            arrays[name] = arrays[name] ^ (context["step"] % 2 == 1)
+        return arrays
+
+    def markupsBulkImportStep(self, context):
+        arrays = self.nextMarkupsArrays(context)
+        startTime = time.perf_counter()
+        slicer.util.updateMarkupsControlPointsFromArrays(context["markupsNode"], **arrays)
+        return time.perf_counter() - startTime
+
+    @staticmethod
+    def markupsBulkExportStep(context):
+        slicer.util.arraysFromMarkupsControlPoints(context["markupsNode"])
+
+    def markupsPerPointImportStep(self, context):
+        arrays = self.nextMarkupsArrays(context)
+        markupsNode = context["markupsNode"]
+        startTime = time.perf_counter()
+        with slicer.util.NodeModify(markupsNode):
+            for index in range(markupsNode.GetNumberOfControlPoints()):
+                markupsNode.SetNthControlPointPosition(index, arrays["positions"][index])
+                markupsNode.SetNthControlPointOrientationMatrix(index, arrays["orientations"][index].flatten())
+                markupsNode.SetNthControlPointLabel(index, arrays["labels"][index])
+                markupsNode.SetNthControlPointSelected(index, bool(arrays["selected"][index]))
+                markupsNode.SetNthControlPointLocked(index, bool(arrays["locked"][index]))
+                markupsNode.SetNthControlPointVisibility(index, bool(arrays["visibility"][index]))
+        return time.perf_counter() - startTime
+
+    @staticmethod
+    def teardownMarkups(context):
+        slicer.mrmlScene.RemoveNode(context["markupsNode"])
+
+
+#
+# PerformanceTestsTest
+#
+
+
+class PerformanceTestsTest(ScriptedLoadableModuleTest):
+    """Run the headless benchmarks.
+
+    Results are saved and compared to a baseline if SLICER_BENCHMARK_OUTPUT_DIRECTORY and
+    SLICER_BENCHMARK_BASELINE_DIRECTORY environment variables are set (see slicer.benchmark.reportResults).
+    """
+
+    def setUp(self):
+        slicer.mrmlScene.Clear()
+
+    def runTest(self):
+        self.setUp()
+        self.test_HeadlessBenchmarks()
+
+    def test_HeadlessBenchmarks(self):
+        self.delayDisplay("Running headless benchmarks")
+        logic = PerformanceTestsLogic()
+        results, _ = logic.runBenchmarks(tags=["headless"])
+        self.assertEqual(len(results), len(logic.registry.benchmarks(tags=["headless"])))
+        for result in results:
+            self.assertGreater(result.median, 0.0)
+
+        comparisons = slicer.benchmark.reportResults(results, "PerformanceTests")
+        regressions = [comparison.name for comparison in comparisons if comparison.regression]
+        self.assertEqual(regressions, [])
+        self.delayDisplay("Test passed")
@@ -453,6 +453,9 @@ class SampleDataLogic:
     ``<algo>:<digest>``. For example, ``SHA256:cc211f0dfd9a05ca3841ce1141b292898b2dd2d3f08286affadf823a7e58df93``.
     """
 
+    maximumConcurrentDownloads = 4
+    """Maximum number of files that are downloaded at the same time by :py:meth:`downloadFilesIntoCache`."""
+
     @staticmethod
     def registerCustomSampleDataSource(category="Custom",
                                        sampleName=None, uris=None, fileNames=None, nodeNames=None,
@@ -653,10 +656,8 @@ class SampleDataLogic:
         """Register sample data sources used by SampleData self-test to test module functionalities."""
         self.registerCustomSampleDataSource(**SampleDataTest.CustomDownloaderDataSource)
 
-    def downloadFileIntoCache(self, uri, name, checksum=None):
-        """Given a uri and and a filename, download the data into
-        a file of the given name in the scene's cache
-        """
+    def cacheFolderPath(self):
+        """Return the scene's cache folder, which is created if it does not exist yet."""
         destFolderPath = slicer.mrmlScene.GetCacheManager().GetRemoteCacheDirectory()
 
         if not os.access(destFolderPath, os.W_OK):
@@ -666,16 +667,79 @@ class SampleDataLogic:
                 self.logMessage(_("Failed to create cache folder {path}").format(path=destFolderPath), logging.ERROR)
             if not os.access(destFolderPath, os.W_OK):
                 self.logMessage(_("Cache folder {path} is not writable").format(path=destFolderPath), logging.ERROR)
-        return self.downloadFile(uri, destFolderPath, name, checksum)
+        return destFolderPath
+
+    def downloadFileIntoCache(self, uri, name, checksum=None):
+        """Given a uri and and a filename, download the data into
+        a file of the given name in the scene's cache
+        """
+        return self.downloadFile(uri, self.cacheFolderPath(), name, checksum)
+
+    def downloadFilesIntoCache(self, uris, names, checksums=None):
+        """Download multiple files into the scene's cache concurrently.
+
+        At most ``maximumConcurrentDownloads`` files are downloaded at the same time.
+        Messages and progress are reported from the main thread while waiting for the downloads to complete.
+
+        :return: list of file paths of the downloaded files.
+        :raises ValueError: if any of the files could not be downloaded.
+        """
+        import concurrent.futures
+        import queue
+
+        destFolderPath = self.cacheFolderPath()
+        if checksums is None:
+            checksums = [None] * len(uris)
+
+        # Download threads must not access the GUI, therefore they just queue messages and progress updates
+        events = queue.Queue()
+
+        def logMessage(message, logLevel=logging.DEBUG):
+            events.put((message, logLevel))
+
+        def progressReporter(filePath):
+            return lambda bytesSoFar, totalSize: events.put((filePath, bytesSoFar, totalSize))
+
+        progress = {}
+
+        def processEvents():
+            while not events.empty():
+                event = events.get()
+                if len(event) == 2:
+                    self.logMessage(*event)
+                    continue
+                filePath, bytesSoFar, totalSize = event
+                progress[filePath] = (bytesSoFar, totalSize)
+                # Report progress of all the downloads that have known size
+                sizes = [size for size in progress.values() if size[1] > 0]
+                self.reportHook(sum(size[0] for size in sizes), 1, sum(size[1] for size in sizes))
+
+        self.downloadPercent = 0
+        filePaths = [destFolderPath + "/" + name for name in names]
+        futures = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.maximumConcurrentDownloads) as executor:
+            for uri, filePath, checksum in zip(uris, filePaths, checksums, strict=False):
+                if filePath in futures:
+                    continue
+                futures[filePath] = executor.submit(SampleDataLogic._downloadFile, uri, filePath, checksum, logMessage, progressReporter(filePath))
+            pendingFutures = set(futures.values())
+            while pendingFutures:
+                _done, pendingFutures = concurrent.futures.wait(pendingFutures, timeout=0.1)
+                processEvents()
+                slicer.app.processEvents(qt.QEventLoop.ExcludeUserInputEvents)
+        processEvents()
+
+        failedFilePaths = [filePath for filePath, future in futures.items() if future.exception()]
+        if failedFilePaths:
+            raise ValueError(_("Failed to download {filePaths}").format(filePaths=", ".join(failedFilePaths)))
+        self.downloadPercent = 100
+        return filePaths
 
     def downloadSourceIntoCache(self, source):
         """Download all files for the given source and return a
         list of file paths for the results
         """
-        filePaths = []
-        for uri, fileName, checksum in zip(source.uris, source.fileNames, source.checksums, strict=False):
-            filePaths.append(self.downloadFileIntoCache(uri, fileName, checksum))
-        return filePaths
+        return self.downloadFilesIntoCache(source.uris, source.fileNames, source.checksums)
 
     def downloadFromSource(self, source, maximumAttemptsCount=3):
         """Given an instance of SampleDataSource, downloads the associated data and
@@ -705,6 +769,7 @@ class SampleDataLogic:
         # In this case default node names are not generated.
         generateDefaultNodeNames = all(n is None for n in source.nodeNames)
 
+        items = []
         for uri, fileName, nodeName, checksum, loadFile, loadFileType in zip(
             source.uris, source.fileNames, source.nodeNames, source.checksums, source.loadFiles, source.loadFileTypes, strict=False):
 
@@ -727,6 +792,19 @@ class SampleDataLogic:
                     # Generate a unique filename to avoid overwriting existing file with the same name
                     fileName = f"{nodeName if nodeName else basename}-{uuid.uuid4().hex}{ext}"
 
+            items.append((uri, fileName, nodeName, checksum, loadFile, loadFileType))
+
+        if len(items) > 1:
+            # Download independent files concurrently. Files are only loaded after all of them are downloaded,
+            # because a node may be loaded from multiple files (e.g., .nhdr and .raw file).
+            # Failed downloads are retried one by one below.
+            try:
+                self.downloadFilesIntoCache([item[0] for item in items], [item[1] for item in items], [item[3] for item in items])
+            except ValueError:
+                pass
+
+        for uri, fileName, nodeName, checksum, loadFile, loadFileType in items:
+
             current_source = SampleDataSource(
                 uris=uri,
                 fileNames=fileName,
@@ -931,6 +1009,9 @@ class SampleDataLogic:
         return "{:3.1f} {}".format(size, "TB")
 
     def reportHook(self, blocksSoFar, blockSize, totalSize):
+        if totalSize <= 0:
+            # size is unknown
+            return
         # we clamp to 100% because the blockSize might be larger than the file itself
         percent = min(int((100.0 * blocksSoFar * blockSize) / totalSize), 100)
         if percent == 100 or (percent - self.downloadPercent >= 10):
@@ -947,46 +1028,160 @@ class SampleDataLogic:
         :param destFolderPath: Folder to download the file into.
         :param name: File name that will be downloaded.
         :param checksum: Checksum formatted as ``<algo>:<digest>`` to verify the downloaded file. For example, ``SHA256:cc211f0dfd9a05ca3841ce1141b292898b2dd2d3f08286affadf823a7e58df93``.
+
+        The checksum is computed while the file is downloaded and it is stored along with the file size and modification time
+        in a ``.checksum.json`` file next to the downloaded file, so that the file is not read again when it is found in the cache.
+        Interrupted downloads are resumed if the server supports range requests.
+
+        :raises ValueError: if the download failed or the downloaded file has a different checksum.
         """
         self.downloadPercent = 0
         filePath = destFolderPath + "/" + name
-        (algo, digest) = extractAlgoAndDigest(checksum)
-        if not os.path.exists(filePath) or os.stat(filePath).st_size == 0:
-            import urllib.request, urllib.parse, urllib.error
+        SampleDataLogic._downloadFile(uri, filePath, checksum, self.logMessage,
+                                      lambda bytesSoFar, totalSize: self.reportHook(bytesSoFar, 1, totalSize))
+        self.downloadPercent = 100
+        return filePath
 
-            self.logMessage(_("Requesting download {name} from {uri} ...").format(name=name, uri=uri))
-            try:
-                urllib.request.urlretrieve(uri, filePath, self.reportHook)
-                self.logMessage(_("Download finished"))
-            except OSError as e:
-                self.logMessage("\t" + _("Download failed: {errorMessage}").format(errorMessage=e), logging.ERROR)
-                raise ValueError(_("Failed to download {uri} to {filePath}").format(uri=uri, filePath=filePath))
+    @staticmethod
+    def checksumCacheFilePath(filePath):
+        """Return path of the file that stores the verified checksum of a downloaded file."""
+        return filePath + ".checksum.json"
 
-            if algo is not None:
-                self.logMessage(_("Verifying checksum"))
-                current_digest = computeChecksum(algo, filePath)
-                if current_digest != digest:
-                    self.logMessage(
-                        _("Checksum verification failed. Computed checksum {currentChecksum} different from expected checksum {expectedChecksum}").format(
-                            currentChecksum=current_digest, expectedChecksum=digest))
-                    qt.QFile(filePath).remove()
-                else:
-                    self.downloadPercent = 100
-                    self.logMessage(_("Checksum OK"))
-        else:
-            if algo is not None:
-                self.logMessage(_("Verifying checksum"))
-                current_digest = computeChecksum(algo, filePath)
-                if current_digest != digest:
-                    self.logMessage(_("File already exists in cache but checksum is different - re-downloading it."))
-                    qt.QFile(filePath).remove()
-                    return self.downloadFile(uri, destFolderPath, name, checksum)
+    @staticmethod
+    def readCachedChecksum(filePath, algo):
+        """Return the stored digest of a file, if the file has not changed since the digest was stored.
+
+        Returns None if there is no valid stored digest.
+        """
+        import json
+
+        try:
+            with open(SampleDataLogic.checksumCacheFilePath(filePath)) as checksumFile:
+                checksumInfo = json.load(checksumFile)
+            fileStat = os.stat(filePath)
+        except (OSError, ValueError):
+            return None
+        if (checksumInfo.get("algo") != algo
+                or checksumInfo.get("size") != fileStat.st_size
+                or checksumInfo.get("mtime_ns") != fileStat.st_mtime_ns):
+            return None
+        return checksumInfo.get("digest")
+
+    @staticmethod
+    def writeCachedChecksum(filePath, algo, digest):
+        """Store the verified digest of a file along with the current size and modification time of the file."""
+        import json
+
+        try:
+            fileStat = os.stat(filePath)
+            with open(SampleDataLogic.checksumCacheFilePath(filePath), "w") as checksumFile:
+                json.dump({"algo": algo, "digest": digest, "size": fileStat.st_size, "mtime_ns": fileStat.st_mtime_ns}, checksumFile)
+        except OSError as e:
+            # Not critical, the checksum is computed again next time
+            logging.debug(f"Failed to store checksum of {filePath}: {e}")
+
+    @staticmethod
+    def streamDownload(uri, filePath, algo=None, reportProgress=None, chunkSize=1024 * 1024):
+        """Download ``uri`` to ``filePath`` and compute the digest of the content while downloading.
+
+        Data is written into a ``.part`` file, which is renamed to ``filePath`` when the download is completed.
+        If a ``.part`` file exists already then the download is resumed from its end (if the server supports range requests).
+
+        :param algo: hashing algorithm (SHA256, SHA512, or MD5). If None then no digest is computed.
+        :param reportProgress: optional function that is called with ``(bytesSoFar, totalSize)`` arguments.
+          ``totalSize`` is -1 if the size is unknown.
+        :return: hexadecimal digest of the downloaded file (None if ``algo`` is None).
+        :raises OSError: if the download failed.
+        """
+        import hashlib
+        import http.client
+        import urllib.error
+        import urllib.parse
+        import urllib.request
+
+        partialFilePath = filePath + ".part"
+        hasher = hashlib.new(algo) if algo else None
+        resumeFrom = os.path.getsize(partialFilePath) if os.path.exists(partialFilePath) else 0
+        request = urllib.request.Request(uri)
+        if resumeFrom > 0 and urllib.parse.urlparse(uri).scheme in ["http", "https"]:
+            request.add_header("Range", f"bytes={resumeFrom}-")
+        try:
+            with urllib.request.urlopen(request) as response:
+                if resumeFrom > 0 and getattr(response, "status", None) == 206:
+                    # Partial content: continue where the previous download stopped
+                    bytesSoFar = resumeFrom
+                    openMode = "ab"
+                    if hasher:
+                        with open(partialFilePath, "rb") as partialFile:
+                            for chunk in iter(lambda: partialFile.read(chunkSize), b""):
+                                hasher.update(chunk)
                 else:
-                    self.downloadPercent = 100
-                    self.logMessage(_("File already exists and checksum is OK - reusing it."))
-            else:
-                self.downloadPercent = 100
-                self.logMessage(_("File already exists in cache - reusing it."))
+                    bytesSoFar = 0
+                    openMode = "wb"
+                contentLength = response.headers.get("Content-Length")
+                totalSize = bytesSoFar + int(contentLength) if contentLength else -1
+                with open(partialFilePath, openMode) as partialFile:
+                    for chunk in iter(lambda: response.read(chunkSize), b""):
+                        partialFile.write(chunk)
+                        if hasher:
+                            hasher.update(chunk)
+                        bytesSoFar += len(chunk)
+                        if reportProgress:
+                            reportProgress(bytesSoFar, totalSize)
+        except urllib.error.HTTPError as e:
+            if e.code == 416:
+                # Requested range is not satisfiable, the partial file is not usable
+                os.remove(partialFilePath)
+            raise
+        except http.client.HTTPException as e:
+            # Keep the partial file, the download can be resumed
+            raise OSError(str(e)) from e
+        if totalSize >= 0 and bytesSoFar != totalSize:
+            raise OSError(f"Incomplete download: received {bytesSoFar} bytes of {totalSize}")
+        os.replace(partialFilePath, filePath)
+        return hasher.hexdigest() if hasher else None
+
+    @staticmethod
+    def _downloadFile(uri, filePath, checksum, logMessage, reportProgress):
+        """Download a file, unless it is already in the cache, and verify its checksum.
+
+        This method does not access the GUI (messages are only reported via ``logMessage``),
+        therefore it can be called from a worker thread.
+        """
+        (algo, digest) = extractAlgoAndDigest(checksum)
+        if os.path.exists(filePath) and os.stat(filePath).st_size > 0:
+            if algo is None:
+                logMessage(_("File already exists in cache - reusing it."))
+                return filePath
+            if SampleDataLogic.readCachedChecksum(filePath, algo) == digest:
+                logMessage(_("File already exists and checksum is OK - reusing it."))
+                return filePath
+            logMessage(_("Verifying checksum"))
+            current_digest = computeChecksum(algo, filePath)
+            if current_digest == digest:
+                SampleDataLogic.writeCachedChecksum(filePath, algo, digest)
+                logMessage(_("File already exists and checksum is OK - reusing it."))
+                return filePath
+            logMessage(_("File already exists in cache but checksum is different - re-downloading it."))
+            os.remove(filePath)
+
+        logMessage(_("Requesting download {name} from {uri} ...").format(name=os.path.basename(filePath), uri=uri))
+        try:
+            current_digest = SampleDataLogic.streamDownload(uri, filePath, algo, reportProgress)
+            logMessage(_("Download finished"))
+        except OSError as e:
+            logMessage("\t" + _("Download failed: {errorMessage}").format(errorMessage=e), logging.ERROR)
+            raise ValueError(_("Failed to download {uri} to {filePath}").format(uri=uri, filePath=filePath))
+
+        if algo is not None:
+            if current_digest != digest:
+                logMessage(
+                    _("Checksum verification failed. Computed checksum {currentChecksum} different from expected checksum {expectedChecksum}").format(
+                        currentChecksum=current_digest, expectedChecksum=digest))
+                os.remove(filePath)
+                raise ValueError(_("Failed to download {uri} to {filePath}").format(uri=uri, filePath=filePath))
+            SampleDataLogic.writeCachedChecksum(filePath, algo, digest)
+            logMessage(_("Checksum OK"))
         return filePath
 
     def loadScene(self, uri, fileProperties={}):
@@ -1065,6 +1260,7 @@ class SampleDataTest(ScriptedLoadableModuleTest):
             self.test_downloadFromSource_loadNodeFromMultipleFiles,
             self.test_downloadFromSource_loadNodes,
             self.test_downloadFromSource_loadNodesWithLoadFileFalse,
+            self.test_downloadFromLocalHTTPServer,
             self.test_sampleDataSourcesByCategory,
             self.test_categoryVisibility,
             self.test_setCategoriesFromSampleDataSources,
@@ -1113,6 +1309,97 @@ class SampleDataTest(ScriptedLoadableModuleTest):
         self.assertTrue(os.path.isfile(filePaths[1]))
         self.assertEqual(sceneMTime, slicer.mrmlScene.GetMTime())
 
+    def test_downloadFromLocalHTTPServer(self):
+        """Download files concurrently from a local HTTP server, reuse verified checksums of cached files,
+        and resume a partial download.
+        """
+        import functools
+        import hashlib
+        import http.server
+        import shutil
+        import tempfile
+        import threading
+        import uuid
+
+        rangeRequests = []
+
+        class RangeRequestHandler(http.server.SimpleHTTPRequestHandler):
+            """Serve files, supporting requests of the form ``Range: bytes=<start>-``."""
+
+            def do_GET(self):
+                try:
+                    with open(self.translate_path(self.path), "rb") as file:
+                        content = file.read()
+                except OSError:
+                    self.send_error(404)
+                    return
+                start = 0
+                rangeHeader = self.headers.get("Range")
+                if rangeHeader:
+                    rangeRequests.append(rangeHeader)
+                    start = int(rangeHeader.split("=")[1].split("-")[0])
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}")
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Length", str(len(content) - start))
+                self.end_headers()
+                self.wfile.write(content[start:])
+
+            def log_message(self, format, *args):
+                pass
+
+        serverFolder = tempfile.mkdtemp()
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(RangeRequestHandler, directory=serverFolder))
+        serverThread = threading.Thread(target=server.serve_forever, daemon=True)
+        serverThread.start()
+        filePaths = []
+        try:
+            names = []
+            contents = []
+            for fileIndex in range(3):
+                names.append(f"SampleDataTest-{uuid.uuid4().hex}-{fileIndex}.bin")
+                contents.append(os.urandom(3 * 1024 * 1024 + fileIndex))
+                with open(os.path.join(serverFolder, names[-1]), "wb") as file:
+                    file.write(contents[-1])
+            uris = [f"http://127.0.0.1:{server.server_address[1]}/{name}" for name in names]
+            checksums = ["SHA256:" + hashlib.sha256(content).hexdigest() for content in contents]
+
+            logic = SampleDataLogic()
+            messages = []
+            logic.logMessage = lambda message, logLevel=logging.DEBUG: messages.append(message)
+
+            self.delayDisplay("Download files concurrently")
+            filePaths = logic.downloadFilesIntoCache(uris, names, checksums)
+            for filePath, content, checksum in zip(filePaths, contents, checksums, strict=True):
+                with open(filePath, "rb") as file:
+                    self.assertEqual(file.read(), content)
+                self.assertEqual(SampleDataLogic.readCachedChecksum(filePath, "SHA256"), checksum.split(":")[1])
+
+            self.delayDisplay("Reuse cached files without computing checksum")
+            messages.clear()
+            self.assertEqual(logic.downloadFileIntoCache(uris[0], names[0], checksums[0]), filePaths[0])
+            self.assertNotIn(_("Verifying checksum"), messages)
+            self.assertEqual(rangeRequests, [])
+
+            self.delayDisplay("Resume partial download")
+            os.remove(filePaths[1])
+            with open(filePaths[1] + ".part", "wb") as file:
+                file.write(contents[1][:1024 * 1024])
+            self.assertEqual(logic.downloadFileIntoCache(uris[1], names[1], checksums[1]), filePaths[1])
+            self.assertEqual(rangeRequests, [f"bytes={1024 * 1024}-"])
+            with open(filePaths[1], "rb") as file:
+                self.assertEqual(file.read(), contents[1])
+            self.assertFalse(os.path.exists(filePaths[1] + ".part"))
+        finally:
+            server.shutdown()
+            server.server_close()
+            shutil.rmtree(serverFolder)
+            for filePath in filePaths:
+                for path in [filePath, SampleDataLogic.checksumCacheFilePath(filePath)]:
+                    if os.path.exists(path):
+                        os.remove(path)
+
     def test_downloadFromSource_downloadZipFile(self):
         logic = SampleDataLogic()
         sceneMTime = slicer.mrmlScene.GetMTime()
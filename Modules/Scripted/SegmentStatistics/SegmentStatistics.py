@@ -645,6 +645,47 @@ class SegmentStatisticsLogic(ScriptedLoadableModuleLogic):
         columnTitles = {keys[i]: columnTitles[i] for i in range(len(keys))}
         return columnNames, columnTitles
 
+    @staticmethod
+    def tableColumnFromValues(values):
+        """Create a table column array that contains all the values (one value per row).
+
+        Integer, float, and list of integer or float values are stored in a numeric array
+        (with one component per list item), which is filled in one step from a numpy array.
+        Missing (None) numeric values are stored as NaN, therefore integer columns with
+        missing values are stored as floating-point values.
+        All other values are stored as strings, missing values as empty strings.
+        """
+        import numpy as np
+        import vtk.util.numpy_support
+
+        measurements = [value for value in values if value is not None]
+        firstValue = measurements[0] if measurements else None
+        numberOfComponents = 1
+        if isinstance(firstValue, list) and len(firstValue) > 0:
+            numberOfComponents = len(firstValue)
+            firstValue = firstValue[0]
+        hasMissingValues = len(measurements) < len(values)
+
+        if isinstance(firstValue, float) or (isinstance(firstValue, int) and hasMissingValues):
+            array = vtk.vtkDoubleArray()
+        elif isinstance(firstValue, int):
+            array = vtk.vtkLongArray()
+        else:
+            array = vtk.vtkStringArray()
+            array.SetNumberOfValues(len(values))
+            for rowIndex, value in enumerate(values):
+                array.SetValue(rowIndex, "" if value is None else str(value))
+            return array
+
+        array.SetNumberOfComponents(numberOfComponents)
+        array.SetNumberOfTuples(len(values))
+        if len(values) > 0:
+            missingValue = np.nan if numberOfComponents == 1 else [np.nan] * numberOfComponents
+            rows = [missingValue if value is None else value for value in values]
+            narray = vtk.util.numpy_support.vtk_to_numpy(array)
+            narray[:] = np.asarray(rows, dtype=narray.dtype).reshape(narray.shape)
+        return array
+
     def exportToTable(self, table, nonEmptyKeysOnly=True):
         """Export statistics to table node"""
         tableWasModified = table.StartModify()
@@ -653,36 +694,12 @@ class SegmentStatisticsLogic(ScriptedLoadableModuleLogic):
         keys = self.getNonEmptyKeys() if nonEmptyKeysOnly else self.keys
         columnNames, columnTitles = self.getColumnNamesTitles(nonEmptyKeysOnly)
 
-        # Define table columns
+        # Define table columns. Each column is allocated and filled at once.
         statistics = self.getStatistics()
+        segmentIDs = statistics["SegmentIDs"]
         for key in keys:
-            # create table column appropriate for data type; currently supported: float, int, long, string
-            measurements = [statistics[segmentID, key] for segmentID in statistics["SegmentIDs"] if
-                            (segmentID, key) in statistics]
-            if len(measurements) == 0:  # there were not measurements and therefore use the default "string" representation
-                col = table.AddColumn()
-            elif isinstance(measurements[0], int):
-                col = table.AddColumn(vtk.vtkLongArray())
-            elif isinstance(measurements[0], float):
-                col = table.AddColumn(vtk.vtkDoubleArray())
-            elif isinstance(measurements[0], list):
-                length = len(measurements[0])
-                if length == 0:
-                    col = table.AddColumn()
-                else:
-                    value = measurements[0][0]
-                    if isinstance(value, int):
-                        array = vtk.vtkLongArray()
-                        array.SetNumberOfComponents(length)
-                        col = table.AddColumn(array)
-                    elif isinstance(value, float):
-                        array = vtk.vtkDoubleArray()
-                        array.SetNumberOfComponents(length)
-                        col = table.AddColumn(array)
-                    else:
-                        col = table.AddColumn()
-            else:  # default
-                col = table.AddColumn()
+            values = [statistics.get((segmentID, key)) for segmentID in segmentIDs]
+            col = table.AddColumn(SegmentStatisticsLogic.tableColumnFromValues(values))
             plugin = self.getPluginByKey(key)
             columnName = columnNames[key]
             columnTitle = columnTitles[key]
@@ -707,21 +724,6 @@ class SegmentStatisticsLogic(ScriptedLoadableModuleLogic):
                     elif mik not in ["name", "title"]:  # name and title are set already
                         table.SetColumnProperty(columnName, str(mik), str(miv))
 
-        # Fill columns
-        for segmentID in statistics["SegmentIDs"]:
-            rowIndex = table.AddEmptyRow()
-            columnIndex = 0
-            for key in keys:
-                value = statistics[segmentID, key] if (segmentID, key) in statistics else None
-                if value is None and key != SegmentStatisticsLogic.segmentColumnName:
-                    value = float("nan")
-                if isinstance(value, list):
-                    for i in range(len(value)):
-                        table.GetTable().GetColumn(columnIndex).SetComponent(rowIndex, i, value[i])
-                else:
-                    table.GetTable().GetColumn(columnIndex).SetValue(rowIndex, value)
-                columnIndex += 1
-
         table.Modified()
         table.EndModify(tableWasModified)
 
@@ -819,6 +821,7 @@ class SegmentStatisticsTest(ScriptedLoadableModuleTest):
         resultsTableNode = slicer.vtkMRMLTableNode()
         slicer.mrmlScene.AddNode(resultsTableNode)
         segStatLogic.exportToTable(resultsTableNode)
+        self.assertEqual(resultsTableNode.GetNumberOfRows(), len(segmentGeometries))
         segStatLogic.showTable(resultsTableNode)
 
         self.delayDisplay("Export results to string")
@@ -16,7 +16,7 @@ from slicer.i18n import translate
 from slicer.ScriptedLoadableModule import *
 from slicer.util import settingsValue, toBool
 
-from WebServerLib.BaseRequestHandler import BaseRequestHandler, BaseRequestLoggingFunction
+from WebServerLib.BaseRequestHandler import BaseRequestHandler, BaseRequestLoggingFunction, BaseResponseStream
 
 logger = logging.getLogger(__name__)
 
@@ -227,7 +227,7 @@ class WebServerWidget(ScriptedLoadableModuleWidget):
         self.stopServer()
 
         packageName = "WebServerLib"
-        submoduleNames = ["SlicerRequestHandler", "StaticPagesRequestHandler"]
+        submoduleNames = ["GLTFExport", "SlicerRequestHandler", "StaticPagesRequestHandler"]
         if hasattr(slicer.modules, "dicom"):
             submoduleNames.append("DICOMRequestHandler")
 
@@ -324,6 +324,64 @@ class SlicerHTTPServer(HTTPServer):
     class DummyRequestHandler:
         pass
 
+    class ChunkedBodyDecoder:
+        """
+        Incremental decoder of a request body that is sent with chunked transfer encoding.
+        Chunk extensions and trailer fields are ignored.
+        .. note:: this is an internal class of the web server
+        """
+
+        # Maximum length of a chunk size line or trailer field line
+        maximumLineLength = 8192
+
+        def __init__(self):
+            self.buffer = b""
+            self.remainingChunkSize = 0
+            self.expectChunkEnd = False
+            self.readingTrailer = False
+            self.finished = False
+
+        def decode(self, data: bytes) -> bytes:
+            """
+            Return the body data that is contained in the received data.
+            :raises ValueError: if the chunk framing is invalid.
+            """
+            self.buffer += data
+            decoded = []
+            while not self.finished:
+                if self.remainingChunkSize > 0:
+                    chunkData = self.buffer[: self.remainingChunkSize]
+                    decoded.append(chunkData)
+                    self.buffer = self.buffer[len(chunkData) :]
+                    self.remainingChunkSize -= len(chunkData)
+                    if self.remainingChunkSize > 0:
+                        break
+                    self.expectChunkEnd = True
+                if self.expectChunkEnd:
+                    if len(self.buffer) < 2:
+                        break
+                    if self.buffer[:2] != b"\r\n":
+                        raise ValueError("Chunk data is not followed by line break")
+                    self.buffer = self.buffer[2:]
+                    self.expectChunkEnd = False
+                endOfLine = self.buffer.find(b"\r\n")
+                if endOfLine == -1:
+                    if len(self.buffer) > self.maximumLineLength:
+                        raise ValueError("Chunk size line is too long")
+                    break
+                line = self.buffer[:endOfLine]
+                self.buffer = self.buffer[endOfLine + 2 :]
+                if self.readingTrailer:
+                    # Body ends with an empty line after the optional trailer fields
+                    self.finished = line == b""
+                    continue
+                chunkSize = line.split(b";", 1)[0].strip()
+                if not chunkSize or chunkSize.strip(b"0123456789abcdefABCDEF"):
+                    raise ValueError("Invalid chunk size: %r" % chunkSize)
+                self.remainingChunkSize = int(chunkSize, 16)
+                self.readingTrailer = self.remainingChunkSize == 0
+            return b"".join(decoded)
+
     class SlicerRequestCommunicator:
         """
         Encapsulate elements for handling event driven read of request.
@@ -353,6 +411,12 @@ class SlicerHTTPServer(HTTPServer):
                 self.registerRequestHandler(requestHandler)
             self.expectedRequestSize = -1
             self.requestSoFar = b""
+            # Decoder and decoded body of requests with chunked transfer encoding
+            self.chunkedBodyDecoder = None
+            self.chunkedRequestBody = b""
+            # Status of requests that are rejected without handling them
+            self.errorStatus = None
+            self.stream = None
             fileno = self.connectionSocket.fileno()
             self.readNotifier = qt.QSocketNotifier(fileno, qt.QSocketNotifier.Read)
             self.readNotifier.connect("activated(int)", self.onReadable)
@@ -362,6 +426,40 @@ class SlicerHTTPServer(HTTPServer):
             self.requestHandlers.append(handler)
             handler.logMessage = self.logMessage
 
+        def highestConfidenceHandler(self, method: str, uri: bytes, requestBody: bytes) -> BaseRequestHandler | None:
+            """Return the request handler that can handle the request with the highest confidence."""
+            highestConfidenceHandler = None
+            highestConfidence = 0.0
+            for handler in self.requestHandlers:
+                confidence = handler.canHandleRequest(method=method, uri=uri, requestBody=requestBody)
+                if confidence > highestConfidence:
+                    highestConfidenceHandler = handler
+                    highestConfidence = confidence
+            return highestConfidenceHandler
+
+        @staticmethod
+        def headerFields(requestHeader: bytes) -> dict[bytes, bytes]:
+            """Return the header fields of the request, with lowercase field names."""
+            fields = {}
+            for requestLine in requestHeader.split(b"\r\n")[1:]:
+                fieldName, _, fieldValue = requestLine.partition(b":")
+                fieldName = fieldName.strip().lower()
+                if fieldName in fields:
+                    # Repeated fields are equivalent to a comma-separated list
+                    fields[fieldName] += b"," + fieldValue.strip()
+                else:
+                    fields[fieldName] = fieldValue.strip()
+            return fields
+
+        def streamsRequestBody(self, requestHeader: bytes) -> bool:
+            """Whether the request body is passed to a response stream instead of being received before handling the request."""
+            try:
+                method, uri, _ = requestHeader.split(b"\r\n", 1)[0].split(b" ")
+            except ValueError:
+                return False
+            handler = self.highestConfidenceHandler(method.decode(), uri, b"")
+            return handler is not None and handler.streamsRequestBody(method.decode(), uri)
+
         def onReadable(self, fileno):
             self.logMessage("Reading...")
             requestHeader = b""
@@ -373,7 +471,13 @@ class SlicerHTTPServer(HTTPServer):
                 self.logMessage("Just received... %d bytes in this part" % len(requestPart))
                 self.requestSoFar += requestPart
                 endOfHeader = self.requestSoFar.find(b"\r\n\r\n")
-                if self.expectedRequestSize > 0:
+                if self.chunkedBodyDecoder is not None:
+                    self.chunkedRequestBody += self.chunkedBodyDecoder.decode(requestPart)
+                    if self.chunkedBodyDecoder.finished:
+                        requestHeader = self.requestSoFar[: endOfHeader + 2]
+                        requestBody = self.chunkedRequestBody
+                        requestComplete = True
+                elif self.expectedRequestSize > 0:
                     self.logMessage("received... %d of %d expected" % (len(self.requestSoFar), self.expectedRequestSize))
                     if len(self.requestSoFar) >= self.expectedRequestSize:
                         requestHeader = self.requestSoFar[: endOfHeader + 2]
@@ -382,12 +486,29 @@ class SlicerHTTPServer(HTTPServer):
                 else:
                     if endOfHeader != -1:
                         self.logMessage("Looking for content in header...")
-                        contentLengthTag = self.requestSoFar.find(b"Content-Length:")
-                        if contentLengthTag != -1:
-                            tag = self.requestSoFar[contentLengthTag:]
-                            numberStartIndex = tag.find(b" ")
-                            numberEndIndex = tag.find(b"\r\n")
-                            contentLength = int(tag[numberStartIndex:numberEndIndex])
+                        headerFields = self.headerFields(self.requestSoFar[:endOfHeader])
+                        transferCodings = [coding.strip().lower() for coding in headerFields.get(b"transfer-encoding", b"").split(b",") if coding.strip()]
+                        if transferCodings:
+                            # Transfer encoding takes precedence over content length. Only chunked encoding is supported,
+                            # the length of the body is not known if it is not the final encoding.
+                            requestHeader = self.requestSoFar[: endOfHeader + 2]
+                            if transferCodings != [b"chunked"]:
+                                self.logMessage("Unsupported transfer encoding: %s" % transferCodings)
+                                self.errorStatus = "400 Bad Request"
+                                requestComplete = True
+                            else:
+                                self.chunkedBodyDecoder = SlicerHTTPServer.ChunkedBodyDecoder()
+                                if self.streamsRequestBody(requestHeader):
+                                    # Request is handled now, the body is decoded and passed to the stream as it arrives
+                                    self.logMessage("Streaming chunked request body")
+                                    requestComplete = True
+                                else:
+                                    self.chunkedRequestBody = self.chunkedBodyDecoder.decode(self.requestSoFar[4 + endOfHeader :])
+                                    if self.chunkedBodyDecoder.finished:
+                                        requestBody = self.chunkedRequestBody
+                                        requestComplete = True
+                        elif b"content-length" in headerFields:
+                            contentLength = int(headerFields[b"content-length"])
                             self.expectedRequestSize = 4 + endOfHeader + contentLength
                             self.logMessage("Expecting a body of %d, total size %d" % (contentLength, self.expectedRequestSize))
                             if len(requestPart) == self.expectedRequestSize:
@@ -398,6 +519,11 @@ class SlicerHTTPServer(HTTPServer):
                             self.logMessage("Found end of header with no content, so body is empty")
                             requestHeader = self.requestSoFar[:-2]
                             requestComplete = True
+            except ValueError as e:
+                self.logMessage("Invalid request body: %s" % e)
+                self.errorStatus = "400 Bad Request"
+                requestHeader = self.requestSoFar[: self.requestSoFar.find(b"\r\n\r\n") + 2]
+                requestComplete = True
             except OSError as e:
                 print("Socket error: ", e)
                 print("So far:\n", self.requestSoFar)
@@ -424,6 +550,13 @@ class SlicerHTTPServer(HTTPServer):
                 if requestLines == "":
                     self.logMessage("Assuming empty string is HTTP/1.1 GET of /.")
 
+                # Entity tags of content versions that the client already has
+                knownETags = set()
+                for requestLine in requestLines[1:]:
+                    headerName, _, headerValue = requestLine.partition(b":")
+                    if headerName.strip().lower() == b"if-none-match":
+                        knownETags.update(etag.strip().removeprefix(b"W/") for etag in headerValue.split(b","))
+
                 if version != b"HTTP/1.1":
                     self.logMessage("Warning, we don't speak %s", version)
                     return
@@ -440,16 +573,14 @@ class SlicerHTTPServer(HTTPServer):
                 self.logMessage("Parsing url request: ", parsedURL)
                 self.logMessage(" request is: %s" % request)
 
-                highestConfidenceHandler = None
-                highestConfidence = 0.0
-                for handler in self.requestHandlers:
-                    confidence = handler.canHandleRequest(method=method, uri=uri, requestBody=requestBody)
-                    if confidence > highestConfidence:
-                        highestConfidenceHandler = handler
-                        highestConfidence = confidence
+                highestConfidenceHandler = self.highestConfidenceHandler(method, uri, requestBody)
 
                 httpStatus = "200 OK"
-                if highestConfidenceHandler is not None and highestConfidence > 0.0 and method != "OPTIONS":
+                if self.errorStatus is not None:
+                    contentType = b"text/plain"
+                    responseBody = self.errorStatus.encode()
+                    httpStatus = self.errorStatus
+                elif highestConfidenceHandler is not None and method != "OPTIONS":
                     try:
                         contentType, responseBody = highestConfidenceHandler.handleRequest(method=method, uri=uri, requestBody=requestBody)
                     except Exception as e:
@@ -470,12 +601,36 @@ class SlicerHTTPServer(HTTPServer):
                     contentType = b"text/plain"
                     responseBody = b""
 
-                if responseBody:
+                if isinstance(responseBody, BaseResponseStream):
+                    receivedData = self.requestSoFar[self.requestSoFar.find(b"\r\n\r\n") + 4 :]
+                    if self.chunkedBodyDecoder is not None:
+                        try:
+                            receivedData = self.chunkedBodyDecoder.decode(receivedData)
+                        except ValueError as e:
+                            self.logMessage("Invalid request body: %s" % e)
+                            receivedData = b""
+                    self.startStream(contentType, responseBody, receivedData)
+                    return
+
+                etag = getattr(responseBody, "etag", None)
+                etagHeader = b'ETag: "%s"\r\n' % etag.encode() if etag else b""
+                if etag and (b'"%s"' % etag.encode() in knownETags or b"*" in knownETags):
+                    self.response = b"HTTP/1.1 304 Not Modified\r\n"
+                    if self.enableCORS:
+                        self.response += b"Access-Control-Allow-Origin: *\r\n"
+                        self.response += b"Access-Control-Expose-Headers: ETag\r\n"
+                    self.response += etagHeader
+                    self.response += b"Cache-Control: no-cache\r\n"
+                    self.response += b"\r\n"
+                elif responseBody:
                     self.response = f"HTTP/1.1 {httpStatus}\r\n".encode()
                     if self.enableCORS:
                         self.response += b"Access-Control-Allow-Origin: *\r\n"
+                        if etag:
+                            self.response += b"Access-Control-Expose-Headers: ETag\r\n"
                     self.response += b"Content-Type: %s\r\n" % contentType
                     self.response += b"Content-Length: %d\r\n" % len(responseBody)
+                    self.response += etagHeader
                     self.response += b"Cache-Control: no-cache\r\n"
                     self.response += b"\r\n"
                     self.response += responseBody
@@ -485,7 +640,7 @@ class SlicerHTTPServer(HTTPServer):
                     if self.enableCORS:
                         self.response += b"Access-Control-Allow-Origin: *\r\n"
                         self.response += b"Access-Control-Allow-Methods: POST, GET, OPTIONS, DELETE, PUT\r\n"
-                        self.response += b"Access-Control-Allow-Headers: Accept\r\n"
+                        self.response += b"Access-Control-Allow-Headers: Accept, If-None-Match\r\n"
                         self.response += b"Access-Control-Max-Age: 86400\r\n"
                 else:
                     self.response = b"HTTP/1.1 404 Not Found\r\n"
@@ -509,11 +664,94 @@ class SlicerHTTPServer(HTTPServer):
                 self.logMessage("Socket error while sending: %s" % e)
                 sendError = True
 
-            if self.sentSoFar >= self.toSend or sendError:
-                self.writeNotifier.disconnect("activated(int)", self.onWritable)
+            if sendError or (self.stream is None and self.sentSoFar >= self.toSend):
+                self.close()
+            elif self.stream is not None and not self.response:
+                # Wait for the next part of the stream
                 self.writeNotifier.setEnabled(False)
-                self.connectionSocket.close()
-                self.logMessage("closed fileno %d" % (fileno))
+
+        def startStream(self, contentType: bytes, stream: BaseResponseStream, receivedData: bytes = b""):
+            """Send the response header and then keep sending parts of the stream
+            until the stream ends or the client disconnects.
+            :param receivedData: data that the client has already sent after the request header
+            """
+            self.logMessage("Starting stream of %s" % contentType)
+            self.stream = stream
+            self.response = b"HTTP/1.1 200 OK\r\n"
+            if self.enableCORS:
+                self.response += b"Access-Control-Allow-Origin: *\r\n"
+            self.response += b"Content-Type: %s\r\n" % contentType
+            self.response += b"Cache-Control: no-cache\r\n"
+            self.response += b"Connection: close\r\n"
+            self.response += b"\r\n"
+            self.toSend = len(self.response)
+            self.sentSoFar = 0
+            fileno = self.connectionSocket.fileno()
+            self.writeNotifier = qt.QSocketNotifier(fileno, qt.QSocketNotifier.Write)
+            self.writeNotifier.connect("activated(int)", self.onWritable)
+            if receivedData:
+                stream.receive(receivedData)
+            # Data sent by the client is passed to the stream, the socket also becomes readable when the client disconnects
+            self.readNotifier = qt.QSocketNotifier(fileno, qt.QSocketNotifier.Read)
+            self.readNotifier.connect("activated(int)", self.onStreamReadable)
+            self.streamTimer = qt.QTimer()
+            self.streamTimer.setInterval(int(stream.interval * 1000))
+            self.streamTimer.connect("timeout()", self.onStreamTimeout)
+            self.streamTimer.start()
+
+        def onStreamTimeout(self):
+            if self.response:
+                # The client has not received the previous part yet, skip this one
+                return
+            try:
+                part = self.stream.nextPart()
+            except Exception as e:
+                self.logMessage("Error while streaming: %s" % e)
+                part = None
+            if part is None:
+                self.logMessage("Stream ended on %d" % self.connectionSocket.fileno())
+                self.close()
+                return
+            if not part:
+                return
+            self.response = part
+            self.toSend += len(part)
+            self.writeNotifier.setEnabled(True)
+
+        def onStreamReadable(self, fileno):
+            try:
+                data = self.connectionSocket.recv(self.bufferSize)
+            except OSError:
+                data = b""
+            if not data:
+                self.logMessage("Client disconnected from stream on %d" % fileno)
+                self.close()
+                return
+            try:
+                if self.chunkedBodyDecoder is not None:
+                    if self.chunkedBodyDecoder.finished:
+                        # End of the request body, the stream may still send data to the client
+                        return
+                    data = self.chunkedBodyDecoder.decode(data)
+                self.stream.receive(data)
+            except Exception as e:
+                self.logMessage("Error while receiving stream data: %s" % e)
+                self.close()
+
+        def close(self):
+            """Stop streaming (if a stream is active) and close the connection."""
+            if self.stream is not None:
+                self.streamTimer.stop()
+                self.streamTimer.disconnect("timeout()", self.onStreamTimeout)
+                self.readNotifier.disconnect("activated(int)", self.onStreamReadable)
+                self.readNotifier.setEnabled(False)
+                self.stream.close()
+                self.stream = None
+            self.writeNotifier.disconnect("activated(int)", self.onWritable)
+            self.writeNotifier.setEnabled(False)
+            fileno = self.connectionSocket.fileno()
+            self.connectionSocket.close()
+            self.logMessage("closed fileno %d" % (fileno))
 
     def onServerSocketNotify(self, fileno):
         self.logMessage("got request on %d" % fileno)
@@ -541,6 +779,9 @@ class SlicerHTTPServer(HTTPServer):
 
     def stop(self):
         self.socket.close()
+        for requestCommunicator in self.requestCommunicators.values():
+            if requestCommunicator.stream is not None:
+                requestCommunicator.close()
         if self.notifier:
             self.notifier.disconnect("activated(int)", self.onServerSocketNotify)
         self.notifier = None
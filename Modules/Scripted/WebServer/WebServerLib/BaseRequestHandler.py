@@ -70,3 +70,77 @@ class BaseRequestHandler(abc.ABC):
             1. The response body content.
         """
         pass
+
+    def streamsRequestBody(self, method: str, uri: bytes) -> bool:
+        """
+        Indicate whether the request returns a `BaseResponseStream` that receives the request body
+        while it is being sent by the client.
+
+        The web server then handles the request as soon as the request header is received
+        (with empty request body) and passes the body to the stream as it arrives,
+        instead of waiting for the entire body.
+        This is only needed for request bodies of unknown length (chunked transfer encoding).
+
+        :param method: The HTTP request method. 'GET', 'POST', etc.
+        :param uri: The request URI to parse.
+        """
+        return False
+
+
+class ETaggedResponseBody(bytes):
+    """
+    Response body with an entity tag that identifies the version of the content.
+
+    A request handler may return an instance of this class as response body.
+    The web server sends the entity tag in the ETag header and if the client
+    already has this version of the content (the If-None-Match header of
+    the request contains the entity tag) then the server responds with
+    304 Not Modified instead of sending the content again.
+    """
+
+    def __new__(cls, content: bytes, etag: str):
+        """
+        :param content: The response body content.
+        :param etag: Entity tag (without quotes) that changes whenever the content changes.
+        """
+        responseBody = super().__new__(cls, content)
+        responseBody.etag = etag
+        return responseBody
+
+
+class BaseResponseStream(abc.ABC):
+    """
+    Abstract base class (ABC) for responses that are sent in parts over a long-lived connection.
+
+    A request handler may return an instance of this class as response body
+    instead of bytes. The web server then sends the response header without
+    content length, keeps the connection open and periodically (every `interval` seconds)
+    asks the stream for the next part to send to the client, until the stream ends
+    or the client disconnects. Data that the client sends after the request header
+    is passed to `receive`.
+    """
+
+    interval: float = 0.1
+    """Time in seconds between consecutive `nextPart` calls."""
+
+    @abc.abstractmethod
+    def nextPart(self) -> bytes | None:
+        """
+        Get the next part of the response body.
+
+        :returns: Bytes to send to the client. Empty bytes if there is nothing
+            to send now, None if the stream has ended and the connection can be closed.
+        """
+        pass
+
+    def receive(self, data: bytes):  # noqa: B027 (optional hook, no-op by default)
+        """
+        Called when data is received from the client while streaming.
+        This allows clients to send a continuous stream of data in the request body.
+        By default the data is ignored.
+        """
+        pass
+
+    def close(self):  # noqa: B027 (optional hook, no-op by default)
+        """Called when the connection is closed. Release resources held by the stream."""
+        pass
@@ -0,0 +1,193 @@
+"""
+Minimal glTF 2.0 writer for exporting surface meshes of the Slicer scene.
+
+Each mesh is stored as a triangle mesh with normals and a single color,
+as a child of one root node. Coordinates are kept in the RAS coordinate system
+(same as vtkGLTFExporter), it is up to the client to reorient the scene.
+"""
+
+import base64
+import json
+import struct
+
+import numpy
+import vtk
+import vtk.util.numpy_support
+
+
+# glTF constants
+COMPONENT_TYPE_FLOAT = 5126
+COMPONENT_TYPE_UNSIGNED_INT = 5125
+TARGET_ARRAY_BUFFER = 34962
+TARGET_ELEMENT_ARRAY_BUFFER = 34963
+PRIMITIVE_MODE_TRIANGLES = 4
+
+
+class GLTFMeshGeometry:
+    """Triangle mesh arrays that can be written into a glTF buffer."""
+
+    def __init__(self, positions, normals, indices):
+        """
+        :param positions: float32 array of point positions (N x 3)
+        :param normals: float32 array of point normals (N x 3)
+        :param indices: uint32 array of triangle point indices (3M)
+        """
+        self.positions = positions
+        self.normals = normals
+        self.indices = indices
+
+    @property
+    def empty(self):
+        return len(self.indices) == 0
+
+    @staticmethod
+    def fromPolyData(polyData, decimation=0.0):
+        """Create mesh geometry from the polygons of a vtkPolyData.
+        :param polyData: input surface
+        :param decimation: ratio of triangles to remove (between 0.0 and 1.0)
+        """
+        triangleFilter = vtk.vtkTriangleFilter()
+        triangleFilter.SetInputData(polyData)
+        triangleFilter.PassLinesOff()
+        triangleFilter.PassVertsOff()
+        outputPort = triangleFilter.GetOutputPort()
+        if decimation > 0.0:
+            decimate = vtk.vtkQuadricDecimation()
+            decimate.SetInputConnection(outputPort)
+            decimate.SetTargetReduction(decimation)
+            decimate.VolumePreservationOn()
+            outputPort = decimate.GetOutputPort()
+        normalsFilter = vtk.vtkPolyDataNormals()
+        normalsFilter.SetInputConnection(outputPort)
+        normalsFilter.ComputePointNormalsOn()
+        normalsFilter.SplittingOff()
+        normalsFilter.Update()
+        surface = normalsFilter.GetOutput()
+
+        if surface.GetNumberOfPoints() == 0 or surface.GetNumberOfPolys() == 0:
+            return GLTFMeshGeometry(
+                numpy.zeros((0, 3), dtype=numpy.float32),
+                numpy.zeros((0, 3), dtype=numpy.float32),
+                numpy.zeros(0, dtype=numpy.uint32))
+
+        positions = vtk.util.numpy_support.vtk_to_numpy(surface.GetPoints().GetData()).astype(numpy.float32)
+        normals = vtk.util.numpy_support.vtk_to_numpy(surface.GetPointData().GetNormals()).astype(numpy.float32)
+        indices = vtk.util.numpy_support.vtk_to_numpy(surface.GetPolys().GetConnectivityArray()).astype(numpy.uint32)
+        return GLTFMeshGeometry(positions, normals, indices)
+
+
+class GLTFMesh:
+    """Mesh geometry with name and appearance."""
+
+    def __init__(self, name, geometry, color, opacity=1.0):
+        """
+        :param name: name of the node in the glTF scene
+        :param geometry: GLTFMeshGeometry instance
+        :param color: RGB color, components between 0.0 and 1.0
+        :param opacity: opacity between 0.0 and 1.0
+        """
+        self.name = name
+        self.geometry = geometry
+        self.color = color
+        self.opacity = opacity
+
+
+def writeGLTF(meshes, binary=False, sceneName="Slicer"):
+    """Write meshes into a glTF document.
+    :param meshes: list of GLTFMesh
+    :param binary: if True then binary glTF (.glb) content is returned, otherwise
+        glTF JSON with the data embedded as base64 encoded buffer.
+    :param sceneName: name of the root node
+    :return: bytes of the glTF document
+    """
+    buffer = bytearray()
+    bufferViews = []
+    accessors = []
+    materials = []
+    gltfMeshes = []
+    nodes = [{"name": sceneName}]
+
+    def addAccessor(array, componentType, accessorType, target, bounds=False):
+        # buffer views must be aligned to 4 bytes
+        buffer.extend(b"\x00" * (-len(buffer) % 4))
+        bufferViews.append({
+            "buffer": 0,
+            "byteOffset": len(buffer),
+            "byteLength": array.nbytes,
+            "target": target,
+        })
+        buffer.extend(array.tobytes())
+        accessor = {
+            "bufferView": len(bufferViews) - 1,
+            "componentType": componentType,
+            "count": len(array),
+            "type": accessorType,
+        }
+        if bounds:
+            accessor["min"] = array.min(axis=0).tolist()
+            accessor["max"] = array.max(axis=0).tolist()
+        accessors.append(accessor)
+        return len(accessors) - 1
+
+    for mesh in meshes:
+        geometry = mesh.geometry
+        if geometry.empty:
+            continue
+        positionAccessor = addAccessor(geometry.positions, COMPONENT_TYPE_FLOAT, "VEC3", TARGET_ARRAY_BUFFER, bounds=True)
+        normalAccessor = addAccessor(geometry.normals, COMPONENT_TYPE_FLOAT, "VEC3", TARGET_ARRAY_BUFFER)
+        indicesAccessor = addAccessor(geometry.indices, COMPONENT_TYPE_UNSIGNED_INT, "SCALAR", TARGET_ELEMENT_ARRAY_BUFFER)
+        material = {
+            "name": mesh.name,
+            "pbrMetallicRoughness": {
+                "baseColorFactor": [*mesh.color[:3], mesh.opacity],
+                "metallicFactor": 0.0,
+                "roughnessFactor": 0.5,
+            },
+            "doubleSided": True,
+        }
+        if mesh.opacity < 1.0:
+            material["alphaMode"] = "BLEND"
+        materials.append(material)
+        gltfMeshes.append({
+            "name": mesh.name,
+            "primitives": [{
+                "attributes": {"POSITION": positionAccessor, "NORMAL": normalAccessor},
+                "indices": indicesAccessor,
+                "material": len(materials) - 1,
+                "mode": PRIMITIVE_MODE_TRIANGLES,
+            }],
+        })
+        nodes.append({"name": mesh.name, "mesh": len(gltfMeshes) - 1})
+
+    if len(nodes) > 1:
+        nodes[0]["children"] = list(range(1, len(nodes)))
+
+    gltf = {
+        "asset": {"version": "2.0", "generator": "3D Slicer"},
+        "scene": 0,
+        "scenes": [{"name": sceneName, "nodes": [0]}],
+        "nodes": nodes,
+    }
+    # glTF does not allow empty arrays
+    if gltfMeshes:
+        gltf["meshes"] = gltfMeshes
+        gltf["materials"] = materials
+        gltf["accessors"] = accessors
+        gltf["bufferViews"] = bufferViews
+        gltf["buffers"] = [{"byteLength": len(buffer)}]
+
+    if not binary:
+        if gltfMeshes:
+            gltf["buffers"][0]["uri"] = "data:application/octet-stream;base64," + base64.b64encode(buffer).decode()
+        return json.dumps(gltf).encode()
+
+    # Binary glTF: header, JSON chunk (padded with spaces), binary chunk (padded with zeros)
+    jsonChunk = json.dumps(gltf).encode()
+    jsonChunk += b" " * (-len(jsonChunk) % 4)
+    buffer.extend(b"\x00" * (-len(buffer) % 4))
+    totalLength = 12 + 8 + len(jsonChunk) + (8 + len(buffer) if gltfMeshes else 0)
+    glb = struct.pack("<4sII", b"glTF", 2, totalLength)
+    glb += struct.pack("<I4s", len(jsonChunk), b"JSON") + jsonChunk
+    if gltfMeshes:
+        glb += struct.pack("<I4s", len(buffer), b"BIN\x00") + bytes(buffer)
+    return glb
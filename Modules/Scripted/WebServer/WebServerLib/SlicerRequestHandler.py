@@ -4,18 +4,23 @@ Docs/user_guide/modules/webserver.md
 """
 
 
+import collections
+import hashlib
 import json
 import logging
+import math
 import numpy
 import os
 import time
 import urllib
+import uuid
 
 import qt
 import vtk.util.numpy_support
 
 import slicer
-from .BaseRequestHandler import BaseRequestHandler, BaseRequestLoggingFunction
+from .BaseRequestHandler import BaseRequestHandler, BaseRequestLoggingFunction, BaseResponseStream, ETaggedResponseBody
+from .GLTFExport import GLTFMesh, GLTFMeshGeometry, writeGLTF
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +45,19 @@ class SlicerRequestHandler(BaseRequestHandler):
         self.enableExec = enableExec
         self.sampleDataLogic = None  # used for progress reporting during download
         self.logMessage = logMessage or self.defaultLogMessage
+        # Most recently encoded frame of each view: (viewName, codec, quality) -> (frameMTime, frameData)
+        self.frameCache = {}
+        # Objects that are modified each time a render window finishes rendering
+        self.renderTimeStamps = {}
+        # Surface mesh of recently exported nodes (or segments): (nodeID, segmentID, decimation) -> (geometryKey, GLTFMeshGeometry)
+        # Least recently used items are removed when the cache is full.
+        self.meshGeometryCacheSize = 256
+        self.meshGeometryCache = collections.OrderedDict()
+        # Most recently exported graphics document for recent queries: query -> ETaggedResponseBody
+        self.graphicsCacheSize = 8
+        self.graphicsCache = collections.OrderedDict()
+        # Modification times are only unique within a session, so include a session identifier in entity tags
+        self.sessionID = uuid.uuid4().hex
 
     def canHandleRequest(self, uri: bytes, **kwargs) -> float:
         """
@@ -52,6 +70,10 @@ class SlicerRequestHandler(BaseRequestHandler):
         route = pathParts[0]
         return 0.5 if route.startswith(b"/slicer") else 0.0
 
+    def streamsRequestBody(self, method: str, uri: bytes) -> bool:
+        """Samples are sent to the tracking stream in the request body for as long as the connection is open."""
+        return urllib.parse.urlparse(uri).path == b"/slicer/tracking/stream"
+
     def handleRequest(
         self, method: str, uri: bytes, requestBody: bytes,
     ) -> tuple[bytes, bytes]:
@@ -82,6 +104,8 @@ class SlicerRequestHandler(BaseRequestHandler):
             responseBody, contentType = self.screenshot(request)
         elif request.find(b"/slice") == 0:
             responseBody, contentType = self.slice(request)
+        elif request.find(b"/stream") == 0:
+            responseBody, contentType = self.stream(request)
         elif request.find(b"/threeDGraphics") == 0:
             responseBody, contentType = self.threeDGraphics(request)
         elif request.find(b"/threeD") == 0:
@@ -180,6 +204,8 @@ class SlicerRequestHandler(BaseRequestHandler):
         p = urllib.parse.urlparse(request.decode())
         q = urllib.parse.parse_qs(p.query)
         self.logMessage(q)
+        if p.path == "/tracking/stream":
+            return self.trackingStream(q)
         try:
             transformMatrix = list(map(float, q["m"][0].split(",")))
         except KeyError:
@@ -196,18 +222,52 @@ class SlicerRequestHandler(BaseRequestHandler):
         self.setupMRMLTracking()
         m = vtk.vtkMatrix4x4()
         self.tracker.GetMatrixTransformToParent(m)
+        self.updateMatrixFromTrackingSample(m, transformMatrix, quaternion, position)
+        self.tracker.SetMatrixTransformToParent(m)
+
+        return (f"Set matrix".encode()), b"text/plain"
+
+    def trackingStream(self, q):
+        """
+        Handle requests with path: /tracking/stream
+        Return a stream that receives transforms in the request body and reports statistics.
+        """
+        try:
+            maximumUpdateRate = float(q["fps"][0].strip())
+        except (KeyError, ValueError):
+            maximumUpdateRate = 60.0
+        maximumUpdateRate = min(max(maximumUpdateRate, 1.0), 200.0)
+        try:
+            statisticsInterval = float(q["statisticsInterval"][0].strip())
+        except (KeyError, ValueError):
+            statisticsInterval = 1.0
+        statisticsInterval = max(statisticsInterval, 0.1)
+        return TrackingStream(self, maximumUpdateRate, statisticsInterval), b"application/x-ndjson"
 
+    @staticmethod
+    def updateMatrixFromTrackingSample(matrix, transformMatrix=None, quaternion=None, position=None):
+        """Update a vtkMatrix4x4 from tracking data.
+        :param matrix: vtkMatrix4x4 to update
+        :param transformMatrix: 9 values (3x3 rotation matrix in row-major order)
+            or 16 values (4x4 matrix in column-major order, position is last row)
+        :param quaternion: rotation as quaternion (w, x, y, z), overrides rotation of transformMatrix
+        :param position: translation (x, y, z), overrides translation of transformMatrix
+        """
         if transformMatrix:
-            for row in range(3):
-                for column in range(3):
-                    m.SetElement(row, column, transformMatrix[3 * row + column])
-                    m.SetElement(row, column, transformMatrix[3 * row + column])
-                    m.SetElement(row, column, transformMatrix[3 * row + column])
-                    m.SetElement(row, column, transformMatrix[3 * row + column])
+            if len(transformMatrix) == 9:
+                for row in range(3):
+                    for column in range(3):
+                        matrix.SetElement(row, column, transformMatrix[3 * row + column])
+            elif len(transformMatrix) == 16:
+                for row in range(3):
+                    for column in range(4):
+                        matrix.SetElement(row, column, transformMatrix[4 * column + row])
+            else:
+                raise ValueError(f"Transform matrix must have 9 or 16 elements, got {len(transformMatrix)}")
 
         if position:
             for row in range(3):
-                m.SetElement(row, 3, position[row])
+                matrix.SetElement(row, 3, position[row])
 
         if quaternion:
             qu = vtk.vtkQuaternion["float64"]()
@@ -219,11 +279,7 @@ class SlicerRequestHandler(BaseRequestHandler):
             qu.ToMatrix3x3(m3)
             for row in range(3):
                 for column in range(3):
-                    m.SetElement(row, column, m3[row][column])
-
-        self.tracker.SetMatrixTransformToParent(m)
-
-        return (f"Set matrix".encode()), b"text/plain"
+                    matrix.SetElement(row, column, m3[row][column])
 
     def sampleData(self, request):
         """Handle requests with path: /sampledata"""
@@ -637,7 +693,7 @@ space origin: %%origin%%
     def segmentation(self, request, requestBody):
         """
         Handle requests with path: /segmentation
-        Return the segmentation geometry
+        Return the closed surface of segments in glTF format.
         """
         p = urllib.parse.urlparse(request.decode())
         q = urllib.parse.parse_qs(p.query)
@@ -646,17 +702,136 @@ space origin: %%origin%%
         except KeyError:
             segmentationID = "vtkMRMLSegmentationNode*"
         try:
-            segmentID = q["segmentationID"][0].strip()
+            segmentIDs = [segmentID.strip() for segmentID in q["segmentID"][0].split(",")]
         except KeyError:
-            segmentID = "Segment_1"
-        try:
-            format = q["format"][0].strip()
-        except KeyError:
-            format = "glTF"
+            segmentIDs = None
+        format, decimation = self.graphicsFormatParameters(q)
 
         segmentationNode = slicer.util.getNode(segmentationID)
+        segmentation = segmentationNode.GetSegmentation()
+        if segmentIDs is None:
+            segmentIDs = list(segmentation.GetSegmentIDs())
+        for segmentID in segmentIDs:
+            if not segmentation.GetSegment(segmentID):
+                raise RuntimeError(f"segment {segmentID} not found in {segmentationNode.GetName()}")
+
+        # Closed surface representation is not created in the segmentation node (it would change the 3D display),
+        # missing surfaces are computed from the source representation of each segment (see meshGeometry).
+        displayNode = segmentationNode.GetDisplayNode()
+        meshSources = []
+        for segmentID in segmentIDs:
+            segment = segmentation.GetSegment(segmentID)
+            opacity = displayNode.GetSegmentOpacity3D(segmentID) * displayNode.GetOpacity3D() if displayNode else 1.0
+            meshSources.append((segmentationNode, segmentID, segment.GetName(), segment.GetColor(), opacity))
+
+        query = ("segmentation", segmentationNode.GetID(), tuple(segmentIDs), format, decimation)
+        return self.exportGraphics(query, meshSources, format, decimation, segmentationNode.GetName())
+
+    def graphicsFormatParameters(self, q):
+        """Get graphics export format and decimation from the query parameters."""
+        try:
+            format = q["format"][0].strip().lower()
+        except KeyError:
+            format = "gltf"
+        if format not in ["gltf", "glb"]:
+            raise RuntimeError(f"format {format} not supported")
+        try:
+            decimation = float(q["decimation"][0].strip())
+        except (KeyError, ValueError):
+            decimation = 0.0
+        if decimation < 0.0 or decimation >= 1.0:
+            raise RuntimeError("decimation must be at least 0.0 and less than 1.0")
+        return format, decimation
 
-        return b'{"result": "not implemented yet"}', b"application/json"
+    @staticmethod
+    def transformModifiedKey(node):
+        """Return a value that changes when the transform from the node to world coordinates changes."""
+        key = []
+        transformNode = node.GetParentTransformNode()
+        while transformNode:
+            key.append((transformNode.GetID(), transformNode.GetMTime(), transformNode.GetTransformToParent().GetMTime()))
+            transformNode = transformNode.GetParentTransformNode()
+        return tuple(key)
+
+    def meshGeometry(self, node, segmentID, decimation):
+        """Return the surface of a model node or segment in world coordinates.
+        Surfaces are cached and only recomputed if the geometry or the transform of the node has changed.
+        :param node: model or segmentation node
+        :param segmentID: segment ID (if node is a segmentation node)
+        :param decimation: ratio of triangles to remove (between 0.0 and 1.0)
+        """
+        polyData = None
+        if segmentID is not None:
+            segmentation = node.GetSegmentation()
+            segment = segmentation.GetSegment(segmentID)
+            closedSurfaceName = slicer.vtkSegmentationConverter.GetSegmentationClosedSurfaceRepresentationName()
+            if segmentation.ContainsRepresentation(closedSurfaceName):
+                representation = segment.GetRepresentation(closedSurfaceName)
+                representationKey = representation.GetMTime() if representation else 0
+            else:
+                # Closed surface is computed from the source representation at export,
+                # without adding the representation to the segmentation
+                representation = segment.GetRepresentation(segmentation.GetSourceRepresentationName())
+                representationKey = (representation.GetMTime() if representation else 0, segmentation.SerializeAllConversionParameters())
+        else:
+            polyData = node.GetPolyData()
+            representationKey = polyData.GetMTime() if polyData else 0
+        geometryKey = (representationKey, self.transformModifiedKey(node))
+        cacheKey = (node.GetID(), segmentID, decimation)
+        cachedGeometryKey, geometry = self.meshGeometryCache.get(cacheKey, (None, None))
+        if geometryKey == cachedGeometryKey:
+            self.meshGeometryCache.move_to_end(cacheKey)
+            return geometryKey, geometry
+
+        worldPolyData = vtk.vtkPolyData()
+        if segmentID is not None:
+            slicer.vtkSlicerSegmentationsModuleLogic.GetSegmentClosedSurfaceRepresentation(node, segmentID, worldPolyData, True)
+        elif polyData:
+            transformNode = node.GetParentTransformNode()
+            if transformNode:
+                transformToWorld = vtk.vtkGeneralTransform()
+                transformNode.GetTransformToWorld(transformToWorld)
+                transformFilter = vtk.vtkTransformPolyDataFilter()
+                transformFilter.SetTransform(transformToWorld)
+                transformFilter.SetInputData(polyData)
+                transformFilter.Update()
+                worldPolyData = transformFilter.GetOutput()
+            else:
+                worldPolyData = polyData
+        geometry = GLTFMeshGeometry.fromPolyData(worldPolyData, decimation)
+        self.meshGeometryCache[cacheKey] = (geometryKey, geometry)
+        self.meshGeometryCache.move_to_end(cacheKey)
+        if len(self.meshGeometryCache) > self.meshGeometryCacheSize:
+            # cache is full, drop least recently used item
+            self.meshGeometryCache.popitem(last=False)
+        return geometryKey, geometry
+
+    def exportGraphics(self, query, meshSources, format, decimation, sceneName):
+        """Return glTF document of the surface meshes.
+        The document is only regenerated if any of the meshes or their appearance has changed.
+        :param query: hashable description of the request
+        :param meshSources: list of (node, segmentID, name, color, opacity)
+        :return: tuple of response body (with entity tag) and content type
+        """
+        meshes = []
+        contentKey = [self.sessionID, query, sceneName]
+        for node, segmentID, name, color, opacity in meshSources:
+            geometryKey, geometry = self.meshGeometry(node, segmentID, decimation)
+            meshes.append(GLTFMesh(name, geometry, color, opacity))
+            contentKey.append((node.GetID(), segmentID, geometryKey, name, tuple(color), opacity))
+        etag = hashlib.sha1(repr(contentKey).encode()).hexdigest()
+
+        binary = format == "glb"
+        contentType = b"model/gltf-binary" if binary else b"model/gltf+json"
+        responseBody = self.graphicsCache.get(query)
+        if responseBody is None or responseBody.etag != etag:
+            responseBody = ETaggedResponseBody(writeGLTF(meshes, binary, sceneName), etag)
+            self.graphicsCache[query] = responseBody
+        self.graphicsCache.move_to_end(query)
+        if len(self.graphicsCache) > self.graphicsCacheSize:
+            # cache is full, drop least recently used item
+            self.graphicsCache.popitem(last=False)
+        return responseBody, contentType
 
     def accessDICOMwebStudy(self, request, requestBody):
         """
@@ -959,11 +1134,7 @@ space origin: %%origin%%
             if orientation.lower() != previousOrientation:
                 sliceLogic.FitSliceToBackground()
 
-        imageData = sliceLogic.GetBlend().Update(0)
-        imageData = sliceLogic.GetBlend().GetOutputDataObject(0)
-        pngData = []
-        if imageData:
-            pngData = self.vtkImageDataToPNG(imageData)
+        _frameMTime, pngData = self.viewFrame(view, "png")
         self.logMessage("returning an image of %d length" % len(pngData))
         return pngData, b"image/png"
 
@@ -971,7 +1142,7 @@ space origin: %%origin%%
         """
         Handle requests with path: /threeDGraphics
         Return a graphics content for a threeD view.
-        Defaults to glTF.
+        Defaults to glTF of the models and segmentations that are visible in the view.
         """
 
         p = urllib.parse.urlparse(request.decode())
@@ -984,26 +1155,61 @@ space origin: %%origin%%
             boxVisible = q["boxVisible"][0].strip().lower()
         except KeyError:
             boxVisible = "false"
-        try:
-            format = q["format"][0].strip().lower()
-        except KeyError:
-            format = "glTF"
 
-        if format == "glTF":
-            lm = slicer.app.layoutManager()
-            boxWasVisible = lm.threeDWidget(widgetIndex).mrmlViewNode().GetBoxVisible()
-            lm.threeDWidget(widgetIndex).mrmlViewNode().SetBoxVisible(boxVisible != "false")
-            renderWindow = lm.threeDWidget(widgetIndex).threeDView().renderWindow()
+        lm = slicer.app.layoutManager()
+        threeDWidget = lm.threeDWidget(widgetIndex)
+        if not threeDWidget:
+            raise RuntimeError(f"3D view {widgetIndex} is not available")
+        viewNode = threeDWidget.mrmlViewNode()
+
+        if boxVisible != "false":
+            # The view box is only available by exporting the entire render window
+            try:
+                format = q["format"][0].strip().lower()
+            except KeyError:
+                format = "gltf"
+            if format != "gltf":
+                raise RuntimeError(f"format {format} not supported")
+            boxWasVisible = viewNode.GetBoxVisible()
+            viewNode.SetBoxVisible(True)
+            renderWindow = threeDWidget.threeDView().renderWindow()
             exporter = vtk.vtkGLTFExporter()
             exporter.SetInlineData(True)
             exporter.SetSaveNormal(True)
             exporter.SetRenderWindow(renderWindow)
             result = exporter.WriteToString()
-            lm.threeDWidget(widgetIndex).mrmlViewNode().SetBoxVisible(boxWasVisible)
-        else:
-            raise RuntimeError(f"format {format} not supported")
+            viewNode.SetBoxVisible(boxWasVisible)
+            return result.encode(), b"application/json"
 
-        return result.encode(), b"application/json"
+        format, decimation = self.graphicsFormatParameters(q)
+
+        meshSources = []
+        for modelNode in slicer.util.getNodesByClass("vtkMRMLModelNode"):
+            displayNode = modelNode.GetDisplayNode()
+            if (modelNode.GetHideFromEditors() or not modelNode.GetPolyData() or not displayNode
+                    or not displayNode.GetVisibility() or not displayNode.GetVisibility3D()
+                    or not displayNode.IsDisplayableInView(viewNode.GetID())):
+                continue
+            meshSources.append((modelNode, None, modelNode.GetName(), displayNode.GetColor(), displayNode.GetOpacity()))
+        for segmentationNode in slicer.util.getNodesByClass("vtkMRMLSegmentationNode"):
+            displayNode = segmentationNode.GetDisplayNode()
+            if (not displayNode or not displayNode.GetVisibility() or not displayNode.GetVisibility3D()
+                    or not displayNode.IsDisplayableInView(viewNode.GetID())):
+                continue
+            segmentation = segmentationNode.GetSegmentation()
+            closedSurfaceName = slicer.vtkSegmentationConverter.GetSegmentationClosedSurfaceRepresentationName()
+            if not segmentation.ContainsRepresentation(closedSurfaceName):
+                # Surfaces are not displayed in 3D views
+                continue
+            for segmentID in segmentation.GetSegmentIDs():
+                if not displayNode.GetSegmentVisibility(segmentID) or not displayNode.GetSegmentVisibility3D(segmentID):
+                    continue
+                segment = segmentation.GetSegment(segmentID)
+                opacity = displayNode.GetSegmentOpacity3D(segmentID) * displayNode.GetOpacity3D()
+                meshSources.append((segmentationNode, segmentID, segment.GetName(), segment.GetColor(), opacity))
+
+        query = ("threeDGraphics", viewNode.GetID(), format, decimation)
+        return self.exportGraphics(query, meshSources, format, decimation, viewNode.GetName())
 
     def threeD(self, request):
         """
@@ -1064,16 +1270,125 @@ space origin: %%origin%%
 
         view.renderWindow().Render()
         view.renderEnabled = True
+        imageData = self.threeDViewImageData(view)
+
+        pngData = self.vtkImageDataToPNG(imageData)
+        self.logMessage("threeD returning an image of %d length" % len(pngData))
+        return pngData, b"image/png"
+
+    def stream(self, request):
+        """
+        Handle requests with path: /stream
+        Return a multipart stream of the frames of a slice or 3D view.
+        A new frame is sent only when the content of the view has changed.
+        """
+
+        p = urllib.parse.urlparse(request.decode())
+        q = urllib.parse.parse_qs(p.query)
+        try:
+            view = q["view"][0].strip().lower()
+        except KeyError:
+            view = "red"
+        if view not in ["red", "yellow", "green"] and not view.isdigit():
+            raise RuntimeError(f"view {view} not supported")
+        try:
+            codec = q["codec"][0].strip().lower()
+        except KeyError:
+            codec = "jpeg"
+        if codec not in ["jpeg", "png"]:
+            raise RuntimeError(f"codec {codec} not supported")
+        try:
+            quality = int(q["quality"][0].strip())
+        except (KeyError, ValueError):
+            quality = 75
+        quality = min(max(quality, 1), 100)
+        try:
+            maximumFrameRate = float(q["fps"][0].strip())
+        except (KeyError, ValueError):
+            maximumFrameRate = 10.0
+        maximumFrameRate = min(max(maximumFrameRate, 0.1), 60.0)
+
+        # Fail early if the view is not available
+        self.viewFrameMTime(view)
+
+        viewStream = ViewFrameStream(self, view, codec, quality, maximumFrameRate)
+        return viewStream, b"multipart/x-mixed-replace; boundary=%s" % viewStream.boundary
+
+    @staticmethod
+    def sliceLogicForView(view):
+        sliceWidget = slicer.app.layoutManager().sliceWidget(view.capitalize())
+        if not sliceWidget:
+            raise RuntimeError(f"slice view {view} is not available")
+        return sliceWidget.sliceLogic()
+
+    @staticmethod
+    def threeDViewForView(view):
+        threeDWidget = slicer.app.layoutManager().threeDWidget(int(view) - 1)
+        if not threeDWidget:
+            raise RuntimeError(f"3D view {view} is not available")
+        return threeDWidget.threeDView()
+
+    def viewFrameMTime(self, view):
+        """Return a value that changes each time the content of the view changes.
+        :param view: slice view name (`red`, `yellow`, `green`) or 3D view number (`1`, `2`, ...)
+        """
+        if view.isdigit():
+            renderWindow = self.threeDViewForView(view).renderWindow()
+            return self.renderTimeStamp(renderWindow).GetMTime()
+        blend = self.sliceLogicForView(view).GetBlend()
+        blend.Update(0)
+        imageData = blend.GetOutputDataObject(0)
+        return imageData.GetMTime() if imageData else 0
+
+    def renderTimeStamp(self, renderWindow):
+        """Return an object that is modified each time the render window finishes rendering."""
+        key = renderWindow.GetAddressAsString("vtkRenderWindow")
+        if key not in self.renderTimeStamps:
+            timeStamp = vtk.vtkObject()
+            timeStamp.Modified()
+            renderWindow.AddObserver(vtk.vtkCommand.EndEvent, lambda caller, event, timeStamp=timeStamp: timeStamp.Modified())
+            self.renderTimeStamps[key] = timeStamp
+        return self.renderTimeStamps[key]
+
+    def viewImageData(self, view):
+        if view.isdigit():
+            return self.threeDViewImageData(self.threeDViewForView(view))
+        return self.sliceLogicForView(view).GetBlend().GetOutputDataObject(0)
+
+    @staticmethod
+    def threeDViewImageData(view):
+        """Render the 3D view and return its content as vtkImageData."""
         view.forceRender()
         w2i = vtk.vtkWindowToImageFilter()
         w2i.SetInput(view.renderWindow())
         w2i.SetReadFrontBuffer(0)
         w2i.Update()
-        imageData = w2i.GetOutput()
-
-        pngData = self.vtkImageDataToPNG(imageData)
-        self.logMessage("threeD returning an image of %d length" % len(pngData))
-        return pngData, b"image/png"
+        return w2i.GetOutput()
+
+    def viewFrame(self, view, codec="png", quality=None):
+        """Return the encoded content of a view.
+        The encoded frame is cached and only recomputed if the content of the view has changed.
+        :param view: slice view name (`red`, `yellow`, `green`) or 3D view number (`1`, `2`, ...)
+        :param codec: `png` or `jpeg`
+        :param quality: jpeg quality (1-100)
+        :return: tuple of frame modification time and encoded frame bytes
+        """
+        cacheKey = (view, codec, quality)
+        frameMTime = self.viewFrameMTime(view)
+        cachedFrameMTime, frameData = self.frameCache.get(cacheKey, (None, None))
+        if frameMTime == cachedFrameMTime:
+            return frameMTime, frameData
+        imageData = self.viewImageData(view)
+        if not imageData:
+            frameData = b""
+        elif codec == "jpeg":
+            frameData = self.vtkImageDataToJPEG(imageData, quality)
+        else:
+            frameData = self.vtkImageDataToPNG(imageData)
+        # Capturing a 3D view renders it, therefore get the modification time after capture
+        frameMTime = self.viewFrameMTime(view)
+        self.frameCache[cacheKey] = (frameMTime, frameData)
+        return frameMTime, frameData
 
     def timeimage(self, request=""):
         """
@@ -1144,6 +1459,31 @@ space origin: %%origin%%
 
         return pngData
 
+    def vtkImageDataToJPEG(self, imageData, quality=75):
+        """Return a buffer of jpeg data using the data
+        from the vtkImageData.
+        :param imageData: a vtkImageData instance
+        :param quality: jpeg quality (1-100)
+        :return: bytes of a jpeg image
+        """
+        if imageData.GetNumberOfScalarComponents() == 4:
+            # jpeg has no alpha channel
+            extractComponents = vtk.vtkImageExtractComponents()
+            extractComponents.SetInputData(imageData)
+            extractComponents.SetComponents(0, 1, 2)
+            extractComponents.Update()
+            imageData = extractComponents.GetOutput()
+        writer = vtk.vtkJPEGWriter()
+        writer.SetWriteToMemory(True)
+        writer.SetInputData(imageData)
+        writer.SetQuality(quality)
+        writer.Write()
+        result = writer.GetResult()
+        jpegArray = vtk.util.numpy_support.vtk_to_numpy(result)
+        jpegData = jpegArray.tobytes()
+
+        return jpegData
+
     def reportProgress(self, message):
         # Abort download if cancel is clicked in progress bar
         if self.progressWindow.wasCanceled:
@@ -1372,3 +1712,167 @@ space origin: %%origin%%
                 traceback.print_exc()
 
         return content
+
+
+class ViewFrameStream(BaseResponseStream):
+    """Multipart (MJPEG-style) stream of the frames of a view.
+    Frames are only sent when the content of the view has changed,
+    at most `maximumFrameRate` times per second.
+    """
+
+    boundary = b"slicerframe"
+
+    def __init__(self, requestHandler, view, codec, quality, maximumFrameRate):
+        self.requestHandler = requestHandler
+        self.view = view
+        self.codec = codec
+        self.quality = quality if codec == "jpeg" else None
+        self.interval = 1.0 / maximumFrameRate
+        self.contentType = b"image/jpeg" if codec == "jpeg" else b"image/png"
+        self.lastFrameMTime = None
+
+    def nextPart(self):
+        frameMTime, frameData = self.requestHandler.viewFrame(self.view, self.codec, self.quality)
+        if frameMTime == self.lastFrameMTime or not frameData:
+            return b""
+        self.lastFrameMTime = frameMTime
+        part = b"--%s\r\n" % self.boundary
+        part += b"Content-Type: %s\r\n" % self.contentType
+        part += b"Content-Length: %d\r\n" % len(frameData)
+        part += b"\r\n"
+        part += frameData
+        part += b"\r\n"
+        return part
+
+
+class TrackingStream(BaseResponseStream):
+    """Persistent tracking channel.
+
+    The client sends newline-delimited JSON in the request body (with chunked transfer encoding,
+    or without content length). Each line is a sample or a list of samples, such as::
+
+        {"name": "Probe", "timestamp": 1712345678.123, "m": [...], "q": [w, x, y, z], "p": [x, y, z]}
+
+    `name` is the name of the transform node (created if it does not exist yet),
+    `m`, `q`, and `p` have the same meaning as in the /tracking endpoint, `timestamp` is optional
+    (time of acquisition, in seconds since the epoch).
+
+    Only the latest sample of each transform is applied at each update,
+    older samples and samples that are older than the last applied sample are dropped.
+    Statistics are sent to the client as a JSON line periodically.
+    """
+
+    def __init__(self, requestHandler, maximumUpdateRate=60.0, statisticsInterval=1.0):
+        self.requestHandler = requestHandler
+        self.interval = statisticsInterval
+        self.receivedData = b""
+        # Latest received sample of each transform: name -> (sample, receive time)
+        self.pendingSamples = {}
+        # Timestamp of the last applied sample of each transform
+        self.lastTimestamps = {}
+        self.transformNodeIDs = {}
+        self.resetStatistics()
+        self.updateTimer = qt.QTimer()
+        self.updateTimer.setInterval(int(1000.0 / maximumUpdateRate))
+        self.updateTimer.connect("timeout()", self.applyPendingSamples)
+        self.updateTimer.start()
+
+    def resetStatistics(self):
+        self.statistics = {"received": 0, "applied": 0, "dropped": 0, "invalid": 0}
+        self.latencies = []
+        self.ages = []
+
+    def receive(self, data):
+        self.receivedData += data
+        lines = self.receivedData.split(b"\n")
+        # Last line is incomplete (empty if data ended with newline)
+        self.receivedData = lines.pop()
+        receiveTime = time.perf_counter()
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                samples = json.loads(line)
+            except ValueError:
+                self.statistics["invalid"] += 1
+                continue
+            if not isinstance(samples, list):
+                samples = [samples]
+            for sample in samples:
+                self.addSample(sample, receiveTime)
+
+    def addSample(self, sample, receiveTime):
+        try:
+            name = sample["name"]
+            timestamp = sample.get("timestamp")
+        except (KeyError, TypeError):
+            self.statistics["invalid"] += 1
+            return
+        if not isinstance(name, str) or not (timestamp is None or self.isValidTimestamp(timestamp)):
+            self.statistics["invalid"] += 1
+            return
+        self.statistics["received"] += 1
+        if timestamp is not None:
+            newerTimestamps = [self.lastTimestamps.get(name)]
+            if name in self.pendingSamples:
+                newerTimestamps.append(self.pendingSamples[name][0].get("timestamp"))
+            newerTimestamps = [t for t in newerTimestamps if t is not None and t > timestamp]
+            if newerTimestamps:
+                # Stale sample, a more recent one has already been received
+                self.statistics["dropped"] += 1
+                return
+        if name in self.pendingSamples:
+            # Replaced by a newer sample before it was applied
+            self.statistics["dropped"] += 1
+        self.pendingSamples[name] = (sample, receiveTime)
+
+    @staticmethod
+    def isValidTimestamp(timestamp):
+        return isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool) and math.isfinite(timestamp)
+
+    def transformNode(self, name):
+        transformNode = slicer.mrmlScene.GetNodeByID(self.transformNodeIDs.get(name, ""))
+        if not transformNode:
+            transformNode = slicer.mrmlScene.GetFirstNode(name, "vtkMRMLLinearTransformNode")
+        if not transformNode:
+            transformNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLLinearTransformNode", name)
+        self.transformNodeIDs[name] = transformNode.GetID()
+        return transformNode
+
+    def applyPendingSamples(self):
+        if not self.pendingSamples:
+            return
+        pendingSamples = self.pendingSamples
+        self.pendingSamples = {}
+        applyTime = time.perf_counter()
+        matrix = vtk.vtkMatrix4x4()
+        for name, (sample, receiveTime) in pendingSamples.items():
+            transformNode = self.transformNode(name)
+            transformNode.GetMatrixTransformToParent(matrix)
+            try:
+                self.requestHandler.updateMatrixFromTrackingSample(matrix, sample.get("m"), sample.get("q"), sample.get("p"))
+            except (ValueError, TypeError, IndexError):
+                self.statistics["invalid"] += 1
+                continue
+            transformNode.SetMatrixTransformToParent(matrix)
+            self.statistics["applied"] += 1
+            self.latencies.append(applyTime - receiveTime)
+            timestamp = sample.get("timestamp")
+            if timestamp is not None:
+                self.lastTimestamps[name] = timestamp
+                self.ages.append(time.time() - timestamp)
+
+    def nextPart(self):
+        statistics = dict(self.statistics)
+        for key, values in [("latency", self.latencies), ("age", self.ages)]:
+            if values:
+                statistics[key] = {
+                    "mean": 1000.0 * sum(values) / len(values),
+                    "max": 1000.0 * max(values),
+                }
+        self.resetStatistics()
+        return json.dumps(statistics).encode() + b"\n"
+
+    def close(self):
+        self.updateTimer.stop()
+        self.applyPendingSamples()
@@ -1,4 +1,4 @@
-from .BaseRequestHandler import BaseRequestHandler
+from .BaseRequestHandler import BaseRequestHandler, BaseResponseStream, ETaggedResponseBody
 from .DICOMRequestHandler import DICOMRequestHandler
 from .SlicerRequestHandler import SlicerRequestHandler
 from .StaticPagesRequestHandler import StaticPagesRequestHandler